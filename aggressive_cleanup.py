@@ -5,57 +5,67 @@ Aggressive WordPress/WooCommerce/Elementor Cleanup Script
 - Comprehensive transformation to native appearance
 """
 
-import re
 import os
 from datetime import datetime
 
-def aggressive_cleanup(content):
-    """Aggressive cleanup of all remaining WordPress/WooCommerce/Elementor references"""
-    print("🔄 Performing aggressive cleanup...")
-    
+from rewrite_engine import regex_rule, compile_rules, apply_rules, print_hit_report
+
+# Prefetch configuration written by the original WordPress install
+PREFETCH_OLD = r'"prefetch":\[{"source":"document","where":{"and":\[{"href_matches":"\\\/\*"},{"not":{"href_matches":\["\\\/wp-\*\.php","\\\/wp-admin\\\\\*","\\\/wp-content\\\/uploads\\\\\*","\\\/wp-content\\\\\*","\\\/wp-content\\\/plugins\\\\\*","\\\/wp-content\\\/themes\\\/custom-theme-child\\\\\*","\\\/wp-content\\\/themes\\\/custom-theme\\\\\*","\\\\\*\\\\\?\(\.\+\)"\]}},{"not":{"selector_matches":"a\[rel~=\\"nofollow\\"\]"}},{"not":{"selector_matches":"\.no-prefetch, \.no-prefetch a"}}]},"eagerness":"conservative"}]'
+PREFETCH_NEW = r'"prefetch":[{"source":"document","where":{"and":[{"href_matches":"\\/*"},{"not":{"href_matches":["\\/*\\?(.+)"]}},{"not":{"selector_matches":"a[rel~=\\"nofollow\\"]"}},{"not":{"selector_matches":".no-prefetch, .no-prefetch a"}}]},"eagerness":"conservative"}]'
+
+AGGRESSIVE_CLEANUP_RULES = [
     # Replace ALL elementor references in CSS classes and attributes
-    content = re.sub(r'\belementor-([a-zA-Z0-9_-]+)', r'builder-\1', content)
-    content = re.sub(r'\belementor\b', 'builder', content)
-    
+    regex_rule(r'\belementor-([a-zA-Z0-9_-]+)', r'builder-\1'),
+    regex_rule(r'\belementor\b', 'builder'),
+
     # Replace ALL woocommerce references
-    content = re.sub(r'\bwoocommerce\b', 'ecommerce', content)
-    
+    regex_rule(r'\bwoocommerce\b', 'ecommerce'),
+
     # Replace ALL wp-admin references
-    content = re.sub(r'\/wp-admin\/[^"\']*', '/api/ajax.php', content)
-    content = re.sub(r'wp-admin', 'admin', content)
-    
+    regex_rule(r'\/wp-admin\/[^"\']*', '/api/ajax.php'),
+    regex_rule(r'wp-admin', 'admin'),
+
     # Replace ALL wp-content references in prefetch and other configurations
-    content = re.sub(r'\/wp-content\/', '/assets/', content)
-    content = re.sub(r'wp-content', 'assets', content)
-    
+    regex_rule(r'\/wp-content\/', '/assets/'),
+    regex_rule(r'wp-content', 'assets'),
+
     # Replace theme references
-    content = re.sub(r'page-template-elementor_header_footer', 'page-template-custom_header_footer', content)
-    content = re.sub(r'elementor_header_footer', 'custom_header_footer', content)
-    content = re.sub(r'elementor_library', 'builder_library', content)
-    
+    regex_rule(r'page-template-elementor_header_footer', 'page-template-custom_header_footer'),
+    regex_rule(r'elementor_header_footer', 'custom_header_footer'),
+    regex_rule(r'elementor_library', 'builder_library'),
+
     # Replace script IDs
-    content = re.sub(r'id="elementor-([^"]*)"', r'id="builder-\1"', content)
-    content = re.sub(r'id="elementskit-([^"]*)"', r'id="elements-\1"', content)
-    
+    regex_rule(r'id="elementor-([^"]*)"', r'id="builder-\1"'),
+    regex_rule(r'id="elementskit-([^"]*)"', r'id="elements-\1"'),
+
     # Replace file paths in href and src attributes
-    content = re.sub(r'header-footer-elementor\.css', 'header-footer-builder.css', content)
-    content = re.sub(r'elementor-icons\.min\.css', 'builder-icons.min.css', content)
-    content = re.sub(r'elementor\.js', 'builder.js', content)
-    
+    regex_rule(r'header-footer-elementor\.css', 'header-footer-builder.css'),
+    regex_rule(r'elementor-icons\.min\.css', 'builder-icons.min.css'),
+    regex_rule(r'elementor\.js', 'builder.js'),
+
     # Replace data attributes
-    content = re.sub(r'data-builder-post-type="elementor_library"', 'data-builder-post-type="builder_library"', content)
-    
+    regex_rule(r'data-builder-post-type="elementor_library"', 'data-builder-post-type="builder_library"'),
+
     # Replace JavaScript configuration objects
-    content = re.sub(r'elementorFrontendConfig', 'builderFrontendConfig', content)
-    content = re.sub(r'ElementorProFrontendConfig', 'ProBuilderFrontendConfig', content)
-    
+    regex_rule(r'elementorFrontendConfig', 'builderFrontendConfig'),
+    regex_rule(r'ElementorProFrontendConfig', 'ProBuilderFrontendConfig'),
+
     # Clean up prefetch configuration completely
-    prefetch_old = r'"prefetch":\[{"source":"document","where":{"and":\[{"href_matches":"\\\/\*"},{"not":{"href_matches":\["\\\/wp-\*\.php","\\\/wp-admin\\\\\*","\\\/wp-content\\\/uploads\\\\\*","\\\/wp-content\\\\\*","\\\/wp-content\\\/plugins\\\\\*","\\\/wp-content\\\/themes\\\/custom-theme-child\\\\\*","\\\/wp-content\\\/themes\\\/custom-theme\\\\\*","\\\\\*\\\\\?\(\.\+\)"\]}},{"not":{"selector_matches":"a\[rel~=\\"nofollow\\"\]"}},{"not":{"selector_matches":"\.no-prefetch, \.no-prefetch a"}}]},"eagerness":"conservative"}]'
-    prefetch_new = r'"prefetch":[{"source":"document","where":{"and":[{"href_matches":"\\/*"},{"not":{"href_matches":["\\/*\\?(.+)"]}},{"not":{"selector_matches":"a[rel~=\\"nofollow\\"]"}},{"not":{"selector_matches":".no-prefetch, .no-prefetch a"}}]},"eagerness":"conservative"}]'
-    content = re.sub(prefetch_old, prefetch_new, content)
-    
+    regex_rule(PREFETCH_OLD, PREFETCH_NEW),
+
     # Clean up any remaining WordPress-specific patterns
-    content = re.sub(r'elementor/lazyload/observe', 'builder/lazyload/observe', content)
+    regex_rule(r'elementor/lazyload/observe', 'builder/lazyload/observe'),
+]
+
+AGGRESSIVE_CLEANUP = compile_rules(AGGRESSIVE_CLEANUP_RULES)
+
+def aggressive_cleanup(content):
+    """Aggressive cleanup of all remaining WordPress/WooCommerce/Elementor references"""
+    print("🔄 Performing aggressive cleanup...")
+    
+    content, hits = apply_rules(content, AGGRESSIVE_CLEANUP)
+    print_hit_report(AGGRESSIVE_CLEANUP, hits)
     
     return content
 
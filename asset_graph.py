@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - GRAFO DE REFERÊNCIAS DOS ASSETS
+Monta o grafo de quem referencia quem (HTML → link/script/img/srcset/url()
+inline, CSS → @import/url()/fontes, JS → caminhos de assets) e faz um
+mark-and-sweep a partir das páginas: o que não é alcançável é asset morto
+"""
+
+import os
+import re
+import sys
+import json
+from urllib.parse import unquote
+
+from html_stream import parse_attributes, read_chunks, tokenize
+from asset_inventory import FILE_TYPES, find_files, load_inventory, save_inventory, update_file
+from site_pipeline import discover_pages
+
+REPORT_FILE = 'asset_graph_report.json'
+
+# Diretórios varridos: só o que está aqui dentro pode ser removido
+SWEEP_ROOTS = ['assets/modules', 'assets/templates', 'assets/media', 'core']
+
+# Scripts carregados fora do HTML (o service worker é registrado pelo navegador)
+ENTRY_SCRIPTS = ['sw.js']
+
+# Atributos HTML que apontam para um arquivo
+URL_ATTRIBUTES = {'href', 'src', 'poster', 'data-src', 'data-bg', 'data-background'}
+SRCSET_ATTRIBUTES = {'srcset', 'data-srcset', 'imagesrcset'}
+
+ASSET_EXTENSIONS = tuple(extension for extensions in FILE_TYPES.values() for extension in extensions)
+
+_CSS_URL = re.compile(r'url\(\s*(?:"([^"]*)"|\'([^\']*)\'|([^)\s]*))\s*\)', re.IGNORECASE)
+_CSS_REBASE_URL = re.compile(r'url\(\s*(["\']?)([^"\')\s]*)\1\s*\)', re.IGNORECASE)
+_CSS_IMPORT = re.compile(r'@import\s+(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_JS_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'')
+
+# ---------------------------------------------------------------------------
+# Extração de referências
+# ---------------------------------------------------------------------------
+
+def _first_group(match):
+    return next((group for group in match.groups() if group is not None), '')
+
+def css_references(css):
+    """URLs referenciadas por um CSS (@import e url(), inclusive fontes)"""
+    css = _CSS_COMMENT.sub('', css)
+    references = [_first_group(match) for match in _CSS_IMPORT.finditer(css)]
+    references.extend(_first_group(match) for match in _CSS_URL.finditer(css))
+    return references
+
+def js_references(js):
+    """Strings de um JS que parecem caminhos de assets"""
+    references = []
+    for match in _JS_STRING.finditer(js):
+        value = _first_group(match).replace('\\/', '/')
+        path = value.split('?')[0].split('#')[0]
+        # Só a extensão (".png") não é um caminho
+        if path.lower().endswith(ASSET_EXTENSIONS) and not os.path.basename(path).startswith('.'):
+            references.append(value)
+    return references
+
+def srcset_references(value):
+    """URLs de um srcset ("a.jpg 1x, b.jpg 2x")"""
+    return [candidate.split()[0] for candidate in value.split(',') if candidate.strip()]
+
+def html_references(path):
+    """Referências de uma página: atributos, srcset, style inline, <style> e <script> inline"""
+    references = {'html': [], 'css': [], 'js': []}
+    open_tag = None
+    pieces = []   # texto do <style>/<script> aberto: vem em partes quando cruza blocos de leitura
+
+    def flush():
+        text = ''.join(pieces)
+        pieces.clear()
+        if open_tag == 'style':
+            references['css'].extend(css_references(text))
+        elif open_tag == 'script':
+            references['js'].extend(js_references(text))
+
+    with open(path, 'r', encoding='utf-8') as source:
+        for token in tokenize(read_chunks(source)):
+            if token['type'] == 'rawtext':
+                pieces.append(token['raw'])
+                continue
+            if pieces:
+                flush()
+            if token['type'] == 'start':
+                open_tag = token['tag']
+                for name, value in parse_attributes(token):
+                    if name in URL_ATTRIBUTES:
+                        references['html'].append(value)
+                    elif name in SRCSET_ATTRIBUTES:
+                        references['html'].extend(srcset_references(value))
+                    elif name == 'style':
+                        references['css'].extend(css_references(value))
+        if pieces:
+            flush()
+
+    return references
+
+# ---------------------------------------------------------------------------
+# Resolução de caminhos
+# ---------------------------------------------------------------------------
+
+def resolve_reference(reference, base_directory):
+    """Caminho local (relativo à raiz) de uma referência, ou None se for externa"""
+    reference = reference.strip()
+    if not reference or reference.startswith(('#', '//', 'data:', 'mailto:', 'tel:', 'javascript:')):
+        return None
+    if re.match(r'^[a-zA-Z][\w+.-]*:', reference):
+        return None
+
+    reference = unquote(reference.split('#')[0].split('?')[0])
+    if not reference:
+        return None
+
+    if reference.startswith('/'):
+        path = reference.lstrip('/')
+    else:
+        path = os.path.join(base_directory, reference)
+
+    path = os.path.normpath(path)
+    if path.startswith('..'):
+        return None
+    return path
+
+def rebase_urls(css, path, directory):
+    """Reescreve os url() relativos de uma folha (em `path`) para valerem a partir de `directory`"""
+    source_directory = os.path.dirname(path)
+
+    def rebase(match):
+        reference = match.group(2)
+        target = resolve_reference(reference, source_directory)
+        if target is None or reference.startswith('/'):
+            return match.group()
+        # Os scripts de conversão gravaram muitos url("./assets/...") relativos à raiz
+        if not os.path.exists(target):
+            root_target = resolve_reference(reference, '')
+            if root_target and os.path.exists(root_target):
+                target = root_target
+        suffix = reference[len(reference.split('?')[0].split('#')[0]):]
+        href = os.path.relpath(target, directory or '.').replace(os.sep, '/')
+        if not href.startswith('.'):
+            href = f'./{href}'
+        return f'url({match.group(1)}{href}{suffix}{match.group(1)})'
+
+    return _CSS_REBASE_URL.sub(rebase, css)
+
+def _link(graph, source, references, base_directories, files):
+    # Primeiro diretório-base em que a referência existe; senão, referência quebrada
+    edges = graph['edges'].setdefault(source, [])
+    for reference in references:
+        candidates = [resolve_reference(reference, base) for base in base_directories]
+        candidates = [path for path in candidates if path is not None]
+        if not candidates:
+            continue
+
+        target = next((path for path in candidates if path in files), None)
+        if target is not None:
+            if target not in edges:
+                edges.append(target)
+        elif candidates[0].lower().endswith(ASSET_EXTENSIONS):
+            graph['missing'].setdefault(candidates[0], []).append(source)
+
+def build_graph(pages=None):
+    """Grafo de referências: páginas e scripts de entrada → assets → assets"""
+    inventory = load_inventory()
+    files = inventory['files']
+    pages = pages if pages is not None else discover_pages()
+
+    graph = {
+        'entries': list(pages) + [script for script in ENTRY_SCRIPTS if script in files],
+        'edges': {},
+        'missing': {},
+    }
+
+    pending = list(graph['entries'])
+    while pending:
+        path = pending.pop()
+        if path in graph['edges']:
+            continue
+
+        directory = os.path.dirname(path)
+        kind = files[path]['type'] if path in files else 'html'
+
+        if kind == 'html':
+            references = html_references(path)
+            _link(graph, path, references['html'] + references['css'] + references['js'], [directory], files)
+        elif kind == 'css':
+            # Os scripts de conversão gravaram muitos url("./assets/...") relativos à raiz
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                _link(graph, path, css_references(f.read()), [directory, ''], files)
+        elif kind == 'js':
+            # Caminhos em JS podem ser relativos ao script (chunks do webpack) ou à página
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                _link(graph, path, js_references(f.read()), [directory, ''], files)
+        else:
+            graph['edges'][path] = []
+
+        pending.extend(target for target in graph['edges'][path] if target not in graph['edges'])
+
+    return graph
+
+# ---------------------------------------------------------------------------
+# Mark-and-sweep
+# ---------------------------------------------------------------------------
+
+def mark(graph):
+    """Conjunto de arquivos alcançáveis a partir das entradas"""
+    reachable = set()
+    pending = list(graph['entries'])
+
+    while pending:
+        path = pending.pop()
+        if path in reachable:
+            continue
+        reachable.add(path)
+        pending.extend(graph['edges'].get(path, ()))
+
+    return reachable
+
+def sweep(reachable, roots=SWEEP_ROOTS):
+    """Arquivos nos diretórios varridos que nenhuma entrada alcança"""
+    dead = []
+    for root in roots:
+        dead.extend(entry for entry in find_files(under=root) if entry['path'] not in reachable)
+    return dead
+
+def collect_dead_assets(apply=False, roots=SWEEP_ROOTS):
+    """Encontra os assets mortos e, com apply=True, remove-os. Retorna o relatório"""
+    graph = build_graph()
+    reachable = mark(graph)
+    dead = sweep(reachable, roots)
+
+    by_root = {}
+    for root in roots:
+        entries = [entry for entry in dead if entry['path'].startswith(os.path.normpath(root) + os.sep)]
+        by_root[root] = {
+            'files': len(entries),
+            'reclaimable_kb': round(sum(entry['size'] for entry in entries) / 1024, 1),
+        }
+
+    if apply:
+        for entry in dead:
+            os.remove(entry['path'])
+            update_file(entry['path'])
+        save_inventory()
+
+    return {
+        'dry_run': not apply,
+        'entries': graph['entries'],
+        'reachable_files': len(reachable),
+        'dead_files': len(dead),
+        'reclaimable_bytes': sum(entry['size'] for entry in dead),
+        'by_root': by_root,
+        'dead': [{'path': entry['path'], 'size': entry['size']} for entry in dead],
+        'missing_references': {path: sorted(set(sources)) for path, sources in sorted(graph['missing'].items())},
+    }
+
+def main():
+    """Relatório de assets mortos (dry-run); --apply remove os arquivos"""
+    print("🕸️ GRAFO DE REFERÊNCIAS DOS ASSETS - PEACOCK COSMÉTICOS\n")
+
+    apply = '--apply' in sys.argv
+    report = collect_dead_assets(apply=apply)
+
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"   📄 Entradas: {', '.join(report['entries'])}")
+    print(f"   🔗 Arquivos alcançáveis: {report['reachable_files']}")
+    for root, summary in report['by_root'].items():
+        print(f"   📂 {root}: {summary['files']} arquivos mortos, {summary['reclaimable_kb']} KB")
+    if report['missing_references']:
+        print(f"   ⚠️ {len(report['missing_references'])} referências quebradas")
+
+    reclaimable_kb = round(report['reclaimable_bytes'] / 1024, 1)
+    if apply:
+        print(f"\n   ✅ {report['dead_files']} arquivos removidos ({reclaimable_kb} KB)")
+    else:
+        print(f"\n   💾 Recuperável: {report['dead_files']} arquivos, {reclaimable_kb} KB "
+              f"(dry-run; use --apply para remover)")
+    print(f"   📊 Relatório: {REPORT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - INLINE DE ASSETS PEQUENOS
+Assets abaixo de um limite de bytes custam mais pela requisição do que pelo
+conteúdo: imagens (src de <img>, ícones e url() do CSS da página) viram data
+URIs e folhas de estilo e scripts pequenos vão para dentro do HTML, até um
+orçamento por página. Assets usados por muitas páginas continuam como arquivos,
+onde o cache do navegador compensa mais
+"""
+
+import os
+import re
+import sys
+import base64
+from collections import Counter
+from urllib.parse import quote
+
+from html_stream import parse_attributes, rewrite_attributes, tokenize
+from css_purge import link_span, noscript_fallback, stylesheet_links
+from asset_graph import build_graph, mark, rebase_urls, resolve_reference
+from pass_engine import parse_option, register_shared_resource, shared_resource
+from site_pipeline import discover_pages
+
+# Tamanho máximo (bytes do arquivo) de um asset inline
+INLINE_THRESHOLD = 4 * 1024
+
+# Total de bytes inline acrescentados a uma página
+PAGE_INLINE_BUDGET = 48 * 1024
+
+# A partir de quantas páginas um asset fica melhor em cache como arquivo
+MAX_SHARED_PAGES = 3
+
+MIME_TYPES = {
+    '.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.gif': 'image/gif',
+    '.webp': 'image/webp', '.avif': 'image/avif', '.svg': 'image/svg+xml', '.ico': 'image/x-icon',
+    '.woff2': 'font/woff2', '.woff': 'font/woff',
+}
+
+# Caracteres que ficam literais no SVG codificado com %
+SVG_SAFE_CHARACTERS = " '=:/;,.-_()!*~@+?$"
+
+_CSS_URL = re.compile(r'url\(\s*(["\']?)([^"\')\s]*)\1\s*\)', re.IGNORECASE)
+
+# ---------------------------------------------------------------------------
+# Data URIs
+# ---------------------------------------------------------------------------
+
+def data_uri(path):
+    """Data URI de um arquivo. SVG usa a codificação com % quando ela é menor que base64"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    uri = f'data:{MIME_TYPES[extension]};base64,{base64.b64encode(data).decode("ascii")}'
+    if extension == '.svg':
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            return uri
+        percent = f'data:{MIME_TYPES[extension]},{quote(text, safe=SVG_SAFE_CHARACTERS)}'
+        if len(percent) < len(uri):
+            return percent
+    return uri
+
+def page_reference_counts():
+    """Em quantas páginas cada asset é alcançável (direto ou por CSS/JS)"""
+    pages = discover_pages()
+    graph = build_graph(pages)
+    counts = Counter()
+    for page in pages:
+        counts.update(mark({'entries': [page], 'edges': graph['edges']}))
+    return counts
+
+register_shared_resource('page_reference_counts', page_reference_counts)
+
+# ---------------------------------------------------------------------------
+# Inline por página
+# ---------------------------------------------------------------------------
+
+def new_stats():
+    return {'images': 0, 'stylesheets': 0, 'scripts': 0, 'bytes_inlined': 0, 'skipped_shared': 0,
+            'skipped_budget': 0}
+
+def _candidate(reference, base_directory, extensions, state):
+    # Caminho local do asset se ele puder ir inline nesta página, senão None
+    path = resolve_reference(reference, base_directory)
+    if not path or not path.lower().endswith(extensions) or not os.path.isfile(path):
+        return None
+    size = os.path.getsize(path)
+    if size > state['threshold']:
+        return None
+    if state['counts'].get(path, 0) > MAX_SHARED_PAGES:
+        state['stats']['skipped_shared'] += 1
+        return None
+    if size > state['budget']:
+        state['stats']['skipped_budget'] += 1
+        return None
+    return path
+
+def _spend(state, kind, size):
+    state['budget'] -= size
+    state['stats'][kind] += 1
+    state['stats']['bytes_inlined'] += size
+
+def _inline_image(reference, base_directory, state):
+    path = _candidate(reference, base_directory, tuple(MIME_TYPES), state)
+    if path is None:
+        return None
+    uri = data_uri(path)
+    _spend(state, 'images', len(uri))
+    return uri
+
+def inline_css_urls(css, base_directory, state):
+    """Troca os url() pequenos de um CSS (relativos a base_directory) por data URIs"""
+    def replace(match):
+        uri = _inline_image(match.group(2), base_directory, state)
+        return match.group() if uri is None else f'url("{uri}")'
+    return _CSS_URL.sub(replace, css)
+
+def _inline_stylesheets(content, base_directory, state):
+    # Folhas pequenas viram <style>; o fallback em <noscript> de um preload sai junto
+    replacements = []
+    for match, path, attributes in stylesheet_links(content, base_directory):
+        if noscript_fallback(content, match):
+            continue
+        if _candidate(attributes.get('href', ''), base_directory, ('.css',), state) is None:
+            continue
+
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            css = rebase_urls(f.read(), path, base_directory)
+        _spend(state, 'stylesheets', len(css))
+        css = inline_css_urls(css, base_directory, state)
+
+        media = attributes.get('media', '').strip()
+        media_attribute = f' media="{media}"' if media and media.lower() != 'all' else ''
+        replacements.append((*link_span(content, match), f'<style{media_attribute}>{css}</style>\n'))
+
+    for start, end, style in reversed(replacements):
+        content = content[:start] + style + content[end:]
+    return content
+
+def _script_tag(attributes):
+    parts = ['<script']
+    for name, value in attributes:
+        if name != 'src':
+            parts.append(f' {name}="{value}"' if value else f' {name}')
+    return ''.join(parts) + '>'
+
+def _inline_script(token, attributes, base_directory, state):
+    # Só scripts síncronos: um defer/async inline rodaria fora de ordem
+    names = dict(attributes)
+    if 'src' not in names or 'defer' in names or 'async' in names or names.get('type', '').lower() == 'module':
+        return None
+    path = _candidate(names['src'], base_directory, ('.js',), state)
+    if path is None:
+        return None
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        js = f.read()
+    if '</script' in js.lower():
+        return None
+    _spend(state, 'scripts', len(js))
+    return _script_tag(attributes) + js
+
+def inline_document(content, base_directory='', threshold=INLINE_THRESHOLD, budget=PAGE_INLINE_BUDGET,
+                    counts=None):
+    """Coloca inline os assets pequenos de uma página, na ordem do documento, até o
+    orçamento. Retorna (conteúdo, estatísticas)"""
+    state = {
+        'threshold': threshold,
+        'budget': budget,
+        'counts': counts if counts is not None else shared_resource('page_reference_counts'),
+        'stats': new_stats(),
+    }
+
+    content = _inline_stylesheets(content, base_directory, state)
+
+    output = []
+    open_tag = None
+    for token in tokenize([content]):
+        raw = token['raw']
+        if token['type'] == 'start':
+            open_tag = token['tag']
+            attributes = parse_attributes(token)
+            names = dict(attributes)
+
+            if token['tag'] == 'script':
+                raw = _inline_script(token, attributes, base_directory, state) or raw
+            elif token['tag'] == 'img' and 'srcset' not in names:
+                raw = rewrite_attributes(token, lambda name, value: _inline_image(value, base_directory, state)
+                                         if name == 'src' else None)
+            elif token['tag'] == 'link' and 'icon' in names.get('rel', '').lower().split():
+                raw = rewrite_attributes(token, lambda name, value: _inline_image(value, base_directory, state)
+                                         if name == 'href' else None)
+            elif 'style' in names:
+                raw = rewrite_attributes(token, lambda name, value: inline_css_urls(value, base_directory, state)
+                                         if name == 'style' else None)
+        elif token['type'] == 'rawtext' and open_tag == 'style':
+            raw = inline_css_urls(raw, base_directory, state)
+        output.append(raw)
+
+    return ''.join(output), state['stats']
+
+def main():
+    """Mostra o que iria inline em cada página (--threshold BYTES, --budget BYTES; não altera arquivos)"""
+    print("📎 INLINE DE ASSETS PEQUENOS - PEACOCK COSMÉTICOS\n")
+
+    threshold = int(parse_option('--threshold', INLINE_THRESHOLD))
+    budget = int(parse_option('--budget', PAGE_INLINE_BUDGET))
+    pages = [argument for argument in sys.argv[1:] if argument.endswith('.html')] or discover_pages()
+
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        content, stats = inline_document(content, os.path.dirname(page), threshold, budget)
+        requests = stats['images'] + stats['stylesheets'] + stats['scripts']
+        print(f"   📄 {page}: {stats['images']} imagens, {stats['stylesheets']} folhas e {stats['scripts']} scripts "
+              f"inline ({round(stats['bytes_inlined'] / 1024, 1)} KB, {requests} requisições a menos)")
+        if stats['skipped_shared'] or stats['skipped_budget']:
+            print(f"      ℹ️ {stats['skipped_shared']} mantidos por serem compartilhados, "
+                  f"{stats['skipped_budget']} por falta de orçamento")
+
+if __name__ == "__main__":
+    main()
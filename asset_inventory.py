@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - INVENTÁRIO DE ARQUIVOS
+Um único índice dos arquivos do site (caminho, tamanho, mtime, tipo, e hash,
+dimensões de imagens e outros metadados calculados sob demanda), montado com
+os.scandir, salvo em disco e atualizado de forma incremental pelos mtimes.
+Substitui as varreduras os.walk repetidas
+"""
+
+import os
+import sys
+import json
+import hashlib
+
+INVENTORY_FILE = '.asset_inventory.json'
+
+# Diretórios que nunca fazem parte do site
+SKIP_DIRS = {'.git', '__pycache__', '.build_cache', 'node_modules'}
+
+FILE_TYPES = {
+    'css': ('.css',),
+    'js': ('.js',),
+    'image': ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg'),
+    'video': ('.mp4', '.webm', '.ogg'),
+    'font': ('.woff', '.woff2', '.ttf', '.otf', '.eot'),
+    'html': ('.html', '.htm'),
+}
+
+# Dados derivados do conteúdo de um arquivo, guardados na entrada dele: valem enquanto
+# tamanho e mtime não mudam (hash, dimensões do image_probe, variantes sem ganho do
+# image_transcode, prévias do image_placeholders)
+METADATA_KEYS = ('hash', 'image', 'useless_variants', 'placeholders')
+
+# Inventário carregado neste processo (None = ainda não montado)
+_inventory = None
+
+# Caminho absoluto da raiz do inventário em memória: a mesma raiz '.' em outro
+# diretório de trabalho (os corpora do benchmark, por exemplo) é outro site
+_inventory_path = None
+
+# Metadados gravados por este processo desde a última coleta: caminho ->
+# {'size', 'mtime_ns', 'values'} (os processos de trabalho devolvem ao principal)
+_pending_metadata = {}
+
+def file_type(name):
+    """Tipo do arquivo pela extensão"""
+    lower = name.lower()
+    for kind, extensions in FILE_TYPES.items():
+        if lower.endswith(extensions):
+            return kind
+    return 'other'
+
+def _scan_directory(inventory, directory):
+    # Lista um diretório com os.scandir e registra arquivos e subdiretórios
+    files = []
+    subdirs = []
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    subdirs.append(entry.name)
+            elif entry.is_file():
+                files.append(entry.name)
+                _record_file(inventory, os.path.normpath(entry.path), entry.stat())
+
+    inventory['dirs'][directory] = {
+        'mtime_ns': os.stat(directory).st_mtime_ns,
+        'files': sorted(files),
+        'subdirs': sorted(subdirs),
+    }
+
+def _record_file(inventory, path, stat):
+    known = inventory['files'].get(path)
+    entry = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'type': file_type(path),
+    }
+    # Hash, dimensões e demais metadados continuam válidos enquanto tamanho e mtime não mudam
+    if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+        for key in METADATA_KEYS:
+            if key in known:
+                entry[key] = known[key]
+    inventory['files'][path] = entry
+
+def _forget_directory(inventory, directory):
+    info = inventory['dirs'].pop(directory, None)
+    if info is None:
+        return
+    for name in info['files']:
+        inventory['files'].pop(os.path.normpath(os.path.join(directory, name)), None)
+    for name in info['subdirs']:
+        _forget_directory(inventory, os.path.join(directory, name))
+
+def refresh_inventory(inventory):
+    """Atualiza o inventário: só lista de novo os diretórios cujo mtime mudou,
+    e só revalida (stat) os arquivos dos demais"""
+    pending = [inventory['root']]
+    seen = set()
+
+    while pending:
+        directory = pending.pop()
+        seen.add(directory)
+        known = inventory['dirs'].get(directory)
+
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            _forget_directory(inventory, directory)
+            continue
+
+        if known is None or known['mtime_ns'] != mtime_ns:
+            # Arquivos que sumiram deste diretório
+            if known is not None:
+                for name in known['files']:
+                    inventory['files'].pop(os.path.normpath(os.path.join(directory, name)), None)
+            _scan_directory(inventory, directory)
+        else:
+            for name in known['files']:
+                path = os.path.normpath(os.path.join(directory, name))
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    inventory['files'].pop(path, None)
+                    continue
+                entry = inventory['files'].get(path)
+                if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+                    _record_file(inventory, path, stat)
+
+        pending.extend(os.path.join(directory, name) for name in inventory['dirs'][directory]['subdirs'])
+
+    for directory in [d for d in inventory['dirs'] if d not in seen]:
+        _forget_directory(inventory, directory)
+
+def _loaded_inventory():
+    # Inventário em memória, se for o do diretório de trabalho atual
+    if _inventory is not None and _inventory_path == os.path.abspath(_inventory['root']):
+        return _inventory
+    return None
+
+def load_inventory(root='.', refresh=True):
+    """Inventário do site, lido do disco e atualizado uma vez por processo"""
+    global _inventory, _inventory_path
+
+    if _loaded_inventory() is not None and _inventory['root'] == root:
+        return _inventory
+
+    inventory = {'root': root, 'dirs': {}, 'files': {}}
+    if os.path.exists(INVENTORY_FILE):
+        try:
+            with open(INVENTORY_FILE, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('root') == root:
+                inventory = stored
+        except (OSError, ValueError):
+            print("   ⚠️ Inventário corrompido, recriando")
+
+    if refresh:
+        refresh_inventory(inventory)
+
+    _inventory = inventory
+    _inventory_path = os.path.abspath(root)
+    return inventory
+
+def install_inventory(inventory):
+    """Usa um inventário já carregado e atualizado em outro processo"""
+    global _inventory, _inventory_path
+    _inventory = inventory
+    _inventory_path = os.path.abspath(inventory['root'])
+
+def save_inventory():
+    """Grava o inventário para a próxima execução"""
+    inventory = _loaded_inventory()
+    if inventory is None:
+        return
+    with open(INVENTORY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(inventory, f, ensure_ascii=False)
+
+def find_files(types=None, under=None, extensions=None):
+    """Arquivos do inventário, filtrados por tipo, diretório e extensão, em ordem de caminho"""
+    inventory = load_inventory()
+    prefix = os.path.normpath(under) + os.sep if under else None
+    results = []
+
+    for path, entry in inventory['files'].items():
+        if types and entry['type'] not in types:
+            continue
+        if prefix and not path.startswith(prefix):
+            continue
+        if extensions and not path.lower().endswith(extensions):
+            continue
+        results.append(dict(entry, path=path))
+
+    results.sort(key=lambda entry: entry['path'])
+    return results
+
+def total_size(types=None, under=None, extensions=None):
+    """Soma dos tamanhos dos arquivos filtrados"""
+    return sum(entry['size'] for entry in find_files(types, under, extensions))
+
+def file_hash(path):
+    """Hash SHA-256 do arquivo, calculado só quando pedido e guardado no inventário"""
+    inventory = load_inventory()
+    path = os.path.normpath(path)
+    entry = inventory['files'].get(path)
+
+    # Arquivo alterado desde a última atualização do inventário
+    if entry is not None:
+        stat = os.stat(path)
+        if entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            _record_file(inventory, path, stat)
+            entry = inventory['files'][path]
+
+    if entry is None or 'hash' not in entry:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if entry is None:
+            return digest
+        entry['hash'] = digest
+
+    return entry['hash']
+
+def file_metadata(path, key):
+    """Metadado (METADATA_KEYS) guardado na entrada do arquivo, ou None se ainda não há
+    ou se o arquivo mudou desde que foi calculado"""
+    path = os.path.normpath(path)
+    if not os.path.isfile(path):
+        return None
+    file_hash(path)   # revalida a entrada
+    entry = load_inventory()['files'].get(path)
+    return entry.get(key) if entry is not None else None
+
+def set_file_metadata(path, key, value):
+    """Guarda um metadado na entrada do arquivo; é gravado em disco com o inventário"""
+    path = os.path.normpath(path)
+    file_hash(path)
+    entry = load_inventory()['files'].get(path)
+    if entry is None:
+        return
+    entry[key] = value
+    pending = _pending_metadata.setdefault(path, {'size': entry['size'], 'mtime_ns': entry['mtime_ns'], 'values': {}})
+    pending['values'][key] = value
+
+def take_pending_metadata():
+    """Metadados gravados por este processo desde a última chamada"""
+    pending = dict(_pending_metadata)
+    _pending_metadata.clear()
+    return pending
+
+def merge_metadata(pending):
+    """Incorpora os metadados calculados por processos de trabalho, se o arquivo não mudou"""
+    inventory = _loaded_inventory()
+    if inventory is None:
+        return
+    for path, record in pending.items():
+        entry = inventory['files'].get(path)
+        if entry is not None and entry['size'] == record['size'] and entry['mtime_ns'] == record['mtime_ns']:
+            entry.update(record['values'])
+
+def update_file(path):
+    """Registra no inventário um arquivo que acabou de ser gravado ou removido"""
+    # Sem inventário carregado não há nada a atualizar: a próxima carga vê o arquivo
+    inventory = _loaded_inventory()
+    if inventory is None:
+        return
+
+    path = os.path.normpath(path)
+
+    if os.path.exists(path):
+        _record_file(inventory, path, os.stat(path))
+    else:
+        inventory['files'].pop(path, None)
+
+def main():
+    """Monta/atualiza o inventário e mostra um resumo por tipo"""
+    print("🗂️ INVENTÁRIO DE ARQUIVOS - PEACOCK COSMÉTICOS\n")
+
+    if '--rebuild' in sys.argv and os.path.exists(INVENTORY_FILE):
+        os.remove(INVENTORY_FILE)
+
+    inventory = load_inventory()
+    save_inventory()
+
+    summary = {}
+    for entry in inventory['files'].values():
+        count, size = summary.get(entry['type'], (0, 0))
+        summary[entry['type']] = (count + 1, size + entry['size'])
+
+    print(f"   📁 Diretórios: {len(inventory['dirs'])}")
+    print(f"   📄 Arquivos: {len(inventory['files'])}")
+    for kind, (count, size) in sorted(summary.items()):
+        print(f"   • {kind}: {count} arquivos, {round(size / (1024 * 1024), 2)} MB")
+
+if __name__ == "__main__":
+    main()
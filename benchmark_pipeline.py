@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - BENCHMARK DO PIPELINE
+Gera um corpus sintético (páginas no estilo Elementor, imagens com srcset,
+folhas de estilo e scripts), mede cada script e o pipeline completo sobre ele
+e guarda os resultados por commit para comparar regressões
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import shutil
+import struct
+import tempfile
+import importlib
+import subprocess
+import statistics
+from contextlib import redirect_stdout
+
+import pass_engine
+import site_pipeline
+from pass_engine import parse_option
+
+RESULTS_FILE = 'benchmark_results.json'
+
+# Uma regressão é sinalizada quando o tempo piora mais que isso em relação ao commit anterior
+REGRESSION_THRESHOLD = 0.10
+
+# Scripts cujo main() é medido sobre o corpus (na ordem de execução habitual)
+BENCHMARK_MODULES = [
+    'optimize_render_blocking',
+    'implement_lazy_loading',
+    'minify_assets',
+    'configure_caching',
+    'optimize_media',
+    'optimize_assets',
+    'reduce_payload',
+    'improve_accessibility',
+    'wordpress_cleanup_and_seo',
+    'aggressive_cleanup',
+    'direct_cleanup',
+    'enhanced_wordpress_cleanup',
+    'final_wordpress_cleanup',
+    'update_paths',
+    'fix_srcset_and_links',
+    'validate_optimizations',
+]
+
+DEFAULT_CONFIG = {
+    'page_sizes_kb': [100, 500, 2000],
+    'site_pages': [1, 4, 16],
+    'images': 24,
+    'stylesheets': 8,
+    'scripts': 6,
+    'css_rules': 400,
+    'repeat': 3,
+    'seed': 42,
+}
+
+QUICK_CONFIG = dict(DEFAULT_CONFIG, page_sizes_kb=[50, 200], site_pages=[1, 4], repeat=1)
+
+# ---------------------------------------------------------------------------
+# Gerador de corpus
+# ---------------------------------------------------------------------------
+
+WORDS = ('peacock cosméticos cabelo tratamento hidratação brilho nutrição fios '
+         'reconstrução máscara shampoo condicionador óleo capilar resultado profissional').split()
+
+def generate_png(width, height):
+    """PNG válido (RGB, uma cor) com as dimensões pedidas"""
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    row = b'\x00' + b'\xc8\x8a\x5a' * width
+    pixels = zlib.compress(row * height, 9)
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', pixels) + chunk(b'IEND', b'')
+
+def generate_css(rules, rng):
+    """Folha de estilo com K regras no formato gerado pelo Elementor"""
+    blocks = []
+    for number in range(rules):
+        element = f'{rng.randrange(16 ** 7):07x}'
+        selector = f'.elementor-{rng.randint(10, 999)} .elementor-element.elementor-element-{element}'
+        if number % 5 == 0:
+            selector += ' > .elementor-widget-container'
+        blocks.append(
+            f'/* Regra {number} */\n'
+            f'{selector} {{\n'
+            f'    margin: {rng.randint(0, 40)}px {rng.randint(0, 40)}px;\n'
+            f'    color: #{rng.randrange(16 ** 6):06x};\n'
+            f'    font-family: "Montserrat", sans-serif;\n'
+            f'}}\n'
+        )
+        if number % 50 == 0:
+            blocks.append('@media (max-width: 767px) {\n'
+                          f'    {selector} {{ display: none; }}\n'
+                          '}\n')
+    return '\n'.join(blocks)
+
+def generate_script(number, rng):
+    """Script de tema/plugin com comentários e espaços para minificar"""
+    lines = [f'// Módulo {number}', '(function ($) {', '    "use strict";']
+    for index in range(rng.randint(20, 60)):
+        lines.append(f'    /* handler {index} */')
+        lines.append(f'    $(".elementor-widget-{index}").on("click", function () {{ return {index}; }});')
+    lines.append('})(jQuery);')
+    return '\n'.join(lines) + '\n'
+
+def generate_section(number, images, rng):
+    """Seção Elementor com título, texto e uma imagem com srcset"""
+    image = rng.randrange(images)
+    element = f'{rng.randrange(16 ** 7):07x}'
+    text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(30, 80)))
+    srcset = ', '.join(f'./assets/media/2025/08/image-{image}-{width}x{width * 2 // 3}.png {width}w'
+                       for width in (300, 768, 1024))
+
+    return f'''
+<section class="elementor-section elementor-top-section elementor-element elementor-element-{element} elementor-section-boxed" data-id="{element}" data-element_type="section">
+    <div class="elementor-container elementor-column-gap-default">
+        <div class="elementor-column elementor-col-50 elementor-top-column elementor-element" data-element_type="column">
+            <div class="elementor-widget-wrap elementor-element-populated">
+                <div class="elementor-element elementor-widget elementor-widget-heading" data-widget_type="heading.default">
+                    <div class="elementor-widget-container">
+                        <h2 class="elementor-heading-title elementor-size-default">Seção {number}</h2>
+                    </div>
+                </div>
+                <div class="elementor-element elementor-widget elementor-widget-text-editor" data-widget_type="text-editor.default">
+                    <div class="elementor-widget-container"><p>{text}</p></div>
+                </div>
+                <!-- elementor widget image -->
+                <div class="elementor-element elementor-widget elementor-widget-image" data-widget_type="image.default">
+                    <div class="elementor-widget-container">
+                        <img src="./assets/media/2025/08/image-{image}.png" class="attachment-large size-large wp-image-{image}" srcset="{srcset}" sizes="(max-width: 1024px) 100vw, 1024px" />
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+</section>'''
+
+def generate_page(size_kb, config, rng, title='Página'):
+    """Página HTML sintética com aproximadamente size_kb KB"""
+    head = [
+        '<!DOCTYPE html>',
+        '<html lang="pt-BR">',
+        '<head>',
+        '<meta charset="UTF-8">',
+        f'<title>{title} - Peacock Cosméticos</title>',
+        '<meta name="generator" content="WordPress 6.6.1" />',
+        '<link rel="https://api.w.org/" href="https://peacockcosmeticos.com.br/wp-json/" />',
+        '<link rel="EditURI" type="application/rsd+xml" title="RSD" href="https://peacockcosmeticos.com.br/xmlrpc.php?rsd" />',
+    ]
+    for number in range(config['stylesheets']):
+        head.append(f"<link rel='stylesheet' id='elementor-post-{number}-css' "
+                    f"href='./assets/media/page-builder/css/post-{number}.css' media='all' />")
+    head.append('<style id="elementor-inline-css">\n'
+                '    .elementor-kit-6 { --e-global-color-primary: #C88A5A; }\n'
+                '    body { margin: 0;   padding: 0; }\n'
+                '</style>')
+    for number in range(config['scripts']):
+        head.append(f'<script src="./assets/js/module-{number}.js" id="module-{number}-js"></script>')
+    head.append('<script>\n    var elementorFrontendConfig = {"environmentMode":{"edit":false,"wpPreview":false}};\n'
+                '    // configuração do tema Astra e WooCommerce\n</script>')
+    head.append('</head>')
+
+    body = ['<body class="home page-template-default page elementor-default elementor-kit-6 woocommerce-no-js">',
+            '<div data-elementor-type="wp-page" data-elementor-id="16" class="elementor elementor-16">']
+
+    size = sum(len(line) for line in head)
+    number = 0
+    while size < size_kb * 1024:
+        section = generate_section(number, config['images'], rng)
+        body.append(section)
+        size += len(section)
+        number += 1
+
+    body.append('</div>')
+    body.append('<video src="./assets/media/2025/08/video.mp4" autoplay muted loop></video>')
+    body.append('<script>jQuery(function ($) { $(".woocommerce").addClass("ready"); /* loja */ });</script>')
+    body.append('</body>')
+    body.append('</html>')
+
+    return '\n'.join(head + body) + '\n'
+
+def generate_corpus(root, config, page_size_kb, pages=1):
+    """Cria o corpus completo (páginas, CSS, JS e imagens) no diretório indicado"""
+    rng = random.Random(config['seed'])
+
+    css_dir = os.path.join(root, 'assets', 'media', 'page-builder', 'css')
+    js_dir = os.path.join(root, 'assets', 'js')
+    # Mídia em assets/media, onde os passes de imagem procuram (wp-content fica fora do site)
+    media_dir = os.path.join(root, 'assets', 'media', '2025', '08')
+    for directory in (css_dir, js_dir, media_dir):
+        os.makedirs(directory, exist_ok=True)
+
+    for number in range(config['stylesheets']):
+        with open(os.path.join(css_dir, f'post-{number}.css'), 'w', encoding='utf-8') as f:
+            f.write(generate_css(config['css_rules'] // config['stylesheets'] or 1, rng))
+
+    for number in range(config['scripts']):
+        with open(os.path.join(js_dir, f'module-{number}.js'), 'w', encoding='utf-8') as f:
+            f.write(generate_script(number, rng))
+
+    for number in range(config['images']):
+        width = rng.choice((600, 800, 1200))
+        with open(os.path.join(media_dir, f'image-{number}.png'), 'wb') as f:
+            f.write(generate_png(width, width * 2 // 3))
+
+    page_paths = ['index.html'] + [os.path.join('produtos', f'produto-{n}.html') for n in range(1, pages)]
+    for number, page in enumerate(page_paths):
+        path = os.path.join(root, page)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_page(page_size_kb, config, rng, title=f'Página {number}'))
+
+    return page_paths
+
+# ---------------------------------------------------------------------------
+# Medições
+# ---------------------------------------------------------------------------
+
+def _timed_in(corpus, function):
+    # Executa function() numa cópia nova do corpus e retorna os segundos gastos
+    workdir = tempfile.mkdtemp(prefix='peacock-bench-')
+    shutil.copytree(corpus, workdir, dirs_exist_ok=True)
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            return time.perf_counter() - start
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def _measure(corpus, function, repeat):
+    # Mediana de várias execuções, cada uma sobre o corpus original
+    return statistics.median(_timed_in(corpus, function) for _ in range(repeat))
+
+def _mb(size_bytes):
+    return size_bytes / (1024 * 1024)
+
+def benchmark_modules(corpus, repeat):
+    """Mede o main() de cada script sobre o corpus"""
+    page_bytes = os.path.getsize(os.path.join(corpus, 'index.html'))
+    results = {}
+
+    for name in BENCHMARK_MODULES:
+        try:
+            module = importlib.import_module(name)
+        except ImportError as e:
+            results[name] = {'status': 'skipped', 'reason': str(e)}
+            continue
+
+        try:
+            seconds = _measure(corpus, module.main, repeat)
+        except Exception as e:
+            results[name] = {'status': 'error', 'reason': f'{type(e).__name__}: {e}'}
+            continue
+
+        results[name] = {
+            'status': 'ok',
+            'seconds': round(seconds, 4),
+            'mb_per_s': round(_mb(page_bytes) / seconds, 2),
+        }
+
+    return results
+
+def benchmark_pipeline_sizes(config):
+    """Curva de escala do pipeline completo pelo tamanho da página"""
+    curve = []
+    for size_kb in config['page_sizes_kb']:
+        corpus = tempfile.mkdtemp(prefix='peacock-corpus-')
+        try:
+            generate_corpus(corpus, config, size_kb)
+            page_bytes = os.path.getsize(os.path.join(corpus, 'index.html'))
+            seconds = _measure(corpus, pass_engine.run_pipeline, config['repeat'])
+        finally:
+            shutil.rmtree(corpus, ignore_errors=True)
+
+        curve.append({
+            'page_kb': round(page_bytes / 1024, 1),
+            'seconds': round(seconds, 4),
+            'mb_per_s': round(_mb(page_bytes) / seconds, 2),
+        })
+    return curve
+
+def benchmark_site(config):
+    """Curva de escala do modo site pelo número de páginas"""
+    size_kb = config['page_sizes_kb'][0]
+    curve = []
+    for pages in config['site_pages']:
+        corpus = tempfile.mkdtemp(prefix='peacock-site-')
+        try:
+            generate_corpus(corpus, config, size_kb, pages)
+            seconds = _measure(corpus, site_pipeline.run_site, config['repeat'])
+        finally:
+            shutil.rmtree(corpus, ignore_errors=True)
+
+        curve.append({
+            'pages': pages,
+            'workers': min(os.cpu_count() or 1, pages),
+            'seconds': round(seconds, 4),
+            'pages_per_s': round(pages / seconds, 2),
+        })
+    return curve
+
+# ---------------------------------------------------------------------------
+# Histórico e comparação
+# ---------------------------------------------------------------------------
+
+def current_commit():
+    """Commit atual do repositório (ou 'unknown' fora do git)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True).stdout.strip()
+        return f'{commit}-dirty' if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def load_results(path=RESULTS_FILE):
+    """Histórico de execuções do benchmark"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'runs': []}
+
+def _timings(run):
+    # Todos os tempos de uma execução, com chaves estáveis para comparação
+    timings = {}
+    for name, result in run['modules'].items():
+        if result.get('status') == 'ok':
+            timings[f'module:{name}'] = result['seconds']
+    for point in run['pipeline']:
+        timings[f"pipeline:{point['page_kb']}KB"] = point['seconds']
+    for point in run['site']:
+        timings[f"site:{point['pages']}pages"] = point['seconds']
+    return timings
+
+def compare_runs(previous, current, threshold=REGRESSION_THRESHOLD):
+    """Lista as medições que ficaram mais lentas que o limite"""
+    before = _timings(previous)
+    after = _timings(current)
+    regressions = []
+
+    for key, seconds in after.items():
+        if key in before and before[key] > 0:
+            change = (seconds - before[key]) / before[key]
+            if change > threshold:
+                regressions.append({'measurement': key, 'before': before[key],
+                                    'after': seconds, 'change_pct': round(change * 100, 1)})
+    return regressions
+
+def run_benchmark(config):
+    """Executa todas as medições e retorna o registro desta execução"""
+    # Cada medição roda numa cópia nova do corpus, sem .build_cache: o cache começa
+    # vazio e nenhum passe é reaproveitado de uma medição anterior
+    corpus = tempfile.mkdtemp(prefix='peacock-corpus-')
+    try:
+        generate_corpus(corpus, config, config['page_sizes_kb'][0])
+        modules = benchmark_modules(corpus, config['repeat'])
+    finally:
+        shutil.rmtree(corpus, ignore_errors=True)
+
+    return {
+        'commit': current_commit(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'cpu_count': os.cpu_count(),
+        'config': config,
+        'modules': modules,
+        'pipeline': benchmark_pipeline_sizes(config),
+        'site': benchmark_site(config),
+    }
+
+def main():
+    """Executa o benchmark (--quick, --repeat N, --sizes 100,500) e compara com a execução anterior"""
+    print("📏 BENCHMARK DO PIPELINE - PEACOCK COSMÉTICOS\n")
+
+    config = dict(QUICK_CONFIG if '--quick' in sys.argv else DEFAULT_CONFIG)
+    sizes = parse_option('--sizes')
+    if sizes:
+        config['page_sizes_kb'] = [int(size) for size in sizes.split(',')]
+    repeat = parse_option('--repeat')
+    if repeat:
+        config['repeat'] = int(repeat)
+
+    run = run_benchmark(config)
+
+    print("🧩 Scripts individuais:")
+    for name, result in run['modules'].items():
+        if result['status'] == 'ok':
+            print(f"   ✅ {name}: {result['seconds']}s ({result['mb_per_s']} MB/s)")
+        else:
+            print(f"   ⚠️ {name}: {result['status']} ({result['reason']})")
+
+    print("\n📈 Pipeline por tamanho de página:")
+    for point in run['pipeline']:
+        print(f"   • {point['page_kb']} KB: {point['seconds']}s ({point['mb_per_s']} MB/s)")
+
+    print("\n🌐 Modo site por número de páginas:")
+    for point in run['site']:
+        print(f"   • {point['pages']} páginas, {point['workers']} processos: "
+              f"{point['seconds']}s ({point['pages_per_s']} páginas/s)")
+
+    history = load_results()
+    previous = next((r for r in reversed(history['runs'])
+                     if r['commit'] != run['commit'] and r['config'] == run['config']), None)
+    if previous is not None:
+        regressions = compare_runs(previous, run)
+        run['regressions'] = regressions
+        if regressions:
+            print(f"\n🚨 Regressões em relação a {previous['commit']}:")
+            for regression in regressions:
+                print(f"   • {regression['measurement']}: {regression['before']}s → "
+                      f"{regression['after']}s (+{regression['change_pct']}%)")
+        else:
+            print(f"\n✅ Nenhuma regressão em relação a {previous['commit']}")
+
+    history['runs'].append(run)
+    with open(RESULTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados salvos em {RESULTS_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - CACHE INCREMENTAL DE BUILD
+Guarda o resultado de cada passe pelo hash do conteúdo de entrada e pela versão
+do passe, para que uma nova execução só refaça o que realmente mudou
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+
+import asset_inventory
+
+CACHE_DIR = '.build_cache'
+CACHE_INDEX = os.path.join(CACHE_DIR, 'index.json')
+CACHE_OBJECTS = os.path.join(CACHE_DIR, 'objects')
+
+# Limite do cache em disco; as entradas menos usadas recentemente saem primeiro
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Desativado com --no-cache na linha de comando ou com set_cache_enabled(False)
+_enabled = '--no-cache' not in sys.argv
+
+# Índice carregado em memória (None = ainda não lido do disco)
+_index = None
+
+# Diretório do cache de onde o índice em memória veio: outro diretório de
+# trabalho (os corpora do benchmark, por exemplo) tem outro cache
+_index_path = None
+
+# Entradas gravadas nesta execução, devolvidas ao processo principal no modo site
+_new_entries = {}
+
+def set_cache_enabled(enabled):
+    """Liga ou desliga o cache para a execução atual"""
+    global _enabled
+    _enabled = enabled
+
+def cache_enabled():
+    """Indica se o cache deve ser consultado e atualizado"""
+    return _enabled
+
+def content_hash(content):
+    """Hash SHA-256 de um texto ou bloco de bytes"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+def load_cache():
+    """Carrega o índice do cache (uma única vez por execução)"""
+    global _index, _index_path
+
+    if _index is None or _index_path != os.path.abspath(CACHE_DIR):
+        _index = {'entries': {}}
+        _index_path = os.path.abspath(CACHE_DIR)
+        if os.path.exists(CACHE_INDEX):
+            try:
+                with open(CACHE_INDEX, 'r', encoding='utf-8') as f:
+                    _index = json.load(f)
+            except (OSError, ValueError):
+                print("   ⚠️ Índice do cache corrompido, recriando")
+
+    return _index
+
+def file_hash(path):
+    """Hash do conteúdo de um arquivo (vem do inventário, que o reaproveita enquanto mtime e tamanho não mudam)"""
+    return asset_inventory.file_hash(path)
+
+def cache_key(name, version, input_hash):
+    """Chave de uma entrada: nome do passe, versão do passe e hash da entrada"""
+    return f'{name}@{version}:{input_hash}'
+
+def _object_path(digest):
+    return os.path.join(CACHE_OBJECTS, digest[:2], digest)
+
+def lookup(key):
+    """Retorna o valor guardado para a chave, ou None se não houver"""
+    if not cache_enabled():
+        return None
+
+    entry = load_cache()['entries'].get(key)
+    if entry is None:
+        return None
+
+    if 'object' in entry:
+        try:
+            with open(_object_path(entry['object']), 'r', encoding='utf-8') as f:
+                value = f.read()
+        except OSError:
+            del _index['entries'][key]
+            return None
+    else:
+        value = entry['value']
+
+    entry['last_used'] = time.time()
+    return value
+
+def store(key, value):
+    """Guarda um valor: textos vão para objects/, metadados pequenos ficam no índice"""
+    if not cache_enabled():
+        return
+
+    entry = {'last_used': time.time()}
+
+    if isinstance(value, str):
+        digest = content_hash(value)
+        path = _object_path(digest)
+        if not os.path.exists(path):
+            # Gravação atômica: vários processos podem gravar o mesmo objeto
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(value)
+            os.replace(temp_path, path)
+        entry['object'] = digest
+        entry['size'] = len(value.encode('utf-8'))
+    else:
+        entry['value'] = value
+        entry['size'] = len(json.dumps(value))
+
+    load_cache()['entries'][key] = entry
+    _new_entries[key] = entry
+
+def take_pending_entries():
+    """Entradas gravadas por este processo desde a última chamada"""
+    entries = dict(_new_entries)
+    _new_entries.clear()
+    return entries
+
+def merge_entries(entries):
+    """Incorpora ao índice as entradas produzidas por processos de trabalho"""
+    if cache_enabled():
+        load_cache()['entries'].update(entries)
+
+def evict(max_bytes=CACHE_MAX_BYTES):
+    """Remove as entradas menos usadas até o cache caber no limite"""
+    index = load_cache()
+    entries = index['entries']
+
+    # Objetos são compartilhados entre entradas com o mesmo conteúdo
+    object_sizes = {}
+    inline_size = 0
+    for entry in entries.values():
+        if 'object' in entry:
+            object_sizes[entry['object']] = entry['size']
+        else:
+            inline_size += entry['size']
+    total = inline_size + sum(object_sizes.values())
+
+    removed = 0
+    for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+        if total <= max_bytes:
+            break
+
+        entry = entries.pop(key)
+        removed += 1
+
+        if 'object' not in entry:
+            total -= entry['size']
+        elif not any(e.get('object') == entry['object'] for e in entries.values()):
+            total -= entry['size']
+            try:
+                os.remove(_object_path(entry['object']))
+            except OSError:
+                pass
+
+    return removed
+
+def save_cache():
+    """Aplica o limite de tamanho e grava o índice no disco"""
+    if not cache_enabled() or _index is None or _index_path != os.path.abspath(CACHE_DIR):
+        return
+
+    evict()
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(CACHE_INDEX, 'w', encoding='utf-8') as f:
+        json.dump(_index, f, indent=2, ensure_ascii=False)
+
+def clear_cache():
+    """Apaga todo o cache em disco"""
+    global _index, _index_path
+
+    _index = {'entries': {}}
+    _index_path = os.path.abspath(CACHE_DIR)
+    if os.path.exists(CACHE_DIR):
+        for root, dirs, files in os.walk(CACHE_DIR, topdown=False):
+            for file in files:
+                os.remove(os.path.join(root, file))
+            for directory in dirs:
+                os.rmdir(os.path.join(root, directory))
+        os.rmdir(CACHE_DIR)
+
+def cache_stats():
+    """Resumo do cache para os relatórios"""
+    index = load_cache()
+    objects = {e['object']: e['size'] for e in index['entries'].values() if 'object' in e}
+    inline = sum(e['size'] for e in index['entries'].values() if 'object' not in e)
+
+    return {
+        'entries': len(index['entries']),
+        'size_kb': round((inline + sum(objects.values())) / 1024, 1),
+        'max_size_kb': round(CACHE_MAX_BYTES / 1024, 1),
+    }
+
+def main():
+    """Mostra o estado do cache; --clear apaga tudo"""
+    print("🗄️ CACHE INCREMENTAL DE BUILD - PEACOCK COSMÉTICOS\n")
+
+    if '--clear' in sys.argv:
+        clear_cache()
+        print("   ✅ Cache apagado")
+        return
+
+    stats = cache_stats()
+    print(f"   📦 Entradas: {stats['entries']}")
+    print(f"   💾 Tamanho: {stats['size_kb']} KB de {stats['max_size_kb']} KB")
+
+if __name__ == "__main__":
+    main()
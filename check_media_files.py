@@ -6,6 +6,8 @@ Script to check if all media files referenced in HTML exist locally
 import re
 import os
 
+from image_probe import image_dimensions
+
 def check_media_files():
     # Read the HTML file
     with open('index.html', 'r', encoding='utf-8') as f:
@@ -47,7 +49,8 @@ def check_media_files():
         
         if os.path.exists(file_path):
             existing_files.append(url)
-            print(f"✓ {url}")
+            dimensions = image_dimensions(file_path)
+            print(f"✓ {url}" + (f" ({dimensions[0]}x{dimensions[1]})" if dimensions else ""))
         else:
             missing_files.append(url)
             print(f"✗ {url} - FILE NOT FOUND")
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - ENCURTAMENTO DE CLASSES E IDS
+Troca os nomes longos de classes e ids (elementor-element-f273e14,
+ekit-heading--title...) por nomes curtos gerados, de forma consistente no HTML
+de todas as páginas, nas folhas de estilo que elas carregam e nas strings dos
+scripts (inline e externos). Os nomes mais usados recebem os nomes mais curtos;
+nomes que o JavaScript pode montar ou ler de outra forma ficam como estão
+"""
+
+import os
+import re
+import sys
+import json
+from collections import Counter
+
+from html_stream import rewrite_attributes, tokenize
+from css_purge import SAFELIST, SAFELIST_PATTERNS, stylesheet_links
+from asset_inventory import find_files, save_inventory, update_file
+from site_pipeline import discover_pages
+
+MAP_FILE = 'class_rename_map.json'
+
+# Scripts do site reescritos junto com as páginas (o painel admin fica de fora)
+SCRIPT_ROOTS = ['assets', 'core']
+
+# Nomes deste tamanho ou menores não compensam
+MIN_NAME_LENGTH = 3
+
+# Nomes curtos que bloqueadores de anúncio escondem
+AVOID_NAMES = {'ad', 'ads', 'adv'}
+
+# Atributos cujo valor é uma lista de ids
+IDREF_ATTRIBUTES = {
+    'for', 'headers', 'list', 'form', 'aria-labelledby', 'aria-describedby', 'aria-controls',
+    'aria-owns', 'aria-activedescendant', 'aria-details', 'aria-errormessage', 'aria-flowto',
+}
+
+_NAME = re.compile(r'-?[_a-zA-Z][\w-]*')
+_WORD = re.compile(r'[\w-]+')
+_STRUCTURE = re.compile(r'([{};])')
+_SELECTOR_NAME = re.compile(r'([.#])(-?[_a-zA-Z][\w-]*)(\x00)?')
+_BRACKETS = re.compile(r'(\[[^\]]*\])')
+_ATTRIBUTE_VALUE = re.compile(r'\[\s*(class|id)\s*[~|^$*]?=\s*["\']?([^"\'\]\s]*)', re.IGNORECASE)
+_PLACEHOLDER = re.compile('\x00(\\d+)\x00')
+_JS_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'|`([^`]*)`')
+
+# Comentários, strings, url() e escapes do CSS: copiados sem mudança
+_CSS_OPAQUE = re.compile(r'''/\*.*?(?:\*/|\Z)|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|url\(\s*[^\s"')]*\s*\)|\\[^\n]''',
+                         re.DOTALL | re.IGNORECASE)
+
+# Em uma string JS, '.nome' ou '#nome' é um seletor quando vem depois disto (ou no início)
+_SELECTOR_BOUNDARY = set(' \t\n,>+~(:*')
+
+# ---------------------------------------------------------------------------
+# Percurso de CSS, JS e HTML
+#
+# visit(tipo, nome, escape) é chamado para cada nome encontrado e retorna o novo
+# nome ou None. Tipos: 'class' e 'id' (renomeáveis), 'word' (palavra usada de
+# outra forma) e 'attribute' (valor de [class*=...]/[id^=...])
+# ---------------------------------------------------------------------------
+
+def _rewrite_selector(selector, opaque, visit):
+    # Os valores de [class^="..."] casam com pedaços dos nomes
+    restored = _PLACEHOLDER.sub(lambda match: opaque[int(match.group(1))], selector)
+    for attribute, value in _ATTRIBUTE_VALUE.findall(restored):
+        if value:
+            visit('attribute', value, False)
+
+    def rename(match):
+        kind = 'class' if match.group(1) == '.' else 'id'
+        name = visit(kind, match.group(2), match.group(3) is not None)
+        return match.group() if name is None else f'{match.group(1)}{name}{match.group(3) or ""}'
+
+    # Dentro de [...] um '.' é texto (ex.: [href$=.pdf])
+    parts = _BRACKETS.split(selector)
+    for index in range(0, len(parts), 2):
+        parts[index] = _SELECTOR_NAME.sub(rename, parts[index])
+    return ''.join(parts)
+
+def rewrite_css(css, visit):
+    """CSS com os nomes dos seletores trocados por visit()"""
+    opaque = []
+
+    def protect(match):
+        opaque.append(match.group())
+        return f'\x00{len(opaque) - 1}\x00'
+
+    parts = _STRUCTURE.split(_CSS_OPAQUE.sub(protect, css))
+    for index, part in enumerate(parts):
+        # Texto seguido de '{' é um seletor (ou o prelúdio de uma at-rule)
+        if index + 1 < len(parts) and parts[index + 1] == '{' and not part.strip().startswith('@'):
+            parts[index] = _rewrite_selector(part, opaque, visit)
+
+    return _PLACEHOLDER.sub(lambda match: opaque[int(match.group(1))], ''.join(parts))
+
+def _rewrite_string(text, visit):
+    for attribute, value in _ATTRIBUTE_VALUE.findall(text):
+        if value:
+            visit('attribute', value, False)
+
+    def rename(match):
+        start = match.start()
+        selector = start > 0 and text[start - 1] in '.#' and (start < 2 or text[start - 2] in _SELECTOR_BOUNDARY)
+        if selector and _NAME.fullmatch(match.group()):
+            name = visit('class' if text[start - 1] == '.' else 'id', match.group(), False)
+            return match.group() if name is None else name
+        visit('word', match.group(), False)
+        return match.group()
+
+    return _WORD.sub(rename, text)
+
+def rewrite_js(js, visit):
+    """JS com os seletores das strings ('.nome', '#nome') trocados por visit().
+    As demais palavras das strings são informadas como 'word'"""
+    def rewrite(match):
+        index = next(i for i, group in enumerate(match.groups(), 1) if group is not None)
+        start, end = match.span(index)
+        return match.group()[:start - match.start()] + _rewrite_string(match.group(index), visit) \
+            + match.group()[end - match.start():]
+
+    return _JS_STRING.sub(rewrite, js)
+
+def rewrite_html(content, visit):
+    """HTML com class, id, atributos de ids, <style> e <script> inline reescritos"""
+    output = []
+    open_tag = None
+
+    for token in tokenize([content]):
+        raw = token['raw']
+        if token['type'] == 'start':
+            open_tag = token['tag']
+            raw = rewrite_attributes(token, lambda name, value: _rewrite_attribute(name, value, visit))
+        elif token['type'] == 'rawtext':
+            if open_tag == 'style':
+                raw = rewrite_css(raw, visit)
+            elif open_tag == 'script':
+                raw = rewrite_js(raw, visit)
+        output.append(raw)
+
+    return ''.join(output)
+
+def _rewrite_attribute(name, value, visit):
+    if name in ('class', 'id') or name in IDREF_ATTRIBUTES:
+        kind = 'class' if name == 'class' else 'id'
+        names = [visit(kind, item, False) or item for item in value.split()]
+        return ' '.join(names) if names != value.split() else None
+    for word in _WORD.findall(value):
+        visit('word', word, False)
+    return None
+
+# ---------------------------------------------------------------------------
+# Mapeamento
+# ---------------------------------------------------------------------------
+
+def site_sources(pages):
+    """Páginas, folhas de estilo que elas carregam e scripts do site"""
+    stylesheets = []
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for match, path, attributes in stylesheet_links(content, os.path.dirname(page)):
+            if path not in stylesheets:
+                stylesheets.append(path)
+
+    scripts = [entry['path'] for root in SCRIPT_ROOTS for entry in find_files(types=('js',), under=root)]
+    return {'html': list(pages), 'css': stylesheets, 'js': scripts}
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+def _rewrite_sources(sources, visit, write=None):
+    rewriters = {'html': rewrite_html, 'css': rewrite_css, 'js': rewrite_js}
+    changed = []
+    for kind, paths in sources.items():
+        for path in paths:
+            content = _read(path)
+            rewritten = rewriters[kind](content, visit)
+            if write is not None and rewritten != content:
+                write(path, rewritten)
+                changed.append(path)
+    return changed
+
+def collect_usage(sources):
+    """Quantas vezes cada classe e id aparece e quais nomes não podem mudar"""
+    usage = {'class': Counter(), 'id': Counter()}
+    blocked = set()
+    prefixes = set()
+    substrings = set()
+
+    def visit(kind, name, escaped):
+        if kind == 'attribute':
+            substrings.add(name)
+            return None
+        if kind in usage and not escaped and _NAME.fullmatch(name):
+            usage[kind][name] += 1
+        else:
+            blocked.add(name)
+        # 'elementor-' + nome, '.elementor-element-${id}': tudo que começa assim pode ser montado pelo JS
+        if len(name) > 3 and name.endswith(('-', '_')):
+            prefixes.add(name)
+        return None
+
+    _rewrite_sources(sources, visit)
+    return usage, blocked, tuple(sorted(prefixes)), substrings
+
+def renamable(name, blocked, prefixes, substrings):
+    """Um nome só muda se nenhum script ou atributo puder usá-lo de outra forma"""
+    return (len(name) > MIN_NAME_LENGTH and name not in blocked and name not in SAFELIST
+            and not name.startswith(prefixes)
+            and not any(pattern.match(name) for pattern in SAFELIST_PATTERNS)
+            and not any(substring in name for substring in substrings))
+
+def short_names():
+    """Nomes curtos em ordem de tamanho: a..z, a0..zz, a00..."""
+    first = 'abcdefghijklmnopqrstuvwxyz'
+    rest = first + '0123456789'
+    suffixes = ['']
+    while True:
+        for suffix in suffixes:
+            for letter in first:
+                yield letter + suffix
+        suffixes = [char + suffix for suffix in suffixes for char in rest]
+
+def build_mapping(usage, blocked, prefixes, substrings):
+    """Nome original -> nome curto, por tipo; os mais usados ficam com os menores"""
+    reserved = blocked | set(usage['class']) | set(usage['id']) | AVOID_NAMES
+    mapping = {}
+
+    for kind, counter in usage.items():
+        names = short_names()
+        mapping[kind] = {}
+        for name, count in sorted(counter.items(), key=lambda item: (-item[1], item[0])):
+            if not renamable(name, blocked, prefixes, substrings):
+                continue
+            token = next(names)
+            while token in reserved:
+                token = next(names)
+            if len(token) >= len(name):
+                continue
+            mapping[kind][name] = token
+
+    return mapping
+
+def rename_site(apply=False, pages=None):
+    """Calcula o mapeamento e, com apply=True, reescreve páginas, CSS e JS.
+    Retorna o relatório (que também é o artefato de depuração)"""
+    sources = site_sources(pages if pages is not None else discover_pages())
+    usage, blocked, prefixes, substrings = collect_usage(sources)
+    mapping = build_mapping(usage, blocked, prefixes, substrings)
+
+    saved = sum(usage[kind][name] * (len(name) - len(token))
+                for kind in mapping for name, token in mapping[kind].items())
+
+    changed = []
+    if apply:
+        def visit(kind, name, escaped):
+            return None if escaped else mapping.get(kind, {}).get(name)
+
+        def write(path, content):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            update_file(path)
+
+        changed = _rewrite_sources(sources, visit, write)
+        save_inventory()
+
+    return {
+        'dry_run': not apply,
+        'classes_renamed': len(mapping['class']),
+        'classes_kept': len(usage['class']) - len(mapping['class']),
+        'ids_renamed': len(mapping['id']),
+        'ids_kept': len(usage['id']) - len(mapping['id']),
+        'estimated_bytes_saved': saved,
+        'files_changed': changed,
+        'classes': mapping['class'],
+        'ids': mapping['id'],
+    }
+
+def main():
+    """Mapeamento de nomes (dry-run); --apply reescreve os arquivos"""
+    print("🏷️ ENCURTAMENTO DE CLASSES E IDS - PEACOCK COSMÉTICOS\n")
+
+    apply = '--apply' in sys.argv
+    report = rename_site(apply=apply)
+
+    with open(MAP_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"   🏷️ Classes: {report['classes_renamed']} encurtadas, {report['classes_kept']} mantidas")
+    print(f"   🆔 Ids: {report['ids_renamed']} encurtados, {report['ids_kept']} mantidos")
+    print(f"   💾 Economia estimada: {round(report['estimated_bytes_saved'] / 1024, 1)} KB")
+    if apply:
+        print(f"\n   ✅ {len(report['files_changed'])} arquivos reescritos")
+    else:
+        print("\n   ℹ️ Dry-run; use --apply para reescrever os arquivos")
+    print(f"   📊 Mapeamento: {MAP_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import os
 import json
 import re
 
+from pass_engine import load_document, save_document
+
 def create_htaccess_cache_rules():
     """Cria regras de cache no .htaccess"""
     print("📁 Criando regras de cache .htaccess...")
@@ -114,8 +116,7 @@ def add_cache_meta_tags():
     """Adiciona meta tags para controle de cache"""
     print("🏷️ Adicionando meta tags de cache...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Meta tags para cache
     cache_meta = '''
@@ -132,8 +133,7 @@ def add_cache_meta_tags():
         content
     )
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Meta tags de cache adicionadas")
 
@@ -240,8 +240,7 @@ def register_service_worker():
     """Registra o Service Worker no HTML"""
     print("📝 Registrando Service Worker...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Script para registrar Service Worker
     sw_registration = """
@@ -264,8 +263,7 @@ if ('serviceWorker' in navigator) {
     # Adicionar antes do fechamento do body
     content = re.sub(r'</body>', sw_registration + '</body>', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Service Worker registrado")
 
@@ -273,8 +271,7 @@ def add_preload_hints():
     """Adiciona hints de preload para recursos críticos"""
     print("🚀 Adicionando hints de preload...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Verificar se já existem preload hints
     if 'rel="preload"' in content:
@@ -297,8 +294,7 @@ def add_preload_hints():
         content
     )
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Hints de preload adicionados")
 
@@ -345,8 +341,7 @@ def create_caching_report():
         files_created.append('cache.manifest')
     
     # Analisar HTML para verificar otimizações
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     preload_count = len(re.findall(r'rel="preload"', content))
     prefetch_count = len(re.findall(r'rel="prefetch"', content))
@@ -384,8 +379,7 @@ def main():
     
     # Backup do arquivo original
     if not os.path.exists('index_cache_backup.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = load_document()
         with open('index_cache_backup.html', 'w', encoding='utf-8') as f:
             f.write(content)
         print("📋 Backup criado: index_cache_backup.html")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - EXTRAÇÃO AUTOMÁTICA DE CSS CRÍTICO
+Estima a região above-the-fold de cada página pela ordem do documento (o
+cabeçalho e as primeiras seções de primeiro nível), extrai das folhas de estilo
+só as regras que podem casar com essa região, coloca-as inline e passa as
+folhas a carregar de forma assíncrona
+"""
+
+import os
+import re
+import sys
+import json
+
+from html_stream import parse_attributes, tokenize
+from css_minify import merge_rules, minify_tree, parse, protect, restore, serialize
+from css_purge import index_html, new_stats, noscript_fallback, purge_rules, purge_stylesheets, stylesheet_links
+from asset_graph import rebase_urls
+from build_cache import cache_key, content_hash, file_hash, lookup, store
+from site_pipeline import discover_pages
+
+# Versão da extração: incrementar invalida o CSS crítico em cache
+CRITICAL_CSS_VERSION = 2
+
+# Seções de primeiro nível consideradas visíveis sem rolar (cabeçalho + banner)
+FOLD_SECTIONS = 2
+
+# Limite de elementos da região, para páginas sem seções reconhecíveis
+FOLD_MAX_ELEMENTS = 800
+
+# Elementos que delimitam uma seção da página
+SECTION_TAGS = {'header', 'section', 'footer'}
+SECTION_CLASSES = {'e-parent', 'elementor-top-section'}
+
+# Mídias em que a folha bloqueia a renderização da tela
+BLOCKING_MEDIA = {'', 'all', 'screen'}
+
+CRITICAL_STYLE_ID = 'critical-css'
+
+_CRITICAL_STYLE = re.compile(rf'<style id="{CRITICAL_STYLE_ID}">.*?</style>\s*', re.DOTALL)
+_ANIMATION_NAME = re.compile(r'[\w-]+')
+
+# ---------------------------------------------------------------------------
+# Região above-the-fold
+# ---------------------------------------------------------------------------
+
+def _starts_section(token):
+    if token['tag'] in SECTION_TAGS:
+        return True
+    for name, value in parse_attributes(token):
+        if name == 'class' and SECTION_CLASSES.intersection(value.split()):
+            return True
+    return False
+
+def fold_region(content, sections=FOLD_SECTIONS, max_elements=FOLD_MAX_ELEMENTS):
+    """HTML do início da página até o fim da região above-the-fold: termina onde
+    começa a seção de primeiro nível seguinte às `sections` primeiras"""
+    position = 0
+    in_body = False
+    elements = 0
+    found = 0
+    open_section = None   # [tag, profundidade] da seção de primeiro nível aberta
+
+    for token in tokenize([content]):
+        if token['type'] == 'start':
+            if token['tag'] == 'body':
+                in_body = True
+            elif in_body:
+                elements += 1
+                if open_section is not None:
+                    if token['tag'] == open_section[0] and not token['raw'].endswith('/>'):
+                        open_section[1] += 1
+                elif _starts_section(token):
+                    if found == sections:
+                        break
+                    found += 1
+                    open_section = [token['tag'], 1]
+                if elements > max_elements:
+                    break
+        elif token['type'] == 'end' and open_section is not None and token['tag'] == open_section[0]:
+            open_section[1] -= 1
+            if open_section[1] == 0:
+                open_section = None
+        position += len(token['raw'])
+
+    return content[:position]
+
+def fold_index(content):
+    """Índice (tags, classes, ids, atributos) só da região above-the-fold. Scripts e
+    a safelist não entram: o que o JavaScript monta aparece depois da primeira pintura"""
+    used, scripts = index_html(fold_region(content), scripts_inline=False)
+    used['prefixes'] = tuple(sorted(used['prefixes']))
+    used['safelist'] = set()
+    used['safelist_patterns'] = []
+    return used
+
+def _index_signature(used):
+    return json.dumps({name: sorted(map(str, values)) for name, values in sorted(used.items())})
+
+# ---------------------------------------------------------------------------
+# Extração
+# ---------------------------------------------------------------------------
+
+def _animation_names(nodes, names):
+    for node in nodes:
+        if node[0] == 'rule':
+            for declaration in node[2]:
+                name, colon, value = declaration.partition(':')
+                if colon and name.strip().lower() in ('animation', 'animation-name'):
+                    names.update(_ANIMATION_NAME.findall(value))
+        elif node[0] == 'block':
+            _animation_names(node[2], names)
+    return names
+
+def _drop_unused_keyframes(nodes, names):
+    kept = []
+    for node in nodes:
+        if node[0] == 'block':
+            keyword, _, name = node[1].partition(' ')
+            if keyword.lower().endswith('keyframes'):
+                if name.strip() not in names:
+                    continue
+            else:
+                node = ('block', node[1], _drop_unused_keyframes(node[2], names))
+        kept.append(node)
+    return kept
+
+def critical_rules(css, used, stats):
+    """Regras de uma folha que podem casar com a região above-the-fold.
+    @import e @charset saem (não valem no meio de um <style>), assim como
+    @keyframes que nenhuma regra crítica anima"""
+    text, protected = protect(css)
+    try:
+        tree = minify_tree(parse(text))
+    except ValueError:
+        return ''
+
+    tree = [node for node in purge_rules(tree, used, stats)
+            if not (node[0] == 'statement' and node[1].lower().startswith(('@import', '@charset')))]
+    tree = _drop_unused_keyframes(tree, _animation_names(tree, set()))
+    return restore(serialize(merge_rules(tree)), protected)
+
+def stylesheet_critical_css(path, used, base_directory='', signature=None):
+    """CSS crítico de uma folha, em cache pelo hash da folha e pelo índice da região"""
+    signature = signature if signature is not None else _index_signature(used)
+    key = cache_key('critical_css', CRITICAL_CSS_VERSION,
+                    content_hash(f'{path}\n{base_directory}\n{file_hash(path)}\n{signature}'))
+
+    cached = lookup(key)
+    if cached is not None:
+        return cached
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        css = f.read()
+    critical = rebase_urls(critical_rules(css, used, new_stats()), path, base_directory)
+    store(key, critical)
+    return critical
+
+def _blocking(attributes):
+    return attributes.get('media', '').strip().lower() in BLOCKING_MEDIA
+
+def async_link(href, element_id=None):
+    """<link> de folha de estilo não bloqueante: o mesmo preload + onload já usado
+    nas fontes, com fallback em <noscript> para quem não tem JavaScript"""
+    element_id = f' id="{element_id}"' if element_id else ''
+    return (f'<link rel="preload"{element_id} href="{href}" as="style" '
+            f'onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>')
+
+def extract_critical_css(content, base_directory=''):
+    """Insere o CSS crítico inline e torna assíncronas as folhas locais bloqueantes.
+    Retorna (conteúdo, estatísticas)"""
+    content = _CRITICAL_STYLE.sub('', content)
+    used = fold_index(content)
+    signature = _index_signature(used)
+
+    links = [(match, path, attributes) for match, path, attributes in stylesheet_links(content, base_directory)
+             if _blocking(attributes) and not noscript_fallback(content, match)]
+
+    paths = []
+    for match, path, attributes in links:
+        if path not in paths:
+            paths.append(path)
+
+    stylesheets = [stylesheet_critical_css(path, used, base_directory, signature) for path in paths]
+
+    # @font-face só das famílias que as regras críticas de todas as folhas usam
+    stats = new_stats()
+    critical = ''.join(css for css in purge_stylesheets(stylesheets, used, stats) if css)
+
+    converted = 0
+    for match, path, attributes in reversed(links):
+        if 'stylesheet' not in attributes.get('rel', '').lower().split():
+            continue
+        link = async_link(attributes['href'], attributes.get('id'))
+        content = content[:match.start()] + link + '\n' + content[match.end():]
+        converted += 1
+
+    if links and critical:
+        first = links[0][0].start()
+        content = content[:first] + f'<style id="{CRITICAL_STYLE_ID}">{critical}</style>\n' + content[first:]
+
+    return content, {
+        'stylesheets': len(paths),
+        'links_async': converted,
+        'critical_bytes': len(critical.encode('utf-8')),
+        'stylesheet_bytes': sum(os.path.getsize(path) for path in paths),
+    }
+
+def main():
+    """Mostra o tamanho do CSS crítico de cada página (não altera arquivos)"""
+    print("🎨 CSS CRÍTICO - PEACOCK COSMÉTICOS\n")
+
+    for page in (sys.argv[1:] or discover_pages()):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        content, stats = extract_critical_css(content, os.path.dirname(page))
+        print(f"   📄 {page}: {round(stats['critical_bytes'] / 1024, 1)} KB inline de "
+              f"{round(stats['stylesheet_bytes'] / 1024, 1)} KB em {stats['stylesheets']} folhas, "
+              f"{stats['links_async']} links assíncronos")
+
+if __name__ == "__main__":
+    main()
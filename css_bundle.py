@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - EMPACOTAMENTO DE CSS
+Junta as folhas de estilo locais de uma página em pacotes, por mídia e fase de
+carregamento (bloqueante ou assíncrona), sem mudar a ordem da cascata: só
+folhas vizinhas no documento são unidas. Os url() são reescritos para o
+diretório do pacote e cada pacote é minificado e nomeado pelo hash do conteúdo
+"""
+
+import os
+import re
+import sys
+import hashlib
+
+from css_purge import link_span, noscript_fallback, stylesheet_links
+from css_minify import minify_css
+from critical_css import async_link
+from asset_graph import rebase_urls
+from build_cache import cache_key, content_hash, lookup, store
+from site_pipeline import discover_pages
+
+# Versão do empacotamento: incrementar invalida os pacotes minificados em cache
+CSS_BUNDLE_VERSION = 2
+
+BUNDLE_DIR = 'assets/bundles'
+
+# Um pacote só compensa a partir de duas folhas
+MIN_BUNDLE_SIZE = 2
+
+# Entre duas folhas, qualquer outro estilo (inline ou externo) interrompe o pacote
+_STYLE_BETWEEN = re.compile(r'<style\b|<link\b[^>]*(?:stylesheet|as=["\']?style)', re.IGNORECASE)
+_CHARSET = re.compile(r'@charset\s+[^;]*;\s*', re.IGNORECASE)
+
+# ---------------------------------------------------------------------------
+# Agrupamento
+# ---------------------------------------------------------------------------
+
+def _group(attributes):
+    # (mídia, fase): 'deferred' = carregada por preload + onload
+    media = attributes.get('media', '').strip().lower() or 'all'
+    phase = 'deferred' if 'preload' in attributes.get('rel', '').lower().split() else 'blocking'
+    return media, phase
+
+def _has_import(path):
+    # @import só vale no início de uma folha: quem o usa fica fora dos pacotes
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return '@import' in f.read()
+
+def bundle_runs(content, base_directory=''):
+    """Sequências de folhas vizinhas do mesmo grupo. Cada item é
+    {'group', 'links': [(início, fim, caminho)]}; o fim inclui o fallback em <noscript>"""
+    runs = []
+    previous_end = None
+
+    for match, path, attributes in stylesheet_links(content, base_directory):
+        if noscript_fallback(content, match):
+            continue
+
+        group = _group(attributes)
+        start, end = link_span(content, match) if group[1] == 'deferred' else match.span()
+
+        if _has_import(path):
+            previous_end = None
+            continue
+
+        between = content[previous_end:start] if previous_end is not None else None
+        if between is None or _STYLE_BETWEEN.search(between) or runs[-1]['group'] != group:
+            runs.append({'group': group, 'links': []})
+        runs[-1]['links'].append((start, end, path))
+        previous_end = end
+
+    return runs
+
+# ---------------------------------------------------------------------------
+# Pacotes
+# ---------------------------------------------------------------------------
+
+def build_bundle(paths):
+    """CSS minificado de um pacote, com os url() reescritos para BUNDLE_DIR"""
+    parts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            parts.append(rebase_urls(_CHARSET.sub('', f.read()), path, BUNDLE_DIR))
+    css = '\n'.join(parts)
+
+    key = cache_key('css_bundle', CSS_BUNDLE_VERSION, content_hash(css))
+    minified = lookup(key)
+    if minified is None:
+        minified = minify_css(css)
+        store(key, minified)
+    return minified
+
+def bundle_path(css):
+    """Caminho do pacote, nomeado pelo hash do conteúdo"""
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:8]
+    return f'{BUNDLE_DIR}/bundle.{digest}.css'
+
+def _bundle_link(href, group):
+    media, phase = group
+    if phase == 'deferred':
+        return async_link(href)
+    media_attribute = f' media="{media}"' if media != 'all' else ''
+    return f'<link rel="stylesheet" href="{href}"{media_attribute}>'
+
+def bundle_document(content, base_directory='', write=None):
+    """Troca as sequências de <link> de cada grupo por um único pacote gravado com
+    write(caminho, css). Retorna (conteúdo, estatísticas)"""
+    stats = {'bundles': 0, 'stylesheets_bundled': 0, 'requests_saved': 0, 'bytes_before': 0, 'bytes_after': 0}
+    runs = [run for run in bundle_runs(content, base_directory) if len(run['links']) >= MIN_BUNDLE_SIZE]
+
+    # De trás para frente para manter as posições válidas
+    for run in reversed(runs):
+        paths = [path for start, end, path in run['links']]
+        css = build_bundle(paths)
+        target = bundle_path(css)
+        if write is not None:
+            write(target, css)
+
+        href = os.path.relpath(target, base_directory or '.').replace(os.sep, '/')
+        for start, end, path in reversed(run['links'][1:]):
+            content = content[:start] + content[end:].lstrip('\n')
+        start, end, path = run['links'][0]
+        content = content[:start] + _bundle_link(f'./{href}', run['group']) + content[end:]
+
+        stats['bundles'] += 1
+        stats['stylesheets_bundled'] += len(paths)
+        stats['requests_saved'] += len(paths) - 1
+        stats['bytes_before'] += sum(os.path.getsize(path) for path in paths)
+        stats['bytes_after'] += len(css.encode('utf-8'))
+
+    return content, stats
+
+def main():
+    """Mostra os pacotes que cada página teria (não altera arquivos)"""
+    print("📦 EMPACOTAMENTO DE CSS - PEACOCK COSMÉTICOS\n")
+
+    for page in (sys.argv[1:] or discover_pages()):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for run in bundle_runs(content, os.path.dirname(page)):
+            media, phase = run['group']
+            print(f"   📄 {page} [{media}, {phase}]: {len(run['links'])} folhas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - DEDUPLICAÇÃO DE CSS ENTRE FOLHAS
+Lê todas as folhas de estilo de uma página (inline e externas) na ordem da
+cascata e remove o que uma regra idêntica mais adiante torna redundante:
+declarações repetidas com o mesmo seletor e contexto, @font-face e @keyframes
+iguais. Depois junta seletores com o mesmo bloco de declarações quando nenhuma
+regra entre os dois mexe nas mesmas propriedades. O resultado calculado da
+cascata não muda
+"""
+
+import os
+import re
+import sys
+import json
+import copy
+import hashlib
+from bisect import bisect_right
+
+from html_stream import parse_attributes, tokenize
+from css_minify import merge_rules, minify_tree, parse, protect, restore, serialize, ungroupable
+from css_purge import link_span, noscript_fallback, split_selector_list, stylesheet_links
+from site_pipeline import discover_pages
+from build_cache import content_hash
+from pass_engine import register_shared_resource, shared_resource
+
+REPORT_FILE = 'css_dedup_report.json'
+
+# Propriedades que um atalho de outro nome também define (font redefine line-height etc.)
+PROPERTY_FAMILIES = {
+    'line-height': 'font', 'white-space': 'text', 'word-wrap': 'overflow', 'columns': 'column',
+    'gap': 'gap', 'row-gap': 'gap', 'column-gap': 'gap', 'grid-gap': 'gap', 'grid-row-gap': 'gap',
+    'grid-column-gap': 'gap', 'page-break-before': 'break', 'page-break-after': 'break',
+    'page-break-inside': 'break',
+}
+SEGMENT_FAMILIES = {'top': 'inset', 'right': 'inset', 'bottom': 'inset', 'left': 'inset',
+                    'place': 'align', 'justify': 'align'}
+
+# Família que conflita com qualquer propriedade (folhas não analisáveis, `all:`)
+ANY_FAMILY = '*'
+
+_STYLE_BLOCK = re.compile(r'(<style[^>]*>)(.*?)</style>', re.DOTALL | re.IGNORECASE)
+_VENDOR_PREFIX = re.compile(r'^-[a-z]+-')
+_DEDUP_SUFFIX = re.compile(r'\.dedup\.[0-9a-f]{8}$')
+
+# ---------------------------------------------------------------------------
+# Folhas da página
+# ---------------------------------------------------------------------------
+
+def _style_attributes(tag):
+    token = next(tokenize([tag]), None)
+    return dict(parse_attributes(token)) if token is not None and token['type'] == 'start' else {}
+
+def page_stylesheets(content, base_directory=''):
+    """Folhas da página na ordem da cascata. Cada item é {'kind': 'inline'|'file',
+    'start', 'end', 'path', 'href', 'media', 'blocking', 'css'}; css None = folha
+    que não pode ser alterada (em <noscript>, repetida ou de outro tipo)"""
+    sheets = []
+
+    for match in _STYLE_BLOCK.finditer(content):
+        attributes = _style_attributes(match.group(1))
+        editable = (attributes.get('type', 'text/css').lower() == 'text/css'
+                    and not content[:match.start()].rstrip().endswith('<noscript>'))
+        sheets.append({'kind': 'inline', 'start': match.start(2), 'end': match.end(2), 'path': None,
+                       'href': None, 'media': attributes.get('media', '').strip().lower() or 'all',
+                       'blocking': True, 'css': match.group(2) if editable else None})
+
+    links = [(match, path, attributes) for match, path, attributes in stylesheet_links(content, base_directory)
+             if not noscript_fallback(content, match)]
+    repeated = {path for index, (match, path, attributes) in enumerate(links)
+                if any(other == path for _, other, _ in links[:index])}
+
+    for match, path, attributes in links:
+        start, end = link_span(content, match)
+        css = None
+        if path not in repeated:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                css = f.read()
+        sheets.append({'kind': 'file', 'start': start, 'end': end, 'path': path, 'href': attributes['href'],
+                       'media': attributes.get('media', '').strip().lower() or 'all',
+                       'blocking': 'stylesheet' in attributes.get('rel', '').lower().split(), 'css': css})
+
+    return sorted(sheets, key=lambda sheet: sheet['start'])
+
+def _restore_tree(nodes, protected):
+    # Strings e url() voltam ao texto: cada folha tem os próprios marcadores
+    restored = []
+    for node in nodes:
+        if node[0] == 'rule':
+            restored.append(('rule', restore(node[1], protected), [restore(d, protected) for d in node[2]]))
+        elif node[0] == 'block':
+            restored.append(('block', restore(node[1], protected), _restore_tree(node[2], protected)))
+        else:
+            restored.append(('statement', restore(node[1], protected)))
+    return restored
+
+def parse_stylesheet(css):
+    """Árvore minificada de uma folha com os trechos protegidos já restaurados
+    (None se não puder ser analisada)"""
+    text, protected = protect(css)
+    try:
+        return _restore_tree(minify_tree(parse(text)), protected)
+    except ValueError:
+        return None
+
+def stylesheet_index():
+    """Folhas externas das páginas já analisadas: {caminho: (hash do css, árvore)}"""
+    index = {}
+    for page in discover_pages():
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for sheet in page_stylesheets(content, os.path.dirname(page)):
+            if sheet['kind'] == 'file' and sheet['css'] is not None and sheet['path'] not in index:
+                index[sheet['path']] = (content_hash(sheet['css']), parse_stylesheet(sheet['css']))
+    return index
+
+# Construído uma vez no modo site e enviado pronto aos processos de trabalho
+register_shared_resource('stylesheet_index', stylesheet_index)
+
+def sheet_tree(sheet, mutable=False):
+    """Árvore de uma folha de page_stylesheets: do índice compartilhado se o arquivo não
+    mudou desde a análise. mutable=True devolve uma cópia que pode ser alterada"""
+    if sheet['css'] is None:
+        return None
+    if sheet['path']:
+        indexed = shared_resource('stylesheet_index').get(sheet['path'])
+        if indexed is not None and indexed[0] == content_hash(sheet['css']):
+            return copy.deepcopy(indexed[1]) if mutable else indexed[1]
+    return parse_stylesheet(sheet['css'])
+
+# ---------------------------------------------------------------------------
+# Regras em ordem de cascata
+# ---------------------------------------------------------------------------
+
+def _keyframes(prelude):
+    return prelude.split(None, 1)[0].lower().endswith('keyframes')
+
+def _flatten(nodes, context, sheet, entries):
+    # Cada regra (ou @keyframes inteiro) vira uma entrada com a lista que a contém
+    for index, node in enumerate(nodes):
+        if node[0] == 'rule' or (node[0] == 'block' and _keyframes(node[1])):
+            entries.append({'sheet': sheet, 'context': context, 'nodes': nodes, 'index': index})
+        elif node[0] == 'block':
+            _flatten(node[2], context + (node[1],), sheet, entries)
+
+def cascade_entries(sheets, trees):
+    """Entradas de todas as folhas na ordem da cascata. O contexto é a mídia da folha
+    mais os prelúdios dos blocos (@media, @supports, @layer) em volta da regra"""
+    entries = []
+    for sheet, tree in zip(sheets, trees):
+        if tree is None:
+            entries.append({'sheet': sheet, 'context': None, 'nodes': None, 'index': None})
+        else:
+            _flatten(tree, (sheet['media'],), sheet, entries)
+    for position, entry in enumerate(entries):
+        entry['position'] = position
+    return entries
+
+def _node(entry):
+    return entry['nodes'][entry['index']]
+
+def _anonymous_layer(context):
+    # Cada @layer sem nome é uma camada diferente, mesmo com o mesmo texto
+    return any(prelude.lower() == '@layer' for prelude in context[1:])
+
+def property_family(name):
+    """Grupo de propriedades que podem se sobrepor (margin e margin-top, font e line-height)"""
+    if name.startswith('--'):
+        return name
+    name = _VENDOR_PREFIX.sub('', name.lower())
+    if name == 'all':
+        return ANY_FAMILY
+    if name in PROPERTY_FAMILIES:
+        return PROPERTY_FAMILIES[name]
+    segment = name.split('-', 1)[0]
+    return SEGMENT_FAMILIES.get(segment, segment)
+
+def _declaration_key(declaration):
+    name, colon, value = declaration.partition(':')
+    return f'{name.strip().lower()}:{value}' if colon and not name.strip().startswith('--') else declaration
+
+# ---------------------------------------------------------------------------
+# Deduplicação
+# ---------------------------------------------------------------------------
+
+def new_stats():
+    return {'declarations_removed': 0, 'rules_removed': 0, 'rules_merged': 0, 'stylesheets_changed': 0,
+            'bytes_before': 0, 'bytes_after': 0}
+
+def remove_overridden(entries, stats):
+    """Remove, de trás para frente, declarações e regras que uma idêntica mais adiante
+    sobrepõe. A posterior precisa estar carregada sempre que a anterior estiver: na
+    mesma folha ou numa folha bloqueante. Retorna as folhas alteradas"""
+    blocking = {}   # (contexto, seletor) -> declarações vistas em folhas bloqueantes
+    by_sheet = {}   # (id da folha, contexto, seletor) -> declarações vistas na folha
+    changed = set()
+
+    for entry in reversed(entries):
+        if entry['nodes'] is None or _anonymous_layer(entry['context']):
+            continue
+        node = _node(entry)
+        sheet = id(entry['sheet'])
+
+        # @font-face, @page e @keyframes só como um todo
+        if node[0] == 'block' or node[1].startswith('@'):
+            key = (entry['context'], serialize([node]))
+            items = [node]
+            declarations = [key[1]]
+        else:
+            key = (entry['context'], node[1])
+            items = node[2]
+            declarations = [_declaration_key(declaration) for declaration in node[2]]
+
+        later = blocking.get(key, set()) | by_sheet.get((sheet,) + key, set())
+        seen = set()
+        kept = []
+        for declaration, normalized in reversed(list(zip(items, declarations))):
+            if normalized in later or normalized in seen:
+                continue
+            seen.add(normalized)
+            kept.append(declaration)
+        kept.reverse()
+
+        if len(kept) < len(declarations):
+            changed.add(sheet)
+            if not kept:
+                stats['rules_removed'] += 1
+                entry['nodes'][entry['index']] = (node[0], node[1], [])
+            elif node[0] == 'rule':
+                stats['declarations_removed'] += len(declarations) - len(kept)
+                entry['nodes'][entry['index']] = ('rule', node[1], kept)
+
+        by_sheet.setdefault((sheet,) + key, set()).update(declarations)
+        if entry['sheet']['blocking']:
+            blocking.setdefault(key, set()).update(declarations)
+
+    return changed
+
+def _family_positions(entries):
+    # Família -> posições (em ordem) das entradas que declaram alguma propriedade dela
+    positions = {}
+    for entry in entries:
+        if entry['nodes'] is None:
+            families = {ANY_FAMILY}
+        else:
+            node = _node(entry)
+            if node[0] == 'block':
+                continue
+            families = set()
+            for declaration in node[2]:
+                name, colon, value = declaration.partition(':')
+                families.add(property_family(name.strip()) if colon else ANY_FAMILY)
+        for family in families:
+            positions.setdefault(family, []).append(entry['position'])
+    return positions
+
+def _declared_between(positions, families, start, end):
+    for family in families | {ANY_FAMILY}:
+        found = positions.get(family, ())
+        index = bisect_right(found, start)
+        if index < len(found) and found[index] < end:
+            return True
+    return False
+
+def merge_selectors(entries, stats):
+    """Junta uma regra à próxima com o mesmo contexto e as mesmas declarações,
+    movendo os seletores para a posterior, quando nenhuma regra entre elas declara
+    propriedades da mesma família. Retorna as folhas alteradas"""
+    positions = _family_positions(entries)
+    pending = {}   # (contexto, declarações) -> última entrada com esse bloco
+    changed = set()
+
+    for entry in entries:
+        if entry['nodes'] is None or _anonymous_layer(entry['context']):
+            continue
+        node = _node(entry)
+        if node[0] != 'rule' or not node[2] or node[1].startswith('@') or ungroupable(node[1]):
+            continue
+
+        families = set()
+        for declaration in node[2]:
+            name, colon, value = declaration.partition(':')
+            families.add(property_family(name.strip()) if colon else ANY_FAMILY)
+        if ANY_FAMILY in families:
+            continue
+
+        key = (entry['context'], tuple(node[2]))
+        previous = pending.get(key)
+        pending[key] = entry
+        if previous is None:
+            continue
+        available = previous['sheet'] is entry['sheet'] or entry['sheet']['blocking']
+        if not available or _declared_between(positions, families, previous['position'], entry['position']):
+            continue
+
+        earlier = _node(previous)
+        selectors = split_selector_list(earlier[1])
+        selectors += [selector for selector in split_selector_list(node[1]) if selector not in selectors]
+        previous['nodes'][previous['index']] = ('rule', earlier[1], [])
+        entry['nodes'][entry['index']] = ('rule', ','.join(selectors), node[2])
+        stats['rules_merged'] += 1
+        changed.update((id(previous['sheet']), id(entry['sheet'])))
+
+    return changed
+
+def deduplicated_path(path, css):
+    """Nome da cópia deduplicada, no mesmo diretório (os url() relativos continuam valendo)"""
+    stem, extension = os.path.splitext(path)
+    stem = _DEDUP_SUFFIX.sub('', stem)
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:8]
+    return f'{stem}.dedup.{digest}{extension}'
+
+def _replace_href(text, href, new_href):
+    # Troca o href do <link> e do fallback em <noscript> que o acompanha
+    pattern = re.compile(r'''(href=)(["']?)''' + re.escape(href) + r'\2')
+    return pattern.sub(lambda match: f'{match.group(1)}{match.group(2)}{new_href}{match.group(2)}', text)
+
+def deduplicate_document(content, base_directory='', write=None):
+    """Deduplica as folhas de uma página. Os <style> são reescritos no lugar e as folhas
+    externas alteradas viram cópias gravadas com write(caminho, css).
+    Retorna (conteúdo, estatísticas)"""
+    stats = new_stats()
+    sheets = page_stylesheets(content, base_directory)
+    trees = [sheet_tree(sheet, mutable=True) for sheet in sheets]
+    entries = cascade_entries(sheets, trees)
+
+    # Tamanho de cada folha só minificada: a economia medida é só a da deduplicação
+    baseline = [serialize(merge_rules(tree)) if tree is not None else None for tree in trees]
+
+    changed = remove_overridden(entries, stats)
+    changed |= merge_selectors(entries, stats)
+
+    # Substituições de trás para frente para manter as posições válidas
+    for sheet, tree, minified in reversed(list(zip(sheets, trees, baseline))):
+        if id(sheet) not in changed:
+            continue
+        css = serialize(merge_rules(tree))
+        stats['stylesheets_changed'] += 1
+        stats['bytes_before'] += len(minified.encode('utf-8'))
+        stats['bytes_after'] += len(css.encode('utf-8'))
+
+        if sheet['kind'] == 'inline':
+            content = content[:sheet['start']] + css + content[sheet['end']:]
+            continue
+
+        target = deduplicated_path(sheet['path'], css)
+        if write is not None:
+            write(target, css)
+        href = os.path.relpath(target, base_directory or '.').replace(os.sep, '/')
+        tag = _replace_href(content[sheet['start']:sheet['end']], sheet['href'], f'./{href}')
+        content = content[:sheet['start']] + tag + content[sheet['end']:]
+
+    return content, stats
+
+def main():
+    """Relatório do CSS duplicado em cada página (não altera arquivos)"""
+    print("♻️ DEDUPLICAÇÃO DE CSS - PEACOCK COSMÉTICOS\n")
+
+    report = {}
+    for page in (sys.argv[1:] or discover_pages()):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        content, stats = deduplicate_document(content, os.path.dirname(page))
+        report[page] = stats
+
+        print(f"   📄 {page}: {stats['declarations_removed']} declarações e {stats['rules_removed']} regras "
+              f"redundantes, {stats['rules_merged']} regras agrupadas em {stats['stylesheets_changed']} folhas "
+              f"({round(stats['bytes_before'] / 1024, 1)} KB → {round(stats['bytes_after'] / 1024, 1)} KB)")
+
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\n   📊 Relatório: {REPORT_FILE}")
+
+if __name__ == "__main__":
+    main()
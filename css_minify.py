@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - MINIFICADOR DE CSS
+Separa o CSS em tokens (strings, url(), escapes e comentários ficam protegidos),
+monta a árvore de regras e a serializa compacta: encurta cores, tira a unidade
+de zeros, junta regras adjacentes iguais e descarta regras vazias
+"""
+
+import re
+import sys
+import time
+
+from asset_inventory import find_files
+
+# Diretório medido pelo main()
+BENCHMARK_DIR = 'assets/media/page-builder/css'
+
+# At-rules cujo bloco contém declarações (as demais contêm regras)
+DECLARATION_AT_RULES = {'@font-face', '@page', '@counter-style', '@property', '@viewport', '@-ms-viewport'}
+
+# Pseudo-classes e pseudo-elementos do CSS2/CSS3 que todo navegador suportado entende.
+# Qualquer outro (::placeholder, :has(), :is(), :focus-visible, prefixos de fabricante)
+# pode ser desconhecido e invalidar a lista de seletores inteira onde aparecer
+SAFE_PSEUDOS = {
+    'link', 'visited', 'hover', 'active', 'focus', 'target', 'lang', 'root', 'empty',
+    'enabled', 'disabled', 'checked', 'not', 'first-child', 'last-child', 'only-child',
+    'first-of-type', 'last-of-type', 'only-of-type', 'nth-child', 'nth-last-child',
+    'nth-of-type', 'nth-last-of-type', 'before', 'after', 'first-line', 'first-letter',
+}
+
+# Unidades de comprimento que podem sumir de um zero (tempo, ângulo e % não)
+_ZERO_UNITS = re.compile(r'(?<![\w.#%\x00-])0(?:\.0+)?(?:px|em|rem|ex|ch|vw|vh|vmin|vmax|cm|mm|in|pt|pc|q)\b',
+                         re.IGNORECASE)
+
+# Em calc()/min()/max()/clamp() um zero sem unidade é inválido
+_MATH_FUNCTION = re.compile(r'\b(?:calc|min|max|clamp)\(', re.IGNORECASE)
+
+# Strings, url() sem aspas, escapes e comentários: nada aqui dentro é reescrito
+_PROTECTED = re.compile(r'''
+    (/\*.*?(?:\*/|\Z))
+  | ("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (url\(\s*[^\s"')]*\s*\))
+  | (\\[^\n])
+''', re.DOTALL | re.IGNORECASE | re.VERBOSE)
+
+_PLACEHOLDER = re.compile('\x00(\\d+)\x00')
+_PSEUDO = re.compile(r'::?([\w-]+)')
+# :not() do CSS3 aceita só um seletor simples; listas e combinadores são do nível 4
+_COMPLEX_NOT = re.compile(r':not\([^)]*[,\s>+~]', re.IGNORECASE)
+_STRUCTURE = re.compile(r'([{};])')
+_WHITESPACE = re.compile(r'\s+')
+
+# Separador usado para minificar vários valores de uma só vez
+_SEPARATOR = '\x02'
+
+_HEX_COLOR = re.compile(r'#([0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3,4})\b')
+
+def _shorten_hex(match):
+    digits = match.group(1).lower()
+    if len(digits) in (6, 8) and all(digits[i] == digits[i + 1] for i in range(0, len(digits), 2)):
+        digits = digits[::2]
+    return '#' + digits
+
+_VALUE_RULES = [
+    (re.compile(r'\s+'), ' '),
+    (re.compile(' ?([,!\x02]) ?'), r'\1'),
+    (re.compile(r'(\() | (\))'), r'\1\2'),
+    (re.compile(r'(\.\d*?[1-9])0+(?!\d)|(\d)\.0+(?!\d)'), r'\1\2'),
+    (re.compile(r'(?<![\w.\x00])0+\.(\d)'), r'.\1'),
+    (_HEX_COLOR, _shorten_hex),
+]
+
+_SELECTOR_RULES = [
+    (re.compile(r'\s+'), ' '),
+    (re.compile(' ?([,>+~=\x02]) ?'), r'\1'),
+    (re.compile(r'([(\[]) | ([)\]])'), r'\1\2'),
+]
+
+_PRELUDE_RULES = [
+    (re.compile(r'\s+'), ' '),
+    (re.compile(' ?([,\x02]) ?'), r'\1'),
+    (re.compile(r'(\() | (\))'), r'\1\2'),
+    (re.compile(r'\(([\w-]+) ?: ?'), r'(\1:'),
+]
+
+# ---------------------------------------------------------------------------
+# Tokens protegidos
+# ---------------------------------------------------------------------------
+
+def protect(css):
+    """Troca strings, url() e escapes por marcadores e remove comentários.
+    Retorna (texto, lista de trechos protegidos)"""
+    protected = []
+
+    def replace(match):
+        comment = match.group(1)
+        if comment is not None:
+            # Comentários /*! (licenças) são mantidos
+            if not comment.startswith('/*!'):
+                return ' '
+        protected.append(match.group())
+        return f'\x00{len(protected) - 1}\x00'
+
+    return _PROTECTED.sub(replace, css), protected
+
+def restore(css, protected):
+    """Devolve os trechos protegidos aos seus marcadores"""
+    return _PLACEHOLDER.sub(lambda match: protected[int(match.group(1))], css)
+
+# ---------------------------------------------------------------------------
+# Árvore de regras
+# ---------------------------------------------------------------------------
+
+def _collapse(text):
+    return _WHITESPACE.sub(' ', text).strip()
+
+def _at_keyword(prelude):
+    return prelude.split(None, 1)[0].split('(', 1)[0].lower()
+
+def parse(css):
+    """Monta a árvore: ('rule', seletor, [declarações]), ('block', prelúdio, [nós])
+    e ('statement', texto). Levanta ValueError se as chaves não fecharem"""
+    root = []
+    stack = [root]
+    rule = None   # regra cujas declarações estão sendo lidas
+    text = ''
+
+    for part in _STRUCTURE.split(css):
+        if part == '{':
+            prelude = text.strip()
+            text = ''
+            if rule is not None:
+                raise ValueError("Regra aninhada dentro de um bloco de declarações")
+            if prelude.startswith('@') and _at_keyword(prelude) not in DECLARATION_AT_RULES:
+                block = ('block', prelude, [])
+                stack[-1].append(block)
+                stack.append(block[2])
+            else:
+                rule = ('rule', prelude, [])
+                stack[-1].append(rule)
+        elif part == ';':
+            if rule is not None:
+                rule[2].append(text)
+            elif text.strip():
+                stack[-1].append(('statement', _collapse(text)))
+            text = ''
+        elif part == '}':
+            if rule is not None:
+                rule[2].append(text)
+                rule = None
+            else:
+                if len(stack) == 1:
+                    raise ValueError("'}' sem '{' correspondente")
+                if text.strip():
+                    stack[-1].append(('statement', _collapse(text)))
+                stack.pop()
+            text = ''
+        else:
+            text += part
+
+    if rule is not None or len(stack) > 1:
+        raise ValueError("Bloco sem '}'")
+    if text.strip():
+        root.append(('statement', _collapse(text)))
+
+    return root
+
+# ---------------------------------------------------------------------------
+# Minificação
+# ---------------------------------------------------------------------------
+
+def _apply_rules(values, rules):
+    # Aplica as expressões a todos os valores de uma vez, separados por _SEPARATOR
+    if not values:
+        return values
+    joined = _SEPARATOR.join(values)
+    for pattern, replacement in rules:
+        joined = pattern.sub(replacement, joined)
+    return joined.strip().split(_SEPARATOR)
+
+def _declarations(nodes, found):
+    for node in nodes:
+        if node[0] == 'rule':
+            found.append(node)
+        elif node[0] == 'block':
+            _declarations(node[2], found)
+    return found
+
+def minify_tree(tree):
+    """Minifica seletores, prelúdios e declarações da árvore (no lugar)"""
+    rules = _declarations(tree, [])
+
+    # Cada declaração vira (propriedade, valor); sem ':' a propriedade é None
+    parsed = []
+    for rule in rules:
+        for declaration in rule[2]:
+            name, colon, value = declaration.partition(':')
+            name = name.strip()
+            parsed.append((name, value) if colon and name else (None, declaration))
+
+    values = [value for name, value in parsed]
+
+    # Declarações inválidas só têm os espaços compactados
+    named = [index for index, (name, value) in enumerate(parsed) if name]
+    for index in set(range(len(parsed))).difference(named):
+        values[index] = _collapse(values[index])
+
+    for index, value in zip(named, _apply_rules([values[index] for index in named], _VALUE_RULES)):
+        values[index] = value
+
+    # Propriedades customizadas podem ser usadas dentro de calc(): o zero mantém a unidade
+    zeros = [index for index in named
+             if parsed[index][0].lower() != 'flex' and not parsed[index][0].startswith('--')
+             and not _MATH_FUNCTION.search(values[index])]
+    for index, value in zip(zeros, _apply_rules([values[index] for index in zeros], [(_ZERO_UNITS, '0')])):
+        values[index] = value
+
+    position = 0
+    for rule in rules:
+        minified_rule = []
+        for _ in rule[2]:
+            name = parsed[position][0]
+            value = values[position]
+            position += 1
+            if name is not None:
+                minified_rule.append(f'{name}:{value}')
+            elif value:
+                minified_rule.append(value)
+        rule[2][:] = minified_rule
+
+    selectors = _apply_rules([rule[1] for rule in rules if not rule[1].startswith('@')], _SELECTOR_RULES)
+    _rename(tree, iter(selectors))
+    return tree
+
+def _rename(nodes, selectors):
+    # Grava os seletores e prelúdios minificados de volta na árvore
+    for index, node in enumerate(nodes):
+        if node[0] == 'rule':
+            selector = node[1] if node[1].startswith('@') else next(selectors)
+            nodes[index] = ('rule', selector, node[2])
+        elif node[0] == 'block':
+            prelude = _apply_rules([node[1]], _PRELUDE_RULES)[0]
+            nodes[index] = ('block', prelude, node[2])
+            _rename(node[2], selectors)
+
+def ungroupable(selector):
+    """Um seletor desconhecido invalida a lista inteira: os que usam pseudo-classes ou
+    pseudo-elementos fora de SAFE_PSEUDOS não podem ser agrupados"""
+    if _COMPLEX_NOT.search(selector):
+        return True
+    return any(name.lower() not in SAFE_PSEUDOS for name in _PSEUDO.findall(selector))
+
+def merge_rules(nodes):
+    """Junta regras adjacentes com o mesmo seletor ou as mesmas declarações
+    e descarta regras e blocos vazios"""
+    merged = []
+
+    for node in nodes:
+        if node[0] == 'block':
+            children = merge_rules(node[2])
+            # Um @layer vazio ainda define a ordem das camadas
+            if children or _at_keyword(node[1]) == '@layer':
+                merged.append(('block', node[1], children))
+            continue
+
+        if node[0] == 'rule':
+            if not node[2]:
+                continue
+            previous = merged[-1] if merged else None
+            if previous is not None and previous[0] == 'rule' and not node[1].startswith('@') \
+                    and not previous[1].startswith('@'):
+                if previous[1] == node[1]:
+                    merged[-1] = ('rule', node[1], previous[2] + node[2])
+                    continue
+                if previous[2] == node[2] and not ungroupable(previous[1]) \
+                        and not ungroupable(node[1]):
+                    merged[-1] = ('rule', f'{previous[1]},{node[1]}', node[2])
+                    continue
+
+        merged.append(node)
+
+    return merged
+
+def serialize(nodes):
+    """Texto compacto da árvore"""
+    output = []
+    for node in nodes:
+        if node[0] == 'rule':
+            output.append(f"{node[1]}{{{';'.join(node[2])}}}")
+        elif node[0] == 'block':
+            output.append(f'{node[1]}{{{serialize(node[2])}}}')
+        else:
+            output.append(f'{node[1]};')
+    return ''.join(output)
+
+def minify_css(css):
+    """Minifica uma folha de estilos. CSS que não pode ser analisado volta sem mudanças"""
+    text, protected = protect(css)
+
+    try:
+        tree = parse(text)
+    except ValueError:
+        return css
+
+    tree = merge_rules(minify_tree(tree))
+    return restore(serialize(tree), protected)
+
+def main():
+    """Mede a vazão do minificador sobre os CSS do page builder (sem gravar)"""
+    print("🎨 MINIFICADOR DE CSS - PEACOCK COSMÉTICOS\n")
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else BENCHMARK_DIR
+    files = find_files(under=directory, extensions=('.css',))
+
+    stylesheets = []
+    for entry in files:
+        with open(entry['path'], 'r', encoding='utf-8') as f:
+            stylesheets.append(f.read())
+
+    original_size = sum(len(css) for css in stylesheets)
+    start = time.perf_counter()
+    minified_size = sum(len(minify_css(css)) for css in stylesheets)
+    elapsed = time.perf_counter() - start
+
+    if not stylesheets:
+        print(f"   ⚠️ Nenhum CSS em {directory}")
+        return
+
+    print(f"   📁 {len(stylesheets)} arquivos em {directory}")
+    print(f"   📦 {round(original_size / 1024, 1)} KB → {round(minified_size / 1024, 1)} KB "
+          f"(-{round((1 - minified_size / original_size) * 100, 1)}%)")
+    print(f"   ⚡ {round(original_size / (1024 * 1024) / elapsed, 1)} MB/s")
+
+if __name__ == "__main__":
+    main()
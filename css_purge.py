@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - REMOÇÃO DE CSS NÃO UTILIZADO
+Indexa em conjuntos as tags, classes, ids e atributos usados no HTML (e os
+nomes de classe montados no JavaScript) e descarta toda regra CSS cujo seletor
+não pode casar com a página, inclusive dentro de @media. @font-face de famílias
+que nenhuma regra restante usa também sai
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+
+from html_stream import parse_attributes, tokenize
+from css_minify import merge_rules, minify_tree, parse, protect, restore, serialize
+from asset_graph import resolve_reference
+from asset_inventory import find_files, update_file
+from site_pipeline import discover_pages
+
+REPORT_FILE = 'css_purge_report.json'
+
+# Classes ligadas e desligadas por JavaScript depois do carregamento
+SAFELIST = {
+    'loaded', 'lazy', 'lazyloaded', 'loading', 'active', 'current', 'show', 'open', 'visible',
+    'hidden', 'hide', 'focus', 'animated', 'elementor-invisible', 'e-lazyloaded', 'sticky',
+    'menu-open', 'is-active', 'is-open', 'is-visible',
+}
+
+# Componentes criados inteiramente por JavaScript (sliders, lightbox, diálogos)
+SAFELIST_PATTERNS = [
+    re.compile(r'^swiper'),
+    re.compile(r'^dialog'),
+    re.compile(r'^elementor-lightbox'),
+    re.compile(r'^elementor-slideshow'),
+    re.compile(r'^elementor-motion-effects'),
+    re.compile(r'^animated'),
+    re.compile(r'^fade'),
+]
+
+# Tags que existem em qualquer documento mesmo se o HTML não as escrever
+ALWAYS_PRESENT_TAGS = {'html', 'head', 'body', '*'}
+
+# Atributos que o JavaScript costuma acrescentar
+DYNAMIC_ATTRIBUTE_PREFIXES = ('aria-', 'data-')
+
+# Blocos cujo conteúdo não é uma lista de regras com seletores da página
+OPAQUE_AT_RULES = ('keyframes',)
+
+_FUNCTION_ARGUMENTS = re.compile(r'\([^()]*\)')
+_ATTRIBUTE_SELECTOR = re.compile(r'\[\s*([^\s\]~|^$*=]+)[^\]]*\]')
+_PSEUDO = re.compile(r'::?[\w-]+')
+_CLASS_OR_ID = re.compile(r'([.#])(-?[_a-zA-Z][\w-]*)(\x00)?')
+_TYPE = re.compile(r'(?<![\w\x00-])([a-zA-Z][\w-]*)')
+_JS_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'|`([^`]*)`')
+_JS_WORD = re.compile(r'[\w-]+')
+_INLINE_FONT_FAMILY = re.compile(r'font(?:-family)?\s*:([^;]*)', re.IGNORECASE)
+_PURGED_SUFFIX = re.compile(r'\.purged\.[0-9a-f]{8}$')
+# Cópia purgada, inclusive a deduplicada a partir dela (css_dedup)
+_PURGED_COPY = re.compile(r'\.purged\.[0-9a-f]{8}(?:\.dedup\.[0-9a-f]{8})?\.css$')
+_STYLE_BLOCK = re.compile(r'(<style[^>]*>)(.*?)</style>', re.DOTALL)
+_LINK_TAG = re.compile(r'<link\b[^>]*>\s*', re.IGNORECASE)
+_NOSCRIPT_LINK = re.compile(r'\s*<noscript>\s*<link\b[^>]*>\s*</noscript>', re.IGNORECASE)
+
+# ---------------------------------------------------------------------------
+# O que a página usa
+# ---------------------------------------------------------------------------
+
+def empty_index():
+    """Conjuntos vazios de tags, classes, ids, atributos e prefixos usados"""
+    return {'tags': set(ALWAYS_PRESENT_TAGS), 'classes': set(), 'ids': set(),
+            'attributes': set(), 'prefixes': set(), 'font_families': set(),
+            'safelist': set(SAFELIST), 'safelist_patterns': list(SAFELIST_PATTERNS)}
+
+def index_script(js, used, prefixes=True):
+    """Palavras das strings de um JS viram classes/ids possíveis. Em JS inline, strings
+    terminadas em '-' ou '_' (ex.: 'elementor-' + nome) valem como prefixo"""
+    for match in _JS_STRING.finditer(js):
+        text = next(group for group in match.groups() if group is not None)
+        for word in _JS_WORD.findall(text):
+            used['classes'].add(word)
+            used['ids'].add(word)
+            if prefixes and len(word) > 3 and word.endswith(('-', '_')):
+                used['prefixes'].add(word)
+
+def index_html(content, used=None, scripts_inline=True):
+    """Acrescenta ao índice o que aparece no HTML e (com scripts_inline) nos scripts
+    inline. Retorna o índice e os caminhos dos scripts externos"""
+    used = used if used is not None else empty_index()
+    scripts = []
+    open_tag = None
+
+    for token in tokenize([content]):
+        if token['type'] == 'start':
+            open_tag = token['tag']
+            used['tags'].add(token['tag'])
+            for name, value in parse_attributes(token):
+                used['attributes'].add(name)
+                if name == 'class':
+                    used['classes'].update(value.split())
+                elif name == 'id':
+                    used['ids'].add(value.strip())
+                elif name == 'src' and token['tag'] == 'script':
+                    scripts.append(value)
+                elif name == 'style':
+                    for family in _INLINE_FONT_FAMILY.findall(value):
+                        used['font_families'].update(_family_names(family))
+        elif token['type'] == 'rawtext' and open_tag == 'script' and scripts_inline:
+            index_script(token['raw'], used)
+
+    return used, scripts
+
+def index_page(content, base_directory=''):
+    """Índice completo de uma página: HTML, scripts inline e scripts locais"""
+    used, scripts = index_html(content)
+
+    for reference in scripts:
+        path = resolve_reference(reference, base_directory)
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                index_script(f.read(), used, prefixes=False)
+
+    used['prefixes'] = tuple(sorted(used['prefixes']))
+    return used
+
+# ---------------------------------------------------------------------------
+# Seletores
+# ---------------------------------------------------------------------------
+
+def _name_used(name, names, used):
+    return (name in names or name in used['safelist'] or name.startswith(used['prefixes'])
+            or any(pattern.match(name) for pattern in used['safelist_patterns']))
+
+def selector_can_match(selector, used):
+    """Falso só quando o seletor exige uma classe, id, tag ou atributo que a página
+    não tem. Argumentos de :not()/:is()/:has() são ignorados (sempre conservador)"""
+    previous = None
+    while previous != selector:
+        previous = selector
+        selector = _FUNCTION_ARGUMENTS.sub('', selector)
+
+    for name in _ATTRIBUTE_SELECTOR.findall(selector):
+        name = name.lower()
+        if name not in used['attributes'] and not name.startswith(DYNAMIC_ATTRIBUTE_PREFIXES):
+            return False
+    selector = _ATTRIBUTE_SELECTOR.sub('', selector)
+    selector = _PSEUDO.sub('', selector)
+
+    for kind, name, escaped in _CLASS_OR_ID.findall(selector):
+        # Nomes com escape (\:, \/) não são comparados
+        if escaped:
+            continue
+        if not _name_used(name, used['classes'] if kind == '.' else used['ids'], used):
+            return False
+    selector = _CLASS_OR_ID.sub('', selector)
+
+    return all(tag.lower() in used['tags'] for tag in _TYPE.findall(selector))
+
+def split_selector_list(selector):
+    """Separa uma lista de seletores pelas vírgulas de primeiro nível (não as de :is(a, b))"""
+    selectors = []
+    depth = 0
+    start = 0
+    for position, char in enumerate(selector):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(selector[start:position])
+            start = position + 1
+    selectors.append(selector[start:])
+    return selectors
+
+def _opaque(prelude):
+    keyword = prelude.split(None, 1)[0].split('(', 1)[0].lower()
+    return keyword.endswith(OPAQUE_AT_RULES)
+
+def purge_rules(nodes, used, stats):
+    """Remove da árvore as regras (e os seletores de uma lista) que não podem casar"""
+    kept = []
+    for node in nodes:
+        if node[0] == 'rule' and not node[1].startswith('@'):
+            selectors = [selector for selector in split_selector_list(node[1]) if selector_can_match(selector, used)]
+            if not selectors:
+                stats['rules_removed'] += 1
+                continue
+            node = ('rule', ','.join(selectors), node[2])
+        elif node[0] == 'block' and not _opaque(node[1]):
+            node = ('block', node[1], purge_rules(node[2], used, stats))
+        kept.append(node)
+    return kept
+
+# ---------------------------------------------------------------------------
+# Fontes
+# ---------------------------------------------------------------------------
+
+def _family_names(value):
+    # Cada item da lista e, para o atalho font:, cada palavra dele (um superconjunto basta)
+    names = set()
+    for item in value.split(','):
+        item = item.strip().strip('"\'').lower()
+        if item:
+            names.add(item)
+            names.update(word.strip('"\'') for word in item.split())
+    return names
+
+def _declares_font_family(name):
+    # font, font-family e propriedades customizadas como --e-global-typography-primary-font-family
+    name = name.strip().lower()
+    return name == 'font' or name.endswith('font-family')
+
+def used_font_families(nodes, protected, families=None):
+    """Famílias citadas em font/font-family (e variáveis de fonte) fora de @font-face"""
+    families = families if families is not None else set()
+    for node in nodes:
+        if node[0] == 'rule' and not node[1].startswith('@'):
+            for declaration in node[2]:
+                name, colon, value = declaration.partition(':')
+                if colon and _declares_font_family(name):
+                    families.update(_family_names(restore(value, protected)))
+        elif node[0] == 'block':
+            used_font_families(node[2], protected, families)
+    return families
+
+def purge_font_faces(nodes, protected, families, stats):
+    """Remove @font-face de famílias que nenhuma regra usa"""
+    kept = []
+    for node in nodes:
+        if node[0] == 'rule' and node[1].lower() == '@font-face':
+            declared = set()
+            for declaration in node[2]:
+                name, colon, value = declaration.partition(':')
+                if name.strip().lower() == 'font-family':
+                    declared = _family_names(restore(value, protected))
+            if declared and not declared & families:
+                stats['font_faces_removed'] += 1
+                continue
+        elif node[0] == 'block':
+            node = ('block', node[1], purge_font_faces(node[2], protected, families, stats))
+        kept.append(node)
+    return kept
+
+# ---------------------------------------------------------------------------
+# Folhas de estilo
+# ---------------------------------------------------------------------------
+
+def new_stats():
+    return {'rules_removed': 0, 'font_faces_removed': 0, 'bytes_before': 0, 'bytes_after': 0,
+            'links_removed': 0, 'stylesheets_purged': 0}
+
+def _parse_stylesheet(css):
+    text, protected = protect(css)
+    try:
+        return minify_tree(parse(text)), protected
+    except ValueError:
+        return None, protected
+
+def purge_stylesheets(stylesheets, used, stats):
+    """Purga um conjunto de folhas de estilo da mesma página. As fontes são avaliadas
+    em conjunto: um @font-face fica se qualquer folha usar a família.
+    Retorna o CSS resultante de cada uma (None = não analisável, mantida como está)"""
+    trees = []
+    for css in stylesheets:
+        tree, protected = _parse_stylesheet(css)
+        if tree is not None:
+            tree = purge_rules(tree, used, stats)
+        trees.append((tree, protected))
+
+    families = set(used['font_families'])
+    for tree, protected in trees:
+        if tree is not None:
+            used_font_families(tree, protected, families)
+
+    results = []
+    for css, (tree, protected) in zip(stylesheets, trees):
+        if tree is None:
+            results.append(None)
+            continue
+        tree = merge_rules(purge_font_faces(tree, protected, families, stats))
+        purged = restore(serialize(tree), protected)
+        stats['bytes_before'] += len(css)
+        stats['bytes_after'] += len(purged)
+        results.append(purged)
+
+    return results
+
+def purged_path(path, css):
+    """Nome da cópia purgada, no mesmo diretório (os url() relativos continuam valendo)"""
+    stem, extension = os.path.splitext(path)
+    stem = _PURGED_SUFFIX.sub('', stem)
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:8]
+    return f'{stem}.purged.{digest}{extension}'
+
+def stylesheet_links(content, base_directory=''):
+    """(match da tag <link>, caminho local, atributos) de cada folha de estilo local,
+    inclusive as carregadas de forma assíncrona (rel="preload" as="style")"""
+    links = []
+    for match in _LINK_TAG.finditer(content):
+        token = next(tokenize([match.group().rstrip()]), None)
+        if token is None or token['type'] != 'start':
+            continue
+        attributes = dict(parse_attributes(token))
+        rel = attributes.get('rel', '').lower().split()
+        if 'stylesheet' not in rel and not ('preload' in rel and attributes.get('as', '').lower() == 'style'):
+            continue
+        path = resolve_reference(attributes.get('href', ''), base_directory)
+        if path and path.endswith('.css') and os.path.exists(path):
+            links.append((match, path, attributes))
+    return links
+
+def noscript_fallback(content, match):
+    """Indica se o <link> encontrado é o fallback em <noscript> de um link assíncrono"""
+    return content[:match.start()].rstrip().endswith('<noscript>')
+
+def link_span(content, match):
+    """(início, fim) de um <link>, incluindo o fallback em <noscript> que o segue"""
+    fallback = _NOSCRIPT_LINK.match(content, match.end())
+    return match.start(), fallback.end() if fallback else match.end()
+
+def purge_document(content, base_directory='', write=None):
+    """Purga os <style> inline e as folhas locais de uma página. Folhas sem nenhuma regra
+    útil perdem o <link>; as demais viram cópias purgadas gravadas com write(caminho, css).
+    Retorna (conteúdo, estatísticas)"""
+    stats = new_stats()
+    used = index_page(content, base_directory)
+
+    inline_blocks = list(_STYLE_BLOCK.finditer(content))
+    links = stylesheet_links(content, base_directory)
+
+    # Uma folha com preload e fallback em <noscript> aparece em dois links
+    paths = []
+    for match, path, attributes in links:
+        if path not in paths:
+            paths.append(path)
+
+    stylesheets = [match.group(2) for match in inline_blocks]
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            stylesheets.append(f.read())
+
+    results = purge_stylesheets(stylesheets, used, stats)
+    inline_results = results[:len(inline_blocks)]
+    path_results = dict(zip(paths, results[len(inline_blocks):]))
+    originals = dict(zip(paths, stylesheets[len(inline_blocks):]))
+
+    # Trechos (início, fim, texto novo) do documento original
+    replacements = [(match.start(), match.end(), f'{match.group(1)}{purged}</style>')
+                    for match, purged in zip(inline_blocks, inline_results) if purged is not None]
+
+    written = set()
+    removed_until = 0
+    for match, path, attributes in links:
+        purged = path_results[path]
+        # Folha que já não tem nada a remover continua com o mesmo arquivo
+        if purged is None or purged == originals[path]:
+            continue
+        if not purged:
+            # O <link> sai junto com o fallback em <noscript> que o segue
+            if match.start() >= removed_until:
+                start, removed_until = link_span(content, match)
+                replacements.append((start, removed_until, ''))
+                stats['links_removed'] += 1
+            continue
+
+        target = purged_path(path, purged)
+        if path not in written:
+            written.add(path)
+            if write is not None:
+                write(target, purged)
+            stats['stylesheets_purged'] += 1
+        href = os.path.relpath(target, base_directory or '.').replace(os.sep, '/')
+        new_tag = re.sub(r'''href=(["']?)[^"'\s>]+\1''', lambda m: f'href={m.group(1)}./{href}{m.group(1)}',
+                         match.group(), count=1)
+        replacements.append((match.start(), match.end(), new_tag))
+
+    # De trás para frente para manter as posições válidas
+    for start, end, text in sorted(replacements, reverse=True):
+        content = content[:start] + text + content[end:]
+
+    return content, stats
+
+def stale_copies(pages=None):
+    """Cópias purgadas que nenhuma página referencia mais. Cada mudança no CSS de origem
+    ou no HTML gera outro hash, e a cópia anterior fica para trás"""
+    linked = set()
+    for page in (pages if pages is not None else discover_pages()):
+        with open(page, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        linked.update(path for match, path, attributes in stylesheet_links(content, os.path.dirname(page)))
+    return [entry['path'] for entry in find_files(types=['css'])
+            if _PURGED_COPY.search(entry['path']) and entry['path'] not in linked]
+
+def remove_stale_copies(pages=None):
+    """Remove as cópias purgadas órfãs. Só depois que todas as páginas foram gravadas:
+    uma página ainda em processamento pode usar uma cópia que outra não referencia.
+    Retorna quantas foram removidas"""
+    stale = stale_copies(pages)
+    for path in stale:
+        os.remove(path)
+        update_file(path)
+    return len(stale)
+
+def main():
+    """Relatório do CSS removível em cada página (não altera arquivos)"""
+    print("🧹 REMOÇÃO DE CSS NÃO UTILIZADO - PEACOCK COSMÉTICOS\n")
+
+    report = {}
+    for page in (sys.argv[1:] or discover_pages()):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        content, stats = purge_document(content, os.path.dirname(page))
+        report[page] = stats
+
+        print(f"   📄 {page}: {stats['rules_removed']} regras e {stats['font_faces_removed']} @font-face removíveis, "
+              f"{round(stats['bytes_before'] / 1024, 1)} KB → {round(stats['bytes_after'] / 1024, 1)} KB, "
+              f"{stats['links_removed']} folhas inteiras")
+
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\n   📊 Relatório: {REPORT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -8,69 +8,79 @@ Direct String Replacement Cleanup Script
 import os
 from datetime import datetime
 
-def direct_cleanup(content):
-    """Direct string replacements for remaining references"""
-    print("🔄 Performing direct string replacements...")
-    
+from rewrite_engine import literal_rule, compile_rules, apply_rules, print_hit_report
+
+DIRECT_CLEANUP_RULES = [
     # Direct replacements for file paths
-    content = content.replace('header-footer-elementor.css', 'header-footer-builder.css')
-    content = content.replace('elementor-icons.min.css', 'builder-icons.min.css')
-    content = content.replace('elementor.js', 'builder.js')
-    
+    literal_rule('header-footer-elementor.css', 'header-footer-builder.css'),
+    literal_rule('elementor-icons.min.css', 'builder-icons.min.css'),
+    literal_rule('elementor.js', 'builder.js'),
+
     # Direct replacements for CSS classes
-    content = content.replace('elementor-col-', 'builder-col-')
-    content = content.replace('elementor-top-section', 'builder-top-section')
-    content = content.replace('elementor-inner-section', 'builder-inner-section')
-    content = content.replace('elementor-top-column', 'builder-top-column')
-    content = content.replace('elementor-inner-column', 'builder-inner-column')
-    content = content.replace('elementor-size-default', 'builder-size-default')
-    content = content.replace('elementor-align-', 'builder-align-')
-    content = content.replace('elementor-hidden-', 'builder-hidden-')
-    content = content.replace('elementor-invisible', 'builder-invisible')
-    content = content.replace('elementor-animation', 'builder-animation')
-    content = content.replace('elementor-button', 'builder-button')
-    content = content.replace('elementor-heading-title', 'builder-heading-title')
-    content = content.replace('elementor-icon-list', 'builder-icon-list')
-    content = content.replace('elementor-inline-items', 'builder-inline-items')
-    content = content.replace('elementor-inline-item', 'builder-inline-item')
-    content = content.replace('elementor-repeater-item', 'builder-repeater-item')
-    content = content.replace('elementor-testimonial', 'builder-testimonial')
-    content = content.replace('elementor-swiper-button', 'builder-swiper-button')
-    content = content.replace('elementor-arrows-position', 'builder-arrows-position')
-    content = content.replace('elementor-pagination-position', 'builder-pagination-position')
-    content = content.replace('elementor-view-stacked', 'builder-view-stacked')
-    content = content.replace('elementor-shape-circle', 'builder-shape-circle')
-    content = content.replace('elementor-position-top', 'builder-position-top')
-    content = content.replace('elementor-mobile-position-top', 'builder-mobile-position-top')
-    content = content.replace('elementor-mobile-align-center', 'builder-mobile-align-center')
-    content = content.replace('elementor-absolute', 'builder-absolute')
-    content = content.replace('elementor-wrapper', 'builder-wrapper')
-    content = content.replace('elementor-open-inline', 'builder-open-inline')
-    
+    literal_rule('elementor-col-', 'builder-col-'),
+    literal_rule('elementor-top-section', 'builder-top-section'),
+    literal_rule('elementor-inner-section', 'builder-inner-section'),
+    literal_rule('elementor-top-column', 'builder-top-column'),
+    literal_rule('elementor-inner-column', 'builder-inner-column'),
+    literal_rule('elementor-size-default', 'builder-size-default'),
+    literal_rule('elementor-align-', 'builder-align-'),
+    literal_rule('elementor-hidden-', 'builder-hidden-'),
+    literal_rule('elementor-invisible', 'builder-invisible'),
+    literal_rule('elementor-animation', 'builder-animation'),
+    literal_rule('elementor-button', 'builder-button'),
+    literal_rule('elementor-heading-title', 'builder-heading-title'),
+    literal_rule('elementor-icon-list', 'builder-icon-list'),
+    literal_rule('elementor-inline-items', 'builder-inline-items'),
+    literal_rule('elementor-inline-item', 'builder-inline-item'),
+    literal_rule('elementor-repeater-item', 'builder-repeater-item'),
+    literal_rule('elementor-testimonial', 'builder-testimonial'),
+    literal_rule('elementor-swiper-button', 'builder-swiper-button'),
+    literal_rule('elementor-arrows-position', 'builder-arrows-position'),
+    literal_rule('elementor-pagination-position', 'builder-pagination-position'),
+    literal_rule('elementor-view-stacked', 'builder-view-stacked'),
+    literal_rule('elementor-shape-circle', 'builder-shape-circle'),
+    literal_rule('elementor-position-top', 'builder-position-top'),
+    literal_rule('elementor-mobile-position-top', 'builder-mobile-position-top'),
+    literal_rule('elementor-mobile-align-center', 'builder-mobile-align-center'),
+    literal_rule('elementor-absolute', 'builder-absolute'),
+    literal_rule('elementor-wrapper', 'builder-wrapper'),
+    literal_rule('elementor-open-inline', 'builder-open-inline'),
+
     # Direct replacements for data attributes
-    content = content.replace('elementor_header_footer', 'custom_header_footer')
-    content = content.replace('elementor_library', 'builder_library')
-    
+    literal_rule('elementor_header_footer', 'custom_header_footer'),
+    literal_rule('elementor_library', 'builder_library'),
+
     # Direct replacements for script IDs
-    content = content.replace('id="elementor-', 'id="builder-')
-    content = content.replace('id="elementskit-', 'id="elements-')
-    
+    literal_rule('id="elementor-', 'id="builder-'),
+    literal_rule('id="elementskit-', 'id="elements-'),
+
     # Direct replacements for JavaScript
-    content = content.replace('elementorFrontendConfig', 'builderFrontendConfig')
-    content = content.replace('ElementorProFrontendConfig', 'ProBuilderFrontendConfig')
-    content = content.replace('elementor/lazyload/observe', 'builder/lazyload/observe')
-    
+    literal_rule('elementorFrontendConfig', 'builderFrontendConfig'),
+    literal_rule('ElementorProFrontendConfig', 'ProBuilderFrontendConfig'),
+    literal_rule('elementor/lazyload/observe', 'builder/lazyload/observe'),
+
     # Direct replacements for WordPress admin
-    content = content.replace('/wp-admin/admin-ajax.php', '/api/ajax.php')
-    
+    literal_rule('/wp-admin/admin-ajax.php', '/api/ajax.php'),
+
     # Direct replacements for prefetch patterns
-    content = content.replace('/wp-*.php', '/*.php')
-    content = content.replace('/wp-admin/*', '/admin/*')
-    content = content.replace('/wp-content/uploads/*', '/assets/media/*')
-    content = content.replace('/wp-content/*', '/assets/*')
-    content = content.replace('/wp-content/plugins/*', '/assets/modules/*')
-    content = content.replace('/wp-content/themes/custom-theme-child/*', '/assets/templates/custom-theme-child/*')
-    content = content.replace('/wp-content/themes/custom-theme/*', '/assets/templates/custom-theme/*')
+    literal_rule('/wp-*.php', '/*.php'),
+    literal_rule('/wp-admin/*', '/admin/*'),
+    literal_rule('/wp-content/uploads/*', '/assets/media/*'),
+    literal_rule('/wp-content/*', '/assets/*'),
+    literal_rule('/wp-content/plugins/*', '/assets/modules/*'),
+    literal_rule('/wp-content/themes/custom-theme-child/*', '/assets/templates/custom-theme-child/*'),
+    literal_rule('/wp-content/themes/custom-theme/*', '/assets/templates/custom-theme/*'),
+    
+]
+
+DIRECT_CLEANUP = compile_rules(DIRECT_CLEANUP_RULES)
+
+def direct_cleanup(content):
+    """Direct string replacements for remaining references"""
+    print("🔄 Performing direct string replacements...")
+    
+    content, hits = apply_rules(content, DIRECT_CLEANUP)
+    print_hit_report(DIRECT_CLEANUP, hits)
     
     return content
 
@@ -7,99 +7,92 @@ Enhanced WordPress Cleanup Script
 - Remove WordPress-specific classes and IDs
 """
 
-import re
 import os
 from datetime import datetime
 
-def enhanced_wordpress_cleanup(content):
-    """Enhanced cleanup of WordPress identifiers"""
+from rewrite_engine import literal_rule, regex_rule, compile_rules, apply_rules, print_hit_report
 
+ENHANCED_CLEANUP_RULES = [
     # Remove WordPress-specific comments
-    content = re.sub(r'// Disable WordPress emoji support for offline use', '// Disable emoji support for offline use', content)
+    regex_rule(r'// Disable WordPress emoji support for offline use', '// Disable emoji support for offline use'),
 
     # Clean up CSS custom properties (remove wp-- prefixes)
-    wp_css_replacements = [
-        (r'--wp--preset--', '--preset--'),
-        (r'--wp--style--', '--style--'),
-        (r'\.wp-site-blocks', '.site-blocks'),
-        (r'\.wp-element-button', '.element-button'),
-        (r'\.wp-block-button__link', '.block-button__link'),
-        (r'\.wp-block-pullquote', '.block-pullquote'),
-    ]
-
-    for pattern, replacement in wp_css_replacements:
-        content = re.sub(pattern, replacement, content)
+    regex_rule(r'--wp--preset--', '--preset--'),
+    regex_rule(r'--wp--style--', '--style--'),
+    regex_rule(r'\.wp-site-blocks', '.site-blocks'),
+    regex_rule(r'\.wp-element-button', '.element-button'),
+    regex_rule(r'\.wp-block-button__link', '.block-button__link'),
+    regex_rule(r'\.wp-block-pullquote', '.block-pullquote'),
 
     # Update remaining CSS classes
-    css_class_replacements = {
-        'wp-image-': 'image-',
-        'wp-post': 'post',
-        'wp-page': 'page',
-        'data-wp-strategy': 'data-strategy',
-        'wp-util': 'util',
-        'wp-dom-ready': 'dom-ready',
-        'wp-hooks': 'hooks',
-        'wp-i18n': 'i18n',
-    }
-
-    for wp_class, new_class in css_class_replacements.items():
-        content = content.replace(wp_class, new_class)
+    literal_rule('wp-image-', 'image-'),
+    literal_rule('wp-post', 'post'),
+    literal_rule('wp-page', 'page'),
+    literal_rule('data-wp-strategy', 'data-strategy'),
+    literal_rule('wp-util', 'util'),
+    literal_rule('wp-dom-ready', 'dom-ready'),
+    literal_rule('wp-hooks', 'hooks'),
+    literal_rule('wp-i18n', 'i18n'),
 
     # Update JavaScript variables and functions
-    js_replacements = [
-        (r'wp\.i18n\.setLocaleData', 'app.i18n.setLocaleData'),
-        (r'"wpPreview"', '"preview"'),
-        (r'"ajaxurl":"\/wp-admin\/admin-ajax\.php"', '"ajaxurl":"/admin/ajax.php"'),
-        (r'"uploadUrl":"\.\/assets\/uploads"', '"uploadUrl":"./assets/media"'),
-        (r'"rest":"\.\/api\/"', '"rest":"./api/"'),
-        (r'https:\/\/peacockcosmeticos\.com\.br\/wp-admin\/admin-ajax\.php', 'https://peacockcosmeticos.com.br/admin/ajax.php'),
-    ]
-
-    for pattern, replacement in js_replacements:
-        content = re.sub(pattern, replacement, content)
+    regex_rule(r'wp\.i18n\.setLocaleData', 'app.i18n.setLocaleData'),
+    regex_rule(r'"wpPreview"', '"preview"'),
+    regex_rule(r'"ajaxurl":"\/wp-admin\/admin-ajax\.php"', '"ajaxurl":"/admin/ajax.php"'),
+    regex_rule(r'"uploadUrl":"\.\/assets\/uploads"', '"uploadUrl":"./assets/media"'),
+    regex_rule(r'"rest":"\.\/api\/"', '"rest":"./api/"'),
+    regex_rule(r'https:\/\/peacockcosmeticos\.com\.br\/wp-admin\/admin-ajax\.php', 'https://peacockcosmeticos.com.br/admin/ajax.php'),
 
     # Clean up WooCommerce references
-    woocommerce_replacements = [
-        (r'woocommerce-js', 'ecommerce-js'),
-        (r'\.woocommerce', '.ecommerce'),
-        (r'wc-blocks', 'ecommerce-blocks'),
-        (r'wc-add-to-cart', 'add-to-cart'),
-        (r'wc-order-attribution', 'order-attribution'),
-        (r'wc-ajax', 'ajax'),
-    ]
-
-    for pattern, replacement in woocommerce_replacements:
-        content = re.sub(pattern, replacement, content)
+    regex_rule(r'woocommerce-js', 'ecommerce-js'),
+    regex_rule(r'\.woocommerce', '.ecommerce'),
+    regex_rule(r'wc-blocks', 'ecommerce-blocks'),
+    regex_rule(r'wc-add-to-cart', 'add-to-cart'),
+    regex_rule(r'wc-order-attribution', 'order-attribution'),
+    regex_rule(r'wc-ajax', 'ajax'),
 
     # Remove WordPress-specific speculation rules
-    content = re.sub(
+    regex_rule(
         r'"href_matches":\["\/wp-\*\.php","\/wp-admin\/\*","\/wp-content\/uploads\/\*","\/wp-content\/\*","\/wp-content\/plugins\/\*","\/wp-content\/themes\/hello-elementor-child\/\*","\/wp-content\/themes\/hello-elementor\/\*","\/*\\?\(.+\)"\]',
-        '"href_matches":["/*.php","/admin/*","/assets/media/*","/assets/*","/assets/modules/*","/assets/templates/hello-elementor-child/*","/assets/templates/hello-elementor/*","/*\\\\?(.+)"]',
-        content
-    )
+        '"href_matches":["/*.php","/admin/*","/assets/media/*","/assets/*","/assets/modules/*","/assets/templates/hello-elementor-child/*","/assets/templates/hello-elementor/*","/*\\\\?(.+)"]'
+    ),
 
     # Clean up remaining WordPress references in data attributes
-    content = re.sub(r'data-elementor-type="wp-post"', 'data-elementor-type="post"', content)
-    content = re.sub(r'data-elementor-type="wp-page"', 'data-elementor-type="page"', content)
-    content = re.sub(r'data-elementor-post-type="elementor-hf"', 'data-elementor-post-type="header-footer"', content)
-
-    return content
-
-def clean_remaining_references(content):
-    """Clean up any remaining WordPress references"""
+    regex_rule(r'data-elementor-type="wp-post"', 'data-elementor-type="post"'),
+    regex_rule(r'data-elementor-type="wp-page"', 'data-elementor-type="page"'),
+    regex_rule(r'data-elementor-post-type="elementor-hf"', 'data-elementor-post-type="header-footer"'),
+]
 
+REMAINING_REFERENCE_RULES = [
     # Remove WordPress version references
-    content = re.sub(r'\?ver=6\.8\.2', '?ver=1.0.0', content)
-    content = re.sub(r'\?ver=10\.1\.0', '?ver=1.0.0', content)
-    content = re.sub(r'\?ver=3\.31\.2', '?ver=1.0.0', content)
+    regex_rule(r'\?ver=6\.8\.2', '?ver=1.0.0'),
+    regex_rule(r'\?ver=10\.1\.0', '?ver=1.0.0'),
+    regex_rule(r'\?ver=3\.31\.2', '?ver=1.0.0'),
 
     # Clean up file paths that might still reference WordPress structure
-    content = re.sub(r'wp-content\\uploads', 'assets/media', content)
-    content = re.sub(r'wp-content\\plugins', 'assets/modules', content)
-    content = re.sub(r'wp-content\\themes', 'assets/templates', content)
+    regex_rule(r'wp-content\\uploads', 'assets/media'),
+    regex_rule(r'wp-content\\plugins', 'assets/modules'),
+    regex_rule(r'wp-content\\themes', 'assets/templates'),
 
     # Remove WordPress-specific noscript styles
-    content = re.sub(r'<noscript><style>\.woocommerce-product-gallery\{ opacity: 1 !important; \}</style></noscript>', '', content)
+    regex_rule(r'<noscript><style>\.woocommerce-product-gallery\{ opacity: 1 !important; \}</style></noscript>', ''),
+]
+
+ENHANCED_CLEANUP = compile_rules(ENHANCED_CLEANUP_RULES)
+REMAINING_REFERENCES = compile_rules(REMAINING_REFERENCE_RULES)
+
+def enhanced_wordpress_cleanup(content):
+    """Enhanced cleanup of WordPress identifiers"""
+
+    content, hits = apply_rules(content, ENHANCED_CLEANUP)
+    print_hit_report(ENHANCED_CLEANUP, hits)
+
+    return content
+
+def clean_remaining_references(content):
+    """Clean up any remaining WordPress references"""
+
+    content, hits = apply_rules(content, REMAINING_REFERENCES)
+    print_hit_report(REMAINING_REFERENCES, hits)
 
     return content
 
@@ -8,208 +8,260 @@ Comprehensive WordPress/WooCommerce/Elementor Disguise Script
 - Ensure native custom-built appearance
 """
 
-import re
 import os
 from datetime import datetime
 
-def clean_woocommerce_references(content):
-    """Clean WooCommerce folder references and update to ecommerce"""
-    print("🔄 Cleaning WooCommerce folder references...")
+from rewrite_engine import regex_rule, compile_rules, apply_rules, print_hit_report
 
+WOOCOMMERCE_REFERENCE_RULES = [
     # Update folder paths from woocommerce to ecommerce
-    content = re.sub(r'./assets/modules/woocommerce/', './assets/modules/ecommerce/', content)
+    regex_rule(r'./assets/modules/woocommerce/', './assets/modules/ecommerce/'),
 
     # Update CSS file references
-    content = re.sub(r"id='woocommerce-([^']*)-css'", r"id='ecommerce-\1-css'", content)
-    content = re.sub(r"woocommerce-layout\.css", "ecommerce-layout.css", content)
-    content = re.sub(r"woocommerce-smallscreen\.css", "ecommerce-smallscreen.css", content)
-    content = re.sub(r"woocommerce\.css", "ecommerce.css", content)
+    regex_rule(r"id='woocommerce-([^']*)-css'", r"id='ecommerce-\1-css'"),
+    regex_rule(r"woocommerce-layout\.css", "ecommerce-layout.css"),
+    regex_rule(r"woocommerce-smallscreen\.css", "ecommerce-smallscreen.css"),
+    regex_rule(r"woocommerce\.css", "ecommerce.css"),
 
     # Update JavaScript file references
-    content = re.sub(r"woocommerce\.min\.js", "ecommerce.min.js", content)
-    content = re.sub(r"woocommerce/assets/js", "ecommerce/assets/js", content)
+    regex_rule(r"woocommerce\.min\.js", "ecommerce.min.js"),
+    regex_rule(r"woocommerce/assets/js", "ecommerce/assets/js"),
 
     # Update JavaScript variable names
-    content = re.sub(r"var woocommerce_params", "var ecommerce_params", content)
-    content = re.sub(r'"woocommerce":', '"ecommerce":', content)
-    content = re.sub(r"woocommerce_notices_elements", "ecommerce_notices_elements", content)
+    regex_rule(r"var woocommerce_params", "var ecommerce_params"),
+    regex_rule(r'"woocommerce":', '"ecommerce":'),
+    regex_rule(r"woocommerce_notices_elements", "ecommerce_notices_elements"),
 
     # Clean up CSS style blocks
-    content = re.sub(r"id='woocommerce-inline-inline-css'", "id='ecommerce-inline-inline-css'", content)
+    regex_rule(r"id='woocommerce-inline-inline-css'", "id='ecommerce-inline-inline-css'"),
 
     # Update remaining WooCommerce references in configuration
-    content = re.sub(r'"wc-ajax=', '"ajax=', content)
-    content = re.sub(r'wc-10\.1\.0', '1.0.0', content)
+    regex_rule(r'"wc-ajax=', '"ajax='),
+    regex_rule(r'wc-10\.1\.0', '1.0.0'),
 
     # Clean up block references
-    content = re.sub(r"ecommerce-blocks\.css\?ver=wc-10\.1\.0", "ecommerce-blocks.css?ver=1.0.0", content)
+    regex_rule(r"ecommerce-blocks\.css\?ver=wc-10\.1\.0", "ecommerce-blocks.css?ver=1.0.0"),
+]
 
-    return content
+WOOCOMMERCE_REFERENCES = compile_rules(WOOCOMMERCE_REFERENCE_RULES)
 
-def clean_elementor_references(content):
-    """Clean Elementor references and update to generic names"""
-    print("🔄 Cleaning Elementor references...")
+def clean_woocommerce_references(content):
+    """Clean WooCommerce folder references and update to ecommerce"""
+    print("🔄 Cleaning WooCommerce folder references...")
+
+    content, hits = apply_rules(content, WOOCOMMERCE_REFERENCES)
+    print_hit_report(WOOCOMMERCE_REFERENCES, hits)
+
+    return content
 
+ELEMENTOR_REFERENCE_RULES = [
     # Update folder paths from elementor to generic names
-    content = re.sub(r'./assets/modules/elementor/', './assets/modules/page-builder/', content)
-    content = re.sub(r'./assets/modules/elementor-pro/', './assets/modules/pro-builder/', content)
-    content = re.sub(r'./assets/modules/header-footer-elementor/', './assets/modules/header-footer/', content)
-    content = re.sub(r'./assets/modules/pro-elements/', './assets/modules/pro-elements/', content)
-    content = re.sub(r'./assets/media/elementor/', './assets/media/builder/', content)
+    regex_rule(r'./assets/modules/elementor/', './assets/modules/page-builder/'),
+    regex_rule(r'./assets/modules/elementor-pro/', './assets/modules/pro-builder/'),
+    regex_rule(r'./assets/modules/header-footer-elementor/', './assets/modules/header-footer/'),
+    regex_rule(r'./assets/modules/pro-elements/', './assets/modules/pro-elements/'),
+    regex_rule(r'./assets/media/elementor/', './assets/media/builder/'),
 
     # Update CSS IDs and references
-    content = re.sub(r"id='elementor-([^']*)-css'", r"id='builder-\1-css'", content)
-    content = re.sub(r"id='hfe-([^']*)-css'", r"id='header-footer-\1-css'", content)
+    regex_rule(r"id='elementor-([^']*)-css'", r"id='builder-\1-css'"),
+    regex_rule(r"id='hfe-([^']*)-css'", r"id='header-footer-\1-css'"),
 
     # Update theme references
-    content = re.sub(r'hello-elementor', 'custom-theme', content)
+    regex_rule(r'hello-elementor', 'custom-theme'),
+]
 
-    return content
+ELEMENTOR_REFERENCES = compile_rules(ELEMENTOR_REFERENCE_RULES)
 
-def clean_css_classes(content):
-    """Clean WordPress/Elementor-specific CSS classes"""
-    print("🔄 Cleaning CSS classes...")
+def clean_elementor_references(content):
+    """Clean Elementor references and update to generic names"""
+    print("🔄 Cleaning Elementor references...")
 
+    content, hits = apply_rules(content, ELEMENTOR_REFERENCES)
+    print_hit_report(ELEMENTOR_REFERENCES, hits)
+
+    return content
+
+CSS_CLASS_RULES = [
     # Update body classes
-    content = re.sub(r'theme-hello-elementor', 'theme-custom', content)
-    content = re.sub(r'child-theme-hello-elementor-child', 'child-theme-custom', content)
-    content = re.sub(r'hello-elementor-default', 'custom-theme-default', content)
-    content = re.sub(r'elementor-default', 'builder-default', content)
-    content = re.sub(r'elementor-template-full-width', 'builder-template-full-width', content)
-    content = re.sub(r'elementor-kit-8', 'builder-kit-8', content)
-    content = re.sub(r'elementor-page', 'builder-page', content)
-    content = re.sub(r'ehf-template-hello-elementor', 'ehf-template-custom', content)
-    content = re.sub(r'ehf-stylesheet-hello-elementor-child', 'ehf-stylesheet-custom', content)
+    regex_rule(r'theme-hello-elementor', 'theme-custom'),
+    regex_rule(r'child-theme-hello-elementor-child', 'child-theme-custom'),
+    regex_rule(r'hello-elementor-default', 'custom-theme-default'),
+    regex_rule(r'elementor-default', 'builder-default'),
+    regex_rule(r'elementor-template-full-width', 'builder-template-full-width'),
+    regex_rule(r'elementor-kit-8', 'builder-kit-8'),
+    regex_rule(r'elementor-page', 'builder-page'),
+    regex_rule(r'ehf-template-hello-elementor', 'ehf-template-custom'),
+    regex_rule(r'ehf-stylesheet-hello-elementor-child', 'ehf-stylesheet-custom'),
 
     # Update data attributes
-    content = re.sub(r'data-elementor-type', 'data-builder-type', content)
-    content = re.sub(r'data-elementor-id', 'data-builder-id', content)
-    content = re.sub(r'data-elementor-post-type', 'data-builder-post-type', content)
-    content = re.sub(r'data-element_type', 'data-element-type', content)
+    regex_rule(r'data-elementor-type', 'data-builder-type'),
+    regex_rule(r'data-elementor-id', 'data-builder-id'),
+    regex_rule(r'data-elementor-post-type', 'data-builder-post-type'),
+    regex_rule(r'data-element_type', 'data-element-type'),
 
     # Update CSS classes in HTML
-    content = re.sub(r'class="elementor', 'class="builder', content)
-    content = re.sub(r'elementor-section', 'builder-section', content)
-    content = re.sub(r'elementor-container', 'builder-container', content)
-    content = re.sub(r'elementor-column', 'builder-column', content)
-    content = re.sub(r'elementor-widget', 'builder-widget', content)
-    content = re.sub(r'elementor-element', 'builder-element', content)
+    regex_rule(r'class="elementor', 'class="builder'),
+    regex_rule(r'elementor-section', 'builder-section'),
+    regex_rule(r'elementor-container', 'builder-container'),
+    regex_rule(r'elementor-column', 'builder-column'),
+    regex_rule(r'elementor-widget', 'builder-widget'),
+    regex_rule(r'elementor-element', 'builder-element'),
+]
+
+CSS_CLASSES = compile_rules(CSS_CLASS_RULES)
+
+def clean_css_classes(content):
+    """Clean WordPress/Elementor-specific CSS classes"""
+    print("🔄 Cleaning CSS classes...")
+
+    content, hits = apply_rules(content, CSS_CLASSES)
+    print_hit_report(CSS_CLASSES, hits)
 
     return content
 
-def clean_javascript_config(content):
-    """Clean WordPress-specific JavaScript configurations"""
-    print("🔄 Cleaning JavaScript configurations...")
+# Prefetch configuration written by the original WordPress install
+PREFETCH_PATTERN = r'"prefetch":\[{"source":"document","where":{"and":\[{"href_matches":"\\\/\*"},{"not":{"href_matches":\["\\\/wp-\*\.php","\\\/wp-admin\\\\\*","\\\/wp-content\\\/uploads\\\\\*","\\\/wp-content\\\\\*","\\\/wp-content\\\/plugins\\\\\*","\\\/wp-content\\\/themes\\\/hello-elementor-child\\\\\*","\\\/wp-content\\\/themes\\\/hello-elementor\\\\\*","\\\\\*\\\\\?\(\.\+\)"\]}},{"not":{"selector_matches":"a\[rel~=\\"nofollow\\"\]"}},{"not":{"selector_matches":"\.no-prefetch, \.no-prefetch a"}}]},"eagerness":"conservative"}]'
+PREFETCH_REPLACEMENT = r'"prefetch":[{"source":"document","where":{"and":[{"href_matches":"\\/*"},{"not":{"href_matches":["\\/*\\?(.+)"]}},{"not":{"selector_matches":"a[rel~=\\"nofollow\\"]"}},{"not":{"selector_matches":".no-prefetch, .no-prefetch a"}}]},"eagerness":"conservative"}]'
 
+JAVASCRIPT_CONFIG_RULES = [
     # Update WordPress admin URLs
-    content = re.sub(r'\/wp-admin\/admin-ajax\.php', '/api/ajax.php', content)
-    content = re.sub(r'"ajaxurl":"[^"]*wp-admin[^"]*"', '"ajaxurl":"/api/ajax.php"', content)
+    regex_rule(r'\/wp-admin\/admin-ajax\.php', '/api/ajax.php'),
+    regex_rule(r'"ajaxurl":"[^"]*wp-admin[^"]*"', '"ajaxurl":"/api/ajax.php"'),
 
     # Update prefetch configuration to remove WordPress patterns
-    prefetch_pattern = r'"prefetch":\[{"source":"document","where":{"and":\[{"href_matches":"\\\/\*"},{"not":{"href_matches":\["\\\/wp-\*\.php","\\\/wp-admin\\\\\*","\\\/wp-content\\\/uploads\\\\\*","\\\/wp-content\\\\\*","\\\/wp-content\\\/plugins\\\\\*","\\\/wp-content\\\/themes\\\/hello-elementor-child\\\\\*","\\\/wp-content\\\/themes\\\/hello-elementor\\\\\*","\\\\\*\\\\\?\(\.\+\)"\]}},{"not":{"selector_matches":"a\[rel~=\\"nofollow\\"\]"}},{"not":{"selector_matches":"\.no-prefetch, \.no-prefetch a"}}]},"eagerness":"conservative"}]'
-    prefetch_replacement = r'"prefetch":[{"source":"document","where":{"and":[{"href_matches":"\\/*"},{"not":{"href_matches":["\\/*\\?(.+)"]}},{"not":{"selector_matches":"a[rel~=\\"nofollow\\"]"}},{"not":{"selector_matches":".no-prefetch, .no-prefetch a"}}]},"eagerness":"conservative"}]'
-    content = re.sub(prefetch_pattern, prefetch_replacement, content)
+    regex_rule(PREFETCH_PATTERN, PREFETCH_REPLACEMENT),
 
     # Update Elementor configuration object names
-    content = re.sub(r'var elementorFrontendConfig', 'var builderFrontendConfig', content)
-    content = re.sub(r'var ElementorProFrontendConfig', 'var ProBuilderFrontendConfig', content)
+    regex_rule(r'var elementorFrontendConfig', 'var builderFrontendConfig'),
+    regex_rule(r'var ElementorProFrontendConfig', 'var ProBuilderFrontendConfig'),
 
     # Update asset URLs in JavaScript
-    content = re.sub(r'"assets":"\.\/assets\/modules\/elementor\/assets\/"', '"assets":"./assets/modules/page-builder/assets/"', content)
-    content = re.sub(r'"assets":"\.\/assets\/modules\/pro-elements\/assets\/"', '"assets":"./assets/modules/pro-builder/assets/"', content)
+    regex_rule(r'"assets":"\.\/assets\/modules\/elementor\/assets\/"', '"assets":"./assets/modules/page-builder/assets/"'),
+    regex_rule(r'"assets":"\.\/assets\/modules\/pro-elements\/assets\/"', '"assets":"./assets/modules/pro-builder/assets/"'),
 
     # Update upload URLs
-    content = re.sub(r'"uploadUrl":"\.\/assets\/media"', '"uploadUrl":"./assets/media"', content)
+    regex_rule(r'"uploadUrl":"\.\/assets\/media"', '"uploadUrl":"./assets/media"'),
+]
 
-    return content
+JAVASCRIPT_CONFIG = compile_rules(JAVASCRIPT_CONFIG_RULES)
 
-def remove_unnecessary_woocommerce_functionality(content):
-    """Remove unnecessary WooCommerce functionality for external checkout"""
-    print("🔄 Removing unnecessary WooCommerce functionality...")
+def clean_javascript_config(content):
+    """Clean WordPress-specific JavaScript configurations"""
+    print("🔄 Cleaning JavaScript configurations...")
 
+    content, hits = apply_rules(content, JAVASCRIPT_CONFIG)
+    print_hit_report(JAVASCRIPT_CONFIG, hits)
+
+    return content
+
+WOOCOMMERCE_FUNCTIONALITY_RULES = [
     # Remove WooCommerce cart-related JavaScript variables
-    content = re.sub(r'var wc_add_to_cart_params = {[^}]+};', '', content)
+    regex_rule(r'var wc_add_to_cart_params = {[^}]+};', ''),
 
     # Remove WooCommerce-specific menu cart configuration
-    content = re.sub(r'"menu_cart":{"cart_page_url":"[^"]*","checkout_page_url":"[^"]*","fragments_nonce":"[^"]*"}', '"menu_cart":{"enabled":false}', content)
+    regex_rule(r'"menu_cart":{"cart_page_url":"[^"]*","checkout_page_url":"[^"]*","fragments_nonce":"[^"]*"}', '"menu_cart":{"enabled":false}'),
 
     # Update ecommerce configuration to be more generic
-    content = re.sub(r'"ecommerce":', '"shop":', content)
-    content = re.sub(r'ecommerce_notices_elements', 'shop_notices_elements', content)
+    regex_rule(r'"ecommerce":', '"shop":'),
+    regex_rule(r'ecommerce_notices_elements', 'shop_notices_elements'),
+]
 
-    return content
+WOOCOMMERCE_FUNCTIONALITY = compile_rules(WOOCOMMERCE_FUNCTIONALITY_RULES)
 
-def ensure_native_appearance(content):
-    """Ensure all remaining references look like custom-built website"""
-    print("🔄 Ensuring native custom-built appearance...")
+def remove_unnecessary_woocommerce_functionality(content):
+    """Remove unnecessary WooCommerce functionality for external checkout"""
+    print("🔄 Removing unnecessary WooCommerce functionality...")
+
+    content, hits = apply_rules(content, WOOCOMMERCE_FUNCTIONALITY)
+    print_hit_report(WOOCOMMERCE_FUNCTIONALITY, hits)
+
+    return content
 
+NATIVE_APPEARANCE_RULES = [
     # Update generator meta tag
-    content = re.sub(r'content="Elementor [^"]*"', 'content="Custom Page Builder 1.0.0"', content)
+    regex_rule(r'content="Elementor [^"]*"', 'content="Custom Page Builder 1.0.0"'),
 
     # Update any remaining WordPress-specific comments
-    content = re.sub(r'<!-- WordPress[^>]*-->', '<!-- Custom CMS -->', content)
-    content = re.sub(r'<!-- Elementor[^>]*-->', '<!-- Page Builder -->', content)
+    regex_rule(r'<!-- WordPress[^>]*-->', '<!-- Custom CMS -->'),
+    regex_rule(r'<!-- Elementor[^>]*-->', '<!-- Page Builder -->'),
 
     # Update script IDs to be more generic
-    content = re.sub(r'id="elementor-([^"]*)-js"', r'id="builder-\1-js"', content)
-    content = re.sub(r'id="elementskit-([^"]*)-js"', r'id="elements-\1-js"', content)
+    regex_rule(r'id="elementor-([^"]*)-js"', r'id="builder-\1-js"'),
+    regex_rule(r'id="elementskit-([^"]*)-js"', r'id="elements-\1-js"'),
 
     # Update any remaining theme references
-    content = re.sub(r'hello-theme-', 'custom-theme-', content)
+    regex_rule(r'hello-theme-', 'custom-theme-'),
 
     # Clean up any remaining WordPress-specific nonces or tokens
-    content = re.sub(r'"nonce":"[a-f0-9]{10}"', '"nonce":"custom_token"', content)
+    regex_rule(r'"nonce":"[a-f0-9]{10}"', '"nonce":"custom_token"'),
+]
 
-    return content
+NATIVE_APPEARANCE = compile_rules(NATIVE_APPEARANCE_RULES)
 
-def final_pass_cleanup(content):
-    """Final pass to catch remaining references"""
-    print("🔄 Final pass cleanup for remaining references...")
+def ensure_native_appearance(content):
+    """Ensure all remaining references look like custom-built website"""
+    print("🔄 Ensuring native custom-built appearance...")
+
+    content, hits = apply_rules(content, NATIVE_APPEARANCE)
+    print_hit_report(NATIVE_APPEARANCE, hits)
 
+    return content
+
+FINAL_PASS_RULES = [
     # Clean remaining elementor CSS classes that weren't caught
-    content = re.sub(r'elementor-col-(\d+)', r'builder-col-\1', content)
-    content = re.sub(r'elementor-top-column', 'builder-top-column', content)
-    content = re.sub(r'elementor-inner-column', 'builder-inner-column', content)
-    content = re.sub(r'elementor-size-default', 'builder-size-default', content)
-    content = re.sub(r'elementor-align-', 'builder-align-', content)
-    content = re.sub(r'elementor-hidden-', 'builder-hidden-', content)
-    content = re.sub(r'elementor-invisible', 'builder-invisible', content)
-    content = re.sub(r'elementor-animation', 'builder-animation', content)
-    content = re.sub(r'elementor-button', 'builder-button', content)
-    content = re.sub(r'elementor-heading-title', 'builder-heading-title', content)
-    content = re.sub(r'elementor-icon-list', 'builder-icon-list', content)
-    content = re.sub(r'elementor-inline-items', 'builder-inline-items', content)
-    content = re.sub(r'elementor-inline-item', 'builder-inline-item', content)
-    content = re.sub(r'elementor-repeater-item', 'builder-repeater-item', content)
-    content = re.sub(r'elementor-testimonial', 'builder-testimonial', content)
-    content = re.sub(r'elementor-swiper-button', 'builder-swiper-button', content)
-    content = re.sub(r'elementor-arrows-position', 'builder-arrows-position', content)
-    content = re.sub(r'elementor-pagination-position', 'builder-pagination-position', content)
-    content = re.sub(r'elementor-view-stacked', 'builder-view-stacked', content)
-    content = re.sub(r'elementor-shape-circle', 'builder-shape-circle', content)
-    content = re.sub(r'elementor-position-top', 'builder-position-top', content)
-    content = re.sub(r'elementor-mobile-position-top', 'builder-mobile-position-top', content)
-    content = re.sub(r'elementor-mobile-align-center', 'builder-mobile-align-center', content)
-    content = re.sub(r'elementor-absolute', 'builder-absolute', content)
-    content = re.sub(r'elementor-wrapper', 'builder-wrapper', content)
-    content = re.sub(r'elementor-open-inline', 'builder-open-inline', content)
+    regex_rule(r'elementor-col-(\d+)', r'builder-col-\1'),
+    regex_rule(r'elementor-top-column', 'builder-top-column'),
+    regex_rule(r'elementor-inner-column', 'builder-inner-column'),
+    regex_rule(r'elementor-size-default', 'builder-size-default'),
+    regex_rule(r'elementor-align-', 'builder-align-'),
+    regex_rule(r'elementor-hidden-', 'builder-hidden-'),
+    regex_rule(r'elementor-invisible', 'builder-invisible'),
+    regex_rule(r'elementor-animation', 'builder-animation'),
+    regex_rule(r'elementor-button', 'builder-button'),
+    regex_rule(r'elementor-heading-title', 'builder-heading-title'),
+    regex_rule(r'elementor-icon-list', 'builder-icon-list'),
+    regex_rule(r'elementor-inline-items', 'builder-inline-items'),
+    regex_rule(r'elementor-inline-item', 'builder-inline-item'),
+    regex_rule(r'elementor-repeater-item', 'builder-repeater-item'),
+    regex_rule(r'elementor-testimonial', 'builder-testimonial'),
+    regex_rule(r'elementor-swiper-button', 'builder-swiper-button'),
+    regex_rule(r'elementor-arrows-position', 'builder-arrows-position'),
+    regex_rule(r'elementor-pagination-position', 'builder-pagination-position'),
+    regex_rule(r'elementor-view-stacked', 'builder-view-stacked'),
+    regex_rule(r'elementor-shape-circle', 'builder-shape-circle'),
+    regex_rule(r'elementor-position-top', 'builder-position-top'),
+    regex_rule(r'elementor-mobile-position-top', 'builder-mobile-position-top'),
+    regex_rule(r'elementor-mobile-align-center', 'builder-mobile-align-center'),
+    regex_rule(r'elementor-absolute', 'builder-absolute'),
+    regex_rule(r'elementor-wrapper', 'builder-wrapper'),
+    regex_rule(r'elementor-open-inline', 'builder-open-inline'),
 
     # Clean remaining WordPress admin references
-    content = re.sub(r'\/wp-admin\/admin-ajax\.php', '/api/ajax.php', content)
-    content = re.sub(r'"url":"[^"]*wp-admin[^"]*"', '"url":"/api/ajax.php"', content)
+    regex_rule(r'\/wp-admin\/admin-ajax\.php', '/api/ajax.php'),
+    regex_rule(r'"url":"[^"]*wp-admin[^"]*"', '"url":"/api/ajax.php"'),
 
     # Clean remaining script references
-    content = re.sub(r'elementor/lazyload/observe', 'builder/lazyload/observe', content)
+    regex_rule(r'elementor/lazyload/observe', 'builder/lazyload/observe'),
 
     # Clean remaining data attributes
-    content = re.sub(r'data-builder-post-type="elementor_library"', 'data-builder-post-type="builder_library"', content)
+    regex_rule(r'data-builder-post-type="elementor_library"', 'data-builder-post-type="builder_library"'),
 
     # Clean remaining CSS file names in file paths
-    content = re.sub(r'header-footer-elementor\.css', 'header-footer-builder.css', content)
-    content = re.sub(r'elementor-icons\.min\.css', 'builder-icons.min.css', content)
+    regex_rule(r'header-footer-elementor\.css', 'header-footer-builder.css'),
+    regex_rule(r'elementor-icons\.min\.css', 'builder-icons.min.css'),
 
     # Clean remaining JavaScript file references
-    content = re.sub(r'elementor\.js', 'builder.js', content)
+    regex_rule(r'elementor\.js', 'builder.js'),
+]
+
+FINAL_PASS = compile_rules(FINAL_PASS_RULES)
+
+def final_pass_cleanup(content):
+    """Final pass to catch remaining references"""
+    print("🔄 Final pass cleanup for remaining references...")
+
+    content, hits = apply_rules(content, FINAL_PASS)
+    print_hit_report(FINAL_PASS, hits)
 
     return content
 
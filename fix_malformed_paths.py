@@ -8,6 +8,8 @@ import os
 import re
 import glob
 
+from asset_inventory import find_files, update_file
+
 def fix_malformed_css_paths():
     """Corrige caminhos malformados em arquivos CSS"""
     print("🔧 Corrigindo caminhos malformados em CSS...")
@@ -31,13 +33,7 @@ def fix_malformed_css_paths():
     total_fixes = 0
     
     # Encontrar todos os arquivos CSS
-    css_files = []
-    for root, dirs, files in os.walk('.'):
-        if any(skip in root for skip in ['.git', '__pycache__']):
-            continue
-        for file in files:
-            if file.endswith('.css'):
-                css_files.append(os.path.join(root, file))
+    css_files = [entry['path'] for entry in find_files(extensions=('.css',))]
     
     for css_file in css_files:
         try:
@@ -59,6 +55,7 @@ def fix_malformed_css_paths():
             if content != original_content:
                 with open(css_file, 'w', encoding='utf-8') as f:
                     f.write(content)
+                update_file(css_file)
                 fixed_files.append(css_file)
                 total_fixes += file_fixes
                 print(f"   ✅ {css_file}: {file_fixes} correções aplicadas")
@@ -134,13 +131,7 @@ def verify_no_malformed_paths():
             malformed_found.extend(matches)
     
     # Verificar CSS
-    css_files = []
-    for root, dirs, files in os.walk('.'):
-        if any(skip in root for skip in ['.git', '__pycache__']):
-            continue
-        for file in files:
-            if file.endswith('.css'):
-                css_files.append(os.path.join(root, file))
+    css_files = [entry['path'] for entry in find_files(extensions=('.css',))]
     
     for css_file in css_files:
         try:
@@ -172,12 +163,7 @@ def clean_duplicate_slashes():
     files_to_check = ['index.html']
     
     # Adicionar arquivos CSS
-    for root, dirs, files in os.walk('.'):
-        if any(skip in root for skip in ['.git', '__pycache__']):
-            continue
-        for file in files:
-            if file.endswith('.css'):
-                files_to_check.append(os.path.join(root, file))
+    files_to_check.extend(entry['path'] for entry in find_files(extensions=('.css',)))
     
     total_fixes = 0
     
@@ -196,6 +182,7 @@ def clean_duplicate_slashes():
             if content != original_content:
                 with open(file_path, 'w', encoding='utf-8') as f:
                     f.write(content)
+                update_file(file_path)
                 total_fixes += 1
                 print(f"   ✅ Barras duplas corrigidas em {file_path}")
         except:
@@ -7,6 +7,8 @@ Corrige problemas específicos em srcset e links que estão causando erros 403
 import os
 import re
 
+from html_stream import handler, count, rewrite_file
+
 def fix_srcset_attributes():
     """Corrige atributos srcset malformados"""
     print("🔧 Corrigindo atributos srcset...")
@@ -77,37 +79,47 @@ def fix_broken_html_structure():
     """Corrige estrutura HTML quebrada"""
     print("🔧 Corrigindo estrutura HTML quebrada...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Padrão 1: Link CSS seguido de um link quebrado que se estende incorretamente
+    css_link = re.compile(r"<link[^>]*href='[^']*\.css[^']*?'[^>]*/>")
+    broken_link = re.compile(r"<link[^>]*href='\./wp-content/uploads/[^']*'[^>]*>")
     
-    original_content = content
-    fixes = 0
-    
-    # Corrigir tags link quebradas que se estendem incorretamente
-    broken_link_patterns = [
-        # Padrão 1: Link que se estende além do fechamento
-        (r"(<link[^>]*href='[^']*\.css[^']*?'[^>]*/>)<link[^>]*href='\.\/wp-content\/uploads\/[^']*'[^>]*>", 
-         r'\1'),
-        
+    # Correções aplicadas dentro de cada tag
+    broken_attribute_patterns = [
         # Padrão 2: Srcset que termina abruptamente
-        (r'srcset="([^"]*),\s*\./wp-content/uploads/[^"]*?"', 
+        ('srcset', re.compile(r'srcset="([^"]*),\s*\./wp-content/uploads/[^"]*?"'),
          r'srcset="\1"'),
         
         # Padrão 3: Atributos duplicados ou malformados
-        (r'(\s+wp-content/uploads/[^"]*?"),\s*\./wp-content/uploads/[^"]*?"', 
+        ('attributes', re.compile(r'(\s+wp-content/uploads/[^"]*?"),\s*\./wp-content/uploads/[^"]*?"'),
          r'\1"'),
     ]
     
-    for pattern, replacement in broken_link_patterns:
-        matches = re.findall(pattern, content)
-        if matches:
-            content = re.sub(pattern, replacement, content)
-            fixes += len(matches)
-            print(f"   🔄 Corrigidas {len(matches)} ocorrências do padrão")
+    def fix_tag(token, context):
+        previous = context['previous']
+        if (token['tag'] == 'link' and previous is not None and previous['type'] == 'start'
+                and not previous.get('dropped')
+                and css_link.fullmatch(previous['source'])
+                and broken_link.fullmatch(token['raw'])):
+            count(context, 'links')
+            return ''
+        
+        raw = token['raw']
+        for name, pattern, replacement in broken_attribute_patterns:
+            raw, fixed = pattern.subn(replacement, raw)
+            if fixed:
+                count(context, name, fixed)
+        return raw
     
-    if content != original_content:
-        with open('index.html', 'w', encoding='utf-8') as f:
-            f.write(content)
+    # O arquivo é reescrito em streaming, tag a tag
+    stats = rewrite_file('index.html', [handler(fix_tag)])
+    
+    fixes = 0
+    for name in ('links', 'srcset', 'attributes'):
+        if stats.get(name):
+            fixes += stats[name]
+            print(f"   🔄 Corrigidas {stats[name]} ocorrências do padrão")
+    
+    if fixes:
         print(f"   ✅ {fixes} correções de estrutura aplicadas")
     else:
         print("   ℹ️ Nenhuma estrutura quebrada encontrada")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - SUBSET DE FONTES
+Descobre os caracteres que as páginas realmente mostram (texto do HTML e os
+valores de `content:` das regras que casam com a página) e gera, para cada
+@font-face com arquivo local, uma fonte WOFF2 só com esses glifos. A regra
+@font-face passa a apontar para o subset com o unicode-range correspondente,
+e os caracteres fora dele caem na fonte seguinte da pilha. Fontes de ícones
+(eicons, Font Awesome, elementskit) ficam só com os poucos ícones usados
+"""
+
+import os
+import re
+import sys
+import json
+import html
+import hashlib
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+from html_stream import parse_attributes, tokenize
+from css_purge import index_page, selector_can_match, split_selector_list, stylesheet_links
+from css_dedup import parse_stylesheet
+from asset_graph import resolve_reference
+from asset_inventory import save_inventory, update_file
+from site_pipeline import discover_pages
+
+REPORT_FILE = 'font_subset_report.json'
+
+# Sempre incluídos: ASCII e Latin-1 cobrem o texto que o JavaScript monta
+# (carrinho, contadores, mensagens) sem que ele apareça no HTML
+BASE_CODEPOINTS = set(range(0x20, 0x7F)) | set(range(0xA0, 0x100))
+
+# Formatos que o fontTools lê, do preferido (sem perda) ao menos preferido
+SOURCE_FORMATS = ('.ttf', '.otf', '.woff', '.woff2')
+
+# Texto dentro destes elementos não é desenhado
+HIDDEN_TAGS = {'script', 'style', 'template', 'head', 'title'}
+
+# Atributos cujo valor aparece na tela
+VISIBLE_ATTRIBUTES = {'placeholder', 'value'}
+
+_FONT_FACE = re.compile(r'@font-face\s*\{([^}]*)\}', re.IGNORECASE)
+_SRC_URL = re.compile(r'url\(\s*(["\']?)([^"\')]*)\1\s*\)')
+_CSS_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'', re.DOTALL)
+_CSS_ESCAPE = re.compile(r'\\([0-9a-fA-F]{1,6})\s?|\\(.)', re.DOTALL)
+_SUBSET_SUFFIX = re.compile(r'\.subset\.[0-9a-f]{8}$')
+
+# ---------------------------------------------------------------------------
+# Caracteres usados
+# ---------------------------------------------------------------------------
+
+def text_codepoints(content, codepoints=None):
+    """Caracteres do texto visível de uma página (e de placeholder/value)"""
+    codepoints = codepoints if codepoints is not None else set()
+    hidden = []
+
+    for token in tokenize([content]):
+        if token['type'] == 'start':
+            if token['tag'] in HIDDEN_TAGS and not token['raw'].endswith('/>'):
+                hidden.append(token['tag'])
+            for name, value in parse_attributes(token):
+                if name in VISIBLE_ATTRIBUTES:
+                    codepoints.update(map(ord, value))
+        elif token['type'] == 'end':
+            if hidden and token['tag'] == hidden[-1]:
+                hidden.pop()
+        elif token['type'] == 'text' and not hidden:
+            codepoints.update(map(ord, html.unescape(token['raw'])))
+
+    return codepoints
+
+def _unescape_css(text):
+    def replace(match):
+        if match.group(1):
+            value = int(match.group(1), 16)
+            return chr(value) if 0 < value <= 0x10FFFF else '\ufffd'
+        return '' if match.group(2) == '\n' else match.group(2)
+    return _CSS_ESCAPE.sub(replace, text)
+
+def content_codepoints(value):
+    """Caracteres das strings de um valor de `content:` (escapes CSS resolvidos)"""
+    codepoints = set()
+    for match in _CSS_STRING.finditer(value):
+        text = match.group(1) if match.group(1) is not None else match.group(2)
+        codepoints.update(map(ord, _unescape_css(text)))
+    return codepoints
+
+def _rule_contents(nodes, used, codepoints):
+    for node in nodes:
+        if node[0] == 'rule' and not node[1].startswith('@'):
+            if not any(selector_can_match(selector, used) for selector in split_selector_list(node[1])):
+                continue
+            for declaration in node[2]:
+                name, colon, value = declaration.partition(':')
+                if colon and name.strip().lower() == 'content':
+                    codepoints.update(content_codepoints(value))
+        elif node[0] == 'block' and not node[1].split(None, 1)[0].lower().endswith('keyframes'):
+            _rule_contents(node[2], used, codepoints)
+    return codepoints
+
+def stylesheet_codepoints(css, used):
+    """Caracteres gerados por `content:` nas regras da folha que casam com a página"""
+    tree = parse_stylesheet(css)
+    return _rule_contents(tree, used, set()) if tree is not None else set()
+
+# ---------------------------------------------------------------------------
+# Regras @font-face
+# ---------------------------------------------------------------------------
+
+def _declarations(body):
+    declarations = {}
+    for declaration in body.split(';'):
+        name, colon, value = declaration.partition(':')
+        if colon:
+            declarations[name.strip().lower()] = value.strip()
+    return declarations
+
+def font_faces(css, path):
+    """Regras @font-face de uma folha: {'match', 'family', 'source'}, onde source é o
+    arquivo local a partir do qual o subset é gerado (None se nenhum existir)"""
+    faces = []
+    directory = os.path.dirname(path)
+
+    for match in _FONT_FACE.finditer(css):
+        declarations = _declarations(match.group(1))
+        family = declarations.get('font-family', '').strip('"\' ')
+        # Já tem unicode-range: a folha divide a fonte por conta própria
+        if not family or 'unicode-range' in declarations:
+            continue
+
+        urls = list(_SRC_URL.finditer(declarations.get('src', '')))
+        # Só local(): a fonte é a do sistema, não há arquivo a reduzir
+        if not urls:
+            continue
+
+        sources = []
+        for url in urls:
+            # url("./assets/...") gravados relativos à raiz pelos scripts de conversão
+            for base in (directory, ''):
+                local = resolve_reference(url.group(2), base)
+                if local and os.path.isfile(local):
+                    sources.append(local)
+                    break
+
+        sources = [source for source in sources if source.lower().endswith(SOURCE_FORMATS)]
+        sources.sort(key=lambda source: SOURCE_FORMATS.index(os.path.splitext(source)[1].lower()))
+        faces.append({'match': match, 'family': family, 'source': sources[0] if sources else None})
+
+    return faces
+
+def unicode_range(codepoints):
+    """Valor de unicode-range compacto: U+20-7E,U+A0-FF,U+E87F"""
+    ranges = []
+    for codepoint in sorted(codepoints):
+        if ranges and codepoint == ranges[-1][1] + 1:
+            ranges[-1][1] = codepoint
+        else:
+            ranges.append([codepoint, codepoint])
+    return ','.join(f'U+{start:X}' if start == end else f'U+{start:X}-{end:X}' for start, end in ranges)
+
+# ---------------------------------------------------------------------------
+# Subset
+# ---------------------------------------------------------------------------
+
+def subset_path(source, codepoints):
+    """Caminho do subset, nomeado pelo arquivo de origem e pelos caracteres pedidos"""
+    with open(source, 'rb') as f:
+        digest = hashlib.sha256(f.read() + unicode_range(codepoints).encode('ascii')).hexdigest()[:8]
+    stem = _SUBSET_SUFFIX.sub('', os.path.splitext(source)[0])
+    return f'{stem}.subset.{digest}.woff2'
+
+def subset_font(source, codepoints, target):
+    """Gera o WOFF2 só com os glifos dos caracteres pedidos. Retorna os caracteres que a
+    fonte de fato tem (o unicode-range da regra)"""
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.notdef_outline = True
+
+    font = TTFont(source)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    covered = set(font.getBestCmap() or {})
+
+    font.flavor = 'woff2'
+    font.save(target)
+    return covered
+
+def _subset_face(body, href, covered):
+    # src vira só o WOFF2 e ganha unicode-range; os demais descritores ficam
+    kept = [declaration for declaration in body.split(';')
+            if declaration.strip() and declaration.partition(':')[0].strip().lower() != 'src']
+    kept.insert(0, f'src:url("{href}") format("woff2")')
+    kept.append(f'unicode-range:{unicode_range(covered)}')
+    return '@font-face{' + ';'.join(declaration.strip() for declaration in kept) + '}'
+
+def subset_site(apply=False, pages=None):
+    """Subsets de todas as fontes locais das páginas. Os caracteres de uma folha com
+    @font-face (ícones) valem para as fontes dela; os das demais, para todas"""
+    pages = pages if pages is not None else discover_pages()
+    text = set(BASE_CODEPOINTS)
+    shared = set()
+    stylesheets = {}   # caminho -> caracteres de `content:` da folha
+
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        text_codepoints(content, text)
+        used = index_page(content, os.path.dirname(page))
+        for match, path, attributes in stylesheet_links(content, os.path.dirname(page)):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                css = f.read()
+            stylesheets.setdefault(path, set()).update(stylesheet_codepoints(css, used))
+
+    faces = {}
+    for path in stylesheets:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            faces[path] = font_faces(f.read(), path)
+        if not faces[path]:
+            shared.update(stylesheets[path])
+
+    report = {'fonts': [], 'missing_sources': [], 'bytes_before': 0, 'bytes_after': 0, 'files_changed': []}
+    for path, path_faces in faces.items():
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            css = f.read()
+
+        replacements = []
+        for face in path_faces:
+            if face['source'] is None:
+                report['missing_sources'].append({'stylesheet': path, 'family': face['family']})
+                continue
+
+            codepoints = text | shared | stylesheets[path]
+            target = subset_path(face['source'], codepoints)
+            # O nome já identifica origem e caracteres: um subset existente é reaproveitado
+            if os.path.exists(target):
+                covered = set(TTFont(target).getBestCmap() or {})
+            else:
+                covered = subset_font(face['source'], codepoints, target)
+
+            report['fonts'].append({
+                'stylesheet': path,
+                'family': face['family'],
+                'source': face['source'],
+                'subset': target,
+                'glyphs': len(covered),
+                'bytes_before': os.path.getsize(face['source']),
+                'bytes_after': os.path.getsize(target),
+            })
+            report['bytes_before'] += os.path.getsize(face['source'])
+            report['bytes_after'] += os.path.getsize(target)
+
+            href = os.path.relpath(target, os.path.dirname(path)).replace(os.sep, '/')
+            replacements.append((face['match'], _subset_face(face['match'].group(1), href, covered)))
+
+        if apply and replacements:
+            for match, rule in reversed(replacements):
+                css = css[:match.start()] + rule + css[match.end():]
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(css)
+            update_file(path)
+            report['files_changed'].append(path)
+
+    if apply:
+        save_inventory()
+
+    return report
+
+def main():
+    """Gera os subsets e mostra a economia (--apply reescreve as regras @font-face)"""
+    print("🔤 SUBSET DE FONTES - PEACOCK COSMÉTICOS\n")
+
+    apply = '--apply' in sys.argv
+    pages = [argument for argument in sys.argv[1:] if argument.endswith('.html')] or None
+    report = subset_site(apply=apply, pages=pages)
+
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    for font in report['fonts']:
+        print(f"   🔤 {font['family']}: {font['glyphs']} glifos, {round(font['bytes_before'] / 1024, 1)} KB → "
+              f"{round(font['bytes_after'] / 1024, 1)} KB")
+    for missing in report['missing_sources']:
+        print(f"   ⚠️ {missing['family']} ({missing['stylesheet']}): nenhum arquivo de fonte local")
+
+    print(f"\n   💾 {round(report['bytes_before'] / 1024, 1)} KB → {round(report['bytes_after'] / 1024, 1)} KB")
+    if apply:
+        print(f"   ✅ {len(report['files_changed'])} folhas reescritas")
+    else:
+        print("   ℹ️ Dry-run; use --apply para apontar as regras @font-face para os subsets")
+    print(f"   📊 Relatório: {REPORT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - REESCRITOR DE HTML EM STREAMING
+Lê o HTML em blocos, separa em tokens (texto, tags, comentários) e aplica
+handlers tag a tag, emitindo a saída aos poucos. A memória usada fica limitada
+ao tamanho do bloco e do maior token individual, não ao tamanho da página
+"""
+
+import os
+import re
+import io
+import html
+
+import pass_engine
+
+CHUNK_SIZE = 64 * 1024
+
+# Conteúdo destas tags é texto bruto: '<' dentro dele não abre tags
+RAW_TEXT_TAGS = {'script', 'style'}
+
+_TAG_NAME = re.compile(r'</?([A-Za-z][^\s/>]*)')
+_ATTRIBUTE = re.compile(r'([^\s"\'>/=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+_WHITESPACE_TO_COMPRESS = re.compile(r'\s{2,}|(?<=>)\s(?=<)')
+
+def read_chunks(source, chunk_size=CHUNK_SIZE):
+    """Lê um arquivo de texto em blocos"""
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+# ---------------------------------------------------------------------------
+# Filtros de texto: operam nos blocos antes da separação em tokens
+# ---------------------------------------------------------------------------
+
+def _compress_run(run, before, after):
+    # Mesmo efeito de \n\s*\n -> \n, >\s+< -> >< e \s{2,} -> ' ' aplicados em sequência
+    if before == '>' and after == '<':
+        return ''
+
+    first = run.find('\n')
+    last = run.rfind('\n')
+    if first != last:
+        run = run[:first] + '\n' + run[last + 1:]
+
+    return ' ' if len(run) >= 2 else run
+
+def _shorten_run(run):
+    # Forma curta equivalente de uma sequência enorme de espaços: só importam o
+    # texto antes da primeira quebra de linha, o depois da última e quantas há
+    first = run.find('\n')
+    if first == -1:
+        return run[:2]
+
+    last = run.rfind('\n')
+    newlines = '\n\n' if last != first else '\n'
+    return run[:first][:2] + newlines + run[last + 1:][-2:]
+
+def compress_whitespace(chunks):
+    """Compacta espaços em branco entre blocos sem montar a página inteira"""
+    context = ''   # último caractere não branco já emitido
+    pending = ''   # espaços no fim do bloco anterior, que dependem do próximo
+
+    for chunk in chunks:
+        text = context + pending + chunk
+        work = text.rstrip()
+        pending = text[len(work):]
+
+        if len(pending) > CHUNK_SIZE:
+            pending = _shorten_run(pending)
+
+        if len(work) > len(context):
+            def compress(match):
+                start = match.start()
+                before = work[start - 1] if start > 0 else ''
+                return _compress_run(match.group(), before, work[match.end()])
+
+            # O primeiro caractere é só contexto e já foi emitido
+            yield _WHITESPACE_TO_COMPRESS.sub(compress, work)[len(context):]
+            context = work[-1]
+
+    if pending:
+        yield _compress_run(pending, context, '')
+
+# ---------------------------------------------------------------------------
+# Tokenizador
+# ---------------------------------------------------------------------------
+
+def _token(kind, raw, tag=None):
+    return {'type': kind, 'raw': raw, 'source': raw, 'tag': tag}
+
+def _markup_token(buffer, start, eof):
+    # Retorna (token, fim) para a marcação que começa em buffer[start] == '<',
+    # ou None se for preciso ler mais
+    if not eof and len(buffer) - start < 4:
+        return None
+
+    if buffer.startswith('<!--', start):
+        end = buffer.find('-->', start + 4)
+        if end == -1:
+            return None if not eof else (_token('text', buffer[start:]), len(buffer))
+        return _token('comment', buffer[start:end + 3]), end + 3
+
+    following = buffer[start + 1:start + 2]
+    if not (following in ('/', '!', '?') or following.isascii() and following.isalpha()):
+        return _token('text', '<'), start + 1
+
+    # Como as expressões regulares dos scripts (<tag[^>]*>), a tag termina no primeiro '>'
+    end = buffer.find('>', start + 1)
+    if end == -1:
+        return None if not eof else (_token('text', buffer[start:]), len(buffer))
+
+    raw = buffer[start:end + 1]
+    name = _TAG_NAME.match(raw)
+    if name is None:
+        return _token('other', raw), end + 1
+
+    kind = 'end' if following == '/' else 'start'
+    return _token(kind, raw, name.group(1).lower()), end + 1
+
+def _raw_text_token(buffer, start, eof, closing):
+    # Conteúdo de <script>/<style> até a tag de fechamento
+    match = closing.search(buffer, start)
+    if match:
+        end = match.start()
+    elif eof:
+        end = len(buffer)
+    else:
+        # Guardar o final do bloco: pode ser o começo da tag de fechamento
+        end = max(start, len(buffer) - len(closing.pattern))
+
+    if end > start:
+        return _token('rawtext', buffer[start:end]), end
+    return None
+
+def tokenize(chunks):
+    """Separa o HTML em tokens, lendo os blocos sob demanda"""
+    chunks = iter(chunks)
+    buffer = ''
+    position = 0
+    eof = False
+    closing = None   # padrão da tag que encerra o texto bruto atual
+
+    while True:
+        result = None
+        if position < len(buffer):
+            if closing is not None and not closing.match(buffer, position):
+                result = _raw_text_token(buffer, position, eof, closing)
+            else:
+                next_markup = buffer.find('<', position)
+                if next_markup == -1:
+                    result = _token('text', buffer[position:]), len(buffer)
+                elif next_markup > position:
+                    result = _token('text', buffer[position:next_markup]), next_markup
+                else:
+                    result = _markup_token(buffer, position, eof)
+
+        if result is None:
+            if eof:
+                return
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buffer = buffer[position:] + chunk
+                position = 0
+            continue
+
+        token, position = result
+
+        if token['type'] == 'start' and token['tag'] in RAW_TEXT_TAGS and not token['raw'].endswith('/>'):
+            closing = re.compile(f'</{token["tag"]}[\\s/>]', re.IGNORECASE)
+        elif token['type'] == 'end' and closing is not None:
+            closing = None
+
+        yield token
+
+def parse_attributes(token):
+    """Atributos de uma tag de abertura: lista de (nome em minúsculas, valor sem entidades)"""
+    attributes = []
+    for match in _ATTRIBUTE.finditer(token['raw'], len(token['tag']) + 1, len(token['raw']) - 1):
+        value = next((group for group in match.groups()[1:] if group is not None), '')
+        attributes.append((match.group(1).lower(), html.unescape(value)))
+    return attributes
+
+def rewrite_attributes(token, function):
+    """Texto de uma tag de abertura com os valores trocados por function(nome, valor),
+    que retorna o novo valor ou None para manter o atributo como está"""
+    raw = token['raw']
+    output = []
+    position = 0
+
+    for match in _ATTRIBUTE.finditer(raw, len(token['tag']) + 1, len(raw) - 1):
+        index = next((i for i, group in enumerate(match.groups()[1:], 2) if group is not None), None)
+        if index is None:
+            continue
+        value = function(match.group(1).lower(), html.unescape(match.group(index)))
+        if value is None:
+            continue
+
+        quote = "'" if index == 3 else '"'
+        value = value.replace('&', '&amp;').replace(quote, '&quot;' if quote == '"' else '&#39;')
+        if index == 4:
+            value = f'"{value}"'
+        output.append(raw[position:match.start(index)])
+        output.append(value)
+        position = match.end(index)
+
+    output.append(raw[position:])
+    return ''.join(output)
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+
+def handler(function, types=('start',), tags=None):
+    """Registra uma função(token, context) para os tipos e tags indicados.
+    A função retorna o novo texto do token, '' para removê-lo ou None para mantê-lo"""
+    return {'function': function, 'types': set(types), 'tags': set(tags) if tags else None}
+
+def drop_element(context, tag, trailing_whitespace=False):
+    """Remove tudo até a tag de fechamento (inclusive), e opcionalmente os espaços seguintes"""
+    context['skip'] = tag
+    context['skip_whitespace'] = trailing_whitespace
+
+def drop_emptied(tag):
+    """Handler que remove um elemento que os handlers anteriores deixaram vazio (só espaços),
+    como um <noscript> cujo <link> saiu. Deve ser o último: segura o elemento até o fechamento"""
+    def hold(token, context):
+        held = context.get('held')
+        if held is None:
+            if token['type'] != 'start' or token['tag'] != tag or token['raw'].endswith('/>'):
+                return None
+            context['held'] = [token['raw']]
+            return ''
+
+        held.append(token['raw'])
+        if token['type'] != 'end' or token['tag'] != tag:
+            return ''
+
+        context['held'] = None
+        if ''.join(held[1:-1]).strip():
+            return ''.join(held)
+        context['skip_whitespace'] = True
+        count(context, f'empty_{tag}')
+        return ''
+
+    return handler(hold, types=('start', 'end', 'text', 'comment', 'other', 'rawtext'))
+
+def count(context, name, amount=1):
+    """Soma uma estatística do reescritor"""
+    context['stats'][name] = context['stats'].get(name, 0) + amount
+
+def rewrite_chunks(chunks, handlers, write, text_filters=()):
+    """Aplica os handlers aos tokens e entrega a saída em blocos para write()"""
+    for text_filter in text_filters:
+        chunks = text_filter(chunks)
+
+    by_type = {}
+    for entry in handlers:
+        for kind in entry['types']:
+            by_type.setdefault(kind, []).append(entry)
+
+    context = {'previous': None, 'stats': {}, 'skip': None, 'skip_whitespace': False}
+    output = []
+    output_size = 0
+
+    for token in tokenize(chunks):
+        if context['skip'] is not None:
+            if token['type'] == 'end' and token['tag'] == context['skip']:
+                context['skip'] = None
+            token['dropped'] = True
+            context['previous'] = token
+            continue
+
+        if context['skip_whitespace']:
+            if token['type'] == 'text':
+                token['raw'] = token['raw'].lstrip()
+                if not token['raw']:
+                    continue
+            context['skip_whitespace'] = False
+
+        for entry in by_type.get(token['type'], ()):
+            if entry['tags'] is not None and token['tag'] not in entry['tags']:
+                continue
+            result = entry['function'](token, context)
+            if result is not None:
+                token['raw'] = result
+            if not token['raw']:
+                token['dropped'] = True
+                break
+
+        context['previous'] = token
+
+        if token['raw']:
+            output.append(token['raw'])
+            output_size += len(token['raw'])
+            if output_size >= CHUNK_SIZE:
+                write(''.join(output))
+                output = []
+                output_size = 0
+
+    # Elemento segurado por drop_emptied que nunca foi fechado
+    if context.get('held'):
+        output.append(''.join(context['held']))
+
+    if output:
+        write(''.join(output))
+
+    return context['stats']
+
+def rewrite_string(content, handlers, text_filters=()):
+    """Reescreve um HTML em memória; retorna (conteúdo, estatísticas)"""
+    output = io.StringIO()
+    stats = rewrite_chunks(read_chunks(io.StringIO(content)), handlers, output.write, text_filters)
+    return output.getvalue(), stats
+
+def rewrite_file(path, handlers, text_filters=(), output_path=None):
+    """Reescreve um arquivo HTML em streaming, sem carregá-lo inteiro"""
+    output_path = output_path or path
+    temp_path = f'{output_path}.{os.getpid()}.tmp'
+
+    with open(path, 'r', encoding='utf-8') as source, \
+         open(temp_path, 'w', encoding='utf-8') as target:
+        stats = rewrite_chunks(read_chunks(source), handlers, target.write, text_filters)
+
+    os.replace(temp_path, output_path)
+    return stats
+
+def rewrite_document(handlers, text_filters=()):
+    """Reescreve o documento do pipeline: em memória numa sessão, em streaming no disco fora dela"""
+    if pass_engine.active_document_path() is None:
+        return rewrite_file(pass_engine.DEFAULT_DOCUMENT, handlers, text_filters)
+
+    content, stats = rewrite_string(pass_engine.load_document(), handlers, text_filters)
+    pass_engine.save_document(content)
+    return stats
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - PLACEHOLDERS DE IMAGENS (LQIP)
+Gera, para cada imagem com loading="lazy", uma prévia minúscula (poucos
+pixels, WebP de baixa qualidade) e a cor média da imagem, e coloca as duas
+no style do <img> como fundo em data URI: o visitante vê a imagem borrada na
+hora em vez do cinza do shimmer. Cada prévia tem um limite estrito de bytes
+(a declaração inteira, não só a imagem) e fica guardada no inventário, na
+entrada da imagem, enquanto ela não muda. Imagens com transparência ficam sem
+prévia: o fundo apareceria através delas
+"""
+
+import os
+import re
+import html
+import base64
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+
+from html_stream import parse_attributes, tokenize
+from asset_graph import resolve_reference
+from asset_inventory import file_metadata, save_inventory, set_file_metadata
+from pass_engine import parse_option
+
+# Versão da prévia: incrementar (ou mudar tamanhos/qualidades) gera tudo de novo
+PLACEHOLDER_VERSION = 1
+
+# Limite de bytes do style acrescentado a cada <img> (--placeholder-budget N)
+PLACEHOLDER_BUDGET = 400
+
+# Tentativas em ordem: (maior lado em px, qualidade WebP); a primeira que cabe no limite vale
+PREVIEW_STEPS = ((16, 40), (12, 30), (8, 20))
+
+MEDIA_ROOT = 'assets/media'
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+_STYLE_ATTRIBUTE = re.compile(r'\sstyle\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE)
+
+def placeholder_budget():
+    """Limite da linha de comando (--placeholder-budget N) ou o padrão"""
+    return int(parse_option('--placeholder-budget', PLACEHOLDER_BUDGET))
+
+# ---------------------------------------------------------------------------
+# Prévias
+# ---------------------------------------------------------------------------
+
+def _placeholder_key(budget):
+    return f'{PLACEHOLDER_VERSION}-{budget}b'
+
+def _stored_placeholder(source, budget):
+    # Prévia guardada na entrada da imagem no inventário, ou None
+    return (file_metadata(source, 'placeholders') or {}).get(_placeholder_key(budget))
+
+def placeholder_style(placeholder):
+    """Declarações CSS de um placeholder: cor média e, se couber no limite, a prévia por cima"""
+    declarations = [f'background-color:{placeholder["color"]}']
+    if placeholder['uri']:
+        declarations += [f'background-image:url({placeholder["uri"]})', 'background-size:cover']
+    # A prévia não pode deslizar com o shimmer do CSS de lazy loading
+    return ';'.join(declarations + ['animation:none'])
+
+def _preview(job):
+    # Processo de trabalho: (origem, limite) -> {'color', 'uri'} ou None
+    from PIL import Image, ImageOps
+
+    source, budget = job
+    try:
+        with Image.open(source) as image:
+            image.draft('RGB', (64, 64))   # JPEG decodificado já reduzido
+            image = ImageOps.exif_transpose(image)
+            if 'A' in image.getbands() or 'transparency' in image.info:
+                image = image.convert('RGBA')
+                if image.getchannel('A').getextrema()[0] < 255:
+                    return job, None
+            image = image.convert('RGB')
+            image.thumbnail((64, 64), Image.Resampling.BOX)
+            red, green, blue = image.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+
+            placeholder = {'color': f'#{red:02x}{green:02x}{blue:02x}', 'uri': None}
+            for size, quality in PREVIEW_STEPS:
+                preview = image.copy()
+                preview.thumbnail((size, size), Image.Resampling.LANCZOS)
+                buffer = BytesIO()
+                preview.save(buffer, 'WEBP', quality=quality, method=6)
+                uri = 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+                if len(placeholder_style(dict(placeholder, uri=uri))) <= budget:
+                    placeholder['uri'] = uri
+                    break
+    except (OSError, ValueError):
+        return job, None
+    return job, placeholder
+
+def generate_placeholders(paths, budget=PLACEHOLDER_BUDGET, workers=None):
+    """Gera as prévias que ainda não estão no inventário. Retorna estatísticas"""
+    stats = {'generated': 0, 'cached': 0, 'skipped': 0}
+    jobs = []
+
+    for source in paths:
+        if _stored_placeholder(source, budget) is not None:
+            stats['cached'] += 1
+        else:
+            jobs.append((source, budget))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_preview, jobs))
+
+        for (source, budget), placeholder in results:
+            # Imagens sem prévia ficam registradas para não serem abertas de novo
+            stats['generated' if placeholder else 'skipped'] += 1
+            placeholders = dict(file_metadata(source, 'placeholders') or {})
+            placeholders[_placeholder_key(budget)] = placeholder or {'color': None, 'uri': None}
+            set_file_metadata(source, 'placeholders', placeholders)
+
+    return stats
+
+def image_placeholder(source, budget=PLACEHOLDER_BUDGET):
+    """Placeholder já gerado de uma imagem ({'color', 'uri'}), ou None"""
+    if not os.path.isfile(source):
+        return None
+    placeholder = _stored_placeholder(source, budget)
+    return placeholder if placeholder and placeholder['color'] else None
+
+# ---------------------------------------------------------------------------
+# HTML
+# ---------------------------------------------------------------------------
+
+def _lazy_source(attributes, base_directory):
+    # Imagem de assets/media de um <img loading="lazy">, ou None
+    if attributes.get('loading', '').lower() != 'lazy':
+        return None
+    path = resolve_reference(attributes.get('src', ''), base_directory)
+    if path and path.startswith(MEDIA_ROOT + '/') and path.lower().endswith(SOURCE_EXTENSIONS) \
+            and os.path.isfile(path):
+        return path
+    return None
+
+def lazy_images(content, base_directory=''):
+    """Imagens de assets/media usadas por <img loading="lazy"> do documento"""
+    images = set()
+    for token in tokenize([content]):
+        if token['type'] == 'start' and token['tag'] == 'img':
+            path = _lazy_source(dict(parse_attributes(token)), base_directory)
+            if path:
+                images.add(path)
+    return sorted(images)
+
+def _with_style(raw, style):
+    # Tag com o style trocado (o atributo antigo sai, o novo vai antes do fechamento)
+    end = -2 if raw.endswith('/>') else -1
+    body = _STYLE_ATTRIBUTE.sub('', raw[:end], count=1)
+    stripped = body.rstrip()
+    return f'{stripped} style="{html.escape(style)}"{body[len(stripped):]}{raw[end:]}'
+
+def placeholder_document(content, base_directory='', budget=PLACEHOLDER_BUDGET):
+    """Coloca os placeholders no style dos <img loading="lazy">. Retorna (conteúdo, estatísticas)"""
+    stats = {'images': 0, 'previews': 0, 'bytes': 0}
+    output = []
+
+    for token in tokenize([content]):
+        raw = token['raw']
+        if token['type'] == 'start' and token['tag'] == 'img':
+            attributes = dict(parse_attributes(token))
+            path = _lazy_source(attributes, base_directory)
+            placeholder = image_placeholder(path, budget) if path else None
+            style = attributes.get('style', '').strip().rstrip(';')
+            if placeholder and 'background' not in style:
+                addition = placeholder_style(placeholder)
+                raw = _with_style(raw, f'{style};{addition}' if style else addition)
+                stats['images'] += 1
+                stats['previews'] += bool(placeholder['uri'])
+                stats['bytes'] += len(addition)
+        output.append(raw)
+
+    return ''.join(output), stats
+
+def main():
+    """Gera as prévias das imagens lazy do index.html (--placeholder-budget N --workers N)"""
+    print("🌫️ PLACEHOLDERS DE IMAGENS - PEACOCK COSMÉTICOS\n")
+
+    budget = placeholder_budget()
+    workers = int(parse_option('--workers')) if parse_option('--workers') else None
+    with open('index.html', 'r', encoding='utf-8') as f:
+        paths = lazy_images(f.read())
+
+    stats = generate_placeholders(paths, budget, workers)
+    save_inventory()
+
+    print(f"   ✅ {stats['generated']} prévias geradas para {len(paths)} imagens (limite de {budget} bytes)")
+    if stats['cached']:
+        print(f"   ♻️ {stats['cached']} prévias já geradas reaproveitadas")
+    if stats['skipped']:
+        print(f"   ℹ️ {stats['skipped']} imagens sem prévia (transparência ou formato ilegível)")
+
+if __name__ == "__main__":
+    main()
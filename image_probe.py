@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - DIMENSÕES DE IMAGENS
+Lê largura e altura só dos cabeçalhos, sem decodificar pixels: marcadores
+SOF do JPEG (com a orientação EXIF), IHDR do PNG, descritor de tela do GIF,
+chunks VP8/VP8L/VP8X do WebP, propriedade ispe do AVIF e width/height/viewBox
+do SVG. O resultado fica
+no inventário de arquivos junto do tamanho e do hash e vale enquanto o
+arquivo não muda: as funções de mídia consultam o índice em vez de abrir as
+imagens
+"""
+
+import os
+import re
+import sys
+import time
+import struct
+
+from asset_inventory import file_hash, find_files, load_inventory, save_inventory
+
+# Bytes lidos do início de um SVG para achar a tag <svg> (e de um AVIF para achar o ispe)
+SVG_HEAD_BYTES = 4096
+AVIF_HEAD_BYTES = 4096
+
+# Marcadores SOF do JPEG (C4, C8 e CC são DHT, JPG e DAC)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_SVG_TAG = re.compile(rb'<svg\b[^>]*>', re.IGNORECASE | re.DOTALL)
+_SVG_ATTRIBUTE = re.compile(rb'\s([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_SVG_LENGTH = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(px)?\s*$')
+
+# ---------------------------------------------------------------------------
+# Formatos
+# ---------------------------------------------------------------------------
+
+def _exif_orientation(segment):
+    # Tag 0x0112 do IFD0 de um segmento APP1 "Exif\0\0" (1 se ausente)
+    if not segment.startswith(b'Exif\x00\x00') or len(segment) < 14:
+        return 1
+    tiff = segment[6:]
+    order = '<' if tiff[:2] == b'II' else '>'
+    offset = struct.unpack(order + 'I', tiff[4:8])[0]
+    if offset + 2 > len(tiff):
+        return 1
+    count = struct.unpack(order + 'H', tiff[offset:offset + 2])[0]
+    for index in range(count):
+        start = offset + 2 + index * 12
+        if start + 12 > len(tiff):
+            break
+        tag, kind = struct.unpack(order + 'HH', tiff[start:start + 4])
+        if tag == 0x0112 and kind == 3:
+            return struct.unpack(order + 'H', tiff[start + 8:start + 10])[0]
+    return 1
+
+def probe_jpeg(f):
+    """(largura, altura) exibidas de um JPEG: percorre os segmentos até o SOF"""
+    f.seek(2)
+    orientation = 1
+    while True:
+        marker = f.read(2)
+        while len(marker) == 2 and marker[0] == 0xFF and marker[1] == 0xFF:
+            marker = marker[1:] + f.read(1)   # bytes de preenchimento
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue   # marcadores sem tamanho
+        if code in (0xD9, 0xDA):
+            return None   # fim da imagem ou início dos dados sem SOF
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        size = struct.unpack('>H', length)[0] - 2
+        if code in _SOF_MARKERS:
+            header = f.read(5)
+            if len(header) < 5:
+                return None
+            height, width = struct.unpack('>HH', header[1:5])
+            return (height, width) if orientation in (5, 6, 7, 8) else (width, height)
+        if code == 0xE1 and orientation == 1:
+            orientation = _exif_orientation(f.read(size))
+        else:
+            f.seek(size, os.SEEK_CUR)
+
+def probe_png(header):
+    """(largura, altura) do chunk IHDR"""
+    if header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+def probe_gif(header):
+    """(largura, altura) do descritor lógico de tela"""
+    return struct.unpack('<HH', header[6:10])
+
+def probe_webp(header):
+    """(largura, altura) de um WebP com perda (VP8), sem perda (VP8L) ou estendido (VP8X)"""
+    chunk = header[12:16]
+    if chunk == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and header[20] == 0x2F:
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return int.from_bytes(header[24:27], 'little') + 1, int.from_bytes(header[27:30], 'little') + 1
+    return None
+
+def probe_avif(head):
+    """(largura, altura) da propriedade ispe (caixa meta/iprp/ipco) e, se houver, da
+    rotação irot"""
+    index = head.find(b'ispe')
+    if index < 0 or index + 16 > len(head):
+        return None
+    width, height = struct.unpack('>II', head[index + 8:index + 16])
+    rotation = head.find(b'irot')
+    if 0 <= rotation and rotation + 5 <= len(head) and head[rotation + 4] & 0x1:
+        return height, width   # 90 ou 270 graus
+    return width, height
+
+def probe_svg(head):
+    """(largura, altura) de width/height em px ou, sem eles, do viewBox"""
+    tag = _SVG_TAG.search(head)
+    if not tag:
+        return None
+    attributes = {}
+    for match in _SVG_ATTRIBUTE.finditer(tag.group()):
+        value = match.group(2) if match.group(2) is not None else match.group(3)
+        attributes[match.group(1).decode('ascii', 'replace').lower()] = value.decode('utf-8', 'replace')
+
+    width = _SVG_LENGTH.match(attributes.get('width', ''))
+    height = _SVG_LENGTH.match(attributes.get('height', ''))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+
+    box = attributes.get('viewbox', '').replace(',', ' ').split()
+    if len(box) == 4:
+        try:
+            box_width, box_height = float(box[2]), float(box[3])
+        except ValueError:
+            return None
+        # Só um dos lados em px: o outro segue a proporção do viewBox
+        if width and box_width:
+            return round(float(width.group(1))), round(float(width.group(1)) * box_height / box_width)
+        if height and box_height:
+            return round(float(height.group(1)) * box_width / box_height), round(float(height.group(1)))
+        return round(box_width), round(box_height)
+    return None
+
+def probe_image(path):
+    """{'width', 'height', 'format'} lidos do cabeçalho, ou None se o arquivo não for
+    uma imagem reconhecida"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(32)
+            if header.startswith(b'\xff\xd8'):
+                size, kind = probe_jpeg(f), 'jpeg'
+            elif header.startswith(b'\x89PNG\r\n\x1a\n'):
+                size, kind = probe_png(header), 'png'
+            elif header[:6] in (b'GIF87a', b'GIF89a'):
+                size, kind = probe_gif(header), 'gif'
+            elif header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+                size, kind = probe_webp(header), 'webp'
+            elif header[4:8] == b'ftyp' and header[8:12] in (b'avif', b'avis'):
+                f.seek(0)
+                size, kind = probe_avif(f.read(AVIF_HEAD_BYTES)), 'avif'
+            elif path.lower().endswith('.svg'):
+                f.seek(0)
+                size, kind = probe_svg(f.read(SVG_HEAD_BYTES)), 'svg'
+            else:
+                return None
+    except (OSError, struct.error, IndexError):
+        return None
+    if not size or not size[0] or not size[1]:
+        return None
+    return {'width': size[0], 'height': size[1], 'format': kind}
+
+# ---------------------------------------------------------------------------
+# Índice
+# ---------------------------------------------------------------------------
+
+def image_metadata(path):
+    """Dimensões, formato, tamanho e hash de uma imagem pelo inventário: o cabeçalho
+    só é lido de novo quando o arquivo muda. None se não for uma imagem legível"""
+    path = os.path.normpath(path)
+    if not os.path.isfile(path):
+        return None
+    digest = file_hash(path)   # também revalida a entrada do inventário
+    entry = load_inventory()['files'].get(path)
+
+    if entry is None:
+        image = probe_image(path)
+        return dict(image, size=os.path.getsize(path), hash=digest) if image else None
+
+    if 'image' not in entry:
+        entry['image'] = probe_image(path)
+    if entry['image'] is None:
+        return None
+    return dict(entry['image'], size=entry['size'], hash=digest)
+
+def image_dimensions(path):
+    """(largura, altura) exibidas de uma imagem, ou None"""
+    metadata = image_metadata(path)
+    return (metadata['width'], metadata['height']) if metadata else None
+
+def main():
+    """Indexa as dimensões de todas as imagens do inventário e mostra o tempo gasto"""
+    print("📏 DIMENSÕES DE IMAGENS - PEACOCK COSMÉTICOS\n")
+
+    under = next((argument for argument in sys.argv[1:] if not argument.startswith('--')), None)
+    entries = find_files(types=('image',), under=under)
+
+    start = time.perf_counter()
+    probed = 0
+    unreadable = []
+    for entry in entries:
+        if 'image' not in entry:
+            probed += 1
+        if image_metadata(entry['path']) is None:
+            unreadable.append(entry['path'])
+    elapsed = time.perf_counter() - start
+    save_inventory()
+
+    print(f"   ✅ {len(entries)} imagens indexadas ({probed} cabeçalhos lidos, "
+          f"{len(entries) - probed} do índice) em {elapsed * 1000:.1f} ms")
+    for path in unreadable[:10]:
+        print(f"   ⚠️ Cabeçalho não reconhecido: {path}")
+    if len(unreadable) > 10:
+        print(f"   ... e mais {len(unreadable) - 10} arquivos")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - TRANSCODIFICAÇÃO DE IMAGENS
+Gera variantes WebP (e AVIF, quando o Pillow tem suporte) das imagens raster
+de assets/media usadas pelas páginas, em paralelo e com qualidade alvo por
+formato. Cada variante tem o hash da origem no nome: o HTML acha as
+variantes no disco, e o cache só evita codificar de novo as que já existem.
+Variantes que não ficaram menores que a origem são apagadas e anotadas no
+inventário. No HTML, o <img> ganha um <picture> com um <source> por formato,
+e só com as variantes que de fato ficaram menores que o original
+"""
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from html_stream import parse_attributes, tokenize
+from asset_graph import build_graph, mark, resolve_reference
+from asset_inventory import file_metadata, save_inventory, set_file_metadata, update_file
+from build_cache import cache_key, file_hash, lookup, save_cache, store
+from site_pipeline import discover_pages
+
+# Versão da codificação: incrementar (ou mudar a qualidade) gera as variantes de novo
+TRANSCODE_VERSION = 1
+
+# Só imagens deste diretório são transcodificadas
+MEDIA_ROOT = 'assets/media'
+
+# Formatos de origem (GIF fica de fora: pode ser animado)
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Qualidade alvo de cada formato, na ordem de preferência do <picture>
+TARGET_QUALITY = {'avif': 50, 'webp': 80}
+
+# Opções do Pillow por formato: esforço de compressão, não qualidade
+ENCODER_OPTIONS = {'avif': {'speed': 6}, 'webp': {'method': 6}}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+_VARIANT_SUFFIX = re.compile(r'\.[0-9a-f]{8}$')
+
+def available_formats():
+    """Formatos que o Pillow instalado consegue gravar, na ordem de preferência
+    (vazio sem o Pillow: as páginas continuam com as variantes já existentes)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return []
+    extensions = Image.registered_extensions()
+    return [name for name in TARGET_QUALITY if f'.{name}' in extensions and extensions[f'.{name}'] in Image.SAVE]
+
+# ---------------------------------------------------------------------------
+# Codificação
+# ---------------------------------------------------------------------------
+
+def variant_path(source, digest, name):
+    """Caminho da variante: mesmo diretório, hash da origem no nome"""
+    stem = _VARIANT_SUFFIX.sub('', os.path.splitext(source)[0])
+    return f'{stem}.{digest[:8]}.{name}'
+
+def _variant_config(name):
+    return f'{TRANSCODE_VERSION}-{name}{TARGET_QUALITY[name]}'
+
+def _variant_key(digest, name):
+    return cache_key('image_transcode', _variant_config(name), digest)
+
+def _encode(job):
+    # Processo de trabalho: (origem, formato, destino) -> bytes gravados ou None
+    from PIL import Image, ImageOps
+
+    source, name, target = job
+    # Gravada com outro nome e renomeada: uma variante no disco está sempre completa
+    temp_path = f'{target}.{os.getpid()}.tmp'
+    try:
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                transparent = 'A' in image.getbands() or 'transparency' in image.info
+                image = image.convert('RGBA' if transparent else 'RGB')
+            image.save(temp_path, name.upper(), quality=TARGET_QUALITY[name], **ENCODER_OPTIONS[name])
+        os.replace(temp_path, target)
+    except (OSError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return job, None
+    return job, os.path.getsize(target)
+
+def transcode_images(paths, workers=None):
+    """Codifica as variantes que ainda não existem (ou não estão no cache). Variantes
+    que não ficam menores que a origem são apagadas e anotadas no inventário, para não
+    serem codificadas de novo. Retorna estatísticas (bytes de cada imagem contra a
+    menor variante dela)"""
+    stats = {'encoded': 0, 'cached': 0, 'smaller': 0, 'bytes_before': 0, 'bytes_after': 0}
+    formats = available_formats()
+    jobs = []
+
+    for source in paths:
+        digest = file_hash(source)
+        useless = file_metadata(source, 'useless_variants') or []
+        for name in formats:
+            target = variant_path(source, digest, name)
+            if _variant_config(name) in useless or \
+                    lookup(_variant_key(digest, name)) is not None and os.path.isfile(target):
+                stats['cached'] += 1
+            else:
+                jobs.append((source, name, target))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_encode, jobs))
+
+        smallest = {}   # origem -> bytes da menor variante útil
+        for (source, name, target), size in results:
+            stats['encoded'] += 1
+            original = os.path.getsize(source)
+            if size is not None and size < original:
+                update_file(target)
+                stats['smaller'] += 1
+                smallest[source] = min(size, smallest.get(source, original))
+                store(_variant_key(file_hash(source), name), {'path': target, 'bytes': size})
+            else:
+                if size is not None:
+                    os.remove(target)
+                    update_file(target)
+                useless = file_metadata(source, 'useless_variants') or []
+                set_file_metadata(source, 'useless_variants', sorted(set(useless) | {_variant_config(name)}))
+
+        for source, size in smallest.items():
+            stats['bytes_before'] += os.path.getsize(source)
+            stats['bytes_after'] += size
+
+    return stats
+
+def image_variants(source):
+    """Variantes menores que a origem já codificadas: [(formato, caminho)], na ordem de
+    preferência. Vêm do disco (as maiores foram apagadas), não do cache nem do Pillow
+    instalado. Vazio para imagens não transcodificadas"""
+    if not os.path.isfile(source):
+        return []
+    digest = file_hash(source)
+    variants = []
+    for name in TARGET_QUALITY:
+        path = variant_path(source, digest, name)
+        if os.path.isfile(path):
+            variants.append((name, path))
+    return variants
+
+def referenced_images(pages=None):
+    """Imagens raster de assets/media alcançáveis a partir das páginas"""
+    pages = pages if pages is not None else discover_pages()
+    graph = build_graph(pages)
+    reachable = mark({'entries': pages, 'edges': graph['edges']})
+    return sorted(path for path in reachable
+                  if path.startswith(MEDIA_ROOT + '/') and path.lower().endswith(SOURCE_EXTENSIONS)
+                  and os.path.isfile(path))
+
+# ---------------------------------------------------------------------------
+# <picture>
+# ---------------------------------------------------------------------------
+
+def _variant_url(url, path):
+    # A variante fica ao lado da origem: troca só o nome do arquivo na URL
+    base = url.split('?')[0].split('#')[0]
+    return base[:base.rfind('/') + 1] + os.path.basename(path)
+
+def _source_tags(attributes, base_directory):
+    # <source> por formato, se todas as URLs (src e srcset) tiverem a variante
+    candidates = [attributes['src']]
+    if attributes.get('srcset'):
+        candidates = [candidate.strip() for candidate in attributes['srcset'].split(',') if candidate.strip()]
+
+    by_format = {}
+    for candidate in candidates:
+        url = candidate.split()[0]
+        path = resolve_reference(url, base_directory)
+        variants = dict(image_variants(path)) if path else {}
+        for name in TARGET_QUALITY:
+            if name in variants:
+                descriptor = candidate[len(url):]
+                by_format.setdefault(name, []).append(_variant_url(url, variants[name]) + descriptor)
+
+    tags = []
+    for name in TARGET_QUALITY:
+        if len(by_format.get(name, [])) == len(candidates):
+            sizes = f' sizes="{attributes["sizes"]}"' if attributes.get('sizes') else ''
+            tags.append(f'<source type="{MIME_TYPES[name]}" srcset="{", ".join(by_format[name])}"{sizes}>')
+    return tags
+
+def picture_document(content, base_directory=''):
+    """Envolve em <picture> os <img> com variantes menores. Retorna (conteúdo, estatísticas)"""
+    stats = {'pictures': 0, 'sources': 0}
+    output = []
+    pictures = 0   # <picture> abertos: <img> já dentro de um não é envolvido de novo
+
+    for token in tokenize([content]):
+        raw = token['raw']
+        if token['type'] == 'start' and token['tag'] == 'picture':
+            pictures += 1
+        elif token['type'] == 'end' and token['tag'] == 'picture':
+            pictures = max(0, pictures - 1)
+        elif token['type'] == 'start' and token['tag'] == 'img' and not pictures:
+            attributes = dict(parse_attributes(token))
+            if attributes.get('src') and not attributes['src'].startswith('data:'):
+                sources = _source_tags(attributes, base_directory)
+                if sources:
+                    raw = f'<picture>{"".join(sources)}{raw}</picture>'
+                    stats['pictures'] += 1
+                    stats['sources'] += len(sources)
+        output.append(raw)
+
+    return ''.join(output), stats
+
+def main():
+    """Codifica as variantes das imagens usadas pelas páginas (--workers N)"""
+    print("🖼️ TRANSCODIFICAÇÃO DE IMAGENS - PEACOCK COSMÉTICOS\n")
+
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else None
+    formats = available_formats()
+    paths = referenced_images()
+
+    start = time.perf_counter()
+    stats = transcode_images(paths, workers)
+    elapsed = time.perf_counter() - start
+    save_inventory()
+    save_cache()
+
+    print(f"   🧰 Formatos: {', '.join(formats)} ({len(paths)} imagens)")
+    print(f"   ✅ {stats['encoded']} variantes codificadas, {stats['smaller']} menores que a origem "
+          f"({round(stats['bytes_before'] / 1024, 1)} KB → {round(stats['bytes_after'] / 1024, 1)} KB)")
+    if stats['cached']:
+        print(f"   ♻️ {stats['cached']} variantes reaproveitadas do cache")
+    print(f"   ⏱️ {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
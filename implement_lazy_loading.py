@@ -7,12 +7,13 @@ Configura carregamento tardio para imagens e vídeos fora da tela (economia de 3
 import re
 import os
 
+from pass_engine import load_document, save_document
+
 def implement_image_lazy_loading():
     """Implementa lazy loading para imagens fora da tela"""
     print("🖼️ Implementando lazy loading para imagens...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Imagens críticas que devem carregar imediatamente (above-the-fold)
     critical_images = [
@@ -45,8 +46,7 @@ def implement_image_lazy_loading():
     # Aplicar lazy loading
     content = re.sub(img_pattern, replace_img, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     # Contar imagens com lazy loading
     lazy_images = len(re.findall(r'loading="lazy"', content))
@@ -56,8 +56,7 @@ def implement_video_lazy_loading():
     """Implementa lazy loading para vídeos"""
     print("🎥 Implementando lazy loading para vídeos...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Padrão para encontrar tags video
     video_pattern = r'<video([^>]*?)>'
@@ -82,8 +81,7 @@ def implement_video_lazy_loading():
     # Aplicar otimizações de vídeo
     content = re.sub(video_pattern, optimize_video, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     # Contar vídeos otimizados
     lazy_videos = len(re.findall(r'loading="lazy".*?<video', content))
@@ -169,14 +167,12 @@ def add_intersection_observer():
 </script>
 """
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Adicionar script antes do fechamento do body
     content = re.sub(r'</body>', intersection_script + '</body>', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Intersection Observer adicionado")
 
@@ -231,14 +227,12 @@ video[loading="lazy"] {
 </style>
 """
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Adicionar CSS antes do fechamento do head
     content = re.sub(r'</head>', lazy_css + '</head>', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ CSS para lazy loading adicionado")
 
@@ -246,8 +240,7 @@ def optimize_background_images():
     """Otimiza imagens de background para lazy loading"""
     print("🖼️ Otimizando imagens de background...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Encontrar elementos com background-image inline
     bg_pattern = r'style="([^"]*background-image:\s*url\([\'"]?([^\'")]+)[\'"]?\)[^"]*)"'
@@ -256,6 +249,10 @@ def optimize_background_images():
         full_style = match.group(1)
         bg_url = match.group(2)
         
+        # data: URI (placeholder LQIP) já está no HTML: adiar não economiza nada
+        if bg_url.startswith('data:'):
+            return match.group(0)
+        
         # Remover background-image do style e adicionar data-bg
         new_style = re.sub(r'background-image:\s*url\([\'"]?[^\'")]+[\'"]?\);?', '', full_style)
         new_style = new_style.strip().rstrip(';')
@@ -268,8 +265,7 @@ def optimize_background_images():
     # Aplicar otimização
     content = re.sub(bg_pattern, optimize_bg, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     # Contar backgrounds otimizados
     bg_count = len(re.findall(r'data-bg=', content))
@@ -279,8 +275,7 @@ def create_lazy_loading_report():
     """Cria relatório das otimizações de lazy loading"""
     print("📊 Gerando relatório de lazy loading...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Contar elementos otimizados
     lazy_images = len(re.findall(r'loading="lazy".*?<img', content))
@@ -319,8 +314,7 @@ def main():
     
     # Backup do arquivo original
     if not os.path.exists('index_lazy_backup.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = load_document()
         with open('index_lazy_backup.html', 'w', encoding='utf-8') as f:
             f.write(content)
         print("📋 Backup criado: index_lazy_backup.html")
@@ -8,12 +8,13 @@ import re
 import json
 import os
 
+from pass_engine import load_document, save_document, write_shared_file
+
 def fix_heading_structure():
     """Corrige a estrutura hierárquica dos cabeçalhos"""
     print("📝 Corrigindo estrutura de cabeçalhos...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Encontrar todos os cabeçalhos
     heading_pattern = r'<h([1-6])([^>]*)>(.*?)</h[1-6]>'
@@ -42,8 +43,7 @@ def fix_heading_structure():
     for pattern, replacement in corrections:
         content = re.sub(pattern, replacement, content, flags=re.DOTALL)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Estrutura de cabeçalhos corrigida")
 
@@ -118,20 +118,16 @@ a:focus {
 }
 """
     
-    # Criar arquivo CSS de acessibilidade
-    os.makedirs('wp-content/uploads', exist_ok=True)
-    with open('wp-content/uploads/accessibility-contrast.css', 'w', encoding='utf-8') as f:
-        f.write(contrast_css)
+    # Criar arquivo CSS de acessibilidade (compartilhado por todas as páginas)
+    write_shared_file('wp-content/uploads/accessibility-contrast.css', contrast_css)
     
     # Adicionar link no HTML
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     css_link = '<link rel="stylesheet" href="./wp-content/uploads/accessibility-contrast.css">\n'
     content = re.sub(r'(</head>)', css_link + r'\1', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ CSS de contraste criado e aplicado")
 
@@ -139,8 +135,7 @@ def add_alt_text_to_images():
     """Adiciona texto alternativo às imagens"""
     print("🖼️ Adicionando texto alternativo às imagens...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Padrão para imagens sem alt text
     img_pattern = r'<img([^>]*?)src="([^"]*)"([^>]*?)(?:alt="[^"]*")?([^>]*?)>'
@@ -180,8 +175,7 @@ def add_alt_text_to_images():
     # Aplicar alt text
     content = re.sub(img_pattern, add_alt_text, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     # Contar imagens com alt
     alt_count = len(re.findall(r'alt="[^"]*"', content))
@@ -191,8 +185,7 @@ def add_video_captions():
     """Adiciona suporte a legendas para vídeos"""
     print("🎥 Adicionando suporte a legendas...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Padrão para vídeos
     video_pattern = r'<video([^>]*?)>(.*?)</video>'
@@ -213,8 +206,7 @@ def add_video_captions():
     # Aplicar suporte a legendas
     content = re.sub(video_pattern, add_caption_support, content, flags=re.DOTALL)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Suporte a legendas adicionado aos vídeos")
 
@@ -301,14 +293,12 @@ def improve_keyboard_navigation():
 </script>
 """
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Adicionar script antes do fechamento do body
     content = re.sub(r'</body>', keyboard_script + '</body>', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Navegação por teclado melhorada")
 
@@ -316,8 +306,7 @@ def add_aria_labels():
     """Adiciona labels ARIA para melhor acessibilidade"""
     print("🏷️ Adicionando labels ARIA...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Adicionar ARIA labels para elementos interativos
     aria_improvements = [
@@ -341,8 +330,7 @@ def add_aria_labels():
         content
     )
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Labels ARIA adicionados")
 
@@ -350,8 +338,7 @@ def add_accessibility_meta():
     """Adiciona meta tags de acessibilidade"""
     print("📋 Adicionando meta tags de acessibilidade...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Meta tags de acessibilidade
     accessibility_meta = '''
@@ -368,8 +355,7 @@ def add_accessibility_meta():
         content
     )
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Meta tags de acessibilidade adicionadas")
 
@@ -377,8 +363,7 @@ def create_accessibility_report():
     """Cria relatório das melhorias de acessibilidade"""
     print("📊 Gerando relatório de acessibilidade...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Analisar melhorias aplicadas
     headings_count = len(re.findall(r'<h[1-6]', content))
@@ -423,8 +408,7 @@ def main():
     
     # Backup do arquivo original
     if not os.path.exists('index_accessibility_backup.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = load_document()
         with open('index_accessibility_backup.html', 'w', encoding='utf-8') as f:
             f.write(content)
         print("📋 Backup criado: index_accessibility_backup.html")
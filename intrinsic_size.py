@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - DIMENSÕES INTRÍNSECAS
+Preenche width/height de todo <img> (e dos <source> de <picture> com outra
+proporção) com as medidas do índice de mídia, inclusive quando o src é um
+placeholder e a imagem real só está no srcset. Containers vazios com
+background-image (cover/contain no CSS, style inline ou data-bg) e sem altura
+declarada ganham aspect-ratio.
+O navegador reserva o espaço antes de baixar a imagem e o lazy loading
+deixa de deslocar o layout (CLS)
+"""
+
+import os
+import re
+import html
+
+from html_stream import parse_attributes, rewrite_attributes, tokenize
+from css_dedup import page_stylesheets, sheet_tree
+from asset_graph import resolve_reference
+from image_probe import image_dimensions
+
+# Diferença de proporção abaixo da qual um <source> não precisa de width/height próprios
+RATIO_TOLERANCE = 0.01
+
+# Tamanhos de fundo em que a proporção da imagem define a área pintada
+COVER_SIZES = ('cover', 'contain')
+
+# <style> gerado com os aspect-ratio dos containers (substituído a cada execução)
+ASPECT_RATIO_STYLE_ID = 'intrinsic-aspect-ratio'
+
+# Elementos que dão altura ao container (texto também conta)
+CONTENT_TAGS = {'img', 'picture', 'video', 'iframe', 'svg', 'canvas', 'object', 'embed',
+                'input', 'textarea', 'select', 'button'}
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+_BACKGROUND_URL = re.compile(r'background(?:-image)?\s*:[^;]*?url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)', re.IGNORECASE)
+_ELEMENT_ID = re.compile(r'\belementor-element-([0-9a-f]+)\b')
+_SELECTOR_ELEMENT = re.compile(r'\.elementor-element-([0-9a-f]+)(?::not\([^)]*\))?$')
+_HEIGHT_PROPERTY = re.compile(r'(?:^|;)\s*(?:min-)?height\s*:', re.IGNORECASE)
+_STYLE_ATTRIBUTE = re.compile(r'\sstyle\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE)
+_ASPECT_RATIO_STYLE = re.compile(r'\s*<style id="' + ASPECT_RATIO_STYLE_ID + r'">.*?</style>', re.DOTALL)
+
+# ---------------------------------------------------------------------------
+# Medidas
+# ---------------------------------------------------------------------------
+
+def _candidates(attributes):
+    # URLs que podem ser medidas, na ordem de preferência: src, data-src e depois
+    # o srcset do maior para o menor (src costuma ser placeholder no lazy loading)
+    urls = [attributes.get('src', ''), attributes.get('data-src', '')]
+    listed = []
+    for name in ('srcset', 'data-srcset'):
+        for candidate in attributes.get(name, '').split(','):
+            parts = candidate.split()
+            if parts:
+                width = parts[1][:-1] if len(parts) > 1 and parts[1].endswith('w') else ''
+                listed.append((int(width) if width.isdigit() else 0, parts[0]))
+    urls += [url for width, url in sorted(listed, key=lambda item: -item[0])]
+    return [url for url in urls if url and not url.startswith('data:')]
+
+def measured_size(attributes, base_directory=''):
+    """(largura, altura) da primeira imagem medível de um <img> ou <source>, ou None"""
+    for url in _candidates(attributes):
+        path = resolve_reference(url, base_directory)
+        dimensions = image_dimensions(path) if path else None
+        if dimensions:
+            return dimensions
+    return None
+
+def _ratio(width, height):
+    return width / height if height else 0
+
+def _insert_attributes(raw, values):
+    # Acrescenta atributos antes do fechamento da tag ('>' ou '/>'), mantendo o espaço antes dele
+    end = -2 if raw.endswith('/>') else -1
+    body = raw[:end].rstrip()
+    extra = ''.join(f' {name}="{value}"' for name, value in values)
+    return body + extra + raw[len(body):]
+
+def _append_style(raw, style, declaration):
+    # Tag com a declaração no fim do style (o atributo antigo sai, o novo vai para o fim)
+    value = f'{style.strip().rstrip(";")}; {declaration}' if style.strip() else declaration
+    return _insert_attributes(_STYLE_ATTRIBUTE.sub('', raw, count=1), [('style', html.escape(value))])
+
+def _declared(attributes, name):
+    value = attributes.get(name, '').strip()
+    return int(value) if value.isdigit() and int(value) else None
+
+# ---------------------------------------------------------------------------
+# <img> e <picture>
+# ---------------------------------------------------------------------------
+
+def _sized_img(token, base_directory, stats):
+    # <img> com width/height completados (e contain-intrinsic-size no sizes="auto").
+    # Retorna (texto, (largura, altura) finais ou None)
+    attributes = dict(parse_attributes(token))
+    width, height = _declared(attributes, 'width'), _declared(attributes, 'height')
+    if (attributes.get('width', '').strip() and not width) or (attributes.get('height', '').strip() and not height):
+        return token['raw'], None   # width="100%" e afins: decisão do autor
+
+    measured = measured_size(attributes, base_directory)
+    if measured is None:
+        if not (width and height):
+            stats['unmeasured'] += 1
+        return token['raw'], (width, height) if width and height else None
+    if width and height and abs(_ratio(width, height) / _ratio(*measured) - 1) <= RATIO_TOLERANCE:
+        return token['raw'], (width, height)
+
+    # A largura declarada vale; a altura segue a proporção medida (uma proporção
+    # declarada errada também desloca o layout quando a imagem chega)
+    if width:
+        stats['corrected' if height else 'images'] += 1
+        height = round(width * measured[1] / measured[0])
+    elif height:
+        stats['images'] += 1
+        width = round(height * measured[0] / measured[1])
+    else:
+        stats['images'] += 1
+        width, height = measured
+
+    values = {'width': str(width), 'height': str(height)}
+    raw = rewrite_attributes(token, lambda name, value: values.pop(name) if name in values else None)
+    raw = _insert_attributes(raw, values.items())
+    style = attributes.get('style', '')
+    if attributes.get('sizes', '').strip().lower().startswith('auto') and 'contain-intrinsic-size' not in style:
+        # Substitui o palpite 3000px 1500px do CSS do WordPress para sizes="auto"
+        raw = _append_style(raw, style, f'contain-intrinsic-size: {width}px {height}px')
+
+    return raw, (width, height)
+
+def _sized_sources(tokens, size, base_directory, stats):
+    # <source> de direção de arte (proporção diferente do <img>) ganham width/height
+    output = []
+    for token in tokens:
+        raw = token['raw']
+        if token['type'] == 'start' and token['tag'] == 'source':
+            attributes = dict(parse_attributes(token))
+            measured = None
+            if not _declared(attributes, 'width') and not _declared(attributes, 'height'):
+                measured = measured_size(attributes, base_directory)
+            if measured and size and abs(_ratio(*measured) / _ratio(*size) - 1) > RATIO_TOLERANCE:
+                raw = _insert_attributes(raw, [('width', measured[0]), ('height', measured[1])])
+                stats['sources'] += 1
+        output.append(raw)
+    return output
+
+def size_images(content, base_directory=''):
+    """Completa width/height dos <img> e dos <source> de <picture>. Retorna
+    (conteúdo, estatísticas)"""
+    stats = {'images': 0, 'corrected': 0, 'sources': 0, 'unmeasured': 0}
+    output = []
+    picture = None   # tokens do <picture> aberto: os <source> vêm antes do <img>
+    picture_size = None
+
+    for token in tokenize([content]):
+        if token['type'] == 'start' and token['tag'] == 'img':
+            raw, size = _sized_img(token, base_directory, stats)
+            token = dict(token, raw=raw)
+            if picture is not None:
+                picture_size = size
+        if token['type'] == 'start' and token['tag'] == 'picture' and picture is None:
+            picture, picture_size = [], None
+        if picture is None:
+            output.append(token['raw'])
+            continue
+        picture.append(token)
+        if token['type'] == 'end' and token['tag'] == 'picture':
+            output.extend(_sized_sources(picture, picture_size, base_directory, stats))
+            picture = None
+
+    if picture is not None:
+        output.extend(token['raw'] for token in picture)
+    return ''.join(output), stats
+
+# ---------------------------------------------------------------------------
+# Containers com background-image
+# ---------------------------------------------------------------------------
+
+def _declarations(declarations):
+    # {propriedade: valor} de uma regra, sem !important
+    result = {}
+    for declaration in declarations:
+        name, colon, value = declaration.partition(':')
+        result[name.strip().lower()] = value.replace('!important', '').strip()
+    return result
+
+def _collect_backgrounds(nodes, directories, backgrounds, heights):
+    for node in nodes:
+        if node[0] == 'block':
+            _collect_backgrounds(node[2], directories, backgrounds, heights)
+            continue
+        if node[0] != 'rule':
+            continue
+        declarations = _declarations(node[2])
+        for selector in node[1].split(','):
+            match = _SELECTOR_ELEMENT.search(selector.strip())
+            if not match:
+                continue
+            element = match.group(1)
+            if any(name in declarations for name in ('height', 'min-height', 'aspect-ratio')):
+                heights.add(element)
+            url = _BACKGROUND_URL.search(';'.join(node[2]))
+            size = declarations.get('background-size', '').lower()
+            if url and size in COVER_SIZES:
+                for directory in directories:
+                    path = resolve_reference(url.group(1), directory)
+                    if path and os.path.isfile(path):
+                        backgrounds[element] = path
+                        break
+
+def background_containers(content, base_directory=''):
+    """Elementos do Elementor com background-image cover/contain no CSS da página e
+    sem altura declarada: {id do elemento: caminho da imagem}"""
+    backgrounds = {}
+    heights = set()
+    for sheet in page_stylesheets(content, base_directory):
+        tree = sheet_tree(sheet)
+        if tree is None:
+            continue
+        # url() relativos à folha ou, como gravaram os scripts de conversão, à raiz
+        directories = [os.path.dirname(sheet['path']), base_directory] if sheet['path'] else [base_directory]
+        _collect_backgrounds(tree, directories, backgrounds, heights)
+    return {element: path for element, path in backgrounds.items() if element not in heights}
+
+def _inline_background(attributes, base_directory):
+    # Medidas do style="background-image:url(...)" ou do data-bg (lazy loading), se
+    # o style não declara altura
+    style = attributes.get('style', '')
+    url = _BACKGROUND_URL.search(style)
+    url = url.group(1) if url else attributes.get('data-bg')
+    if not url or _HEIGHT_PROPERTY.search(style) or 'aspect-ratio' in style:
+        return None
+    path = resolve_reference(url, base_directory)
+    return image_dimensions(path) if path else None
+
+def aspect_ratio_document(content, base_directory=''):
+    """aspect-ratio nos containers vazios com imagem de fundo: no style dos que a
+    declaram inline/data-bg e num <style> no <head> para os fundos vindos do CSS.
+    Containers com conteúdo já têm a altura definida por ele e ficam como estão.
+    Retorna (conteúdo, estatísticas)"""
+    stats = {'containers': 0}
+    content = _ASPECT_RATIO_STYLE.sub('', content)
+    backgrounds = background_containers(content, base_directory)
+
+    output = []
+    rules = {}
+    stack = []   # [tag, índice no output, atributos, tem conteúdo] dos elementos abertos
+    for token in tokenize([content]):
+        output.append(token['raw'])
+        if token['type'] == 'text' and token['raw'].strip():
+            for entry in stack:
+                entry[3] = True
+        elif token['type'] == 'start':
+            if token['tag'] in CONTENT_TAGS:
+                for entry in stack:
+                    entry[3] = True
+            if token['tag'] not in VOID_TAGS and not token['raw'].endswith('/>'):
+                stack.append([token['tag'], len(output) - 1, dict(parse_attributes(token)), False])
+        elif token['type'] == 'end':
+            # Fecha até a tag correspondente (HTML tolera tags sem fechamento)
+            index = next((i for i in range(len(stack) - 1, -1, -1) if stack[i][0] == token['tag']), None)
+            if index is None:
+                continue
+            tag, position, attributes, filled = stack[index]
+            del stack[index:]
+            if filled:
+                continue
+            dimensions = _inline_background(attributes, base_directory)
+            if dimensions:
+                raw = _append_style(output[position], attributes.get('style', ''),
+                                    f'aspect-ratio: {dimensions[0]} / {dimensions[1]}')
+                output[position] = raw
+                stats['containers'] += 1
+                continue
+            element = _ELEMENT_ID.search(attributes.get('class', ''))
+            if element and element.group(1) in backgrounds:
+                rules[element.group(1)] = image_dimensions(backgrounds[element.group(1)])
+    content = ''.join(output)
+
+    rules = [f'.elementor-element-{element}{{aspect-ratio:{dimensions[0]} / {dimensions[1]}}}'
+             for element, dimensions in sorted(rules.items()) if dimensions]
+    if rules and '</head>' in content:
+        style = f'<style id="{ASPECT_RATIO_STYLE_ID}">{"".join(rules)}</style>\n'
+        content = content.replace('</head>', style + '</head>', 1)
+        stats['containers'] += len(rules)
+
+    return content, stats
@@ -0,0 +1,725 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - MINIFICADOR DE JAVASCRIPT
+Separa o JavaScript em tokens (strings, templates, regex e comentários são
+reconhecidos pelo contexto, não por expressões soltas) e o reescreve compacto:
+sem comentários e espaços, com quebras de linha só onde a inserção automática
+de ponto e vírgula depende delas, variáveis locais de funções com nomes curtos
+e expressões numéricas constantes já calculadas. Roda em paralelo sobre os
+arquivos do site, com cache pelo hash do conteúdo
+"""
+
+import re
+import sys
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_inventory import find_files, save_inventory, update_file
+from build_cache import cache_key, content_hash, lookup, save_cache, store
+
+# Versão do minificador: incrementar invalida os resultados em cache
+JS_MINIFY_VERSION = 2
+
+# Diretórios com os scripts do site (o painel admin fica de fora)
+SCRIPT_ROOTS = ['core', 'assets']
+
+KEYWORDS = {
+    'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete', 'do', 'else',
+    'enum', 'export', 'extends', 'false', 'finally', 'for', 'function', 'if', 'import', 'in', 'instanceof',
+    'new', 'null', 'return', 'super', 'switch', 'this', 'throw', 'true', 'try', 'typeof', 'var', 'void',
+    'while', 'with', 'implements', 'interface', 'package', 'private', 'protected', 'public',
+}
+
+# Nomes que também são palavras-chave em algum contexto: nunca renomeados
+CONTEXTUAL_NAMES = {'arguments', 'eval', 'async', 'await', 'yield', 'get', 'set', 'of', 'let', 'static',
+                    'from', 'as', 'target', 'meta'}
+
+# Depois destas palavras uma barra começa uma regex (e uma chave, um objeto)
+EXPRESSION_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw',
+                       'case', 'do', 'else', 'yield', 'await', 'extends'}
+
+# Depois destes tokens uma quebra de linha nunca termina o comando
+CONTINUE_AFTER = {
+    '{', '(', '[', ',', ';', ':', '?', '.', '?.', '=>', '...', '=', '+=', '-=', '*=', '/=', '%=', '**=',
+    '<<=', '>>=', '>>>=', '&=', '|=', '^=', '&&=', '||=', '??=', '+', '-', '*', '/', '%', '**', '&', '|',
+    '^', '~', '!', '<', '>', '<=', '>=', '==', '!=', '===', '!==', '&&', '||', '??', '<<', '>>', '>>>',
+}
+
+# Antes destes tokens uma quebra de linha nunca termina o comando
+CONTINUE_BEFORE = {
+    ')', ']', '}', ',', ';', ':', '?', '.', '?.', '=', '+=', '-=', '*=', '/=', '%=', '**=', '<<=',
+    '>>=', '>>>=', '&=', '|=', '^=', '&&=', '||=', '??=', '*', '%', '**', '&', '|', '^', '<', '>', '<=',
+    '>=', '==', '!=', '===', '!==', '&&', '||', '??', '<<', '>>', '>>>', 'in', 'instanceof',
+}
+
+# Operadores de precedência menor que + e -: podem cercar uma soma que é calculada
+_LOW_PRECEDENCE = {
+    '(', '[', '{', '}', ',', ';', ':', '?', '=>', '=', '+=', '-=', '*=', '/=', '%=', '**=', '<<=', '>>=',
+    '>>>=', '&=', '|=', '^=', '&&=', '||=', '??=', '&&', '||', '??', '==', '!=', '===', '!==', '<', '>',
+    '<=', '>=', '&', '|', '^', '<<', '>>', '>>>', 'return', 'case', 'in', 'instanceof',
+}
+_AFTER_FOLD = {')', ']', '}', ',', ';', ':', '?'} | (_LOW_PRECEDENCE - {'(', '[', '{', '=>', 'return', 'case'})
+
+_NAME = re.compile(r'#?(?:[A-Za-z_$\u0080-\uffff]|\\u[0-9a-fA-F]{4}|\\u\{[0-9a-fA-F]+\})'
+                   r'(?:[\w$\u0080-\uffff]|\\u[0-9a-fA-F]{4}|\\u\{[0-9a-fA-F]+\})*')
+_NUMBER = re.compile(r'0[xX][\da-fA-F_]+n?|0[oO][0-7_]+n?|0[bB][01_]+n?'
+                     r'|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?n?')
+_STRING = re.compile(r'"(?:[^"\\\n\r]|\\(?:\r\n|[\s\S]))*"|\'(?:[^\'\\\n\r]|\\(?:\r\n|[\s\S]))*\'')
+_REGEX = re.compile(r'/(?![*/])(?:[^/\\\[\n\r]|\\.|\[(?:[^\]\\\n\r]|\\.)*\])+/[A-Za-z]*')
+_PUNCTUATOR = re.compile(r'>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=|<=|>=|&&|\|\||\?\?'
+                         r'|\?\.(?!\d)|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|\*\*|<<|>>|[{}()\[\];,<>+\-*/%&|^!~?:=.@]')
+_WHITESPACE = re.compile(r'[\s\ufeff]+')
+_LINE_BREAK = re.compile(r'[\n\r\u2028\u2029]')
+_SIMPLE_NUMBER = re.compile(r'(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$')
+# 010 é octal (8) em código não estrito e 08 é decimal: literais com zero à esquerda não são calculados
+_LEADING_ZERO = re.compile(r'0\d')
+_WORD_CHARACTER = re.compile(r'[\w$\u0080-\uffff\\]')
+
+# ---------------------------------------------------------------------------
+# Tokens
+# ---------------------------------------------------------------------------
+
+def _regex_allowed(previous):
+    # Uma barra começa uma regex onde uma expressão pode começar
+    if previous is None:
+        return True
+    kind, value = previous[0], previous[1]
+    if kind == 'punct':
+        return value not in (')', ']', '++', '--')
+    if kind == 'name':
+        return value in EXPRESSION_KEYWORDS
+    if kind == 'template':
+        return value.endswith('${')
+    return False
+
+def _scan_template(source, position):
+    # Do ` ou } até o próximo ${ ou o ` final
+    index = position + 1
+    while index < len(source):
+        char = source[index]
+        if char == '\\':
+            index += 2
+            continue
+        if char == '`':
+            return index + 1
+        if char == '$' and source.startswith('${', index):
+            return index + 2
+        index += 1
+    raise ValueError("Template sem '`' de fechamento")
+
+def tokenize_js(source):
+    """Lista de tokens [tipo, valor, quebra de linha antes]. Os tipos são name, number,
+    string, template, regex, punct e comment (só os /*! de licença são mantidos).
+    Levanta ValueError para código que não pode ser separado com segurança"""
+    tokens = []
+    previous = None
+    newline = False
+    position = 0
+    braces = 0
+    templates = []   # profundidade de chaves de cada ${ aberto
+
+    while position < len(source):
+        char = source[position]
+
+        match = _WHITESPACE.match(source, position)
+        if match:
+            newline = newline or bool(_LINE_BREAK.search(match.group()))
+            position = match.end()
+            continue
+
+        if source.startswith('//', position) or source.startswith('<!--', position):
+            end = _LINE_BREAK.search(source, position)
+            position = end.start() if end else len(source)
+            continue
+
+        if source.startswith('/*', position):
+            end = source.find('*/', position + 2)
+            if end == -1:
+                raise ValueError("Comentário sem '*/'")
+            comment = source[position:end + 2]
+            if comment.startswith('/*!'):
+                tokens.append(['comment', comment, newline])
+                newline = True
+            else:
+                newline = newline or bool(_LINE_BREAK.search(comment))
+            position = end + 2
+            continue
+
+        if char == '`' or (char == '}' and templates and templates[-1] == braces):
+            if char == '}':
+                templates.pop()
+            end = _scan_template(source, position)
+            value = source[position:end]
+            if value.endswith('${'):
+                templates.append(braces)
+            token = ['template', value, newline]
+        elif char in '"\'':
+            match = _STRING.match(source, position)
+            if not match:
+                raise ValueError(f"String sem fechamento na posição {position}")
+            token = ['string', match.group(), newline]
+        elif char == '/' and _regex_allowed(previous):
+            match = _REGEX.match(source, position)
+            if not match:
+                raise ValueError(f"Regex inválida na posição {position}")
+            token = ['regex', match.group(), newline]
+        elif char.isdigit() or (char == '.' and source[position + 1:position + 2].isdigit()):
+            token = ['number', _NUMBER.match(source, position).group(), newline]
+        else:
+            match = _NAME.match(source, position)
+            if match:
+                token = ['name', match.group(), newline]
+            else:
+                match = _PUNCTUATOR.match(source, position)
+                if not match:
+                    raise ValueError(f"Caractere inesperado {char!r} na posição {position}")
+                token = ['punct', match.group(), newline]
+                if token[1] == '{':
+                    braces += 1
+                elif token[1] == '}':
+                    braces -= 1
+
+        tokens.append(token)
+        previous = token
+        newline = False
+        position += len(token[1])
+
+    if templates:
+        raise ValueError("Template sem '}' de fechamento")
+    return tokens
+
+# ---------------------------------------------------------------------------
+# Escopos
+# ---------------------------------------------------------------------------
+
+def _ends_statement(previous, token):
+    # Quebra de linha em que a inserção automática de ; pode acontecer
+    return token[2] and previous is not None and previous[1] not in CONTINUE_AFTER \
+        and token[1] not in CONTINUE_BEFORE
+
+def _brace_kind(previous, colon):
+    # Objeto ou bloco, pelo token anterior à chave
+    if previous is None:
+        return 'block'
+    kind, value = previous[0], previous[1]
+    if kind == 'punct':
+        if value in (';', '{', '}', ')', '=>'):
+            return 'block'
+        if value == ':':
+            return 'object' if colon in ('ternary', 'key') else 'block'
+        return 'object'
+    if kind == 'name':
+        return 'object' if value in EXPRESSION_KEYWORDS - {'do', 'else'} else 'block'
+    return 'object' if kind == 'template' else 'block'
+
+def _new_frame(kind, function=None, role=None):
+    # kind: '(', '[', 'block', 'object' ou '${'; function: função dona do nível;
+    # role: 'params' ou 'body' quando o nível é de uma função
+    return {'kind': kind, 'function': function, 'role': role, 'ternary': 0, 'key': kind == 'object',
+            'declaration': None}
+
+def _mark_unsafe(owners):
+    for owner in owners:
+        if owner is not None:
+            owner['unsafe'] = True
+
+def analyze(tokens):
+    """Classifica os nomes dos tokens significativos (token[3]: 'ref' para variáveis,
+    'shorthand' para {a} em objetos, 'label' ou None para chaves e propriedades) e
+    retorna (tokens significativos, funções). Cada função declarada com `function`
+    é {'start', 'end', 'declared', 'unsafe'}: intervalo dos parâmetros ao fim do corpo
+    e nomes declarados no nível dela"""
+    significant = [token + [None] for token in tokens if token[0] != 'comment']
+    functions = []
+    owners = []               # dono das declarações var: função, ou None (arrow e método)
+    frames = [_new_frame('block')]
+    pending_function = None   # 'function' visto, esperando os parâmetros
+    pending_body = None       # [função ou None]: o próximo { depois de ) ou => é um corpo
+    pending_method = False    # chave de objeto seguida de (: método
+    colon = None              # tipo do último ':' (ternary, key ou label)
+
+    for index, token in enumerate(significant):
+        kind, value = token[0], token[1]
+        previous = significant[index - 1] if index else None
+        following = significant[index + 1] if index + 1 < len(significant) else None
+        following_value = following[1] if following is not None else None
+        frame = frames[-1]
+
+        # Declaração terminada por ; implícito
+        if frame['declaration'] and _ends_statement(previous, token):
+            frame['declaration'] = None
+
+        if kind == 'name':
+            after_dot = previous is not None and previous[1] in ('.', '?.')
+            if after_dot or token[3] == 'label':
+                continue
+
+            if frame['kind'] == 'object' and frame['key']:
+                if following_value == '(':
+                    pending_method = True
+                    frame['key'] = False
+                elif following_value in (',', '}', '=') and value not in KEYWORDS:
+                    token[3] = 'shorthand'
+                    frame['key'] = False
+                elif following_value != ':' and not (following[0] in ('name', 'string', 'number')
+                                                     or following_value in ('[', '*')):
+                    frame['key'] = False
+                continue
+
+            if value == 'function' and following_value in ('(', '*') or \
+                    value == 'function' and following is not None and following[0] == 'name':
+                record = {'start': None, 'end': None, 'declared': set(), 'unsafe': False, 'declares_in': None}
+                statement = previous is None or previous[1] in (';', '{', '}') or (
+                    previous[1] == 'async' and (index < 2 or significant[index - 2][1] in (';', '{', '}')))
+                if statement and frame['role'] == 'body':
+                    record['declares_in'] = frame['function']
+                pending_function = record
+                functions.append(record)
+                continue
+
+            if pending_function is not None and following_value == '(':
+                # Nome da função: a declaração pertence ao escopo de fora
+                if pending_function['declares_in'] is not None:
+                    pending_function['declares_in']['declared'].add(value)
+                token[3] = 'ref'
+                continue
+
+            if value in ('with', 'eval', 'class'):
+                _mark_unsafe(owners)
+                continue
+
+            if value in ('var', 'const') or (value == 'let' and following is not None and
+                                              (following[0] == 'name' or following_value in ('[', '{'))):
+                frame['declaration'] = value
+                # Desestruturação declara nomes que também são chaves
+                if following_value in ('[', '{'):
+                    _mark_unsafe(owners)
+                continue
+
+            if value in ('break', 'continue') and following is not None and following[0] == 'name' \
+                    and not following[2]:
+                following[3] = 'label'
+                continue
+
+            if value in KEYWORDS:
+                continue
+
+            if following_value == ':' and frame['kind'] == 'block' and frame['ternary'] == 0 \
+                    and (previous is None or previous[1] in (';', '{', '}')):
+                token[3] = 'label'
+                continue
+
+            token[3] = 'ref'
+            if frame['role'] == 'params' and previous is not None and previous[1] in ('(', ',', '...'):
+                frame['function']['declared'].add(value)
+            elif frame['declaration'] and previous is not None and previous[1] in ('var', 'let', 'const', ','):
+                owner = owners[-1] if owners else None
+                if owner is not None and (frame['declaration'] == 'var' or
+                                          (frame['role'] == 'body' and frame['function'] is owner)):
+                    owner['declared'].add(value)
+            continue
+
+        if kind in ('string', 'number'):
+            if frame['kind'] == 'object' and frame['key'] and following_value != ':':
+                pending_method = following_value == '('
+                frame['key'] = False
+            continue
+
+        if kind == 'template':
+            if value.startswith('}'):
+                frames.pop()
+            if value.endswith('${'):
+                frames.append(_new_frame('${', frames[-1]['function']))
+            continue
+
+        if kind != 'punct':
+            continue
+
+        if value == '?':
+            frame['ternary'] += 1
+        elif value == ':':
+            if frame['ternary']:
+                frame['ternary'] -= 1
+                colon = 'ternary'
+            elif frame['kind'] == 'object':
+                colon = 'key'
+                frame['key'] = False
+            else:
+                colon = 'label'
+        elif value == ',':
+            frame['key'] = frame['kind'] == 'object'
+        elif value == ';':
+            frame['declaration'] = None
+        elif value == '...':
+            frame['key'] = False
+        elif value == '=>' and following_value == '{':
+            pending_body = [None]
+        elif value in ('=', '{', '[') and frame['role'] == 'params':
+            # Valores padrão e desestruturação nos parâmetros
+            frame['function']['unsafe'] = True
+
+        if value == '(':
+            if pending_function is not None:
+                record = pending_function
+                pending_function = None
+                record['start'] = index
+                frames.append(_new_frame('(', record, 'params'))
+                pending_body = [record]
+            else:
+                if pending_method:
+                    pending_body = [None]
+                frames.append(_new_frame('(', frame['function']))
+            pending_method = False
+        elif value == '{':
+            if pending_body is not None and previous is not None and previous[1] in (')', '=>'):
+                record = pending_body[0]
+                pending_body = None
+                owners.append(record)
+                frames.append(_new_frame('block', record, 'body'))
+            else:
+                frames.append(_new_frame(_brace_kind(previous, colon), frame['function']))
+        elif value == '[':
+            frames.append(_new_frame('[', frame['function']))
+        elif value in (')', ']', '}'):
+            if len(frames) == 1:
+                raise ValueError(f"'{value}' sem abertura")
+            closed = frames.pop()
+            if closed['role'] == 'body':
+                owner = owners.pop()
+                if owner is not None:
+                    owner['end'] = index
+            # Chave calculada de método: { [nome]() {} }
+            if value == ']' and frames[-1]['kind'] == 'object' and frames[-1]['key']:
+                pending_method = following_value == '('
+                frames[-1]['key'] = following_value == ':' and frames[-1]['key']
+
+    if len(frames) != 1:
+        raise ValueError("Chaves, colchetes ou parênteses sem par")
+    return significant, [record for record in functions if record['start'] is not None and record['end'] is not None]
+
+# ---------------------------------------------------------------------------
+# Nomes curtos
+# ---------------------------------------------------------------------------
+
+_FIRST_CHARACTERS = 'etnrisoaucldfphmgvbywkxjqzETNRISOAUCLDFPHMGVBYWKXJQZ_$'
+_OTHER_CHARACTERS = _FIRST_CHARACTERS + '0123456789'
+
+def short_names():
+    """Nomes curtos em ordem: e, t, n, ..., ee, te, ... (sem palavras reservadas)"""
+    length = 1
+    while True:
+        for index in range(len(_FIRST_CHARACTERS) * len(_OTHER_CHARACTERS) ** (length - 1)):
+            name = _FIRST_CHARACTERS[index % len(_FIRST_CHARACTERS)]
+            index //= len(_FIRST_CHARACTERS)
+            for _ in range(length - 1):
+                name += _OTHER_CHARACTERS[index % len(_OTHER_CHARACTERS)]
+                index //= len(_OTHER_CHARACTERS)
+            if name not in KEYWORDS and name not in CONTEXTUAL_NAMES:
+                yield name
+        length += 1
+
+def rename_locals(significant, functions):
+    """Encurta os nomes declarados no nível de cada função, de fora para dentro. Todas as
+    referências ao nome dentro da função mudam juntas (inclusive as de funções internas que
+    o redeclaram) e o nome novo não aparece em nenhuma referência dentro dela.
+    Retorna quantos nomes foram trocados"""
+    renamed = 0
+    for record in sorted(functions, key=lambda record: record['start']):
+        if record['unsafe']:
+            continue
+        references = [token for token in significant[record['start']:record['end'] + 1]
+                      if token[0] == 'name' and token[3] in ('ref', 'shorthand')]
+        used = {token[1] for token in references}
+
+        counts = {}
+        for token in references:
+            if token[1] in record['declared'] and token[1] not in CONTEXTUAL_NAMES:
+                counts[token[1]] = counts.get(token[1], 0) + 1
+
+        mapping = {}
+        names = short_names()
+        for name in sorted(counts, key=lambda name: (-counts[name], name)):
+            candidate = next(names)
+            while candidate in used:
+                candidate = next(names)
+            if len(candidate) < len(name):
+                used.add(candidate)
+                mapping[name] = candidate
+        if not mapping:
+            continue
+
+        for token in references:
+            if token[1] in mapping:
+                if token[3] == 'shorthand':
+                    # {a} vira {a:e}: a chave continua com o nome original
+                    token.append(mapping[token[1]])
+                    token[3] = 'expanded'
+                else:
+                    token[1] = mapping[token[1]]
+        # Funções internas passam a ver os nomes novos
+        for inner in functions:
+            if inner is not record and record['start'] < inner['start'] <= record['end']:
+                inner['declared'] = {mapping.get(name, name) for name in inner['declared']}
+        renamed += len(mapping)
+    return renamed
+
+def expand_shorthands(significant):
+    """Troca cada {a} renomeado pelos tokens a, :, e"""
+    expanded = []
+    for token in significant:
+        if token[3] == 'expanded':
+            expanded.append(['name', token[1], token[2], None])
+            expanded.append(['punct', ':', False, None])
+            expanded.append(['name', token[4], False, 'ref'])
+        else:
+            expanded.append(token)
+    significant[:] = expanded
+
+# ---------------------------------------------------------------------------
+# Constantes
+# ---------------------------------------------------------------------------
+
+def _number_value(text):
+    if _LEADING_ZERO.match(text):
+        return None
+    return float(text) if _SIMPLE_NUMBER.match(text) else None
+
+def format_number(value):
+    """Literal numérico mais curto de um valor não negativo (None se não houver um exato)"""
+    if math.isnan(value) or math.isinf(value) or value < 0:
+        return None
+    if value == int(value) and value < 1e21:
+        text = str(int(value))
+        stripped = text.rstrip('0')
+        if len(text) - len(stripped) > 2:
+            text = f'{stripped}e{len(text) - len(stripped)}'
+        return text
+    text = repr(value).replace('e-0', 'e-').replace('e+', 'e')
+    return text[1:] if text.startswith('0.') else text
+
+def _fold(operator, left, right):
+    if operator == '+':
+        return left + right
+    if operator == '-':
+        return left - right
+    if operator == '*':
+        return left * right
+    if right == 0:
+        return None
+    return left / right if operator == '/' else math.fmod(left, right)
+
+def _foldable(significant, index, output):
+    # Resultado de número-operador-número em significant[index], se os vizinhos deixarem
+    left, operator, right = significant[index:index + 3]
+    if operator[0] != 'punct' or operator[1] not in ('+', '-', '*', '/', '%') or right[0] != 'number' \
+            or operator[2] or right[2]:
+        return None
+    left_value, right_value = _number_value(left[1]), _number_value(right[1])
+    if left_value is None or right_value is None:
+        return None
+
+    additive = operator[1] in ('+', '-')
+    previous = output[-1] if output else None
+    following = significant[index + 3] if index + 3 < len(significant) else None
+    before = _LOW_PRECEDENCE if additive else _LOW_PRECEDENCE | {'+', '-'}
+    after = _AFTER_FOLD | ({'+', '-'} if additive else {'+', '-', '*', '/', '%'})
+    if previous is not None and (previous[0] not in ('punct', 'name') or previous[1] not in before):
+        return None
+    if following is not None and following[1] not in after:
+        return None
+
+    result = _fold(operator[1], left_value, right_value)
+    text = format_number(result) if result is not None else None
+    if text is None or len(text) > len(left[1]) + len(operator[1]) + len(right[1]):
+        return None
+    return text
+
+def fold_constants(significant):
+    """Calcula somas, subtrações, multiplicações e divisões entre números literais quando
+    os vizinhos têm precedência menor e troca true/false por !0/!1. Retorna quantas
+    expressões foram trocadas"""
+    folded = 0
+    changed = True
+    while changed:
+        changed = False
+        output = []
+        index = 0
+        while index < len(significant):
+            token = significant[index]
+            if token[0] == 'name' and token[1] in ('true', 'false') and token[3] is None:
+                previous = output[-1] if output else None
+                following = significant[index + 1] if index + 1 < len(significant) else None
+                if (previous is None or previous[1] not in ('.', '?.')) and \
+                        (following is None or following[1] not in ('.', '?.', ':', '[', '(', '=>')):
+                    output.append(['punct', '!', token[2], None])
+                    output.append(['number', '0' if token[1] == 'true' else '1', False, None])
+                    index += 1
+                    folded += 1
+                    continue
+
+            if token[0] == 'number' and index + 2 < len(significant):
+                text = _foldable(significant, index, output)
+                if text is not None:
+                    output.append(['number', text, token[2], None])
+                    index += 3
+                    folded += 1
+                    changed = True
+                    continue
+
+            output.append(token)
+            index += 1
+        significant[:] = output
+    return folded
+
+# ---------------------------------------------------------------------------
+# Saída
+# ---------------------------------------------------------------------------
+
+def _separator(previous, token):
+    # '' quando os dois tokens podem ficar colados, senão ' ' ou '\n'
+    if previous is None:
+        return ''
+    if previous[0] == 'comment' or token[0] == 'comment' or _ends_statement(previous, token):
+        return '\n'
+    left, right = previous[1], token[1]
+    if _WORD_CHARACTER.match(left[-1]) and _WORD_CHARACTER.match(right[0]):
+        return ' '
+    if previous[0] == 'regex' and _WORD_CHARACTER.match(right[0]):
+        return ' '
+    if previous[0] == 'number' and right[0] == '.' and left.isdigit():
+        return ' '
+    if left[-1] + right[0] in ('++', '--', '//', '/*', '<!', '</', '->'):
+        return ' '
+    return ''
+
+def serialize_js(tokens):
+    """Texto compacto a partir dos tokens"""
+    output = []
+    previous = None
+    for token in tokens:
+        output.append(_separator(previous, token))
+        output.append(token[1])
+        previous = token
+    return ''.join(output)
+
+def minify_js(source):
+    """Minifica um script. Código que não pode ser analisado, ou cuja saída não volta
+    exatamente aos tokens gerados, é devolvido sem mudanças"""
+    try:
+        tokens = tokenize_js(source)
+        significant, functions = analyze(tokens)
+    except ValueError:
+        return source
+
+    rename_locals(significant, functions)
+    expand_shorthands(significant)
+    fold_constants(significant)
+
+    comments = [token for token in tokens if token[0] == 'comment']
+    minified = serialize_js(comments + significant)
+
+    # Conferência: separar a saída de novo precisa dar os mesmos tokens
+    try:
+        check = [token[1] for token in tokenize_js(minified) if token[0] != 'comment']
+    except ValueError:
+        return source
+    if check != [token[1] for token in significant]:
+        return source
+    return minified if len(minified) < len(source) else source
+
+# Casos de ida e volta: (entrada, saída esperada de minify_js), conferidos com --check
+ROUND_TRIP_CASES = [
+    ('var a = 2 * 3 + x;', 'var a=6+x;'),
+    ('var a = 0.5 + 1;', 'var a=1.5;'),
+    ('var t = true;', 'var t=!0;'),
+    ('function f(longName){return longName+1}', 'function f(e){return e+1}'),
+    # Octal legado (010 === 8) e decimal com zero à esquerda ficam como estão
+    ('var a = 010 + 1;', 'var a=010+1;'),
+    ('var a = 08 + 1;', 'var a=08+1;'),
+]
+
+def check_round_trip():
+    """Confere os casos de ida e volta; retorna a lista de (entrada, esperado, obtido) que falharam"""
+    failures = []
+    for source, expected in ROUND_TRIP_CASES:
+        result = minify_js(source)
+        if result != expected:
+            failures.append((source, expected, result))
+    return failures
+
+# ---------------------------------------------------------------------------
+# Arquivos
+# ---------------------------------------------------------------------------
+
+def _minify_file(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        source = f.read()
+    return path, source, minify_js(source)
+
+def minify_files(paths, workers=None):
+    """Minifica os arquivos em paralelo; os já minificados nesta versão vêm do cache.
+    Retorna {'minified', 'cached', 'bytes_before', 'bytes_after'}"""
+    stats = {'minified': 0, 'cached': 0, 'bytes_before': 0, 'bytes_after': 0}
+    pending = []
+
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest = content_hash(f.read())
+        if lookup(cache_key('js_minify', JS_MINIFY_VERSION, digest)) is not None:
+            stats['cached'] += 1
+        else:
+            pending.append(path)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_minify_file, pending))
+
+        for path, source, minified in results:
+            if minified != source:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(minified)
+                update_file(path)
+                stats['minified'] += 1
+                stats['bytes_before'] += len(source.encode('utf-8'))
+                stats['bytes_after'] += len(minified.encode('utf-8'))
+            # O conteúdo final não precisa ser minificado de novo
+            store(cache_key('js_minify', JS_MINIFY_VERSION, content_hash(minified)), len(source) - len(minified))
+
+    return stats
+
+def site_scripts():
+    """Arquivos .js do site (core/ e assets/) pelo inventário"""
+    paths = []
+    for root in SCRIPT_ROOTS:
+        paths.extend(entry['path'] for entry in find_files(under=root, extensions=('.js',)))
+    return paths
+
+def main():
+    """Minifica os scripts do site em paralelo (--workers N); --check só confere os casos de ida e volta"""
+    print("📜 MINIFICADOR DE JAVASCRIPT - PEACOCK COSMÉTICOS\n")
+
+    if '--check' in sys.argv:
+        failures = check_round_trip()
+        for source, expected, result in failures:
+            print(f"   ❌ {source!r}: esperado {expected!r}, obtido {result!r}")
+        print(f"   ✅ {len(ROUND_TRIP_CASES) - len(failures)} de {len(ROUND_TRIP_CASES)} casos de ida e volta")
+        sys.exit(1 if failures else 0)
+
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else None
+    paths = site_scripts()
+
+    start = time.perf_counter()
+    stats = minify_files(paths, workers)
+    elapsed = time.perf_counter() - start
+    save_inventory()
+    save_cache()
+
+    print(f"   ✅ {stats['minified']} de {len(paths)} arquivos minificados "
+          f"({round(stats['bytes_before'] / 1024, 1)} KB → {round(stats['bytes_after'] / 1024, 1)} KB)")
+    if stats['cached']:
+        print(f"   ♻️ {stats['cached']} arquivos inalterados reaproveitados do cache")
+    print(f"   ⏱️ {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
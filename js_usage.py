@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - JAVASCRIPT NÃO UTILIZADO
+Monta o grafo dos scripts de uma página: o que cada um exporta (globais em
+window/self/globalThis, declarações de topo e plugins jQuery em $.fn), o que
+cada um referencia e para quais widgets do Elementor registra handlers. A
+partir das referências dos scripts inline, dos data-settings e dos widgets
+presentes na página, marca os scripts alcançáveis; os demais exportam coisas
+que ninguém usa e podem sair. Scripts sem nada que se possa identificar
+(efeitos colaterais) ficam sempre
+"""
+
+import os
+import re
+import sys
+import json
+import html
+
+from html_stream import count, drop_element, handler, parse_attributes, rewrite_string, tokenize
+from asset_graph import resolve_reference
+from build_cache import cache_key, file_hash, lookup, save_cache, store
+from js_minify import KEYWORDS, tokenize_js
+from site_pipeline import discover_pages
+
+REPORT_FILE = 'js_usage_report.json'
+
+# Versão da análise dos scripts: incrementar invalida as descrições em cache
+JS_USAGE_VERSION = 1
+
+# Objetos globais: window.X = ... exporta X
+GLOBAL_OBJECTS = {'window', 'self', 'globalThis'}
+
+# Tipos de elemento do Elementor com handler em toda página que os tem
+GENERIC_HANDLERS = {'global', 'widget', 'section', 'column', 'container'}
+
+# Registro de handler por widget: "frontend/element_ready/x.default",
+# attachHandler("x", ...) e mapas {"x.default": ...}
+_ELEMENT_READY = re.compile(r'^frontend/element_ready/([\w-]+)(?:\.[\w-]+)?$')
+_WIDGET_SKIN = re.compile(r'^([a-z][\w-]*)\.default$')
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+# ---------------------------------------------------------------------------
+# Scripts
+# ---------------------------------------------------------------------------
+
+def _string_value(token):
+    return token[1][1:-1] if token[0] == 'string' else None
+
+def _assigned(tokens, index):
+    # tokens[index] é seguido de um = de atribuição (não ==, ===, =>)
+    return index + 1 < len(tokens) and tokens[index + 1][1] == '='
+
+def _object_keys(tokens, start):
+    # Chaves do literal de objeto que abre em tokens[start]
+    keys = set()
+    depth = 0
+    for index in range(start, len(tokens)):
+        value = tokens[index][1]
+        if value in ('{', '(', '['):
+            depth += 1
+        elif value in ('}', ')', ']'):
+            depth -= 1
+            if depth == 0:
+                break
+        elif depth == 1 and value == ':' and tokens[index - 2][1] in (',', '{'):
+            key = tokens[index - 1]
+            keys.add(_string_value(key) or key[1])
+    return keys
+
+def script_exports(tokens):
+    """(globais, plugins jQuery) definidos por um script"""
+    globals_, plugins = set(), set()
+    groups = []   # tokens de cada ( aberto, para (e = e || self).X = ...
+    depth = 0
+
+    for index, token in enumerate(tokens):
+        kind, value = token[0], token[1]
+        following = tokens[index + 1][1] if index + 1 < len(tokens) else None
+        previous = tokens[index - 1][1] if index else None
+
+        if kind == 'punct':
+            if value == '(':
+                groups.append(set())
+            elif value == ')' and groups:
+                group = groups.pop()
+                if groups:
+                    groups[-1] |= group
+                # (... self ...).X = valor
+                if group & GLOBAL_OBJECTS and following == '.' and index + 2 < len(tokens) \
+                        and tokens[index + 2][0] == 'name' and _assigned(tokens, index + 2):
+                    globals_.add(tokens[index + 2][1])
+            if value in ('{', '(', '['):
+                depth += 1
+            elif value in ('}', ')', ']'):
+                depth -= 1
+            continue
+
+        if kind != 'name':
+            continue
+        if groups:
+            groups[-1].add(value)
+
+        if value in GLOBAL_OBJECTS and previous not in ('.', '?.'):
+            # window.X = valor e window["X"] = valor
+            if following == '.' and index + 2 < len(tokens) and _assigned(tokens, index + 2):
+                globals_.add(tokens[index + 2][1])
+            elif following == '[' and index + 3 < len(tokens) and tokens[index + 3][1] == ']' \
+                    and _string_value(tokens[index + 2]) and _assigned(tokens, index + 3):
+                globals_.add(_string_value(tokens[index + 2]))
+        elif value == 'fn' and previous == '.' and following == '.' and index + 2 < len(tokens):
+            # $.fn.plugin = função e $.fn.extend({plugin: função})
+            name = tokens[index + 2][1]
+            if _assigned(tokens, index + 2):
+                plugins.add(name)
+            elif name == 'extend' and index + 4 < len(tokens) and tokens[index + 3][1] == '(' \
+                    and tokens[index + 4][1] == '{':
+                plugins.update(_object_keys(tokens, index + 4))
+        elif depth == 0 and value in ('var', 'let', 'const', 'function', 'class') and following is not None \
+                and index + 1 < len(tokens) and tokens[index + 1][0] == 'name':
+            # Declarações no topo de um script clássico viram globais
+            globals_.add(following)
+            for position in range(index + 2, len(tokens) - 1):
+                if tokens[position][1] in (';', '{') or tokens[position][2]:
+                    break
+                if tokens[position][1] == ',' and tokens[position + 1][0] == 'name':
+                    globals_.add(tokens[position + 1][1])
+
+    return globals_, plugins
+
+def script_references(tokens):
+    """Nomes que um script pode usar: identificadores, propriedades e strings com
+    cara de identificador (window["X"], typeof checks)"""
+    references = set()
+    for token in tokens:
+        if token[0] == 'name':
+            references.add(token[1].lstrip('#'))
+        elif token[0] == 'string' and _IDENTIFIER.match(_string_value(token)):
+            references.add(_string_value(token))
+    return references - KEYWORDS
+
+def script_handlers(tokens):
+    """Tipos de elemento/widget para os quais o script registra handlers"""
+    handlers = set()
+    for index, token in enumerate(tokens):
+        value = _string_value(token)
+        if not value:
+            continue
+        ready = _ELEMENT_READY.match(value)
+        skin = _WIDGET_SKIN.match(value)
+        if ready:
+            handlers.add(ready.group(1))
+        elif skin:
+            handlers.add(skin.group(1))
+        elif index >= 2 and tokens[index - 1][1] == '(' and tokens[index - 2][1] == 'attachHandler':
+            handlers.add(value)
+    return handlers
+
+def describe_script(path):
+    """{'globals', 'plugins', 'references', 'handlers'} de um arquivo, ou None se ele
+    não puder ser separado em tokens. Fica no cache pelo hash do arquivo"""
+    key = cache_key('js_usage', JS_USAGE_VERSION, file_hash(path))
+    cached = lookup(key)
+    if cached is not None:
+        description = cached['description']
+        return {name: set(values) for name, values in description.items()} if description else None
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        source = f.read()
+    try:
+        tokens = [token for token in tokenize_js(source) if token[0] != 'comment']
+    except ValueError:
+        store(key, {'description': None})
+        return None
+    globals_, plugins = script_exports(tokens)
+    description = {
+        'globals': globals_,
+        'plugins': plugins,
+        'references': script_references(tokens),
+        'handlers': script_handlers(tokens),
+    }
+    store(key, {'description': {name: sorted(values) for name, values in description.items()}})
+    return description
+
+# ---------------------------------------------------------------------------
+# Página
+# ---------------------------------------------------------------------------
+
+def _settings_names(value, names):
+    # Chaves e valores string de um data-settings, em qualquer profundidade
+    if isinstance(value, dict):
+        for key, item in value.items():
+            names.add(key)
+            _settings_names(item, names)
+    elif isinstance(value, list):
+        for item in value:
+            _settings_names(item, names)
+    elif isinstance(value, str) and _IDENTIFIER.match(value):
+        names.add(value)
+
+def page_features(content, base_directory=''):
+    """Scripts externos da página, em ordem ({'path', 'id'}), nomes referenciados por
+    scripts inline e data-settings, e os tipos de widget/elemento presentes"""
+    scripts = []
+    references = set()
+    elements = set()
+    inline = False
+
+    for token in tokenize([content]):
+        if token['type'] == 'start':
+            attributes = dict(parse_attributes(token))
+            if token['tag'] == 'script':
+                path = resolve_reference(attributes['src'], base_directory) if attributes.get('src') else None
+                if path and os.path.isfile(path):
+                    scripts.append({'path': path, 'id': attributes.get('id', '')})
+                inline = 'src' not in attributes and 'json' not in attributes.get('type', '').lower()
+            widget = attributes.get('data-widget_type')
+            if widget:
+                elements.add(widget.split('.')[0])
+            if attributes.get('data-element_type'):
+                elements.add(attributes['data-element_type'])
+            if attributes.get('data-settings'):
+                try:
+                    _settings_names(json.loads(html.unescape(attributes['data-settings'])), references)
+                except ValueError:
+                    pass
+        elif token['type'] == 'rawtext' and inline:
+            try:
+                tokens = [item for item in tokenize_js(token['raw']) if item[0] != 'comment']
+            except ValueError:
+                continue
+            references |= script_references(tokens)
+        elif token['type'] == 'end':
+            inline = False
+
+    return scripts, references, elements
+
+def find_unused_scripts(content, base_directory='', descriptions=None):
+    """Marca os scripts alcançáveis a partir da página. Retorna a lista de scripts
+    com 'used' e o motivo ('reason') de cada decisão"""
+    descriptions = descriptions if descriptions is not None else {}
+    scripts, references, elements = page_features(content, base_directory)
+
+    for script in scripts:
+        if script['path'] not in descriptions:
+            descriptions[script['path']] = describe_script(script['path'])
+        script['description'] = descriptions[script['path']]
+        script['used'] = False
+        script['reason'] = None
+
+    def reached(script):
+        description = script['description']
+        if description is None:
+            return 'não analisável'
+        if not (description['globals'] or description['plugins'] or description['handlers']):
+            return 'sem exports (efeitos colaterais)'
+        handled = description['handlers'] & (elements | GENERIC_HANDLERS)
+        if handled:
+            return 'handlers de ' + ', '.join(sorted(handled))
+        used = (description['globals'] | description['plugins']) & references
+        if used:
+            return 'usado: ' + ', '.join(sorted(used))
+        return None
+
+    # Cada script alcançado acrescenta as próprias referências, até estabilizar
+    changed = True
+    while changed:
+        changed = False
+        for script in scripts:
+            if script['used']:
+                continue
+            reason = reached(script)
+            if reason:
+                script['used'] = True
+                script['reason'] = reason
+                references |= script['description']['references'] if script['description'] else set()
+                changed = True
+
+    for script in scripts:
+        if not script['used']:
+            description = script['description']
+            exports = sorted(description['globals'] | description['plugins'])
+            script['reason'] = ('exports nunca referenciados: ' + ', '.join(exports)) if exports else \
+                'handlers só de widgets ausentes'
+
+    return scripts
+
+def remove_unused_scripts(content, base_directory='', descriptions=None):
+    """Remove da página os scripts não alcançados e os scripts inline de configuração
+    deles (id="<handle>-js-extra/-before/-after"). Retorna (conteúdo, scripts removidos)"""
+    unused = [script for script in find_unused_scripts(content, base_directory, descriptions) if not script['used']]
+    handles = {script['id'][:-len('-js')] for script in unused if script['id'].endswith('-js')}
+    paths = {script['path'] for script in unused}
+
+    def remove_script(token, context):
+        attributes = dict(parse_attributes(token))
+        path = resolve_reference(attributes['src'], base_directory) if attributes.get('src') else None
+        handle = re.sub(r'-js(?:-extra|-before|-after)?$', '', attributes.get('id', ''))
+        if path in paths or (path is None and handle in handles and attributes.get('id') != handle):
+            drop_element(context, 'script', trailing_whitespace=True)
+            count(context, 'removed')
+            return ''
+        return None
+
+    content, stats = rewrite_string(content, [handler(remove_script, tags=('script',))])
+    return content, unused
+
+def _report_entry(script):
+    description = script['description'] or {'globals': set(), 'plugins': set(), 'handlers': set()}
+    return {
+        'path': script['path'],
+        'used': script['used'],
+        'reason': script['reason'],
+        'globals': sorted(description['globals']),
+        'plugins': sorted(description['plugins']),
+        'handlers': sorted(description['handlers']),
+    }
+
+def main():
+    """Relatório dos scripts não utilizados de cada página (--apply remove os scripts das páginas)"""
+    print("🕸️ JAVASCRIPT NÃO UTILIZADO - PEACOCK COSMÉTICOS\n")
+
+    apply = '--apply' in sys.argv
+    pages = [argument for argument in sys.argv[1:] if argument.endswith('.html')] or discover_pages()
+    descriptions = {}
+    report = {}
+
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        base_directory = os.path.dirname(page)
+        scripts = find_unused_scripts(content, base_directory, descriptions)
+        report[page] = [_report_entry(script) for script in scripts]
+
+        unused = [script for script in scripts if not script['used']]
+        print(f"   📄 {page}: {len(unused)} de {len(scripts)} scripts não alcançados")
+        for script in unused:
+            print(f"      🗑️ {script['path']} ({script['reason']})")
+
+        if apply and unused:
+            content, removed = remove_unused_scripts(content, base_directory, descriptions)
+            with open(page, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    save_cache()
+
+    if apply:
+        print("\n   ✅ Scripts não alcançados removidos das páginas")
+    else:
+        print("\n   ℹ️ Dry-run; use --apply para remover os scripts das páginas")
+    print(f"   📊 Relatório: {REPORT_FILE}")
+
+if __name__ == "__main__":
+    main()
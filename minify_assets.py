@@ -6,116 +6,105 @@ Reduz CSS (56 KiB) e JavaScript não usado (50 KiB) para melhorar o carregamento
 
 import re
 import os
+import sys
 import json
 from pathlib import Path
 
+from pass_engine import DEFAULT_DOCUMENT, active_document_path, load_document, save_document, write_shared_file
+from html_stream import handler, count, drop_element, parse_attributes, rewrite_document, tokenize
+from build_cache import cache_key, file_hash, lookup, store, save_cache
+from asset_inventory import find_files, update_file
+from css_minify import minify_css
+from css_purge import purge_document, remove_stale_copies
+from css_dedup import deduplicate_document
+from js_minify import minify_files, minify_js, site_scripts
+from js_usage import find_unused_scripts, remove_unused_scripts
+
+# Incrementar quando a minificação de arquivos CSS mudar, invalidando o cache
+CSS_MINIFY_VERSION = 3
+
+# Valores de type de <script> que o navegador executa como JavaScript
+JAVASCRIPT_TYPES = {'', 'text/javascript', 'application/javascript', 'module'}
+
 def minify_inline_css():
     """Minifica CSS inline no HTML"""
     print("🎨 Minificando CSS inline...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Padrão para encontrar blocos <style>
-    style_pattern = r'<style[^>]*>(.*?)</style>'
+    style_pattern = r'(<style[^>]*>)(.*?)</style>'
     
     def minify_css_block(match):
-        css_content = match.group(1)
-        
-        # Remover comentários CSS
-        css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.DOTALL)
-        
-        # Remover espaços em branco desnecessários
-        css_content = re.sub(r'\s+', ' ', css_content)
-        css_content = re.sub(r';\s*}', '}', css_content)
-        css_content = re.sub(r'{\s*', '{', css_content)
-        css_content = re.sub(r'}\s*', '}', css_content)
-        css_content = re.sub(r':\s*', ':', css_content)
-        css_content = re.sub(r';\s*', ';', css_content)
-        
-        # Remover últimos pontos e vírgulas antes de }
-        css_content = re.sub(r';+}', '}', css_content)
-        
-        return f'<style>{css_content.strip()}</style>'
+        return f'{match.group(1)}{minify_css(match.group(2))}</style>'
     
     # Aplicar minificação
     content = re.sub(style_pattern, minify_css_block, content, flags=re.DOTALL)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ CSS inline minificado")
 
 def remove_unused_css():
-    """Remove CSS não utilizado baseado na análise do PageSpeed"""
+    """Remove CSS não utilizado: regras cujos seletores não casam com o DOM da página"""
     print("🗑️ Removendo CSS não utilizado...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # CSS files identificados como não utilizados pelo PageSpeed
-    unused_css_patterns = [
-        # FontAwesome não utilizado
-        r'<link[^>]*fontawesome[^>]*\.css[^>]*>\s*',
-        # WooCommerce CSS não crítico
-        r'<link[^>]*woocommerce-smallscreen[^>]*\.css[^>]*>\s*',
-        # Widgets não utilizados na página inicial
-        r'<link[^>]*widget-mega-menu[^>]*\.css[^>]*>\s*',
-        r'<link[^>]*widget-blockquote[^>]*\.css[^>]*>\s*',
-        # Fontes não utilizadas
-        r'<link[^>]*robotoslab[^>]*\.css[^>]*>\s*',
-        r'<link[^>]*playfairdisplay[^>]*\.css[^>]*>\s*',
-    ]
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
     
-    removed_count = 0
-    for pattern in unused_css_patterns:
-        matches = re.findall(pattern, content)
-        if matches:
-            content = re.sub(pattern, '', content)
-            removed_count += len(matches)
+    # Folhas locais viram cópias purgadas; as que ficam vazias perdem o <link>
+    content, stats = purge_document(content, base_directory, write=write_shared_file)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
-    print(f"   ✅ {removed_count} arquivos CSS não utilizados removidos")
+    print(f"   ✅ {stats['rules_removed']} regras e {stats['font_faces_removed']} @font-face removidos "
+          f"({round(stats['bytes_before'] / 1024, 1)} KB → {round(stats['bytes_after'] / 1024, 1)} KB)")
+    print(f"   ✅ {stats['links_removed']} arquivos CSS não utilizados removidos, "
+          f"{stats['stylesheets_purged']} purgados")
+
+def deduplicate_css():
+    """Remove regras e declarações repetidas entre as folhas da página, sem mudar a cascata"""
+    print("♻️ Deduplicando CSS entre folhas...")
+    
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
+    
+    # Folhas externas alteradas viram cópias; os <style> são reescritos no lugar
+    content, stats = deduplicate_document(content, base_directory, write=write_shared_file)
+    
+    save_document(content)
+    
+    print(f"   ✅ {stats['declarations_removed']} declarações e {stats['rules_removed']} regras duplicadas removidas, "
+          f"{stats['rules_merged']} regras agrupadas")
+    print(f"   ✅ {stats['stylesheets_changed']} folhas: {round(stats['bytes_before'] / 1024, 1)} KB → "
+          f"{round(stats['bytes_after'] / 1024, 1)} KB")
 
 def optimize_css_files():
     """Otimiza arquivos CSS individuais"""
     print("📁 Otimizando arquivos CSS...")
     
-    css_files = []
-    
-    # Encontrar arquivos CSS no diretório
-    for root, dirs, files in os.walk('.'):
-        for file in files:
-            if file.endswith('.css') and 'min.css' not in file:
-                css_files.append(os.path.join(root, file))
+    # Arquivos CSS do inventário, exceto os já minificados
+    css_files = [entry['path'] for entry in find_files(extensions=('.css',))
+                 if 'min.css' not in os.path.basename(entry['path'])]
     
     optimized_count = 0
     total_savings = 0
+    cached_count = 0
     
     for css_file in css_files:
         try:
+            # Arquivo já minificado numa execução anterior e não alterado desde então
+            if lookup(cache_key('minify_assets.optimize_css_files', CSS_MINIFY_VERSION, file_hash(css_file))) is not None:
+                cached_count += 1
+                continue
+            
             with open(css_file, 'r', encoding='utf-8') as f:
                 original_content = f.read()
             
             original_size = len(original_content)
             
             # Minificar CSS
-            minified = original_content
-            
-            # Remover comentários
-            minified = re.sub(r'/\*.*?\*/', '', minified, flags=re.DOTALL)
-            
-            # Remover espaços desnecessários
-            minified = re.sub(r'\s+', ' ', minified)
-            minified = re.sub(r'{\s*', '{', minified)
-            minified = re.sub(r'}\s*', '}', minified)
-            minified = re.sub(r':\s*', ':', minified)
-            minified = re.sub(r';\s*', ';', minified)
-            minified = re.sub(r';+}', '}', minified)
-            
-            minified = minified.strip()
+            minified = minify_css(original_content)
             
             new_size = len(minified)
             savings = original_size - new_size
@@ -123,88 +112,112 @@ def optimize_css_files():
             if savings > 100:  # Só salvar se houver economia significativa
                 with open(css_file, 'w', encoding='utf-8') as f:
                     f.write(minified)
+                update_file(css_file)
                 
                 optimized_count += 1
                 total_savings += savings
+            
+            # Guardar o hash do conteúdo final, que não precisa ser minificado de novo
+            store(cache_key('minify_assets.optimize_css_files', CSS_MINIFY_VERSION, file_hash(css_file)), savings)
         
         except Exception as e:
             print(f"   ⚠️ Erro ao otimizar {css_file}: {e}")
     
     print(f"   ✅ {optimized_count} arquivos CSS otimizados, {total_savings} bytes economizados")
+    if cached_count:
+        print(f"   ♻️ {cached_count} arquivos inalterados reaproveitados do cache")
 
 def remove_unused_javascript():
     """Remove JavaScript não utilizado"""
     print("⚡ Removendo JavaScript não utilizado...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Scripts identificados como não utilizados
-    unused_js_patterns = [
+    # Scripts identificados como não utilizados (trecho da tag <script>)
+    unused_js_markers = [
         # Template preview não necessário em produção
-        r'<script[^>]*template-preview[^>]*>.*?</script>\s*',
-        r'<script[^>]*starter-templates[^>]*>.*?</script>\s*',
+        'template-preview',
+        'starter-templates',
         # Scripts de desenvolvimento
-        r'<script[^>]*astra-sites[^>]*>.*?</script>\s*',
+        'astra-sites',
         # jQuery migrate não necessário
-        r'<script[^>]*jquery-migrate[^>]*>.*?</script>\s*',
+        'jquery-migrate',
     ]
     
-    removed_count = 0
-    for pattern in unused_js_patterns:
-        matches = re.findall(pattern, content, flags=re.DOTALL)
-        if matches:
-            content = re.sub(pattern, '', content, flags=re.DOTALL)
-            removed_count += len(matches)
+    # Tag a tag em vez de <script[^>]*...[^>]*>.*?</script>, que retrocede
+    # sobre a página inteira a cada <script>
+    def remove_script(token, context):
+        if any(marker in token['raw'] for marker in unused_js_markers):
+            drop_element(context, 'script', trailing_whitespace=True)
+            count(context, 'removed')
+            return ''
+        return None
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    stats = rewrite_document([handler(remove_script, tags=('script',))])
+    removed_count = stats.get('removed', 0)
     
     print(f"   ✅ {removed_count} scripts não utilizados removidos")
+    
+    # Scripts cujos globais, plugins jQuery e handlers de widget a página não alcança:
+    # só relatório, a não ser com --remove-unreached-js
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
+    if '--remove-unreached-js' in sys.argv:
+        content, unreached = remove_unused_scripts(content, base_directory)
+        save_document(content)
+        print(f"   ✅ {len(unreached)} scripts não alcançados pelo grafo de globais e widgets removidos")
+    else:
+        unreached = [script for script in find_unused_scripts(content, base_directory) if not script['used']]
+        for script in unreached:
+            print(f"   ℹ️ Não alcançado: {script['path']} ({script['reason']})")
+        if unreached:
+            print(f"   ℹ️ {len(unreached)} scripts não alcançados mantidos; use --remove-unreached-js para removê-los")
+
+def optimize_js_files():
+    """Minifica os arquivos JavaScript do site em paralelo"""
+    print("📜 Minificando arquivos JavaScript...")
+    
+    # Tokens, nomes locais curtos e constantes calculadas; cache pelo hash do conteúdo
+    paths = site_scripts()
+    stats = minify_files(paths)
+    
+    print(f"   ✅ {stats['minified']} de {len(paths)} arquivos JS minificados "
+          f"({round(stats['bytes_before'] / 1024, 1)} KB → {round(stats['bytes_after'] / 1024, 1)} KB)")
+    if stats['cached']:
+        print(f"   ♻️ {stats['cached']} arquivos inalterados reaproveitados do cache")
 
 def minify_inline_javascript():
     """Minifica JavaScript inline"""
     print("📜 Minificando JavaScript inline...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Padrão para encontrar blocos <script>
-    script_pattern = r'<script[^>]*>(.*?)</script>'
-    
-    def minify_js_block(match):
-        js_content = match.group(1)
-        
-        # Pular se for muito pequeno ou se for configuração JSON
-        if len(js_content.strip()) < 50 or js_content.strip().startswith('{'):
-            return match.group(0)
-        
-        # Remover comentários JavaScript
-        js_content = re.sub(r'//.*?$', '', js_content, flags=re.MULTILINE)
-        js_content = re.sub(r'/\*.*?\*/', '', js_content, flags=re.DOTALL)
-        
-        # Remover espaços em branco desnecessários
-        js_content = re.sub(r'\s+', ' ', js_content)
-        js_content = re.sub(r'{\s*', '{', js_content)
-        js_content = re.sub(r'}\s*', '}', js_content)
-        js_content = re.sub(r';\s*', ';', js_content)
-        
-        return f'<script>{js_content.strip()}</script>'
-    
-    # Aplicar minificação
-    content = re.sub(script_pattern, minify_js_block, content, flags=re.DOTALL)
-    
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    print("   ✅ JavaScript inline minificado")
+    content = load_document()
+    
+    # O conteúdo de <script> chega inteiro num token rawtext; só os que são
+    # JavaScript (sem src e sem type de JSON ou template) passam pelo minificador
+    output = []
+    executable = False
+    bytes_saved = 0
+    for token in tokenize([content]):
+        raw = token['raw']
+        if token['type'] == 'start' and token['tag'] == 'script':
+            attributes = dict(parse_attributes(token))
+            executable = 'src' not in attributes and \
+                attributes.get('type', '').strip().lower() in JAVASCRIPT_TYPES
+        elif token['type'] == 'rawtext' and executable:
+            minified = minify_js(raw)
+            bytes_saved += len(raw) - len(minified)
+            raw = minified
+        elif token['type'] == 'end':
+            executable = False
+        output.append(raw)
+    
+    save_document(''.join(output))
+    
+    print(f"   ✅ JavaScript inline minificado ({bytes_saved} bytes economizados)")
 
 def combine_css_files():
     """Combina arquivos CSS pequenos para reduzir requests"""
     print("🔗 Combinando arquivos CSS pequenos...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Encontrar arquivos CSS pequenos que podem ser combinados
     small_css_pattern = r'<link[^>]*href=[\'"]([^\'"]*(?:widget-|theme|header-footer)[^\'"]*\.css[^\'"]*)[\'"][^>]*>\s*'
@@ -237,8 +250,7 @@ def combine_css_files():
             combined_link = '<link rel="stylesheet" href="./wp-content/uploads/combined-small.css">\n'
             content = re.sub(r'(<link[^>]*elementor[^>]*frontend[^>]*>)', r'\1\n' + combined_link, content)
             
-            with open('index.html', 'w', encoding='utf-8') as f:
-                f.write(content)
+            save_document(content)
             
             print(f"   ✅ {len(small_css_files[:5])} arquivos CSS combinados")
     else:
@@ -248,8 +260,7 @@ def create_minification_report():
     """Cria relatório das otimizações de minificação"""
     print("📊 Gerando relatório de minificação...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Contar elementos otimizados
     css_links = len(re.findall(r'<link[^>]*\.css', content))
@@ -292,8 +303,7 @@ def main():
     
     # Backup do arquivo original
     if not os.path.exists('index_minify_backup.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = load_document()
         with open('index_minify_backup.html', 'w', encoding='utf-8') as f:
             f.write(content)
         print("📋 Backup criado: index_minify_backup.html")
@@ -301,11 +311,17 @@ def main():
     # Executar otimizações
     minify_inline_css()
     remove_unused_css()
+    deduplicate_css()
     optimize_css_files()
     remove_unused_javascript()
+    optimize_js_files()
     minify_inline_javascript()
     combine_css_files()
+    stale = remove_stale_copies()
+    if stale:
+        print(f"   ♻️ {stale} cópias purgadas antigas removidas")
     report = create_minification_report()
+    save_cache()
     
     print("\n🎉 MINIFICAÇÃO COMPLETA!")
     print("📊 Resultados:")
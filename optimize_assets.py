@@ -10,13 +10,16 @@ import json
 from PIL import Image
 import shutil
 
+from pass_engine import load_document, save_document
+from asset_inventory import find_files
+from css_minify import minify_css
+
 def implement_lazy_loading():
     """Add lazy loading to images for better performance"""
     print("🖼️ Implementing lazy loading for images...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Add lazy loading to images (except the first few critical ones)
     # Pattern to find img tags
@@ -42,8 +45,7 @@ def implement_lazy_loading():
     content = re.sub(img_pattern, replace_img, content)
     
     # Write back the content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Lazy loading implemented for non-critical images")
 
@@ -60,21 +62,18 @@ def optimize_image_sizes():
     total_size = 0
     image_count = 0
     
-    # Walk through all image files
-    for root, dirs, files in os.walk(uploads_dir):
-        for file in files:
-            if file.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-                file_path = os.path.join(root, file)
-                file_size = os.path.getsize(file_path)
-                total_size += file_size
-                image_count += 1
-                
-                # Flag large images (>500KB)
-                if file_size > 500 * 1024:
-                    large_images.append({
-                        'path': file_path,
-                        'size_kb': round(file_size / 1024, 1)
-                    })
+    # All image files, from the asset inventory
+    for entry in find_files(under=uploads_dir, extensions=('.jpg', '.jpeg', '.png', '.gif', '.webp')):
+        file_size = entry['size']
+        total_size += file_size
+        image_count += 1
+        
+        # Flag large images (>500KB)
+        if file_size > 500 * 1024:
+            large_images.append({
+                'path': entry['path'],
+                'size_kb': round(file_size / 1024, 1)
+            })
     
     print(f"   📊 Total images: {image_count}")
     print(f"   📏 Total size: {round(total_size / (1024*1024), 1)} MB")
@@ -96,8 +95,7 @@ def add_resource_hints():
     print("🚀 Adding resource hints...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Resource hints to add
     resource_hints = '''
@@ -117,8 +115,7 @@ def add_resource_hints():
     )
     
     # Write back the content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Resource hints added for critical assets")
 
@@ -127,8 +124,7 @@ def optimize_css_delivery():
     print("🎨 Optimizing CSS delivery...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Critical CSS files that should load immediately
     critical_css = [
@@ -156,8 +152,7 @@ def optimize_css_delivery():
         content = re.sub(pattern, make_async, content)
     
     # Write back the content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ CSS delivery optimized with async loading")
 
@@ -166,24 +161,16 @@ def minify_inline_styles():
     print("🗜️ Minifying inline styles...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
-    # Minify inline CSS (remove extra whitespace)
-    def minify_css(match):
-        css_content = match.group(1)
-        # Remove extra whitespace and newlines
-        css_content = re.sub(r'\s+', ' ', css_content)
-        css_content = re.sub(r';\s*}', '}', css_content)
-        css_content = re.sub(r'{\s*', '{', css_content)
-        css_content = re.sub(r';\s*', ';', css_content)
-        return f'<style>{css_content.strip()}</style>'
+    # Minify inline CSS with the CSS tokenizer
+    def minify_css_block(match):
+        return f'{match.group(1)}{minify_css(match.group(2))}</style>'
     
-    content = re.sub(r'<style[^>]*>(.*?)</style>', minify_css, content, flags=re.DOTALL)
+    content = re.sub(r'(<style[^>]*>)(.*?)</style>', minify_css_block, content, flags=re.DOTALL)
     
     # Write back the content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Inline styles minified")
 
@@ -192,8 +179,7 @@ def add_compression_meta():
     print("📦 Adding compression meta tags...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Compression and caching hints
     compression_meta = '''
@@ -210,8 +196,7 @@ def add_compression_meta():
     )
     
     # Write back the content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Compression meta tags added")
 
@@ -220,8 +205,7 @@ def create_optimization_summary():
     print("📊 Creating optimization summary...")
     
     # Analyze final state
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Count optimizations
     lazy_images = len(re.findall(r'loading="lazy"', content))
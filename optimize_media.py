@@ -9,6 +9,15 @@ import re
 import json
 from pathlib import Path
 
+from pass_engine import DEFAULT_DOCUMENT, active_document_path, load_document, save_document, write_shared_file
+from asset_inventory import find_files
+from build_cache import save_cache
+from image_probe import image_dimensions
+from intrinsic_size import aspect_ratio_document, size_images
+from image_placeholders import generate_placeholders, lazy_images, placeholder_budget, placeholder_document
+from image_transcode import available_formats, picture_document, referenced_images, transcode_images
+from responsive_images import generate_variants, page_images, responsive_document, responsive_variants, width_ladder
+
 def analyze_large_images():
     """Analisa imagens grandes que precisam de otimização"""
     print("🔍 Analisando imagens grandes...")
@@ -21,37 +30,56 @@ def analyze_large_images():
     image_dirs = ['wp-content/uploads']
     
     for img_dir in image_dirs:
-        if os.path.exists(img_dir):
-            for root, dirs, files in os.walk(img_dir):
-                for file in files:
-                    if file.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-                        file_path = os.path.join(root, file)
-                        try:
-                            file_size = os.path.getsize(file_path)
-                            total_size += file_size
-                            image_count += 1
-                            
-                            # Marcar imagens grandes (>200KB)
-                            if file_size > 200 * 1024:
-                                large_images.append({
-                                    'path': file_path,
-                                    'size_kb': round(file_size / 1024, 1),
-                                    'size_mb': round(file_size / (1024 * 1024), 2)
-                                })
-                        except OSError:
-                            continue
+        for entry in find_files(under=img_dir, extensions=('.jpg', '.jpeg', '.png', '.gif', '.webp')):
+            file_size = entry['size']
+            total_size += file_size
+            image_count += 1
+            
+            # Marcar imagens grandes (>200KB); dimensões vêm do índice de mídia
+            if file_size > 200 * 1024:
+                dimensions = image_dimensions(entry['path'])
+                large_images.append({
+                    'path': entry['path'],
+                    'size_kb': round(file_size / 1024, 1),
+                    'size_mb': round(file_size / (1024 * 1024), 2),
+                    'width': dimensions[0] if dimensions else None,
+                    'height': dimensions[1] if dimensions else None
+                })
     
     print(f"   📊 Total: {image_count} imagens, {round(total_size / (1024 * 1024), 1)} MB")
     print(f"   🚨 {len(large_images)} imagens grandes encontradas")
     
     return large_images, total_size
 
+def encode_image_variants():
+    """Codifica variantes WebP/AVIF das imagens usadas pelas páginas"""
+    print("🧪 Codificando variantes WebP/AVIF...")
+    
+    # Sem o Pillow o passe é pulado; as páginas usam as variantes já existentes
+    if not available_formats():
+        print("   ⚠️ Pillow não instalado (ou sem WebP/AVIF): codificação ignorada")
+        return
+    
+    # Em paralelo; imagens já codificadas nesta versão vêm do cache pelo hash.
+    # As variantes de largura entram também: o <picture> espelha o srcset
+    paths = referenced_images()
+    paths += [variant for path in paths for width, variant in responsive_variants(path, width_ladder())]
+    stats = transcode_images(paths)
+    
+    print(f"   ✅ {stats['encoded']} variantes codificadas, {stats['smaller']} menores que a origem "
+          f"({round(stats['bytes_before'] / 1024, 1)} KB → {round(stats['bytes_after'] / 1024, 1)} KB)")
+    if stats['cached']:
+        print(f"   ♻️ {stats['cached']} variantes reaproveitadas do cache")
+
 def optimize_image_formats():
     """Otimiza formatos de imagem no HTML"""
     print("🖼️ Otimizando formatos de imagem...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
+    
+    # <picture> com <source> AVIF/WebP só onde a variante é menor que o original
+    content, stats = picture_document(content, base_directory)
     
     # Padrão para encontrar tags img
     img_pattern = r'<img([^>]*?)src="([^"]*\.(?:jpg|jpeg|png))"([^>]*?)>'
@@ -61,92 +89,100 @@ def optimize_image_formats():
         src = match.group(2)
         after_src = match.group(3)
         
-        # Verificar se a versão WebP existe
-        webp_src = re.sub(r'\.(jpg|jpeg|png)$', '.webp', src)
-        webp_path = webp_src.lstrip('./')
+        # Adicionar atributos de otimização
+        optimizations = []
         
-        if os.path.exists(webp_path):
-            # Usar WebP se disponível
-            return f'<img{before_src}src="{webp_src}"{after_src}>'
-        else:
-            # Adicionar atributos de otimização
-            optimizations = []
-            
-            if 'decoding=' not in before_src + after_src:
-                optimizations.append('decoding="async"')
-            
-            if 'fetchpriority=' not in before_src + after_src and 'banner' not in src:
-                optimizations.append('fetchpriority="low"')
-            
-            opt_str = ' ' + ' '.join(optimizations) if optimizations else ''
-            return f'<img{before_src}src="{src}"{opt_str}{after_src}>'
+        if 'decoding=' not in before_src + after_src:
+            optimizations.append('decoding="async"')
+        
+        if 'fetchpriority=' not in before_src + after_src and 'banner' not in src:
+            optimizations.append('fetchpriority="low"')
+        
+        opt_str = ' ' + ' '.join(optimizations) if optimizations else ''
+        return f'<img{before_src}src="{src}"{opt_str}{after_src}>'
     
     # Aplicar otimizações
     content = re.sub(img_pattern, optimize_img_format, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
+    
+    print(f"   ✅ Formatos de imagem otimizados ({stats['pictures']} imagens com {stats['sources']} "
+          f"fontes AVIF/WebP)")
+
+def add_intrinsic_dimensions():
+    """Adiciona width/height e aspect-ratio medidos para evitar deslocamento de layout"""
+    print("📏 Adicionando dimensões intrínsecas às imagens...")
+    
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
+    
+    # Medidas do índice de mídia: <img>, <source> de direção de arte e fundos
+    content, image_stats = size_images(content, base_directory)
+    content, background_stats = aspect_ratio_document(content, base_directory)
     
-    print("   ✅ Formatos de imagem otimizados")
+    save_document(content)
+    
+    print(f"   ✅ {image_stats['images']} imagens e {image_stats['sources']} fontes com width/height, "
+          f"{image_stats['corrected']} proporções corrigidas, {background_stats['containers']} containers com aspect-ratio")
+    if image_stats['unmeasured']:
+        print(f"   ⚠️ {image_stats['unmeasured']} imagens sem medida no índice")
+
+def add_image_placeholders():
+    """Adiciona prévias borradas (LQIP) às imagens com lazy loading"""
+    print("🌫️ Adicionando placeholders às imagens com lazy loading...")
+    
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
+    
+    # Prévias de poucos bytes, geradas uma vez por hash da imagem
+    budget = placeholder_budget()
+    try:
+        generate_placeholders(lazy_images(content, base_directory), budget)
+    except ImportError:
+        # Sem o Pillow só as prévias já geradas (no inventário) entram no HTML
+        print("   ⚠️ Pillow não instalado: novas prévias não geradas")
+    content, stats = placeholder_document(content, base_directory, budget)
+    
+    save_document(content)
+    
+    print(f"   ✅ {stats['images']} placeholders ({stats['previews']} com prévia, "
+          f"{round(stats['bytes'] / 1024, 1)} KB no HTML)")
+
+def generate_responsive_variants():
+    """Gera a escada de larguras das imagens usadas nas páginas"""
+    print("📐 Gerando variantes de largura das imagens...")
+    
+    # Só larguras menores que a original; as já geradas vêm do cache pelo hash
+    paths = page_images()
+    try:
+        stats = generate_variants(paths, width_ladder())
+    except ImportError:
+        print("   ⚠️ Pillow não instalado: redimensionamento ignorado")
+        return
+    
+    print(f"   ✅ {stats['generated']} variantes geradas para {stats['images']} de {len(paths)} imagens")
+    if stats['cached']:
+        print(f"   ♻️ {stats['cached']} variantes reaproveitadas do cache")
 
 def add_responsive_images():
     """Adiciona suporte a imagens responsivas"""
     print("📱 Adicionando suporte a imagens responsivas...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Padrão para imagens grandes que precisam de versões responsivas
-    large_img_pattern = r'<img([^>]*?)src="([^"]*(?:banner|depoimento|png))"([^>]*?)>'
-    
-    def add_responsive_attrs(match):
-        before_src = match.group(1)
-        src = match.group(2)
-        after_src = match.group(3)
-        
-        # Pular se já tem srcset
-        if 'srcset=' in before_src + after_src:
-            return match.group(0)
-        
-        # Gerar srcset para imagens grandes
-        base_path = re.sub(r'\.[^.]+$', '', src)
-        ext = src.split('.')[-1]
-        
-        srcset_candidates = [
-            f"{base_path}-300x300.{ext} 300w",
-            f"{base_path}-600x600.{ext} 600w",
-            f"{base_path}-1024x1024.{ext} 1024w",
-            f"{src} 1200w"
-        ]
-        
-        # Verificar quais versões existem
-        existing_srcset = []
-        for candidate in srcset_candidates:
-            img_path = candidate.split(' ')[0].lstrip('./')
-            if os.path.exists(img_path) or candidate.endswith(f"{src} 1200w"):
-                existing_srcset.append(candidate)
-        
-        if len(existing_srcset) > 1:
-            srcset = ', '.join(existing_srcset)
-            sizes = 'sizes="(max-width: 300px) 300px, (max-width: 600px) 600px, (max-width: 1024px) 1024px, 1200px"'
-            return f'<img{before_src}src="{src}" srcset="{srcset}" {sizes}{after_src}>'
-        
-        return match.group(0)
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
     
-    # Aplicar responsividade
-    content = re.sub(large_img_pattern, add_responsive_attrs, content)
+    # srcset com as variantes geradas e sizes calculado das colunas do Elementor
+    content, stats = responsive_document(content, base_directory, width_ladder())
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
-    print("   ✅ Imagens responsivas configuradas")
+    print(f"   ✅ Imagens responsivas configuradas ({stats['images']} imagens, {stats['candidates']} larguras)")
 
 def optimize_video_loading():
     """Otimiza carregamento de vídeos"""
     print("🎥 Otimizando carregamento de vídeos...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Encontrar vídeos grandes
     video_pattern = r'<video([^>]*?)>'
@@ -181,8 +217,7 @@ def optimize_video_loading():
     # Aplicar otimizações
     content = re.sub(video_pattern, optimize_video_attrs, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Vídeos otimizados")
 
@@ -190,8 +225,7 @@ def add_image_optimization_meta():
     """Adiciona meta tags para otimização de imagens"""
     print("🏷️ Adicionando meta tags de otimização...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Meta tags para otimização de imagens
     image_meta = '''
@@ -208,8 +242,7 @@ def add_image_optimization_meta():
         content
     )
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Meta tags de otimização adicionadas")
 
@@ -276,21 +309,17 @@ img.loaded {
 }
 '''
     
-    # Criar arquivo CSS de otimização
-    os.makedirs('wp-content/uploads', exist_ok=True)
-    with open('wp-content/uploads/image-optimization.css', 'w', encoding='utf-8') as f:
-        f.write(optimization_css)
+    # Criar arquivo CSS de otimização (compartilhado por todas as páginas)
+    write_shared_file('wp-content/uploads/image-optimization.css', optimization_css)
     
     # Adicionar link no HTML
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Adicionar link para CSS de otimização
     css_link = '<link rel="stylesheet" href="./wp-content/uploads/image-optimization.css">\n'
     content = re.sub(r'(</head>)', css_link + r'\1', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ CSS de otimização criado e vinculado")
 
@@ -298,8 +327,7 @@ def create_media_optimization_report():
     """Cria relatório das otimizações de mídia"""
     print("📊 Gerando relatório de otimização de mídia...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Analisar otimizações aplicadas
     total_images = len(re.findall(r'<img', content))
@@ -345,20 +373,24 @@ def main():
     
     # Backup do arquivo original
     if not os.path.exists('index_media_backup.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = load_document()
         with open('index_media_backup.html', 'w', encoding='utf-8') as f:
             f.write(content)
         print("📋 Backup criado: index_media_backup.html")
     
     # Executar otimizações
     large_images, total_size = analyze_large_images()
-    optimize_image_formats()
+    generate_responsive_variants()
+    encode_image_variants()
     add_responsive_images()
+    optimize_image_formats()
+    add_intrinsic_dimensions()
+    add_image_placeholders()
     optimize_video_loading()
     add_image_optimization_meta()
     create_image_optimization_css()
     report = create_media_optimization_report()
+    save_cache()
     
     print("\n🎉 OTIMIZAÇÃO DE MÍDIA COMPLETA!")
     print("📊 Resultados:")
@@ -371,7 +403,8 @@ def main():
     if large_images:
         print(f"\n🚨 Imagens grandes encontradas:")
         for img in large_images[:3]:
-            print(f"   📁 {img['path']}: {img['size_kb']} KB")
+            size = f" ({img['width']}x{img['height']})" if img['width'] else ''
+            print(f"   📁 {img['path']}: {img['size_kb']} KB{size}")
 
 if __name__ == "__main__":
     main()
@@ -8,13 +8,14 @@ import re
 import os
 import json
 
+from pass_engine import load_document, save_document
+
 def fix_external_dependencies():
     """Fix remaining external dependencies in index.html"""
     print("🔧 Fixing external dependencies...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Fix remaining external URLs
     fixes = [
@@ -38,8 +39,7 @@ def fix_external_dependencies():
         content = re.sub(pattern, replacement, content)
     
     # Write back the fixed content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("✅ External dependencies fixed!")
 
@@ -48,8 +48,7 @@ def optimize_css_loading():
     print("🎨 Optimizing CSS loading...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Find all CSS files that can be combined
     css_patterns = [
@@ -65,8 +64,7 @@ def optimize_css_loading():
         content = re.sub(pattern, replacement, content)
     
     # Write back the optimized content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("✅ CSS loading optimized!")
 
@@ -75,8 +73,7 @@ def optimize_javascript_loading():
     print("⚡ Optimizing JavaScript loading...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # JavaScript optimizations
     js_optimizations = [
@@ -95,8 +92,7 @@ def optimize_javascript_loading():
         content = re.sub(pattern, replacement, content)
     
     # Write back the optimized content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("✅ JavaScript loading optimized!")
 
@@ -105,8 +101,7 @@ def add_performance_meta_tags():
     print("🚀 Adding performance meta tags...")
     
     # Read the HTML file
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Performance meta tags to add
     performance_tags = '''
@@ -125,8 +120,7 @@ def add_performance_meta_tags():
     )
     
     # Write back the content
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("✅ Performance meta tags added!")
 
@@ -135,8 +129,7 @@ def create_optimization_report():
     print("📊 Creating optimization report...")
     
     # Read the HTML file to analyze
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Count resources
     css_count = len(re.findall(r'<link[^>]*\.css[^>]*>', content))
@@ -8,101 +8,31 @@ import re
 import os
 from pathlib import Path
 
+from pass_engine import DEFAULT_DOCUMENT, active_document_path, load_document, save_document
+from critical_css import extract_critical_css
+
 def optimize_critical_css():
     """Otimiza o carregamento de CSS crítico vs não-crítico"""
     print("🎨 Otimizando CSS crítico...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # CSS crítico que deve carregar imediatamente (above-the-fold)
-    critical_css_patterns = [
-        'elementor/assets/css/frontend.min.css',
-        'themes/hello-elementor/style.css', 
-        'uploads/elementor/css/post-16.css',
-        'uploads/elementor/css/post-8.css'
-    ]
-    
-    # CSS não-crítico que pode ser carregado de forma assíncrona
-    non_critical_patterns = [
-        # WooCommerce (não usado above-the-fold)
-        (r'(<link[^>]*woocommerce[^>]*\.css[^>]*>)', 'async'),
-        # FontAwesome (ícones não críticos)
-        (r'(<link[^>]*fontawesome[^>]*\.css[^>]*>)', 'async'),
-        # Widgets específicos
-        (r'(<link[^>]*widget-testimonial[^>]*\.css[^>]*>)', 'async'),
-        (r'(<link[^>]*widget-icon[^>]*\.css[^>]*>)', 'async'),
-        (r'(<link[^>]*widget-video[^>]*\.css[^>]*>)', 'async'),
-        # Animações
-        (r'(<link[^>]*fadeIn[^>]*\.css[^>]*>)', 'async'),
-        (r'(<link[^>]*fadeInUp[^>]*\.css[^>]*>)', 'async'),
-    ]
-    
-    # Converter CSS não-crítico para carregamento assíncrono
-    for pattern, load_type in non_critical_patterns:
-        def replace_css(match):
-            css_link = match.group(1)
-            # Extrair href
-            href_match = re.search(r'href=[\'"]([^\'"]*)[\'"]', css_link)
-            if href_match:
-                href = href_match.group(1)
-                return f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'" crossorigin>'
-            return css_link
-        
-        content = re.sub(pattern, replace_css, content)
-    
-    # Adicionar CSS crítico inline para elementos above-the-fold
-    critical_inline_css = """
-<style>
-/* Critical CSS - Above the fold */
-.elementor-element-f273e14 {
-    min-height: 100vh;
-    background: linear-gradient(45deg, #ff6b9d, #c44569);
-}
-.ekit-heading--title {
-    font-size: 2.5rem;
-    font-weight: 700;
-    color: white;
-    text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-}
-.elementor-button {
-    background: #ff6b9d;
-    color: white;
-    padding: 15px 30px;
-    border-radius: 25px;
-    text-decoration: none;
-    display: inline-block;
-    transition: all 0.3s ease;
-}
-.elementor-button:hover {
-    background: #c44569;
-    transform: translateY(-2px);
-}
-/* Hide non-critical content initially */
-.elementor-testimonial, .elementor-accordion {
-    opacity: 0;
-    transition: opacity 0.3s ease;
-}
-.loaded .elementor-testimonial, .loaded .elementor-accordion {
-    opacity: 1;
-}
-</style>
-"""
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
     
-    # Inserir CSS crítico antes do fechamento do head
-    content = re.sub(r'</head>', critical_inline_css + '</head>', content)
+    # Regras que casam com o cabeçalho e o banner vão inline; as folhas locais
+    # passam a carregar de forma assíncrona
+    content, stats = extract_critical_css(content, base_directory)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
-    print("   ✅ CSS crítico otimizado")
+    print(f"   ✅ CSS crítico: {round(stats['critical_bytes'] / 1024, 1)} KB inline "
+          f"(de {round(stats['stylesheet_bytes'] / 1024, 1)} KB em {stats['stylesheets']} folhas)")
+    print(f"   ✅ {stats['links_async']} folhas de estilo carregadas de forma assíncrona")
 
 def optimize_javascript_loading():
     """Otimiza o carregamento de JavaScript para reduzir bloqueio"""
     print("⚡ Otimizando carregamento de JavaScript...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # JavaScript crítico (deve carregar imediatamente)
     critical_js = [
@@ -149,8 +79,7 @@ def optimize_javascript_loading():
         moved_scripts = '\n'.join(scripts_to_move)
         content = re.sub(r'</body>', f'{moved_scripts}\n</body>', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print(f"   ✅ {len(scripts_to_move)} scripts otimizados")
 
@@ -158,8 +87,7 @@ def add_resource_preloading():
     """Adiciona preload para recursos críticos"""
     print("🚀 Adicionando preload para recursos críticos...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Recursos críticos para preload
     preload_resources = """
@@ -178,8 +106,7 @@ def add_resource_preloading():
         content
     )
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Preload adicionado para recursos críticos")
 
@@ -187,20 +114,21 @@ def optimize_font_loading():
     """Otimiza o carregamento de fontes"""
     print("🔤 Otimizando carregamento de fontes...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Fontes que podem ser carregadas de forma assíncrona
     font_patterns = [
-        (r'(<link[^>]*lato\.css[^>]*>)', 'swap'),
-        (r'(<link[^>]*opensans\.css[^>]*>)', 'swap'),
-        (r'(<link[^>]*roboto\.css[^>]*>)', 'swap'),
-        (r'(<link[^>]*montserrat\.css[^>]*>)', 'swap'),
+        (r'(?<!<noscript>)(<link[^>]*lato\.css[^>]*>)', 'swap'),
+        (r'(?<!<noscript>)(<link[^>]*opensans\.css[^>]*>)', 'swap'),
+        (r'(?<!<noscript>)(<link[^>]*roboto\.css[^>]*>)', 'swap'),
+        (r'(?<!<noscript>)(<link[^>]*montserrat\.css[^>]*>)', 'swap'),
     ]
     
     for pattern, display_type in font_patterns:
         def optimize_font(match):
             font_link = match.group(1)
+            if 'preload' in font_link:
+                return font_link
             # Adicionar font-display: swap via preload
             href_match = re.search(r'href=[\'"]([^\'"]*)[\'"]', font_link)
             if href_match:
@@ -210,8 +138,7 @@ def optimize_font_loading():
         
         content = re.sub(pattern, optimize_font, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Fontes otimizadas com font-display: swap")
 
@@ -254,14 +181,12 @@ def add_performance_script():
 </script>
 """
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Adicionar script antes do fechamento do body
     content = re.sub(r'</body>', performance_script + '</body>', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Script de performance adicionado")
 
@@ -271,8 +196,7 @@ def main():
     
     # Backup do arquivo original
     if not os.path.exists('index_backup.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = load_document()
         with open('index_backup.html', 'w', encoding='utf-8') as f:
             f.write(content)
         print("📋 Backup criado: index_backup.html")
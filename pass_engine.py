@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - MOTOR DE PASSES
+Carrega o index.html uma única vez, executa cada otimização como um passe sobre
+o documento em memória e grava o resultado uma única vez no final
+"""
+
+import os
+import sys
+import importlib
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from build_cache import (cache_key, content_hash, lookup, store, save_cache, cache_enabled,
+                         set_cache_enabled, take_pending_entries, merge_entries)
+from asset_inventory import install_inventory, load_inventory, save_inventory, update_file
+from pass_trace import (TRACE_FILE, CHROME_TRACE_FILE, add_pass_record, measure_detached_pass, measure_pass,
+                        start_trace, stop_trace, trace_requested, tracing_enabled, write_trace,
+                        write_chrome_trace, print_trace_summary)
+
+# Quando executado como script, os passes importam 'pass_engine' e precisam
+# enxergar a mesma sessão ativa deste módulo
+sys.modules.setdefault('pass_engine', sys.modules[__name__])
+
+DEFAULT_DOCUMENT = 'index.html'
+
+# Documento compartilhado da sessão ativa (None = modo script, lê/grava no disco)
+_active_document = None
+
+# Registro de passes na ordem de execução
+PASS_REGISTRY = []
+
+# Pipeline padrão: (módulo, função, tipo) na mesma ordem dos main() de cada script.
+# 'document' = função sem argumentos que usa load_document/save_document
+# 'transform' = função que recebe e devolve o conteúdo HTML
+DEFAULT_PASSES = [
+    ('optimize_render_blocking', 'optimize_critical_css', 'document'),
+    ('optimize_render_blocking', 'optimize_javascript_loading', 'document'),
+    ('optimize_render_blocking', 'add_resource_preloading', 'document'),
+    ('optimize_render_blocking', 'optimize_font_loading', 'document'),
+    ('optimize_render_blocking', 'add_performance_script', 'document'),
+    ('implement_lazy_loading', 'implement_image_lazy_loading', 'document'),
+    ('implement_lazy_loading', 'implement_video_lazy_loading', 'document'),
+    ('implement_lazy_loading', 'add_intersection_observer', 'document'),
+    ('implement_lazy_loading', 'add_lazy_loading_css', 'document'),
+    ('implement_lazy_loading', 'optimize_background_images', 'document'),
+    ('minify_assets', 'minify_inline_css', 'document'),
+    ('minify_assets', 'remove_unused_css', 'document'),
+    ('minify_assets', 'deduplicate_css', 'document'),
+    ('minify_assets', 'optimize_css_files', 'document'),
+    ('minify_assets', 'remove_unused_javascript', 'document'),
+    ('minify_assets', 'optimize_js_files', 'document'),
+    ('minify_assets', 'minify_inline_javascript', 'document'),
+    ('configure_caching', 'create_htaccess_cache_rules', 'document'),
+    ('configure_caching', 'add_cache_meta_tags', 'document'),
+    ('configure_caching', 'register_service_worker', 'document'),
+    ('configure_caching', 'add_preload_hints', 'document'),
+    ('optimize_media', 'generate_responsive_variants', 'document'),
+    ('optimize_media', 'encode_image_variants', 'document'),
+    ('optimize_media', 'add_responsive_images', 'document'),
+    ('optimize_media', 'optimize_image_formats', 'document'),
+    ('optimize_media', 'add_intrinsic_dimensions', 'document'),
+    ('optimize_media', 'add_image_placeholders', 'document'),
+    ('optimize_media', 'optimize_video_loading', 'document'),
+    ('optimize_media', 'add_image_optimization_meta', 'document'),
+    ('optimize_media', 'create_image_optimization_css', 'document'),
+    ('reduce_payload', 'optimize_video_delivery', 'document'),
+    ('reduce_payload', 'implement_progressive_loading', 'document'),
+    ('reduce_payload', 'optimize_css_delivery', 'document'),
+    ('reduce_payload', 'remove_unused_resources', 'document'),
+    ('reduce_payload', 'compress_inline_content', 'document'),
+    ('reduce_payload', 'create_resource_bundling', 'document'),
+    ('reduce_payload', 'inline_small_assets', 'document'),
+    ('improve_accessibility', 'fix_heading_structure', 'document'),
+    ('improve_accessibility', 'improve_color_contrast', 'document'),
+    ('improve_accessibility', 'add_alt_text_to_images', 'document'),
+    ('improve_accessibility', 'add_video_captions', 'document'),
+    ('improve_accessibility', 'improve_keyboard_navigation', 'document'),
+    ('improve_accessibility', 'add_aria_labels', 'document'),
+    ('improve_accessibility', 'add_accessibility_meta', 'document'),
+    ('wordpress_cleanup_and_seo', 'remove_wordpress_identifiers', 'transform'),
+    ('wordpress_cleanup_and_seo', 'add_seo_enhancements', 'transform'),
+    ('wordpress_cleanup_and_seo', 'add_structured_data_enhancements', 'transform'),
+    ('wordpress_cleanup_and_seo', 'add_image_alt_attributes', 'transform'),
+]
+
+# Recurso que representa o documento HTML da sessão
+DOCUMENT = 'document'
+
+# O que cada passe lê e grava, quando não é só o documento:
+# nome -> (recursos lidos, recursos gravados). 'css-files' = arquivos .css do
+# site, 'js-files' = arquivos .js do site, 'media' = imagens e vídeos,
+# 'htaccess' = regras do servidor
+PASS_RESOURCES = {
+    'optimize_render_blocking.optimize_critical_css': ({DOCUMENT, 'css-files'}, {DOCUMENT}),
+    'minify_assets.optimize_css_files': ({'css-files'}, {'css-files'}),
+    'minify_assets.remove_unused_css': ({DOCUMENT, 'css-files'}, {DOCUMENT, 'css-files'}),
+    'minify_assets.deduplicate_css': ({DOCUMENT, 'css-files'}, {DOCUMENT, 'css-files'}),
+    'minify_assets.remove_unused_javascript': ({DOCUMENT, 'js-files'}, {DOCUMENT}),
+    'minify_assets.optimize_js_files': ({'js-files'}, {'js-files'}),
+    'configure_caching.create_htaccess_cache_rules': (set(), {'htaccess'}),
+    'optimize_media.generate_responsive_variants': ({'media'}, {'media'}),
+    'optimize_media.encode_image_variants': ({'media'}, {'media'}),
+    'optimize_media.optimize_image_formats': ({DOCUMENT, 'media'}, {DOCUMENT}),
+    'optimize_media.add_responsive_images': ({DOCUMENT, 'media'}, {DOCUMENT}),
+    'optimize_media.add_intrinsic_dimensions': ({DOCUMENT, 'css-files', 'media'}, {DOCUMENT}),
+    'optimize_media.add_image_placeholders': ({DOCUMENT, 'media'}, {DOCUMENT}),
+    'optimize_media.optimize_video_loading': ({DOCUMENT, 'media'}, {DOCUMENT}),
+    'optimize_media.create_image_optimization_css': ({DOCUMENT}, {DOCUMENT, 'css-files'}),
+    'reduce_payload.optimize_video_delivery': ({DOCUMENT, 'media'}, {DOCUMENT}),
+    'reduce_payload.create_resource_bundling': ({DOCUMENT, 'css-files'}, {DOCUMENT, 'css-files'}),
+    'reduce_payload.inline_small_assets': ({DOCUMENT, 'css-files', 'js-files', 'media'}, {DOCUMENT}),
+    'improve_accessibility.improve_color_contrast': ({DOCUMENT}, {DOCUMENT, 'css-files'}),
+}
+
+# Versão de cada passe cujo código mudou desde a criação do cache (padrão 1).
+# Incrementar invalida as entradas em cache do passe
+PASS_VERSIONS = {
+    'optimize_render_blocking.optimize_critical_css': 2,
+    'optimize_render_blocking.optimize_font_loading': 2,
+    'minify_assets.minify_inline_css': 3,
+    'minify_assets.remove_unused_javascript': 3,
+    'implement_lazy_loading.optimize_background_images': 2,
+    'optimize_media.optimize_image_formats': 2,
+    'optimize_media.add_responsive_images': 2,
+    'minify_assets.minify_inline_javascript': 2,
+    'reduce_payload.optimize_css_delivery': 2,
+    'reduce_payload.remove_unused_resources': 3,
+    'reduce_payload.compress_inline_content': 2,
+}
+
+# Passes que não tocam a página: no modo site rodam uma única vez, antes das
+# páginas, e no pipeline rodam em paralelo com os passes do documento
+SITE_PASSES = {name for name, (reads, writes) in PASS_RESOURCES.items()
+               if DOCUMENT not in reads | writes}
+
+# Recursos somente leitura compartilhados entre os passes (e entre processos no
+# modo site): nome -> função sem argumentos que constrói o recurso
+SHARED_RESOURCES = {}
+
+# Recursos já construídos neste processo
+_shared = {}
+
+# Nome -> função que entrega ao módulo dono um recurso recebido de outro processo
+_installers = {}
+
+def active_document_path():
+    """Caminho do documento da sessão ativa, ou None fora de uma sessão"""
+    return _active_document['path'] if _active_document is not None else None
+
+def load_document(path=None):
+    """Retorna o HTML do documento ativo, ou lê do disco fora de uma sessão"""
+    if _active_document is not None and path in (None, _active_document['path']):
+        return _active_document['content']
+
+    with open(path or DEFAULT_DOCUMENT, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def save_document(content, path=None):
+    """Atualiza o documento ativo, ou grava no disco fora de uma sessão"""
+    if _active_document is not None and path in (None, _active_document['path']):
+        _active_document['content'] = content
+        return
+
+    with open(path or DEFAULT_DOCUMENT, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def write_shared_file(path, content):
+    """Grava um arquivo compartilhado por várias páginas de forma atômica, só se mudou"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+    update_file(path)
+
+def register_shared_resource(name, builder, install=None):
+    """Registra um recurso somente leitura, construído uma vez e compartilhado.
+    install(recurso), se houver, instala no módulo dono o recurso vindo de outro processo"""
+    SHARED_RESOURCES[name] = builder
+    if install is not None:
+        _installers[name] = install
+
+def build_shared_resources():
+    """Constrói todos os recursos registrados e retorna o dicionário resultante"""
+    for name, builder in SHARED_RESOURCES.items():
+        if name not in _shared:
+            _shared[name] = builder()
+    return dict(_shared)
+
+def install_shared_resources(resources):
+    """Instala recursos já construídos em outro processo"""
+    _shared.update(resources)
+    for name, resource in resources.items():
+        if name in _installers:
+            _installers[name](resource)
+
+# Os processos de trabalho recebem o inventário pronto em vez de varrer o site de novo
+register_shared_resource('asset_inventory', load_inventory, install_inventory)
+
+def shared_resource(name):
+    """Retorna um recurso compartilhado, construindo-o na primeira vez"""
+    if name not in _shared:
+        _shared[name] = SHARED_RESOURCES[name]()
+    return _shared[name]
+
+@contextmanager
+def document_session(path=DEFAULT_DOCUMENT):
+    """Mantém o documento em memória durante a sessão e grava uma única vez no final"""
+    global _active_document
+
+    if _active_document is not None:
+        raise RuntimeError(f"Sessão já ativa para {_active_document['path']}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    document = {
+        'path': path,
+        'content': content,
+        'original_size': len(content),
+        'passes_run': [],
+        'passes_cached': [],
+    }
+    _active_document = document
+
+    try:
+        yield document
+    finally:
+        _active_document = None
+
+    if document['content'] != content:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(document['content'])
+
+def register_pass(module, function, kind='document', version=1, cacheable=None,
+                  reads=None, writes=None):
+    """Registra uma função existente como passe do pipeline"""
+    if kind not in ('document', 'transform'):
+        raise ValueError(f"Tipo de passe inválido: {kind}")
+
+    name = f'{module}.{function}'
+    default_reads, default_writes = PASS_RESOURCES.get(name, ({DOCUMENT}, {DOCUMENT}))
+    reads = set(reads if reads is not None else default_reads)
+    writes = set(writes if writes is not None else default_writes)
+
+    # Só o documento entra na chave do cache: passes que leem ou gravam
+    # outros recursos sempre executam (optimize_css_files tem cache próprio por arquivo)
+    if cacheable is None:
+        cacheable = reads | writes <= {DOCUMENT}
+
+    entry = {
+        'name': name,
+        'module': module,
+        'function': function,
+        'kind': kind,
+        'version': version,
+        'cacheable': cacheable,
+        'reads': sorted(reads),
+        'writes': sorted(writes),
+    }
+    PASS_REGISTRY.append(entry)
+    return entry
+
+def register_default_passes():
+    """Registra o pipeline padrão (uma única vez)"""
+    if not PASS_REGISTRY:
+        for module, function, kind in DEFAULT_PASSES:
+            register_pass(module, function, kind, PASS_VERSIONS.get(f'{module}.{function}', 1))
+    return PASS_REGISTRY
+
+def resolve_pass(entry):
+    """Importa o módulo do passe e retorna a função correspondente"""
+    module = importlib.import_module(entry['module'])
+    return getattr(module, entry['function'])
+
+def run_pass(entry, document):
+    """Executa um único passe sobre o documento ativo, ou reaproveita o resultado do cache"""
+    with measure_pass(entry['name'], document) as record:
+        key = None
+        if entry.get('cacheable', True):
+            key = cache_key(entry['name'], entry['version'], content_hash(document['content']))
+            cached = lookup(key)
+            if cached is not None:
+                document['content'] = cached
+                document['passes_run'].append(entry['name'])
+                document['passes_cached'].append(entry['name'])
+                if record is not None:
+                    record['cached'] = True
+                return
+
+        function = resolve_pass(entry)
+
+        if entry['kind'] == 'transform':
+            document['content'] = function(document['content'])
+        else:
+            function()
+
+        if key is not None:
+            store(key, document['content'])
+
+        document['passes_run'].append(entry['name'])
+
+def build_pass_graph(passes):
+    """Dependências de cada passe: os anteriores que gravam o que ele lê ou grava,
+    ou que leem o que ele grava. Passes sem conflito podem rodar ao mesmo tempo"""
+    dependencies = []
+
+    for index, entry in enumerate(passes):
+        reads, writes = set(entry['reads']), set(entry['writes'])
+        dependencies.append({
+            earlier for earlier in range(index)
+            if set(passes[earlier]['writes']) & (reads | writes)
+            or set(passes[earlier]['reads']) & writes
+        })
+
+    return dependencies
+
+def run_detached_pass(entry, cache_enabled, traced=False):
+    """Executa num processo separado um passe que não toca o documento.
+    Retorna (entradas novas do cache, registro do trace ou None)"""
+    set_cache_enabled(cache_enabled)
+    record = None
+    if traced:
+        with measure_detached_pass(entry['name']) as record:
+            resolve_pass(entry)()
+    else:
+        resolve_pass(entry)()
+
+    # O índice do cache é gravado só pelo processo principal
+    return take_pending_entries(), record
+
+def run_scheduled(passes, document, workers):
+    """Executa os passes respeitando o grafo de dependências.
+    Passes do documento rodam neste processo, na ordem do registro; os demais
+    rodam num pool de processos assim que suas dependências terminam"""
+    dependencies = build_pass_graph(passes)
+    detached = [DOCUMENT not in set(entry['reads']) | set(entry['writes']) for entry in passes]
+
+    done = set()
+    started = set()
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while len(done) < len(passes):
+            ready = [index for index in range(len(passes))
+                     if index not in started and dependencies[index] <= done]
+
+            for index in ready:
+                if detached[index]:
+                    started.add(index)
+                    running[pool.submit(run_detached_pass, passes[index], cache_enabled(),
+                                        tracing_enabled())] = index
+
+            inline = [index for index in ready if not detached[index]]
+            if inline:
+                index = inline[0]
+                started.add(index)
+                run_pass(passes[index], document)
+                done.add(index)
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = running.pop(future)
+                entries, record = future.result()
+                merge_entries(entries)
+                add_pass_record(record)
+                document['passes_run'].append(passes[index]['name'])
+                done.add(index)
+
+    # Ordem determinística, independente de qual processo terminou primeiro
+    order = {entry['name']: index for index, entry in enumerate(passes)}
+    document['passes_run'].sort(key=order.get)
+
+def run_pipeline(path=DEFAULT_DOCUMENT, passes=None, persist_cache=True, workers=None):
+    """Carrega o documento, aplica todos os passes e grava o resultado uma vez.
+    Com workers > 1, passes independentes rodam em paralelo"""
+    passes = passes if passes is not None else register_default_passes()
+
+    with document_session(path) as document:
+        if workers and workers > 1:
+            run_scheduled(passes, document, workers)
+        else:
+            for entry in passes:
+                run_pass(entry, document)
+
+    if persist_cache:
+        # Importado aqui: css_purge depende do site_pipeline, que depende deste módulo
+        from css_purge import remove_stale_copies
+        remove_stale_copies()
+        save_cache()
+        save_inventory()
+    return document
+
+def parse_option(name, default=None):
+    """Lê uma opção '--nome valor' da linha de comando"""
+    if name in sys.argv:
+        position = sys.argv.index(name)
+        if position + 1 < len(sys.argv):
+            return sys.argv[position + 1]
+    return default
+
+def main():
+    """Executa o pipeline completo sobre o index.html
+    (--no-cache refaz todos os passes, --trace/--chrome-trace medem cada passe,
+    --workers N roda passes independentes em paralelo)"""
+    print("🎯 PIPELINE DE OTIMIZAÇÃO EM PASSE ÚNICO - PEACOCK COSMÉTICOS\n")
+
+    if not os.path.exists('index_pipeline_backup.html'):
+        with open(DEFAULT_DOCUMENT, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open('index_pipeline_backup.html', 'w', encoding='utf-8') as f:
+            f.write(content)
+        print("📋 Backup criado: index_pipeline_backup.html")
+
+    if trace_requested():
+        start_trace()
+
+    workers = parse_option('--workers')
+    document = run_pipeline(workers=int(workers) if workers else None)
+
+    print("\n🎉 PIPELINE COMPLETO!")
+    print("📊 Resultados:")
+    print(f"   🔁 Passes executados: {len(document['passes_run'])}")
+    print(f"   ♻️ Passes reaproveitados do cache: {len(document['passes_cached'])}")
+    print(f"   📄 Tamanho original: {round(document['original_size'] / 1024, 1)} KB")
+    print(f"   📄 Tamanho final: {round(len(document['content']) / 1024, 1)} KB")
+    print("   💾 index.html lido e gravado apenas uma vez")
+
+    trace = stop_trace()
+    if trace is not None:
+        write_trace(trace)
+        print(f"   📈 Trace salvo em {TRACE_FILE}")
+        if '--chrome-trace' in sys.argv:
+            write_chrome_trace(trace)
+            print(f"   📈 Trace do Chrome salvo em {CHROME_TRACE_FILE}")
+        print_trace_summary(trace)
+
+if __name__ == "__main__":
+    main()
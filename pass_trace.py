@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - INSTRUMENTAÇÃO DOS PASSES
+Mede cada passe do pipeline (tempo de parede, tempo de CPU do processo e dos
+subprocessos, pico de memória, bytes de entrada e saída e número de
+correspondências de regex) e grava um trace JSON e, opcionalmente, um trace no
+formato do Chrome (chrome://tracing). Passes que rodam num processo de trabalho
+(--workers) são medidos lá e o registro volta ao processo principal
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:   # Windows: sem CPU dos subprocessos
+    resource = None
+
+TRACE_FILE = 'pipeline_trace.json'
+CHROME_TRACE_FILE = 'pipeline_trace.chrome.json'
+
+# Funções do módulo re contadas durante um passe. Padrões pré-compilados
+# (re.compile no nível do módulo) não passam por aqui e não são contados
+_REGEX_FUNCTIONS = ('sub', 'subn', 'findall', 'finditer', 'search', 'match', 'fullmatch')
+
+# Trace ativo (None = instrumentação desligada)
+_active_trace = None
+
+# Correspondências de regex do passe em andamento
+_regex_matches = {'count': 0}
+
+def tracing_enabled():
+    """Indica se há um trace sendo gravado"""
+    return _active_trace is not None
+
+def _counting(name, function, subn):
+    if name == 'sub':
+        def wrapper(*args, **kwargs):
+            result, matches = subn(*args, **kwargs)
+            _regex_matches['count'] += matches
+            return result
+    elif name == 'subn':
+        def wrapper(*args, **kwargs):
+            result = function(*args, **kwargs)
+            _regex_matches['count'] += result[1]
+            return result
+    elif name == 'findall':
+        def wrapper(*args, **kwargs):
+            result = function(*args, **kwargs)
+            _regex_matches['count'] += len(result)
+            return result
+    elif name == 'finditer':
+        def wrapper(*args, **kwargs):
+            for match in function(*args, **kwargs):
+                _regex_matches['count'] += 1
+                yield match
+    else:
+        def wrapper(*args, **kwargs):
+            result = function(*args, **kwargs)
+            if result is not None:
+                _regex_matches['count'] += 1
+            return result
+
+    wrapper.__wrapped__ = function
+    return wrapper
+
+def _install_regex_counters():
+    subn = re.subn
+    for name in _REGEX_FUNCTIONS:
+        setattr(re, name, _counting(name, getattr(re, name), subn))
+
+def _remove_regex_counters():
+    for name in _REGEX_FUNCTIONS:
+        setattr(re, name, getattr(re, name).__wrapped__)
+
+def start_trace():
+    """Liga a instrumentação para os próximos passes"""
+    global _active_trace
+
+    if _active_trace is not None:
+        raise RuntimeError("Trace já ativo")
+
+    _active_trace = {
+        'started_at': time.time(),
+        'start': time.perf_counter(),
+        'passes': [],
+    }
+    tracemalloc.start()
+    _install_regex_counters()
+
+def stop_trace():
+    """Desliga a instrumentação e retorna o trace coletado"""
+    global _active_trace
+
+    trace = _active_trace
+    if trace is None:
+        return None
+
+    _remove_regex_counters()
+    tracemalloc.stop()
+    _active_trace = None
+
+    trace['total_ms'] = round((time.perf_counter() - trace.pop('start')) * 1000, 3)
+    return trace
+
+def _size(content):
+    return len(content.encode('utf-8'))
+
+def _cpu_times():
+    # (CPU deste processo, CPU dos subprocessos já encerrados e aguardados), em segundos.
+    # Pools de processos criados dentro do passe entram no segundo valor quando fecham
+    children = 0.0
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        children = usage.ru_utime + usage.ru_stime
+    return time.process_time(), children
+
+def _finish_record(record, wall_start, cpu_start):
+    own, children = _cpu_times()
+    record['wall_ms'] = round((time.perf_counter() - wall_start) * 1000, 3)
+    record['cpu_ms'] = round((own - cpu_start[0]) * 1000, 3)
+    record['child_cpu_ms'] = round((children - cpu_start[1]) * 1000, 3)
+
+@contextmanager
+def measure_pass(name, document):
+    """Mede um passe sobre o documento; não faz nada sem um trace ativo"""
+    if _active_trace is None:
+        yield None
+        return
+
+    record = {'name': name, 'bytes_in': _size(document['content'])}
+
+    _regex_matches['count'] = 0
+    tracemalloc.reset_peak()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    offset = time.perf_counter() - _active_trace['start']
+    wall_start = time.perf_counter()
+    cpu_start = _cpu_times()
+
+    try:
+        yield record
+    finally:
+        _finish_record(record, wall_start, cpu_start)
+        record['peak_memory_kb'] = round((tracemalloc.get_traced_memory()[1] - memory_before) / 1024, 1)
+        record['bytes_out'] = _size(document['content'])
+        record['regex_matches'] = _regex_matches['count']
+        record['start_ms'] = round(offset * 1000, 3)
+        _active_trace['passes'].append(record)
+
+@contextmanager
+def measure_detached_pass(name):
+    """Mede, dentro de um processo de trabalho, um passe que não toca o documento.
+    O registro é devolvido ao processo principal, que o junta ao trace com add_pass_record"""
+    record = {'name': name, 'pid': os.getpid(), 'started_at': time.time()}
+
+    counting = not hasattr(re.sub, '__wrapped__')
+    if counting:
+        _install_regex_counters()
+    tracing = not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+
+    _regex_matches['count'] = 0
+    tracemalloc.reset_peak()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    wall_start = time.perf_counter()
+    cpu_start = _cpu_times()
+
+    try:
+        yield record
+    finally:
+        _finish_record(record, wall_start, cpu_start)
+        record['peak_memory_kb'] = round((tracemalloc.get_traced_memory()[1] - memory_before) / 1024, 1)
+        record['regex_matches'] = _regex_matches['count']
+        if tracing:
+            tracemalloc.stop()
+        if counting:
+            _remove_regex_counters()
+
+def add_pass_record(record):
+    """Junta ao trace ativo o registro de um passe medido em outro processo"""
+    if _active_trace is None or record is None:
+        return
+    record = dict(record)
+    record['start_ms'] = round((record.pop('started_at') - _active_trace['started_at']) * 1000, 3)
+    _active_trace['passes'].append(record)
+
+def write_trace(trace, path=TRACE_FILE):
+    """Grava o trace em JSON"""
+    summary = {
+        'total_ms': trace['total_ms'],
+        'passes': len(trace['passes']),
+        'slowest': sorted(trace['passes'], key=lambda p: p['wall_ms'], reverse=True)[0]['name']
+                   if trace['passes'] else None,
+    }
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'summary': summary, **trace}, f, indent=2, ensure_ascii=False)
+
+def write_chrome_trace(trace, path=CHROME_TRACE_FILE):
+    """Grava o trace no formato de eventos do Chrome (abrir em chrome://tracing ou Perfetto)"""
+    events = []
+    for record in trace['passes']:
+        module = record['name'].split('.')[0]
+        events.append({
+            'name': record['name'],
+            'cat': module,
+            'ph': 'X',
+            'ts': int(record['start_ms'] * 1000),
+            'dur': int(record['wall_ms'] * 1000),
+            'pid': record.get('pid', os.getpid()),
+            'tid': 1,
+            'args': {key: value for key, value in record.items()
+                     if key not in ('name', 'start_ms', 'wall_ms', 'pid')},
+        })
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, indent=2, ensure_ascii=False)
+
+def print_trace_summary(trace, top=5):
+    """Mostra os passes mais lentos"""
+    print(f"\n⏱️ Passes mais lentos (total {round(trace['total_ms'], 1)} ms):")
+    for record in sorted(trace['passes'], key=lambda p: p['wall_ms'], reverse=True)[:top]:
+        cached = " (cache)" if record.get('cached') else ""
+        where = f"processo {record['pid']}" if 'pid' in record else \
+            f"{record['bytes_in']} → {record['bytes_out']} bytes"
+        print(f"   • {record['name']}: {record['wall_ms']} ms, CPU {record['cpu_ms']} ms "
+              f"(+{record['child_cpu_ms']} ms em subprocessos), pico {record['peak_memory_kb']} KB, "
+              f"{where}, {record['regex_matches']} regex{cached}")
+
+def trace_requested():
+    """Instrumentação pedida na linha de comando (--trace ou --chrome-trace)"""
+    return '--trace' in sys.argv or '--chrome-trace' in sys.argv
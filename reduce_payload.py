@@ -7,7 +7,12 @@ Otimiza o payload total de 15.473 KiB, especialmente vídeos grandes
 import os
 import re
 import json
-from pathlib import Path
+
+from pass_engine import DEFAULT_DOCUMENT, active_document_path, load_document, save_document, write_shared_file
+from html_stream import handler, count, compress_whitespace, drop_element, drop_emptied, rewrite_document
+from asset_inventory import find_files
+from css_bundle import bundle_document
+from asset_inline import inline_document
 
 def analyze_large_files():
     """Analisa arquivos grandes que contribuem para o payload"""
@@ -19,28 +24,19 @@ def analyze_large_files():
     # Extensões para analisar
     target_extensions = ['.mp4', '.webm', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.css', '.js']
     
-    for root, dirs, files in os.walk('.'):
-        # Pular diretórios desnecessários
-        if any(skip in root for skip in ['.git', 'node_modules', '__pycache__']):
-            continue
-            
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in target_extensions):
-                file_path = os.path.join(root, file)
-                try:
-                    file_size = os.path.getsize(file_path)
-                    total_size += file_size
-                    
-                    # Marcar arquivos grandes (>500KB)
-                    if file_size > 500 * 1024:
-                        large_files.append({
-                            'path': file_path,
-                            'size_kb': round(file_size / 1024, 1),
-                            'size_mb': round(file_size / (1024 * 1024), 2),
-                            'type': file.split('.')[-1].lower()
-                        })
-                except OSError:
-                    continue
+    # Arquivos vêm do inventário (sem varrer a árvore de novo)
+    for entry in find_files(extensions=tuple(target_extensions)):
+        file_size = entry['size']
+        total_size += file_size
+        
+        # Marcar arquivos grandes (>500KB)
+        if file_size > 500 * 1024:
+            large_files.append({
+                'path': entry['path'],
+                'size_kb': round(file_size / 1024, 1),
+                'size_mb': round(file_size / (1024 * 1024), 2),
+                'type': entry['path'].split('.')[-1].lower()
+            })
     
     # Ordenar por tamanho
     large_files.sort(key=lambda x: x['size_kb'], reverse=True)
@@ -54,8 +50,7 @@ def optimize_video_delivery():
     """Otimiza entrega de vídeos grandes"""
     print("🎥 Otimizando entrega de vídeos...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Encontrar vídeos no HTML
     video_pattern = r'<video([^>]*?)>(.*?)</video>'
@@ -103,8 +98,7 @@ def optimize_video_delivery():
     # Aplicar otimizações
     content = re.sub(video_pattern, optimize_video_tag, content, flags=re.DOTALL)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Vídeos otimizados para entrega eficiente")
 
@@ -170,14 +164,12 @@ def implement_progressive_loading():
 </script>
 """
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Adicionar script antes do fechamento do body
     content = re.sub(r'</body>', progressive_script + '</body>', content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ Carregamento progressivo implementado")
 
@@ -185,8 +177,7 @@ def optimize_css_delivery():
     """Otimiza entrega de CSS para reduzir payload inicial"""
     print("🎨 Otimizando entrega de CSS...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # CSS não crítico que pode ser carregado depois
     non_critical_css = [
@@ -199,10 +190,13 @@ def optimize_css_delivery():
     
     # Converter CSS não crítico para carregamento assíncrono
     for css_type in non_critical_css:
-        pattern = f'<link([^>]*{css_type}[^>]*\\.css[^>]*)>'
+        # Fallbacks em <noscript> e links já assíncronos ficam como estão
+        pattern = f'(?<!<noscript>)<link([^>]*{css_type}[^>]*\\.css[^>]*)>'
         
         def make_async(match):
             link_attrs = match.group(1)
+            if 'preload' in link_attrs:
+                return match.group(0)
             href_match = re.search(r'href=[\'"]([^\'"]*)[\'"]', link_attrs)
             if href_match:
                 href = href_match.group(1)
@@ -211,8 +205,7 @@ def optimize_css_delivery():
         
         content = re.sub(pattern, make_async, content)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_document(content)
     
     print("   ✅ CSS não crítico convertido para carregamento assíncrono")
 
@@ -220,30 +213,42 @@ def remove_unused_resources():
     """Remove recursos não utilizados"""
     print("🗑️ Removendo recursos não utilizados...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Recursos que podem ser removidos
-    unused_patterns = [
+    # Recursos que podem ser removidos (trecho da tag)
+    unused_scripts = [
         # Scripts de desenvolvimento
-        r'<script[^>]*astra-sites[^>]*>.*?</script>\s*',
-        r'<script[^>]*template-preview[^>]*>.*?</script>\s*',
-        # CSS não utilizados
-        r'<link[^>]*robotoslab[^>]*\.css[^>]*>\s*',
-        r'<link[^>]*playfairdisplay[^>]*\.css[^>]*>\s*',
+        'astra-sites',
+        'template-preview',
         # Scripts duplicados
-        r'<script[^>]*jquery-migrate[^>]*>.*?</script>\s*',
+        'jquery-migrate',
+    ]
+    unused_stylesheets = [
+        # CSS não utilizados
+        'robotoslab',
+        'playfairdisplay',
     ]
     
-    removed_count = 0
-    for pattern in unused_patterns:
-        matches = re.findall(pattern, content, flags=re.DOTALL)
-        if matches:
-            content = re.sub(pattern, '', content, flags=re.DOTALL)
-            removed_count += len(matches)
-    
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Tag a tag em vez de <script[^>]*...[^>]*>.*?</script> com DOTALL, que
+    # retrocede sobre a página inteira a cada <script>
+    def remove_script(token, context):
+        if any(marker in token['raw'] for marker in unused_scripts):
+            drop_element(context, 'script', trailing_whitespace=True)
+            count(context, 'removed')
+            return ''
+        return None
+    
+    def remove_stylesheet(token, context):
+        if '.css' in token['raw'] and any(marker in token['raw'] for marker in unused_stylesheets):
+            # <link> não tem fechamento: só os espaços seguintes saem junto
+            context['skip_whitespace'] = True
+            count(context, 'removed')
+            return ''
+        return None
+    
+    # O fallback em <noscript> de uma folha removida sai junto com ela
+    stats = rewrite_document([handler(remove_script, tags=('script',)),
+                              handler(remove_stylesheet, tags=('link',)),
+                              drop_emptied('noscript')])
+    removed_count = stats.get('removed', 0)
     
     print(f"   ✅ {removed_count} recursos não utilizados removidos")
 
@@ -251,65 +256,66 @@ def compress_inline_content():
     """Comprime conteúdo inline"""
     print("🗜️ Comprimindo conteúdo inline...")
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Comentários importantes são mantidos
+    important_comment = re.compile(r'Critical|Performance|Cache')
     
-    # Remover espaços em branco desnecessários
-    content = re.sub(r'\n\s*\n', '\n', content)  # Múltiplas linhas vazias
-    content = re.sub(r'>\s+<', '><', content)    # Espaços entre tags
-    content = re.sub(r'\s{2,}', ' ', content)    # Múltiplos espaços
+    def remove_comment(token, context):
+        if important_comment.search(token['raw']):
+            return None
+        count(context, 'comments')
+        return ''
     
-    # Remover comentários HTML desnecessários (manter os importantes)
-    content = re.sub(r'<!--(?!.*(?:Critical|Performance|Cache)).*?-->', '', content, flags=re.DOTALL)
+    # Espaços em branco (linhas vazias, espaços entre tags, múltiplos espaços)
+    # são compactados em streaming, antes da separação em tokens
+    stats = rewrite_document([handler(remove_comment, types=('comment',))],
+                             text_filters=[compress_whitespace])
     
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    print("   ✅ Conteúdo inline comprimido")
+    print(f"   ✅ Conteúdo inline comprimido ({stats.get('comments', 0)} comentários removidos)")
 
 def create_resource_bundling():
     """Cria bundling de recursos pequenos"""
     print("📦 Criando bundling de recursos...")
     
-    # Combinar CSS pequenos
-    small_css_files = []
-    css_dir = Path('wp-content')
-    
-    if css_dir.exists():
-        for css_file in css_dir.rglob('*.css'):
-            try:
-                if css_file.stat().st_size < 10 * 1024:  # Menor que 10KB
-                    small_css_files.append(css_file)
-            except:
-                continue
-    
-    if len(small_css_files) > 3:
-        combined_css = ""
-        for css_file in small_css_files[:5]:  # Combinar até 5 arquivos
-            try:
-                with open(css_file, 'r', encoding='utf-8') as f:
-                    css_content = f.read()
-                combined_css += f"/* {css_file} */\n{css_content}\n\n"
-            except:
-                continue
-        
-        if combined_css:
-            os.makedirs('wp-content/uploads', exist_ok=True)
-            with open('wp-content/uploads/bundled-small.css', 'w', encoding='utf-8') as f:
-                f.write(combined_css)
-            
-            print(f"   ✅ {len(small_css_files[:5])} arquivos CSS pequenos combinados")
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
+    
+    # Folhas vizinhas com a mesma mídia e fase de carregamento viram um pacote
+    content, stats = bundle_document(content, base_directory, write=write_shared_file)
+    
+    save_document(content)
+    
+    if stats['bundles']:
+        print(f"   ✅ {stats['stylesheets_bundled']} arquivos CSS combinados em {stats['bundles']} pacotes "
+              f"({stats['requests_saved']} requisições a menos)")
     else:
         print("   ℹ️ Poucos arquivos pequenos para combinar")
 
+def inline_small_assets():
+    """Coloca inline os assets pequenos da página"""
+    print("📎 Colocando assets pequenos inline...")
+    
+    content = load_document()
+    base_directory = os.path.dirname(active_document_path() or DEFAULT_DOCUMENT)
+    
+    # Imagens viram data URIs; folhas e scripts pequenos vão para dentro do HTML
+    content, stats = inline_document(content, base_directory)
+    
+    save_document(content)
+    
+    inlined = stats['images'] + stats['stylesheets'] + stats['scripts']
+    if inlined:
+        print(f"   ✅ {inlined} assets inline ({stats['images']} imagens, {stats['stylesheets']} folhas, "
+              f"{stats['scripts']} scripts; {round(stats['bytes_inlined'] / 1024, 1)} KB)")
+    else:
+        print("   ℹ️ Nenhum asset pequeno o bastante para ir inline")
+
 def create_payload_report():
     """Cria relatório de redução de payload"""
     print("📊 Gerando relatório de payload...")
     
     large_files, total_size = analyze_large_files()
     
-    with open('index.html', 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_document()
     
     # Analisar otimizações
     html_size_kb = round(len(content) / 1024, 1)
@@ -361,8 +367,7 @@ def main():
     
     # Backup do arquivo original
     if not os.path.exists('index_payload_backup.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = load_document()
         with open('index_payload_backup.html', 'w', encoding='utf-8') as f:
             f.write(content)
         print("📋 Backup criado: index_payload_backup.html")
@@ -375,6 +380,7 @@ def main():
     remove_unused_resources()
     compress_inline_content()
     create_resource_bundling()
+    inline_small_assets()
     report = create_payload_report()
     
     print("\n🎉 PAYLOAD OTIMIZADO!")
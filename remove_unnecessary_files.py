@@ -5,10 +5,13 @@ Removes unused plugins, duplicate files, and non-essential assets
 """
 
 import os
-import shutil
+import sys
 import re
 import json
 
+from asset_inventory import find_files, total_size
+from asset_graph import collect_dead_assets
+
 def analyze_file_usage():
     """Analyze which files are actually used in the HTML"""
     print("🔍 Analyzing file usage...")
@@ -38,54 +41,25 @@ def analyze_file_usage():
     
     return used_files
 
-def remove_unused_plugins():
-    """Remove unused plugin files that are not referenced"""
-    print("🧹 Removing unused plugin files...")
-    
-    plugins_dir = 'wp-content/plugins'
-    if not os.path.exists(plugins_dir):
-        print("   ⚠️ Plugins directory not found")
-        return
+def remove_unreachable_assets(dry_run=True):
+    """Remove assets that no page reaches (mark-and-sweep over the reference graph).
+    Only reports them unless dry_run=False"""
+    print("🧹 Removing unreachable assets...")
     
-    # List of plugins that are actually used based on HTML analysis
-    used_plugins = [
-        'elementor',
-        'pro-elements', 
-        'elementskit-lite',
-        'header-footer-elementor',
-        'woocommerce',
-        'infixs-correios-automatico',
-        'virtuaria-pagseguro'
-    ]
-    
-    removed_count = 0
-    for plugin in os.listdir(plugins_dir):
-        plugin_path = os.path.join(plugins_dir, plugin)
-        if os.path.isdir(plugin_path) and plugin not in used_plugins:
-            print(f"   🗑️ Removing unused plugin: {plugin}")
-            shutil.rmtree(plugin_path)
-            removed_count += 1
+    report = collect_dead_assets(apply=not dry_run)
     
-    print(f"   ✅ Removed {removed_count} unused plugins")
-
-def remove_duplicate_css_files():
-    """Remove duplicate CSS files"""
-    print("🎨 Removing duplicate CSS files...")
-    
-    # Files that are duplicates or not needed
-    duplicate_files = [
-        'wp-content/plugins/elementor/assets/css/widget-icon-list-c91d2640e685c8.min',  # Duplicate
-        'wp-content/plugins/woocommerce/assets/css/woocommerce-smallscreen.css',  # Mobile-specific, can be combined
-    ]
+    for root, summary in report['by_root'].items():
+        if summary['files']:
+            print(f"   🗑️ {root}: {summary['files']} unreachable files ({summary['reclaimable_kb']} KB)")
     
-    removed_count = 0
-    for file_path in duplicate_files:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            print(f"   🗑️ Removed duplicate: {file_path}")
-            removed_count += 1
+    reclaimable_kb = round(report['reclaimable_bytes'] / 1024, 1)
+    if dry_run:
+        print(f"   ✅ {report['dead_files']} unreachable files found, {reclaimable_kb} KB reclaimable "
+              f"(dry run; use --apply to remove them)")
+    else:
+        print(f"   ✅ Removed {report['dead_files']} unreachable files ({reclaimable_kb} KB)")
     
-    print(f"   ✅ Removed {removed_count} duplicate CSS files")
+    return report
 
 def optimize_elementor_css():
     """Remove unused Elementor post-specific CSS files"""
@@ -170,43 +144,27 @@ def remove_development_files():
     
     print(f"   ✅ Removed {removed_count} development files")
 
-def create_cleanup_report():
+def create_cleanup_report(assets_removed=False):
     """Create a report of cleanup operations"""
     print("📊 Creating cleanup report...")
     
-    # Calculate directory sizes
-    def get_dir_size(path):
-        total = 0
-        if os.path.exists(path):
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    if os.path.exists(filepath):
-                        total += os.path.getsize(filepath)
-        return total
-    
-    # Get sizes of main directories
+    # Directory sizes and file counts, from the asset inventory
     sizes = {
-        'wp-content/plugins': get_dir_size('wp-content/plugins'),
-        'wp-content/uploads': get_dir_size('wp-content/uploads'),
-        'wp-content/themes': get_dir_size('wp-content/themes'),
-        'wp-includes': get_dir_size('wp-includes')
+        'wp-content/plugins': total_size(under='wp-content/plugins'),
+        'wp-content/uploads': total_size(under='wp-content/uploads'),
+        'wp-content/themes': total_size(under='wp-content/themes'),
+        'wp-includes': total_size(under='wp-includes')
     }
     
     # Count remaining files
     file_counts = {}
     for dir_name, dir_path in [('plugins', 'wp-content/plugins'), ('uploads', 'wp-content/uploads')]:
-        count = 0
-        if os.path.exists(dir_path):
-            for root, dirs, files in os.walk(dir_path):
-                count += len(files)
-        file_counts[dir_name] = count
+        file_counts[dir_name] = len(find_files(under=dir_path))
     
     report = {
         "cleanup_summary": {
             "operations_performed": [
-                "Removed unused plugins",
-                "Removed duplicate CSS files", 
+                "Removed unreachable assets" if assets_removed else "Reported unreachable assets (dry run)",
                 "Optimized Elementor CSS files",
                 "Removed unused font files",
                 "Removed development files"
@@ -235,14 +193,15 @@ def main():
     used_files = analyze_file_usage()
     
     # Run cleanup operations
-    remove_unused_plugins()
-    remove_duplicate_css_files()
+    # Deleting unreachable assets is opt-in, like asset_graph.py
+    apply = '--apply' in sys.argv
+    remove_unreachable_assets(dry_run=not apply)
     optimize_elementor_css()
     remove_unused_fonts()
     remove_development_files()
     
     # Create report
-    report = create_cleanup_report()
+    report = create_cleanup_report(assets_removed=apply)
     
     print("\n🎉 Cleanup completed!")
     print("📈 Results:")
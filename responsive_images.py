@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - IMAGENS RESPONSIVAS
+Gera, para cada imagem de assets/media usada num <img>, uma escada de
+larguras (só as menores que a imagem original) com reamostragem Lanczos, e
+reescreve srcset/sizes. O sizes sai do layout do Elementor: largura das
+colunas (elementor-col-N e os width/--width do CSS dos posts) por faixa de
+tela, máximo do container boxed e a largura declarada no próprio <img>.
+Celulares deixam de baixar os banners em tamanho de desktop
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from html_stream import parse_attributes, rewrite_attributes, tokenize
+from css_dedup import page_stylesheets, sheet_tree
+from asset_graph import resolve_reference
+from asset_inventory import save_inventory, update_file
+from build_cache import cache_key, file_hash, lookup, save_cache, store
+from image_probe import image_dimensions
+from pass_engine import parse_option
+from site_pipeline import discover_pages
+
+# Versão do redimensionamento: incrementar gera as variantes de novo
+RESPONSIVE_VERSION = 1
+
+# Larguras geradas (--widths 320,640,...); as maiores que a origem são puladas
+WIDTH_LADDER = (320, 480, 640, 768, 1024, 1366, 1600, 1920)
+
+# Variante com menos de 10% de diferença para a seguinte não compensa
+MIN_WIDTH_STEP = 0.9
+
+MEDIA_ROOT = 'assets/media'
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Qualidade das variantes JPEG (PNG é sem perda)
+JPEG_QUALITY = 85
+
+# Faixas de tela do Elementor: (nome, menor largura, maior largura)
+BREAKPOINTS = (('mobile', 0, 767), ('tablet', 768, 1024), ('desktop', 1025, None))
+
+# Largura máxima do container boxed por faixa (kit padrão do Elementor)
+CONTAINER_WIDTHS = {'mobile': 767, 'tablet': 1024, 'desktop': 1140}
+
+# elementor-col-N com N arredondado: porcentagem real da coluna
+COLUMN_PERCENTS = {11: 100 / 9, 12: 12.5, 14: 100 / 7, 16: 100 / 6, 33: 100 / 3, 66: 200 / 3, 83: 500 / 6}
+
+_ELEMENT_ID = re.compile(r'\belementor-element-([0-9a-f]+)\b')
+_COLUMN_CLASS = re.compile(r'\belementor-col-(\d+)\b')
+_SELECTOR_ELEMENT = re.compile(r'\.elementor-element-([0-9a-f]+)(\s*>\s*\.elementor-container|\s*>\s*\.e-con-inner)?$')
+_MEDIA_MIN = re.compile(r'min-width:\s*(\d+)px')
+_MEDIA_MAX = re.compile(r'max-width:\s*(\d+)px')
+_PERCENT = re.compile(r'^(\d+(?:\.\d+)?)%$')
+_PIXELS = re.compile(r'^(\d+(?:\.\d+)?)px$')
+_VARIANT_SUFFIX = re.compile(r'-\d+w\.[0-9a-f]{8}$')
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# ---------------------------------------------------------------------------
+# Variantes
+# ---------------------------------------------------------------------------
+
+def width_ladder():
+    """Escada da linha de comando (--widths 320,640,...) ou a padrão"""
+    value = parse_option('--widths')
+    return tuple(int(width) for width in value.split(',')) if value else WIDTH_LADDER
+
+def ladder(source, widths=WIDTH_LADDER):
+    """Larguras da escada menores que a origem (largura lida do índice de mídia), sem
+    degraus quase iguais à origem"""
+    dimensions = image_dimensions(source)
+    if dimensions is None:
+        return []
+    return [step for step in sorted(widths) if step < dimensions[0] * MIN_WIDTH_STEP]
+
+def variant_path(source, digest, width):
+    stem = _VARIANT_SUFFIX.sub('', os.path.splitext(source)[0])
+    return f'{stem}-{width}w.{digest[:8]}{os.path.splitext(source)[1].lower()}'
+
+def _variant_key(digest, width):
+    return cache_key('responsive_images', f'{RESPONSIVE_VERSION}-{width}w', digest)
+
+def _resize(job):
+    # Processo de trabalho: (origem, largura, destino) -> (largura, altura) ou None
+    from PIL import Image, ImageOps
+
+    source, width, target = job
+    # Gravada com outro nome e renomeada: uma variante no disco está sempre completa
+    temp_path = f'{target}.{os.getpid()}.tmp'
+    try:
+        with Image.open(source) as image:
+            icc_profile = image.info.get('icc_profile')
+            image = ImageOps.exif_transpose(image)
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            if target.endswith('.png'):
+                resized.save(temp_path, 'PNG', optimize=True)
+            else:
+                if resized.mode not in ('RGB', 'L'):
+                    resized = resized.convert('RGB')
+                resized.save(temp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True,
+                             icc_profile=icc_profile)
+        os.replace(temp_path, target)
+    except (OSError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return job, None
+    return job, (width, height)
+
+def generate_variants(paths, widths=WIDTH_LADDER, workers=None):
+    """Gera as larguras que ainda não existem (ou não estão no cache). Retorna estatísticas"""
+    stats = {'images': 0, 'generated': 0, 'cached': 0}
+    jobs = []
+
+    for source in paths:
+        digest = file_hash(source)
+        steps = ladder(source, widths)
+        stats['images'] += bool(steps)
+        for width in steps:
+            target = variant_path(source, digest, width)
+            if lookup(_variant_key(digest, width)) is not None and os.path.isfile(target):
+                stats['cached'] += 1
+            else:
+                jobs.append((source, width, target))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_resize, jobs))
+
+        for (source, width, target), size in results:
+            if size is None:
+                continue
+            update_file(target)
+            stats['generated'] += 1
+            store(_variant_key(file_hash(source), width), {'path': target, 'width': size[0], 'height': size[1]})
+
+    return stats
+
+def responsive_variants(source, widths=WIDTH_LADDER):
+    """Variantes já geradas de uma imagem: [(largura, caminho)] em ordem crescente.
+    Vêm do disco pelo nome determinístico, não do cache"""
+    if not os.path.isfile(source):
+        return []
+    digest = file_hash(source)
+    variants = []
+    for width in ladder(source, widths):
+        path = variant_path(source, digest, width)
+        if os.path.isfile(path):
+            variants.append((width, path))
+    return variants
+
+def page_images(pages=None):
+    """Imagens raster de assets/media usadas como src de <img> nas páginas"""
+    pages = pages if pages is not None else discover_pages()
+    images = set()
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for token in tokenize([content]):
+            if token['type'] == 'start' and token['tag'] == 'img':
+                path = resolve_reference(dict(parse_attributes(token)).get('src', ''), os.path.dirname(page))
+                if path and path.startswith(MEDIA_ROOT + '/') and path.lower().endswith(SOURCE_EXTENSIONS) \
+                        and os.path.isfile(path):
+                    images.add(path)
+    return sorted(images)
+
+# ---------------------------------------------------------------------------
+# Layout
+# ---------------------------------------------------------------------------
+
+def _media_breakpoints(prelude):
+    # Faixas inteiramente cobertas por um @media (None = não é @media de largura)
+    if not prelude.lower().startswith('@media'):
+        return None
+    if 'print' in prelude.lower():
+        return set()
+    minimum = _MEDIA_MIN.search(prelude)
+    maximum = _MEDIA_MAX.search(prelude)
+    minimum = int(minimum.group(1)) if minimum else 0
+    maximum = int(maximum.group(1)) if maximum else None
+    return {name for name, low, high in BREAKPOINTS
+            if low >= minimum and (maximum is None or (high is not None and high <= maximum))}
+
+def _collect_widths(nodes, breakpoints, layout):
+    for node in nodes:
+        if node[0] == 'block':
+            inner = _media_breakpoints(node[1])
+            if inner is not None:
+                _collect_widths(node[2], breakpoints & inner, layout)
+            continue
+        if node[0] != 'rule' or not breakpoints:
+            continue
+        for selector in node[1].split(','):
+            match = _SELECTOR_ELEMENT.search(selector.strip())
+            if not match:
+                continue
+            element, inner = match.group(1), match.group(2)
+            for declaration in node[2]:
+                name, colon, value = declaration.partition(':')
+                name, value = name.strip().lower(), value.replace('!important', '').strip()
+                percent, pixels = _PERCENT.match(value), _PIXELS.match(value)
+                if inner and name == 'max-width' and pixels:
+                    for breakpoint in breakpoints:
+                        layout['containers'][(element, breakpoint)] = float(pixels.group(1))
+                elif not inner and name in ('width', '--width') and percent:
+                    for breakpoint in breakpoints:
+                        layout['widths'][(element, breakpoint)] = float(percent.group(1)) / 100
+
+def page_layout(content, base_directory=''):
+    """Larguras por elemento e faixa tiradas do CSS da página: {'widths': {(id, faixa):
+    fração}, 'containers': {(id, faixa): px}}"""
+    layout = {'widths': {}, 'containers': {}}
+    for sheet in page_stylesheets(content, base_directory):
+        if sheet['css'] is None or sheet['media'] not in ('all', 'screen'):
+            continue
+        tree = sheet_tree(sheet)
+        if tree is not None:
+            _collect_widths(tree, {name for name, low, high in BREAKPOINTS}, layout)
+    return layout
+
+def _element_fraction(classes, element, breakpoint, layout):
+    # Fração da largura do pai ocupada por uma coluna ou container filho
+    if (element, breakpoint) in layout['widths']:
+        return layout['widths'][(element, breakpoint)]
+    column = _COLUMN_CLASS.search(classes)
+    if column and 'elementor-column' in classes.split():
+        # Colunas empilham no celular; nas demais faixas valem elementor-col-N
+        if breakpoint == 'mobile':
+            return 1.0
+        return COLUMN_PERCENTS.get(int(column.group(1)), int(column.group(1))) / 100
+    return 1.0
+
+def slot_ranges(ancestors, layout):
+    """Para cada faixa de tela: (fração da viewport, container máximo em px ou None)"""
+    ranges = {}
+    for name, low, high in BREAKPOINTS:
+        fraction = 1.0
+        container = None
+        for classes in ancestors:
+            match = _ELEMENT_ID.search(classes)
+            element = match.group(1) if match else None
+            fraction *= _element_fraction(classes, element, name, layout)
+            boxed = 'elementor-section-boxed' in classes.split() or 'e-con-boxed' in classes.split()
+            if boxed and container is None:
+                container = layout['containers'].get((element, name), CONTAINER_WIDTHS[name])
+        ranges[name] = (fraction, container)
+    return ranges
+
+def _slot_at(viewport, fraction, container, cap):
+    # Largura do slot numa viewport: ('vw', %) ou ('px', n)
+    if container is not None and viewport >= container:
+        width = fraction * container
+        return ('px', round(min(width, cap) if cap else width))
+    if cap and fraction * viewport >= cap:
+        return ('px', round(cap))
+    return ('vw', round(fraction * 100, 2))
+
+def sizes_attribute(ranges, cap=None):
+    """Valor de sizes a partir das faixas; cap = largura máxima do <img> em px"""
+    segments = []   # (limite superior da viewport ou None, valor)
+    for name, low, high in BREAKPOINTS:
+        fraction, container = ranges[name]
+        points = sorted({point for point in (container, cap / fraction if cap and fraction else None)
+                         if point is not None and low < point < (high if high is not None else float('inf'))})
+        bounds = [low] + [round(point) for point in points]
+        uppers = [round(point) - 1 for point in points] + [high]
+        for start, upper in zip(bounds, uppers):
+            value = _slot_at(start, fraction, container, cap)
+            if segments and segments[-1][1] == value:
+                segments[-1] = (upper, value)
+            else:
+                segments.append((upper, value))
+
+    parts = []
+    for upper, (unit, amount) in segments:
+        amount = f'{amount:g}{unit}'
+        parts.append(amount if upper is None else f'(max-width: {upper}px) {amount}')
+    return ', '.join(parts)
+
+# ---------------------------------------------------------------------------
+# srcset/sizes
+# ---------------------------------------------------------------------------
+
+def _variant_url(url, path):
+    base = url.split('?')[0].split('#')[0]
+    return base[:base.rfind('/') + 1] + os.path.basename(path)
+
+def responsive_document(content, base_directory='', widths=WIDTH_LADDER):
+    """Reescreve srcset/sizes dos <img> com variantes geradas. Retorna (conteúdo, estatísticas)"""
+    stats = {'images': 0, 'candidates': 0}
+    layout = page_layout(content, base_directory)
+    output = []
+    ancestors = []   # (tag, classes) dos elementos abertos
+
+    for token in tokenize([content]):
+        raw = token['raw']
+        if token['type'] == 'start':
+            attributes = dict(parse_attributes(token))
+            if token['tag'] == 'img' and attributes.get('src'):
+                raw = _responsive_img(token, attributes, ancestors, layout, base_directory, widths, stats)
+            elif token['tag'] not in VOID_TAGS and not raw.endswith('/>'):
+                ancestors.append((token['tag'], attributes.get('class', '')))
+        elif token['type'] == 'end':
+            # Fecha até a tag correspondente (HTML tolera tags sem fechamento)
+            for index in range(len(ancestors) - 1, -1, -1):
+                if ancestors[index][0] == token['tag']:
+                    del ancestors[index:]
+                    break
+        output.append(raw)
+
+    return ''.join(output), stats
+
+def _responsive_img(token, attributes, ancestors, layout, base_directory, widths, stats):
+    src = attributes['src']
+    path = resolve_reference(src, base_directory)
+    if not path or not path.startswith(MEDIA_ROOT + '/') or not os.path.isfile(path):
+        return token['raw']
+    variants = responsive_variants(path, widths)
+    if not variants:
+        return token['raw']
+
+    width = image_dimensions(path)[0]
+    candidates = [f'{_variant_url(src, variant)} {step}w' for step, variant in variants] + [f'{src} {width}w']
+    ranges = slot_ranges([classes for tag, classes in ancestors if 'elementor-element' in classes], layout)
+    declared = attributes.get('width', '')
+    cap = min(int(declared), width) if declared.isdigit() and int(declared) else width
+    values = {'srcset': ', '.join(candidates), 'sizes': sizes_attribute(ranges, cap)}
+
+    raw = rewrite_attributes(token, lambda name, value: values.pop(name) if name in values else None)
+    if values:
+        end = -2 if raw.endswith('/>') else -1
+        extra = ''.join(f' {name}="{value}"' for name, value in values.items())
+        raw = raw[:end].rstrip() + extra + raw[end:]
+    stats['images'] += 1
+    stats['candidates'] += len(candidates)
+    return raw
+
+def main():
+    """Gera as variantes de largura das imagens usadas pelas páginas (--widths 320,640,... --workers N)"""
+    print("📱 IMAGENS RESPONSIVAS - PEACOCK COSMÉTICOS\n")
+
+    widths = width_ladder()
+    workers = int(parse_option('--workers')) if parse_option('--workers') else None
+    paths = page_images()
+
+    start = time.perf_counter()
+    stats = generate_variants(paths, widths, workers)
+    elapsed = time.perf_counter() - start
+    save_inventory()
+    save_cache()
+
+    print(f"   ✅ {stats['generated']} variantes geradas para {stats['images']} de {len(paths)} imagens")
+    if stats['cached']:
+        print(f"   ♻️ {stats['cached']} variantes reaproveitadas do cache")
+    print(f"   ⏱️ {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
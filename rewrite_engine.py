@@ -0,0 +1,787 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - MOTOR DE REESCRITA COM REGRAS FUNDIDAS
+Compila regras de substituição ordenadas em expressões alternadas, agrupadas
+pelo literal inicial: uma regra sobe para um grupo anterior quando comuta com
+todas as regras que ultrapassa. Cada grupo é aplicado em uma única varredura
+do documento (regras que dependem umas das outras continuam em varreduras
+separadas), com a contagem de ocorrências de cada regra. O resultado é o
+mesmo de aplicar as regras uma a uma, na ordem
+"""
+
+import re
+import time
+
+# Character classes used by the pattern model: (negated, frozenset_of_chars)
+ANY_CHAR = (True, frozenset())
+ANY_BUT_NEWLINE = (True, frozenset('\n'))
+DIGITS = frozenset('0123456789')
+WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+SPACE_CHARS = frozenset(' \t\n\r\f\v')
+SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', 'a': '\a'}
+
+# Rules are fused only when they share this many leading literal characters
+PREFIX_KEY_LENGTH = 2
+
+def literal_rule(old, new):
+    """Plain substring replacement, same semantics as str.replace"""
+    return {'kind': 'literal', 'pattern': old, 'replacement': new, 'flags': 0}
+
+def regex_rule(pattern, replacement, flags=0):
+    """Regex replacement, same semantics as re.sub"""
+    return {'kind': 'regex', 'pattern': pattern, 'replacement': replacement, 'flags': flags}
+
+def _literal_steps(text):
+    """Model a literal string as a sequence of single-character steps"""
+    return [('one', (False, frozenset(ch))) for ch in text]
+
+def _parse_class(pattern, i):
+    """Parse a [...] character class starting after '['; returns (charset, next_index)"""
+    negated = False
+    if i < len(pattern) and pattern[i] == '^':
+        negated = True
+        i += 1
+
+    chars = set()
+    first = True
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == ']' and not first:
+            return (negated, frozenset(chars)), i + 1
+        first = False
+
+        if ch == '\\':
+            if i + 1 >= len(pattern):
+                return None, i
+            esc = pattern[i + 1]
+            i += 2
+            if esc == 'd':
+                chars |= DIGITS
+                continue
+            if esc == 's':
+                chars |= SPACE_CHARS
+                continue
+            if esc in 'wWDS' or esc.isdigit():
+                return None, i
+            ch = SIMPLE_ESCAPES.get(esc, esc)
+        else:
+            i += 1
+
+        # Character ranges such as a-z
+        if i + 1 < len(pattern) and pattern[i] == '-' and pattern[i + 1] != ']':
+            end = pattern[i + 1]
+            if end == '\\':
+                return None, i
+            chars |= {chr(c) for c in range(ord(ch), ord(end) + 1)}
+            i += 2
+        else:
+            chars.add(ch)
+
+    return None, i
+
+def _parse_pattern(pattern, flags):
+    """
+    Build a conservative language model for a regex.
+
+    Returns None ("opaque") for anything outside the supported subset
+    (alternation, anchors, lookarounds, backreferences, counted repeats,
+    quantified groups, case-insensitive matching). Opaque rules are never
+    fused with their neighbours.
+    """
+    if flags & ~re.DOTALL:
+        return None
+
+    any_char = ANY_CHAR if flags & re.DOTALL else ANY_BUT_NEWLINE
+    steps = []
+    groups = {}
+    open_groups = []
+    group_count = 0
+    lead_context = trail_context = False
+
+    body = pattern
+    if body.startswith(r'\b'):
+        lead_context = True
+        body = body[2:]
+    if body.endswith(r'\b') and not body.endswith(r'\\b'):
+        trail_context = True
+        body = body[:-2]
+
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        atom = None
+
+        if ch == '\\':
+            if i + 1 >= len(body):
+                return None
+            esc = body[i + 1]
+            i += 2
+            if esc == 'd':
+                atom = (False, DIGITS)
+            elif esc == 's':
+                atom = (False, SPACE_CHARS)
+            elif esc == 'w':
+                atom = (False, WORD_CHARS)
+            elif esc.isalnum() and esc not in SIMPLE_ESCAPES:
+                return None
+            else:
+                atom = (False, frozenset(SIMPLE_ESCAPES.get(esc, esc)))
+        elif ch == '[':
+            atom, i = _parse_class(body, i + 1)
+            if atom is None:
+                return None
+        elif ch == '.':
+            atom = any_char
+            i += 1
+        elif ch == '(':
+            if body.startswith('(?:', i):
+                open_groups.append((None, len(steps)))
+                i += 3
+            elif body.startswith('(?', i):
+                return None
+            else:
+                group_count += 1
+                open_groups.append((group_count, len(steps)))
+                i += 1
+            continue
+        elif ch == ')':
+            if not open_groups:
+                return None
+            number, start = open_groups.pop()
+            if number is not None:
+                groups[number] = (start, len(steps))
+            i += 1
+            if i < len(body) and body[i] in '*+?{':
+                return None
+            continue
+        elif ch in '|^$*+?':
+            return None
+        elif ch == '{' and re.match(r'\{\d*(,\d*)?\}', body[i:]):
+            return None
+        else:
+            atom = (False, frozenset(ch))
+            i += 1
+
+        # Quantifiers apply to the atom just parsed
+        quantifier = body[i] if i < len(body) else ''
+        if quantifier == '{' and re.match(r'\{\d*(,\d*)?\}', body[i:]):
+            return None
+        if quantifier in ('*', '+', '?'):
+            i += 1
+            if i < len(body) and body[i] == '?':
+                i += 1
+            if quantifier == '*':
+                steps.append(('star', atom))
+            elif quantifier == '+':
+                steps.append(('one', atom))
+                steps.append(('star', atom))
+            else:
+                steps.append(('opt', atom))
+        else:
+            steps.append(('one', atom))
+
+    if open_groups:
+        return None
+
+    # Word-boundary assertions inspect one neighbouring character
+    context_steps = list(steps)
+    if lead_context:
+        context_steps.insert(0, ('one', ANY_CHAR))
+    if trail_context:
+        context_steps.append(('one', ANY_CHAR))
+
+    return {'steps': steps, 'context_steps': context_steps, 'groups': groups}
+
+def _parse_template(template):
+    """
+    Split a re.sub replacement template into literal text and group numbers.
+
+    Returns None for templates using features the engine does not expand
+    itself (named groups, octal escapes); those rules run unfused.
+    """
+    parts = []
+    literal = []
+    i = 0
+    while i < len(template):
+        ch = template[i]
+        if ch != '\\':
+            literal.append(ch)
+            i += 1
+            continue
+
+        if i + 1 >= len(template):
+            return None
+        esc = template[i + 1]
+        group = None
+
+        if esc == 'g':
+            match = re.match(r'g<(\d+)>', template[i + 1:])
+            if not match:
+                return None
+            group = int(match.group(1))
+            i += 1 + len(match.group(0))
+        elif esc.isdigit():
+            if esc == '0' or re.match(r'[0-7]{3}', template[i + 1:]):
+                return None
+            match = re.match(r'\d{1,2}', template[i + 1:])
+            group = int(match.group(0))
+            i += 1 + len(match.group(0))
+        elif esc == '\\':
+            literal.append('\\')
+            i += 2
+        elif esc in SIMPLE_ESCAPES or esc == 'b':
+            literal.append('\b' if esc == 'b' else SIMPLE_ESCAPES[esc])
+            i += 2
+        elif esc.isascii() and esc.isalpha():
+            return None
+        else:
+            # Unknown non-letter escapes are kept verbatim by re.sub
+            literal.append('\\' + esc)
+            i += 2
+
+        if group is not None:
+            if literal:
+                parts.append(''.join(literal))
+                literal = []
+            parts.append(group)
+
+    if literal:
+        parts.append(''.join(literal))
+    return parts
+
+def _output_steps(rule, model, template_parts):
+    """Model the text a rule writes back into the document"""
+    if rule['kind'] == 'literal':
+        return _literal_steps(rule['replacement'])
+    if model is None or template_parts is None:
+        return None
+
+    steps = []
+    for part in template_parts:
+        if isinstance(part, int):
+            if part not in model['groups']:
+                return None
+            start, end = model['groups'][part]
+            steps.extend(model['steps'][start:end])
+        else:
+            steps.extend(_literal_steps(part))
+    return steps
+
+def _intersects(a, b):
+    """True when two character classes share at least one character"""
+    neg_a, set_a = a
+    neg_b, set_b = b
+    if not neg_a and not neg_b:
+        return bool(set_a & set_b)
+    if not neg_a:
+        return bool(set_a - set_b)
+    if not neg_b:
+        return bool(set_b - set_a)
+    return True
+
+def _closure(steps, states):
+    """Add the states reachable by skipping optional/starred steps"""
+    result = set()
+    pending = list(states)
+    while pending:
+        state = pending.pop()
+        if state in result:
+            continue
+        result.add(state)
+        if state < len(steps) and steps[state][0] in ('opt', 'star'):
+            pending.append(state + 1)
+    return result
+
+def _moves(steps, state):
+    """Outgoing transitions of a state: [(charset, next_state)]"""
+    if state >= len(steps):
+        return []
+    kind, charset = steps[state]
+    target = state if kind == 'star' else state + 1
+    return [(charset, target)]
+
+def _states_after_one_char(steps):
+    """States reachable after consuming at least one character"""
+    seen = set()
+    pending = [target for state in _closure(steps, {0}) for _, target in _moves(steps, state)]
+    while pending:
+        state = pending.pop()
+        if state in seen:
+            continue
+        for reached in _closure(steps, {state}):
+            if reached not in seen:
+                seen.add(reached)
+                pending.extend(target for _, target in _moves(steps, reached))
+    return seen
+
+def _all_states(steps):
+    return set(range(len(steps) + 1))
+
+def _product_reaches(steps_a, starts_a, steps_b, starts_b):
+    """
+    True if both models can consume a common non-empty string from the given
+    start states and reach a point where either of them accepts.
+    """
+    accept_a = len(steps_a)
+    accept_b = len(steps_b)
+    start_pairs = {(a, b) for a in _closure(steps_a, starts_a) for b in _closure(steps_b, starts_b)}
+
+    seen = set()
+    pending = []
+    for a, b in start_pairs:
+        for charset_a, target_a in _moves(steps_a, a):
+            for charset_b, target_b in _moves(steps_b, b):
+                if _intersects(charset_a, charset_b):
+                    for pair in ((x, y) for x in _closure(steps_a, {target_a})
+                                 for y in _closure(steps_b, {target_b})):
+                        pending.append(pair)
+
+    while pending:
+        pair = pending.pop()
+        if pair in seen:
+            continue
+        seen.add(pair)
+        a, b = pair
+        if a == accept_a or b == accept_b:
+            return True
+        for charset_a, target_a in _moves(steps_a, a):
+            for charset_b, target_b in _moves(steps_b, b):
+                if _intersects(charset_a, charset_b):
+                    for x in _closure(steps_a, {target_a}):
+                        for y in _closure(steps_b, {target_b}):
+                            if (x, y) not in seen:
+                                pending.append((x, y))
+    return False
+
+def _conflicts(earlier, later, overlaps=True):
+    """
+    True when fusing two rules could change the result of applying them in order.
+
+    Three interactions are checked:
+    1. a match of the later rule starting before a match of the earlier rule
+       and running into it (the single scan would pick the later rule first);
+    2. a match of the later rule touching text written by the earlier rule
+       (sequential application would rewrite it again);
+    3. a literal that extends an earlier literal: the literal trie tries the
+       longer branch first, which is only right when the longer one comes first.
+
+    With overlaps=False the first check is skipped (see _literal_overlaps).
+    """
+    if earlier['model'] is None or later['model'] is None or earlier['output'] is None:
+        return True
+
+    if earlier['literal'] is not None and later['literal'] is not None:
+        if later['literal'].startswith(earlier['literal']):
+            return True
+
+    earlier_steps = earlier['model']['steps']
+    later_steps = later['model']['steps']
+    later_context = later['model']['context_steps']
+    output = earlier['output']
+
+    # Deletions can join surrounding text into a new match
+    if len(output) in _closure(output, {0}):
+        return True
+
+    if overlaps and _product_reaches(later_steps, later['model']['inner_states'], earlier_steps, {0}):
+        return True
+
+    if _product_reaches(later_context, {0}, output, _all_states(output)):
+        return True
+    if _product_reaches(later_context, later['model']['context_inner_states'], output, {0}):
+        return True
+
+    return False
+
+def _literal_overlaps(earlier, later):
+    """
+    Offsets into a match of the later literal where the earlier literal can start.
+
+    'elementor-invisible' and 'elementor-icons.min.css' share the final 'e':
+    in 'elementor-invisiblelementor-icons.min.css' the earlier rule must win.
+    Such text is very unlikely, so two literals are still fused and
+    apply_rules checks these offsets at every match instead.
+    """
+    word = later['literal']
+    return [offset for offset in range(1, len(word))
+            if earlier['literal'].startswith(word[offset:]) or word[offset:].startswith(earlier['literal'])]
+
+def _fusable(earlier, later):
+    """True when a rule can join a scan after an earlier rule"""
+    if not _conflicts(earlier, later):
+        return True
+    # Literal overlaps are checked while scanning
+    return (earlier['literal'] is not None and later['literal'] is not None
+            and not _conflicts(earlier, later, overlaps=False))
+
+def _commutes(a, b):
+    """
+    True when two rules give the same result in either order.
+
+    Besides the fusion checks in both directions, the rules must not be able
+    to match at the same position: there the rule applied first wins.
+    """
+    if _conflicts(a, b) or _conflicts(b, a):
+        return False
+    return not _product_reaches(a['model']['steps'], {0}, b['model']['steps'], {0})
+
+def _scoped(pattern, flags):
+    """Wrap a pattern so its flags only apply to its own alternative"""
+    letters = ''
+    if flags & re.DOTALL:
+        letters += 's'
+    if flags & re.IGNORECASE:
+        letters += 'i'
+    if flags & re.MULTILINE:
+        letters += 'm'
+    return f'(?{letters}:{pattern})' if letters else f'(?:{pattern})'
+
+def _leading_literal(source):
+    """Split a pattern into its leading literal run and the rest: (head, chars, rest)"""
+    i = 0
+    chars = []
+    while i < len(source):
+        if source[i] == '\\':
+            if i + 1 >= len(source) or source[i + 1].isalnum():
+                break
+            step = 2
+        elif source[i] in '[](){}.*+?|^$':
+            break
+        else:
+            step = 1
+
+        # A quantifier binds to the last character, so it stays in the rest
+        if source[i + step:i + step + 1] in ('*', '+', '?', '{'):
+            break
+        chars.append(source[i + step - 1])
+        i += step
+
+    return source[:i], ''.join(chars), source[i:]
+
+def _anchor_boundary(source):
+    """
+    Rewrite a leading \\b before a literal word as a lookbehind after it.
+
+    '\\belementor' becomes 'elementor(?<!\\welementor)', which matches the same
+    text but lets the regex compiler search for the literal prefix instead of
+    testing the word boundary at every position of the document.
+    """
+    if not source.startswith(r'\b'):
+        return source
+
+    head, chars, rest = _leading_literal(source[2:])
+    if not chars or not re.fullmatch(r'\w', chars[0]):
+        return source
+    return f'{head}(?<!\\w{head}){rest}'
+
+def _split_leading_literal(source):
+    """Split off the first literal character of a pattern: 'abc' -> ('a', 'bc')"""
+    head, chars, rest = _leading_literal(source)
+    if not chars:
+        return None
+    first = 2 if head.startswith('\\') else 1
+    return head[:first], head[first:] + rest
+
+def _literal_trie(rules):
+    """
+    Build a prefix-factored regex for a run of literal rules.
+
+    Each literal ends in an empty named group used only to tell which rule
+    matched. Sharing prefixes (all the 'elementor-...' rules) keeps a long
+    literal prefix in front of the alternation, which the regex compiler
+    turns into a fast substring search.
+    """
+    trie = {}
+    for rule in rules:
+        node = trie
+        for ch in rule['literal']:
+            node = node.setdefault(ch, {})
+        node[''] = rule['index']
+
+    def emit(node):
+        alternatives = []
+        for ch, child in node.items():
+            if ch == '':
+                alternatives.append(f'(?P<r{child}>)')
+            else:
+                alternatives.append(re.escape(ch) + emit(child))
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    return emit(trie)
+
+def _construct(rule):
+    """
+    Leading literal shared by the rules of a scan ('el' for all the
+    'elementor-...' rules), or None when the pattern starts with a class;
+    those rules keep a scan of their own.
+
+    An alternation whose branches share a literal prefix is found with a fast
+    substring search; one without it has to inspect every position of the
+    document, which costs more than a few separate str.replace calls.
+    """
+    key = _leading_literal(rule['source'])[1][:PREFIX_KEY_LENGTH]
+    return key if len(key) == PREFIX_KEY_LENGTH else None
+
+def _build_group(group):
+    """
+    Compile a fused group into one alternation regex.
+
+    Literal rules are merged into a prefix trie; regex rules keep their
+    first literal character outside their named group so the regex compiler
+    can still build a first-character filter for the alternation.
+    Alternatives stay in rule order, which is what makes the single scan
+    pick the same match as the sequential calls; the trie only moves ahead
+    of the regex rules when none of them can match where a literal starts.
+    """
+    if len(group) == 1:
+        return {'rules': group, 'regex': None}
+
+    literals = [rule for rule in group if rule['literal'] is not None]
+    for position, rule in enumerate(group):
+        rule['overlaps'] = [(offset, previous['literal']) for previous in group[:position]
+                            if previous['literal'] is not None and rule['literal'] is not None
+                            for offset in _literal_overlaps(previous, rule)]
+
+    # All literals go into one trie when no regex rule can match where a literal starts
+    if all(not _product_reaches(literal['model']['steps'], {0}, rule['model']['steps'], {0})
+           for literal in literals for rule in group if rule['literal'] is None):
+        group = literals + [rule for rule in group if rule['literal'] is None]
+
+    alternatives = []
+    literal_run = []
+    for rule in group:
+        if rule['literal'] is not None:
+            literal_run.append(rule)
+            continue
+        if literal_run:
+            alternatives.append(_literal_trie(literal_run))
+            literal_run = []
+
+        name = f"r{rule['index']}"
+        split = _split_leading_literal(rule['source'])
+        if split:
+            head, rest = split
+            alternatives.append(f"{head}(?P<{name}>{_scoped(rest, rule['flags'])})")
+        else:
+            alternatives.append(f"(?P<{name}>{_scoped(rule['source'], rule['flags'])})")
+    if literal_run:
+        alternatives.append(_literal_trie(literal_run))
+
+    regex = re.compile('|'.join(alternatives))
+    for rule in group:
+        rule['group_offset'] = regex.groupindex[f"r{rule['index']}"]
+
+    return {'rules': group, 'regex': regex}
+
+def compile_rules(rules):
+    """Analyze an ordered rule list and compile it into fused groups"""
+    compiled_rules = []
+    for index, rule in enumerate(rules):
+        if rule['kind'] == 'literal':
+            source = re.escape(rule['pattern'])
+            model = None
+            if rule['pattern']:
+                model = {'steps': _literal_steps(rule['pattern']),
+                         'context_steps': _literal_steps(rule['pattern']), 'groups': {}}
+            template_parts = [rule['replacement']] if rule['replacement'] else []
+            regex = None
+        else:
+            source = _anchor_boundary(rule['pattern'])
+            regex = re.compile(source, rule['flags'])
+            model = _parse_pattern(rule['pattern'], rule['flags'])
+            template_parts = _parse_template(rule['replacement'])
+            if regex.groupindex or (model is not None and regex.groups != len(model['groups'])):
+                model = None
+
+        # Plain-text patterns (including regexes without metacharacters) and
+        # their fixed replacement text, used for the literal trie
+        literal = replacement = None
+        if model is not None and template_parts is not None:
+            head, chars, rest = _leading_literal(source)
+            if chars and not rest and all(isinstance(part, str) for part in template_parts):
+                literal, replacement = chars, ''.join(template_parts)
+
+        entry = dict(rule)
+        entry.update({
+            'literal': literal,
+            'literal_replacement': replacement,
+            'index': index,
+            'source': source,
+            'regex': regex,
+            'model': model,
+            'template_parts': template_parts,
+            'output': _output_steps(rule, model, template_parts),
+        })
+        if template_parts is None:
+            entry['model'] = None
+        elif model is not None:
+            # Start states for matches that begin inside another one, used by _conflicts
+            model['inner_states'] = _states_after_one_char(model['steps'])
+            model['context_inner_states'] = _states_after_one_char(model['context_steps'])
+        compiled_rules.append(entry)
+
+    # Rules are grouped by construct rather than by position: each rule joins
+    # the first scan of its construct it can be fused with, as long as it
+    # commutes with every rule of the scans it moves ahead of
+    groups = []
+    for rule in compiled_rules:
+        position = len(groups)
+        candidates = [where for where, group in enumerate(groups)
+                      if rule['model'] is not None and group[0]['model'] is not None
+                      and _construct(rule) is not None and _construct(group[0]) == _construct(rule)]
+        if candidates:
+            # Latest scan holding a rule this one cannot move ahead of
+            lowest = next((where for where in range(len(groups) - 1, candidates[0], -1)
+                           if not all(_commutes(other, rule) for other in groups[where])),
+                          candidates[0])
+            position = next((where for where in candidates if where >= lowest
+                             and all(_fusable(previous, rule) for previous in groups[where])),
+                            len(groups))
+        if position == len(groups):
+            groups.append([])
+        groups[position].append(rule)
+
+    scans = [_build_group(group) for group in groups]
+    return {'rules': compiled_rules, 'groups': scans}
+
+def _apply_single(content, rule, hits):
+    """Apply one unfused rule exactly like the original call"""
+    if rule['kind'] == 'literal' and not rule['pattern']:
+        count = len(content) + 1
+        content = content.replace('', rule['replacement'])
+    elif rule['kind'] == 'literal':
+        pieces = content.split(rule['pattern'])
+        count = len(pieces) - 1
+        if count:
+            content = rule['replacement'].join(pieces)
+    else:
+        content, count = rule['regex'].subn(rule['replacement'], content)
+    hits[rule['index']] += count
+    return content
+
+def apply_rules(content, compiled):
+    """Rewrite content with a compiled rule set; returns (content, hits per rule)"""
+    if isinstance(compiled, list):
+        compiled = compile_rules(compiled)
+
+    hits = [0] * len(compiled['rules'])
+
+    for group in compiled['groups']:
+        if group['regex'] is None:
+            content = _apply_single(content, group['rules'][0], hits)
+            continue
+
+        by_name = {f"r{rule['index']}": rule for rule in group['rules']}
+        counts = [0] * len(hits)
+        overlapped = []
+
+        def replace(match):
+            rule = by_name[match.lastgroup]
+            counts[rule['index']] += 1
+            if rule['literal'] is not None:
+                if rule['overlaps'] and any(content.startswith(literal, match.start() + offset)
+                                            for offset, literal in rule['overlaps']):
+                    overlapped.append(rule)
+                return rule['literal_replacement']
+            offset = rule['group_offset']
+            return ''.join(part if isinstance(part, str) else (match.group(offset + part) or '')
+                           for part in rule['template_parts'])
+
+        result = group['regex'].sub(replace, content)
+        if overlapped:
+            # An earlier literal starts inside a match: one scan per rule, in order
+            for rule in group['rules']:
+                content = _apply_single(content, rule, hits)
+        else:
+            content = result
+            hits = [total + count for total, count in zip(hits, counts)]
+
+    return content, hits
+
+def apply_sequential(content, rules):
+    """Reference implementation: one full pass per rule, in order"""
+    for rule in rules:
+        if rule['kind'] == 'literal':
+            content = content.replace(rule['pattern'], rule['replacement'])
+        else:
+            content = re.sub(rule['pattern'], rule['replacement'], content, flags=rule['flags'])
+    return content
+
+def hit_report(compiled, hits):
+    """Per-rule hit counts for rules that matched at least once"""
+    return [
+        {'pattern': rule['pattern'], 'replacement': rule['replacement'], 'hits': count}
+        for rule, count in zip(compiled['rules'], hits)
+        if count
+    ]
+
+def print_hit_report(compiled, hits):
+    """Print a short summary of the rewrite"""
+    report = hit_report(compiled, hits)
+    print(f"   ✅ {sum(hits)} replacements from {len(report)}/{len(hits)} rules "
+          f"({len(compiled['groups'])} scans)")
+    for entry in sorted(report, key=lambda e: -e['hits'])[:5]:
+        print(f"      • {entry['hits']:>5} × {entry['pattern'][:60]}")
+
+def benchmark(content, rules, repeat=5):
+    """Compare fused and sequential application on the same content"""
+    compiled = compile_rules(rules)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        expected = apply_sequential(content, rules)
+    sequential_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result, hits = apply_rules(content, compiled)
+    fused_time = (time.perf_counter() - start) / repeat
+
+    return {
+        'rules': len(rules),
+        'scans': len(compiled['groups']),
+        'identical': result == expected,
+        'sequential_ms': round(sequential_time * 1000, 2),
+        'fused_ms': round(fused_time * 1000, 2),
+        'speedup': round(sequential_time / fused_time, 1) if fused_time else None,
+        'hits': sum(hits),
+    }
+
+def main():
+    """Benchmark every cleanup rule set against index.html"""
+    import aggressive_cleanup
+    import direct_cleanup
+    import enhanced_wordpress_cleanup
+    import final_wordpress_cleanup
+    import update_paths
+
+    print("🚀 Benchmarking fused rewrite engine on index.html...")
+
+    with open('index.html', 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    rule_sets = {
+        'aggressive_cleanup': aggressive_cleanup.AGGRESSIVE_CLEANUP_RULES,
+        'direct_cleanup': direct_cleanup.DIRECT_CLEANUP_RULES,
+        'enhanced_wordpress_cleanup': (enhanced_wordpress_cleanup.ENHANCED_CLEANUP_RULES
+                                       + enhanced_wordpress_cleanup.REMAINING_REFERENCE_RULES),
+        'final_wordpress_cleanup': (final_wordpress_cleanup.WOOCOMMERCE_REFERENCE_RULES
+                                    + final_wordpress_cleanup.ELEMENTOR_REFERENCE_RULES
+                                    + final_wordpress_cleanup.CSS_CLASS_RULES
+                                    + final_wordpress_cleanup.JAVASCRIPT_CONFIG_RULES
+                                    + final_wordpress_cleanup.WOOCOMMERCE_FUNCTIONALITY_RULES
+                                    + final_wordpress_cleanup.NATIVE_APPEARANCE_RULES
+                                    + final_wordpress_cleanup.FINAL_PASS_RULES),
+        'update_paths': update_paths.PATH_RULES,
+    }
+
+    for name, rules in rule_sets.items():
+        result = benchmark(content, rules)
+        status = "✅" if result['identical'] else "❌"
+        print(f"   {status} {name}: {result['rules']} rules in {result['scans']} scans, "
+              f"{result['sequential_ms']} ms → {result['fused_ms']} ms ({result['speedup']}x)")
+
+if __name__ == "__main__":
+    main()
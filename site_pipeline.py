@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+PEACOCK COSMÉTICOS - OTIMIZAÇÃO DO SITE INTEIRO
+Descobre todas as páginas HTML do site e executa o pipeline de passes em cada
+uma delas em paralelo, usando um pool de processos. Os passes que não tocam
+a página rodam uma única vez, antes de todas as páginas, e não intercalados
+como no pass_engine.py: um passe de página que lê o que eles gravam (CSS
+minificado, variantes de imagem) pode gerar uma saída diferente
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pass_engine
+import build_cache
+import asset_inventory
+from pass_engine import parse_option
+
+# Diretórios que não contêm páginas do site
+SKIP_DIRS = {'.git', '.build_cache', '__pycache__', 'node_modules', 'wp-content',
+             # Painel administrativo (app Vite), não é página do site
+             'peacock-admin'}
+
+def is_backup_page(filename):
+    """Backups criados pelos scripts (index_*_backup.html etc.) não são páginas"""
+    return 'backup' in filename.lower()
+
+def discover_pages(root='.'):
+    """Lista todas as páginas HTML sob a raiz, em ordem estável"""
+    pages = []
+
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for file in sorted(files):
+            if file.endswith('.html') and not is_backup_page(file):
+                pages.append(os.path.relpath(os.path.join(current, file)))
+
+    return pages
+
+def split_passes(passes):
+    """Separa os passes que rodam uma vez por site dos que rodam por página"""
+    site_passes = [entry for entry in passes if entry['name'] in pass_engine.SITE_PASSES]
+    page_passes = [entry for entry in passes if entry['name'] not in pass_engine.SITE_PASSES]
+    return site_passes, page_passes
+
+def run_site_passes(site_passes):
+    """Executa os passes de site no processo principal, antes das páginas"""
+    for entry in site_passes:
+        pass_engine.resolve_pass(entry)()
+
+def init_worker(resources, cache_enabled):
+    """Prepara um processo de trabalho com os recursos compartilhados"""
+    pass_engine.install_shared_resources(resources)
+    build_cache.set_cache_enabled(cache_enabled)
+
+def optimize_page(path, page_passes):
+    """Executa os passes de página sobre um único arquivo (roda num processo de trabalho)"""
+    start = time.perf_counter()
+
+    # A saída de cada passe é silenciada: com várias páginas ela fica ilegível
+    with open(os.devnull, 'w') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            document = pass_engine.run_pipeline(path, page_passes, persist_cache=False)
+        finally:
+            sys.stdout = stdout
+
+    return {
+        'path': path,
+        'original_size': document['original_size'],
+        'final_size': len(document['content']),
+        'passes_run': len(document['passes_run']),
+        'passes_cached': len(document['passes_cached']),
+        'seconds': round(time.perf_counter() - start, 3),
+        # O índice do cache e o inventário são gravados só pelo processo principal
+        'cache_entries': build_cache.take_pending_entries(),
+        'inventory_metadata': asset_inventory.take_pending_metadata(),
+    }
+
+def run_site(root='.', workers=None, passes=None):
+    """Otimiza todas as páginas do site e retorna o resultado de cada uma (caminhos
+    relativos à raiz). Os passes resolvem assets e gravam arquivos relativos ao
+    diretório atual: a raiz vira o diretório de trabalho do processo e dos workers"""
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        return _optimize_site(workers, passes)
+    finally:
+        os.chdir(previous)
+
+def _optimize_site(workers, passes):
+    passes = passes if passes is not None else pass_engine.register_default_passes()
+    site_passes, page_passes = split_passes(passes)
+
+    pages = discover_pages()
+    if not pages:
+        return []
+
+    run_site_passes(site_passes)
+    build_cache.save_cache()
+
+    # Importar os módulos dos passes de página registra os recursos que eles compartilham
+    for entry in page_passes:
+        pass_engine.resolve_pass(entry)
+    resources = pass_engine.build_shared_resources()
+    workers = min(workers or os.cpu_count() or 1, len(pages))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(resources, build_cache.cache_enabled())) as pool:
+        futures = [pool.submit(optimize_page, page, page_passes) for page in pages]
+        for future in futures:
+            result = future.result()
+            build_cache.merge_entries(result.pop('cache_entries'))
+            asset_inventory.merge_metadata(result.pop('inventory_metadata'))
+            results.append(result)
+
+    # Os processos de trabalho gravaram arquivos que o inventário deste processo não viu
+    asset_inventory.refresh_inventory(asset_inventory.load_inventory())
+
+    # Cópias purgadas de execuções anteriores só saem com todas as páginas gravadas
+    from css_purge import remove_stale_copies
+    remove_stale_copies(pages)
+
+    build_cache.save_cache()
+    asset_inventory.save_inventory()
+    return results
+
+def main():
+    """Otimiza todas as páginas do site (--root DIR, --workers N, --no-cache)"""
+    print("🌐 OTIMIZAÇÃO DO SITE INTEIRO - PEACOCK COSMÉTICOS\n")
+
+    root = parse_option('--root', '.')
+    workers = parse_option('--workers')
+    workers = int(workers) if workers else None
+
+    start = time.perf_counter()
+    results = run_site(root, workers)
+    elapsed = time.perf_counter() - start
+
+    if not results:
+        print(f"   ⚠️ Nenhuma página HTML encontrada em {root}")
+        return
+
+    for result in results:
+        print(f"   ✅ {os.path.normpath(os.path.join(root, result['path']))}: {round(result['original_size'] / 1024, 1)} KB → "
+              f"{round(result['final_size'] / 1024, 1)} KB ({result['seconds']}s, "
+              f"{result['passes_cached']}/{result['passes_run']} do cache)")
+
+    print("\n🎉 SITE OTIMIZADO!")
+    print("📊 Resultados:")
+    print(f"   📄 Páginas: {len(results)}")
+    print(f"   ⏱️ Tempo total: {round(elapsed, 2)}s")
+    print(f"   🚀 Páginas por segundo: {round(len(results) / elapsed, 1)}")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ import json
 import time
 from pathlib import Path
 
+from asset_inventory import total_size
+
 def validate_html_structure():
     """Valida a estrutura HTML após otimizações"""
     print("🔍 Validando estrutura HTML...")
@@ -125,26 +127,11 @@ def calculate_file_sizes():
         "total_videos_mb": 0,
     }
     
-    # Calcular tamanhos por tipo
-    for root, dirs, files in os.walk('.'):
-        if any(skip in root for skip in ['.git', '__pycache__']):
-            continue
-            
-        for file in files:
-            file_path = os.path.join(root, file)
-            try:
-                file_size = os.path.getsize(file_path)
-                
-                if file.endswith('.css'):
-                    sizes["total_css_kb"] += file_size / 1024
-                elif file.endswith('.js'):
-                    sizes["total_js_kb"] += file_size / 1024
-                elif file.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg')):
-                    sizes["total_images_mb"] += file_size / (1024 * 1024)
-                elif file.lower().endswith(('.mp4', '.webm', '.ogg')):
-                    sizes["total_videos_mb"] += file_size / (1024 * 1024)
-            except OSError:
-                continue
+    # Calcular tamanhos por tipo (a partir do inventário de arquivos)
+    sizes["total_css_kb"] = total_size(extensions=('.css',)) / 1024
+    sizes["total_js_kb"] = total_size(extensions=('.js',)) / 1024
+    sizes["total_images_mb"] = total_size(extensions=('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg')) / (1024 * 1024)
+    sizes["total_videos_mb"] = total_size(extensions=('.mp4', '.webm', '.ogg')) / (1024 * 1024)
     
     # Arredondar valores
     for key in sizes:
@@ -274,7 +261,7 @@ def create_final_report():
                 "cache.manifest",
                 "wp-content/uploads/image-optimization.css",
                 "wp-content/uploads/accessibility-contrast.css",
-                "wp-content/uploads/bundled-small.css"
+                "assets/bundles/"
             ],
             "backup_files": [
                 "index_backup.html",
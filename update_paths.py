@@ -8,10 +8,44 @@ wp-content/uploads/ → assets/media/
 wp-includes/ → core/
 """
 
-import re
 import os
 from pathlib import Path
 
+from rewrite_engine import regex_rule, compile_rules, apply_rules
+
+# Path references, in the order they must be applied
+PATH_RULES = [
+    # Main folder changes
+    regex_rule(r'\.\/wp-content\/uploads\/', './assets/media/'),
+    regex_rule(r'\.\/wp-content\/plugins\/', './assets/modules/'),
+    regex_rule(r'\.\/wp-content\/themes\/', './assets/templates/'),
+    regex_rule(r'\.\/wp-content\/', './assets/'),
+    regex_rule(r'\.\/wp-includes\/', './core/'),
+
+    # Without leading ./
+    regex_rule(r'"wp-content\/uploads\/', '"assets/media/'),
+    regex_rule(r'"wp-content\/plugins\/', '"assets/modules/'),
+    regex_rule(r'"wp-content\/themes\/', '"assets/templates/'),
+    regex_rule(r'"wp-content\/', '"assets/'),
+    regex_rule(r'"wp-includes\/', '"core/'),
+
+    # In URLs and hrefs
+    regex_rule(r'href=["\']\.\/wp-content\/uploads\/', 'href="./assets/media/'),
+    regex_rule(r'href=["\']\.\/wp-content\/plugins\/', 'href="./assets/modules/'),
+    regex_rule(r'href=["\']\.\/wp-content\/themes\/', 'href="./assets/templates/'),
+    regex_rule(r'href=["\']\.\/wp-content\/', 'href="./assets/'),
+    regex_rule(r'href=["\']\.\/wp-includes\/', 'href="./core/'),
+
+    # In src attributes
+    regex_rule(r'src=["\']\.\/wp-content\/uploads\/', 'src="./assets/media/'),
+    regex_rule(r'src=["\']\.\/wp-content\/plugins\/', 'src="./assets/modules/'),
+    regex_rule(r'src=["\']\.\/wp-content\/themes\/', 'src="./assets/templates/'),
+    regex_rule(r'src=["\']\.\/wp-content\/', 'src="./assets/'),
+    regex_rule(r'src=["\']\.\/wp-includes\/', 'src="./core/'),
+]
+
+PATHS = compile_rules(PATH_RULES)
+
 def update_file_paths(file_path):
     """Update WordPress paths in a single file"""
     try:
@@ -21,42 +55,8 @@ def update_file_paths(file_path):
         original_content = content
 
         # Update path references
-        replacements = [
-            # Main folder changes
-            (r'\.\/wp-content\/uploads\/', './assets/media/'),
-            (r'\.\/wp-content\/plugins\/', './assets/modules/'),
-            (r'\.\/wp-content\/themes\/', './assets/templates/'),
-            (r'\.\/wp-content\/', './assets/'),
-            (r'\.\/wp-includes\/', './core/'),
-
-            # Without leading ./
-            (r'"wp-content\/uploads\/', '"assets/media/'),
-            (r'"wp-content\/plugins\/', '"assets/modules/'),
-            (r'"wp-content\/themes\/', '"assets/templates/'),
-            (r'"wp-content\/', '"assets/'),
-            (r'"wp-includes\/', '"core/'),
-
-            # In URLs and hrefs
-            (r'href=["\']\.\/wp-content\/uploads\/', 'href="./assets/media/'),
-            (r'href=["\']\.\/wp-content\/plugins\/', 'href="./assets/modules/'),
-            (r'href=["\']\.\/wp-content\/themes\/', 'href="./assets/templates/'),
-            (r'href=["\']\.\/wp-content\/', 'href="./assets/'),
-            (r'href=["\']\.\/wp-includes\/', 'href="./core/'),
-
-            # In src attributes
-            (r'src=["\']\.\/wp-content\/uploads\/', 'src="./assets/media/'),
-            (r'src=["\']\.\/wp-content\/plugins\/', 'src="./assets/modules/'),
-            (r'src=["\']\.\/wp-content\/themes\/', 'src="./assets/templates/'),
-            (r'src=["\']\.\/wp-content\/', 'src="./assets/'),
-            (r'src=["\']\.\/wp-includes\/', 'src="./core/'),
-        ]
-
-        changes_made = 0
-        for pattern, replacement in replacements:
-            new_content = re.sub(pattern, replacement, content)
-            if new_content != content:
-                changes_made += len(re.findall(pattern, content))
-                content = new_content
+        content, hits = apply_rules(content, PATHS)
+        changes_made = sum(hits)
 
         if content != original_content:
             with open(file_path, 'w', encoding='utf-8') as f:
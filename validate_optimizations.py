@@ -8,6 +8,8 @@ import re
 import os
 import json
 
+from asset_inventory import total_size
+
 def validate_external_dependencies():
     """Validate that external dependencies are properly handled"""
     print("🔍 Validating external dependencies...")
@@ -151,13 +153,7 @@ def check_file_sizes():
     
     for dir_path in directories:
         if os.path.exists(dir_path):
-            total_size = 0
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if os.path.exists(file_path):
-                        total_size += os.path.getsize(file_path)
-            file_sizes[dir_path] = total_size
+            file_sizes[dir_path] = total_size(under=dir_path)
     
     print("   📊 File sizes:")
     for path, size in file_sizes.items():